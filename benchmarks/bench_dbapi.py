@@ -0,0 +1,102 @@
+"""
+BENCHMARK: Pooled DB-API Storage
+=================================
+
+Times payroll/dbapi.py on the SQLite stand-in against the original access
+pattern of one new connection (and one commit) per button press:
+
+    connect_per_save    connect, INSERT, commit, close - per record
+    pooled_per_save     DBAPISalaryStore.insert() - per record, pooled connection
+    pooled_batch        DBAPISalaryStore.insert_many() with each --batch-sizes value
+    connect_per_lookup  connect, SELECT, close - per lookup
+    pooled_lookup       DBAPISalaryStore.get() - per lookup
+
+Per-record runs use at most --cap records; rates are per record, so they
+compare directly with the batch runs.
+
+Usage:
+    python benchmarks/bench_dbapi.py --rows 100000 --batch-sizes 100,1000,10000
+"""
+
+import sys
+import os
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.dbapi import open_sqlite, statements
+from payroll.storage import to_record
+
+
+def make_records(rows, month='Jan', year='2025'):
+    blank = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+    return [to_record(dict(blank, code=code, name=f'Employee {code}', month=month, year=year, salary='52850.00',
+                           pf='6000.00', net='54056.82', reciept=f'receipt {code}')) for code in range(1, rows + 1)]
+
+
+def report(name, rows, seconds):
+    print(f"{name:<28} {rows:>9,} rows {seconds:>8.3f}s {rows / seconds:>12,.0f} rows/s")
+    return rows / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cap', type=int, default=2000, help='records for the per-record runs')
+    parser.add_argument('--batch-sizes', default='100,1000,10000')
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    records = make_records(args.rows)
+    small = records[:min(args.cap, args.rows)]
+    lookups = random.Random(1).choices([record.code for record in small], k=len(small))
+    insert, get = statements('qmark')['insert'], statements('qmark')['get_period']
+    directory = tempfile.mkdtemp(prefix='bench_dbapi_')
+    try:
+        path = os.path.join(directory, 'per_save.db')
+        open_sqlite(path).close()
+        start = time.perf_counter()
+        for record in small:
+            con = sqlite3.connect(path)
+            con.execute('PRAGMA synchronous=NORMAL')
+            with con:
+                con.execute(insert, record)
+            con.close()
+        per_save = report('connect_per_save', len(small), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for code in lookups:
+            con = sqlite3.connect(path)
+            con.execute(get, (code, '2025', 'Jan')).fetchall()
+            con.close()
+        report('connect_per_lookup', len(lookups), time.perf_counter() - start)
+
+        with open_sqlite(os.path.join(directory, 'pooled.db'), pool_size=args.pool_size) as store:
+            start = time.perf_counter()
+            for record in small:
+                store.insert(record)
+            report('pooled_per_save', len(small), time.perf_counter() - start)
+            start = time.perf_counter()
+            for code in lookups:
+                store.get(code, 'Jan', '2025')
+            report('pooled_lookup', len(lookups), time.perf_counter() - start)
+
+        for batch_size in map(int, args.batch_sizes.split(',')):
+            with open_sqlite(os.path.join(directory, f'batch{batch_size}.db'), batch_size=batch_size) as store:
+                start = time.perf_counter()
+                store.insert_many(records)
+                rate = report(f'pooled_batch/{batch_size}', len(records), time.perf_counter() - start)
+            print(f"{'':<28} {rate / per_save:.0f}x connect_per_save")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
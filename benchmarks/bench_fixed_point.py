@@ -0,0 +1,86 @@
+"""
+BENCHMARK: Float vs Exact (Integer Paise) Gross-Up
+===================================================
+
+Times the float and fixed-point engines on the same synthetic workforce -
+scalar functions, batch with NumPy and batch without - and shows how far
+the per-employee rounded float results drift from the exact total.
+
+Usage:
+    python benchmarks/bench_fixed_point.py --rows 1000000 --scalar-rows 100000
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll import core
+from payroll.core import (calculate_gross_up_salary, calculate_gross_up_batch, calculate_gross_up_paise,
+                          calculate_gross_up_batch_paise)
+from bench_parallel import make_workforce
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label, rows, seconds):
+    print(f"{label:<34}{seconds:>9.3f}s{rows / seconds:>16,.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--scalar-rows', type=int, default=100000, help='rows for the per-row scalar loops')
+    args = parser.parse_args()
+
+    columns = make_workforce(args.rows)
+    del columns['code']
+    # Whole rupees in the synthetic data, so both modes see identical inputs
+    paise_columns = {name: [v * 100 for v in values] for name, values in columns.items()}
+    print(f"{args.rows:,} employees ({args.scalar_rows:,} for scalar loops)\n")
+
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())][:args.scalar_rows]
+    paise_rows = [dict(zip(paise_columns, values)) for values in zip(*paise_columns.values())][:args.scalar_rows]
+    _, seconds = timed(lambda: [calculate_gross_up_salary(row) for row in rows])
+    report('scalar float', len(rows), seconds)
+    _, seconds = timed(lambda: [calculate_gross_up_paise(row) for row in paise_rows])
+    report('scalar paise', len(rows), seconds)
+
+    if core.np is not None:
+        float_arrays = {name: core.np.asarray(values, dtype=core.np.float64) for name, values in columns.items()}
+        paise_arrays = {name: core.np.asarray(values, dtype=core.np.int64) for name, values in paise_columns.items()}
+        float_result, seconds = timed(calculate_gross_up_batch, float_arrays)
+        report('batch float (NumPy)', args.rows, seconds)
+        paise_result, seconds = timed(calculate_gross_up_batch_paise, paise_arrays)
+        report('batch paise (NumPy int64)', args.rows, seconds)
+    else:
+        float_result = calculate_gross_up_batch(columns)
+        paise_result = calculate_gross_up_batch_paise(paise_columns)
+
+    numpy = core.np
+    core.np = None
+    try:
+        small = {name: values[:args.scalar_rows] for name, values in columns.items()}
+        small_paise = {name: values[:args.scalar_rows] for name, values in paise_columns.items()}
+        _, seconds = timed(calculate_gross_up_batch, small)
+        report('batch float (pure Python)', args.scalar_rows, seconds)
+        _, seconds = timed(calculate_gross_up_batch_paise, small_paise)
+        report('batch paise (pure Python)', args.scalar_rows, seconds)
+    finally:
+        core.np = numpy
+
+    float_total = sum(round(net, 2) for net in float_result['Net Salary'].tolist())
+    exact_total = sum(paise_result['Net Salary'].tolist())
+    print(f"\nNet salary total, rounded floats : Rs.{float_total:,.2f}")
+    print(f"Net salary total, exact paise    : Rs.{exact_total // 100:,}.{exact_total % 100:02d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
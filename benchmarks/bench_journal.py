@@ -0,0 +1,125 @@
+"""
+BENCHMARK: Group-Committed Journal vs Commit-per-Save
+======================================================
+
+Simulates month-end: --clerks threads each save --saves records, one at a
+time, as the GUI's Save button does.
+
+    commit_per_save/full    SalaryStore.insert() per save, synchronous=FULL
+                            (one fsync per save - durable on power loss)
+    commit_per_save/normal  SalaryStore.insert() per save, the store's
+                            default synchronous=NORMAL (no fsync per save)
+    journal                 JournaledSalaryStore.insert() - group commit,
+                            one fsync per group, compaction in the background
+
+Reported: saves per second, fsyncs (journal groups) and the 50th/99th
+percentile latency of one save. The journal time includes closing the
+store, i.e. compacting everything into the database.
+
+Usage:
+    python benchmarks/bench_journal.py --clerks 16 --saves 200 --max-delay 0.005
+"""
+
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.journal import JournaledSalaryStore
+from payroll.storage import SalaryStore
+
+
+def make_record(code):
+    record = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+    record.update(code=code, name=f'Employee {code}', month='Jan', year='2025', salary='52850.00',
+                  pf='6000.00', net='54056.82', reciept=f'receipt {code}')
+    return record
+
+
+def run_clerks(clerks, saves, save):
+    """Run save(code) from `clerks` threads. Returns (seconds, sorted per-save latencies)."""
+    latencies = []
+    lock = threading.Lock()
+
+    def clerk(first):
+        own = []
+        for code in range(first, first + saves):
+            start = time.perf_counter()
+            save(code)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=clerk, args=(1 + i * saves,)) for i in range(clerks)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name, count, seconds, latencies, fsyncs):
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{name:<24} {count / seconds:>10,.0f} saves/s  {fsyncs:>7} fsyncs  "
+          f"p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+    return count / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clerks', type=int, default=16)
+    parser.add_argument('--saves', type=int, default=200, help='saves per clerk')
+    parser.add_argument('--max-delay', type=float, default=0.005, help='journal group commit window (s)')
+    parser.add_argument('--dir', default=None, help='database directory (default: a temporary directory)')
+    args = parser.parse_args()
+    count = args.clerks * args.saves
+
+    directory = args.dir or tempfile.mkdtemp(prefix='bench_journal_')
+    try:
+        rates = {}
+        for synchronous in ('FULL', 'NORMAL'):
+            path = os.path.join(directory, f'per_save_{synchronous.lower()}.db')
+            SalaryStore(path).close()
+            local = threading.local()
+            stores = []
+
+            def save(code):
+                store = getattr(local, 'store', None)
+                if store is None:
+                    store = local.store = SalaryStore(path, check_same_thread=False)
+                    store.con.execute(f'PRAGMA synchronous={synchronous}')
+                    stores.append(store)
+                store.insert(make_record(code))
+
+            seconds, latencies = run_clerks(args.clerks, args.saves, save)
+            for store in stores:
+                store.close()
+            name = f'commit_per_save/{synchronous.lower()}'
+            rates[name] = report(name, count, seconds, latencies, count if synchronous == 'FULL' else 0)
+
+        path = os.path.join(directory, 'journal.db')
+        store = JournaledSalaryStore(path, max_delay=args.max_delay)
+        start = time.perf_counter()
+        _, latencies = run_clerks(args.clerks, args.saves, lambda code: store.insert(make_record(code)))
+        store.close()
+        rate = report('journal', count, time.perf_counter() - start, latencies, store.groups)
+        with SalaryStore(path) as check:
+            assert check.count() == count
+        print(f"journal: {store.entries / store.groups:.1f} saves per fsync, "
+              f"{rate / rates['commit_per_save/full']:.1f}x commit_per_save/full")
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
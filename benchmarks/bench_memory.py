@@ -0,0 +1,86 @@
+"""
+BENCHMARK: Memory of Per-Employee Results
+==========================================
+
+Measures (tracemalloc) the memory held by the results of --rows employees
+in each representation:
+
+    dict results        one plain dict per employee (what
+                        calculate_gross_up_salary() returns)
+    SalaryResult        one __slots__ SalaryResult.from_mapping() per employee
+    columnar (array)    calculate_gross_up_batch() without NumPy: one
+                        array('d') per key
+    columnar (NumPy)    calculate_gross_up_batch() with NumPy
+    employee dicts      one dict of the 14 EMPLOYEE_FIELDS per employee
+    Employee            one __slots__ Employee per employee
+
+Result values (floats) are created by the measured code and counted;
+the employee strings exist beforehand and are shared, so the employee lines
+compare the containers alone. Results are reported in MB per 100k employees.
+
+Usage:
+    python benchmarks/bench_memory.py --rows 100000
+"""
+
+import sys
+import os
+import gc
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll import core
+from payroll.core import EMPLOYEE_FIELDS, Employee, SalaryResult, calculate_gross_up_batch, calculate_gross_up_salary
+from bench_parallel import make_workforce
+
+
+def measure(build):
+    """Bytes still allocated by build() while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    columns = make_workforce(args.rows)
+    codes = columns.pop('code')
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    scale = 100000 / args.rows / 1e6
+
+    results = {
+        'dict results': lambda: [calculate_gross_up_salary(row) for row in rows],
+        'SalaryResult': lambda: [SalaryResult.from_mapping(calculate_gross_up_salary(row)) for row in rows],
+    }
+    numpy = core.np
+    core.np = None
+    try:
+        results['columnar (array)'] = measure(lambda: calculate_gross_up_batch(columns))
+    finally:
+        core.np = numpy
+    if numpy is not None:
+        results['columnar (NumPy)'] = measure(lambda: calculate_gross_up_batch(columns))
+
+    details = [[str(code), 'Clerk', f'Employee {code}', '30', 'F', f'e{code}@example.com', 'Hired', '01-01-1995',
+                '01-04-2020', '5', f'P{code}', f'98{code:08d}', 'Active', f'Address {code}'] for code in codes]
+    results['employee dicts'] = lambda: [dict(zip(EMPLOYEE_FIELDS, values)) for values in details]
+    results['Employee'] = lambda: [Employee(*values) for values in details]
+
+    print(f"{'':<20} {'MB per 100k':>12} {'bytes/employee':>15}")
+    for name, build in results.items():
+        size = build if isinstance(build, int) else measure(build)
+        print(f"{name:<20} {size * scale:>12.1f} {size / args.rows:>15.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
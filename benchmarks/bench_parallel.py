@@ -0,0 +1,73 @@
+"""
+BENCHMARK: Multi-Process Payroll Run Scaling
+=============================================
+
+Times run_parallel() on a synthetic workforce with 1, 2, 4 ... N worker
+processes and prints rows/s and speed-up against 1 worker.
+
+Usage:
+    python benchmarks/bench_parallel.py --rows 1000000 --max-workers 8 --chunk-size 50000
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll.parallel import run_parallel
+
+
+def make_workforce(rows, seed=42):
+    rng = random.Random(seed)
+    codes = list(range(1, rows + 1))
+    rng.shuffle(codes)
+    grades = [(20000 + 2500 * g, 4000 + 500 * g) for g in range(200)]
+    basic, hra = zip(*(rng.choice(grades) for _ in range(rows)))
+    return {
+        'code': codes,
+        'Basic Pay': list(basic),
+        'HRA': list(hra),
+        'Over Time': [rng.randrange(0, 5000) for _ in range(rows)],
+        'Other Allowances': [rng.randrange(0, 3000) for _ in range(rows)],
+        'PF Percentage': [rng.choice([10, 12, 12, 12, 15]) for _ in range(rows)],
+        'Other Deductions': [rng.randrange(0, 1000) for _ in range(rows)],
+    }
+
+
+def worker_counts(max_workers):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3, help='best of N runs per worker count')
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} employees...")
+    columns = make_workforce(args.rows)
+
+    print(f"\n{'Workers':<10}{'Seconds':<12}{'Rows/s':<16}{'Speed-up':<10}")
+    print("-" * 48)
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run_parallel(columns, workers=workers, chunk_size=args.chunk_size)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"{workers:<10}{best:<12.3f}{args.rows / best:<16,.0f}{baseline / best:<10.2f}")
+
+
+if __name__ == "__main__":
+    main()
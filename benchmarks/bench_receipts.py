@@ -0,0 +1,66 @@
+"""
+BENCHMARK: Bulk Receipt Rendering and Writing
+==============================================
+
+Calculates a synthetic payroll run, then times write_receipts() writing one
+receipt file per employee. Target: 100k receipts in under 10 seconds.
+
+Usage:
+    python benchmarks/bench_receipts.py --rows 100000 --workers 8 --dir /tmp/receipts
+"""
+
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from payroll.core import calculate_gross_up_batch
+from payroll.receipts import GROSS_UP_TEMPLATE, write_receipts
+from bench_parallel import make_workforce
+
+TARGET_SECONDS_PER_100K = 10.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--dir', default=None, help='output directory (default: a temporary directory)')
+    args = parser.parse_args()
+
+    columns = make_workforce(args.rows)
+    codes = columns.pop('code')
+    result = calculate_gross_up_batch(columns)
+
+    # Rendering only (no disk)
+    start = time.perf_counter()
+    render_columns = {field: result[field] for field in GROSS_UP_TEMPLATE.fields if field in result}
+    render_columns.update(code=codes, month='Jan', year='2025', generated_on='31-01-2025')
+    for _ in GROSS_UP_TEMPLATE.render_rows(render_columns, len(codes)):
+        pass
+    render_seconds = time.perf_counter() - start
+
+    directory = args.dir or tempfile.mkdtemp(prefix='receipts_')
+    try:
+        summary = write_receipts(result, codes, directory, 'Jan', '2025', generated_on='31-01-2025',
+                                 workers=args.workers, chunk_size=args.chunk_size)
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    per_100k = summary['seconds'] * 100000 / max(summary['written'], 1)
+    print(f"Rendered {args.rows:,} receipts in {render_seconds:.2f}s ({args.rows / render_seconds:,.0f}/s)")
+    print(f"Rendered + wrote {summary['written']:,} receipts in {summary['seconds']:.2f}s "
+          f"({summary['receipts_per_second']:,.0f}/s) with {args.workers} writer threads")
+    print(f"{per_100k:.2f}s per 100k receipts (target {TARGET_SECONDS_PER_100K:.0f}s) - "
+          f"{'OK' if per_100k < TARGET_SECONDS_PER_100K else 'SLOW'}")
+    return 0 if per_100k < TARGET_SECONDS_PER_100K else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
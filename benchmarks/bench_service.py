@@ -0,0 +1,161 @@
+"""
+BENCHMARK: Gross-Up HTTP Service Load Test
+===========================================
+
+Starts payroll/service.py on a free localhost port (or uses --port of a
+running service) and drives it over keep-alive connections:
+
+    single      --connections clients, each POSTing one employee to
+                /gross-up, --requests in total
+    batch       --connections clients POSTing --batch-rows employees to
+                /gross-up/batch, --batch-requests in total
+    mixed       the single load again while batches are running - shows
+                whether the event loop keeps serving small requests while
+                batches are calculated in the worker pool
+
+Reported: requests per second and the 50th/99th percentile latency
+(rows per second for batches).
+
+Usage:
+    python benchmarks/bench_service.py --connections 16 --requests 5000 --batch-rows 5000 --workers 2
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_parallel import make_workforce
+
+HOST = '127.0.0.1'
+
+
+async def request(connection, method, path, payload=None):
+    """Send one request on an open (reader, writer) pair. Returns (status, decoded JSON)."""
+    reader, writer = connection
+    body = b'' if payload is None else payload
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def drive(port, connections, count, path, bodies):
+    """Send `count` requests from `connections` clients. Returns (seconds, sorted latencies)."""
+    latencies = []
+    remaining = [count]
+
+    async def client():
+        connection = await asyncio.open_connection(HOST, port)
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                body = bodies[remaining[0] % len(bodies)]
+                start = time.perf_counter()
+                status, _ = await request(connection, 'POST', path, body)
+                latencies.append(time.perf_counter() - start)
+                assert status == 200, status
+        finally:
+            connection[1].close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(name, count, seconds, latencies, rows=1):
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    line = f"{name:<8} {count / seconds:>9,.0f} req/s  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms"
+    if rows > 1:
+        line += f"  {count * rows / seconds:>11,.0f} rows/s"
+    print(line)
+
+
+async def wait_until_up(port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = await asyncio.open_connection(HOST, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+            continue
+        status, _ = await request(connection, 'GET', '/health')
+        connection[1].close()
+        return status
+
+
+async def run(args, port):
+    await wait_until_up(port)
+    employees = make_workforce(max(args.batch_rows, 1000))
+    del employees['code']
+    rows = [dict(zip(employees, values)) for values in zip(*employees.values())]
+    singles = [json.dumps(row).encode() for row in rows[:1000]]
+    batch = [json.dumps({'rows': rows[i:i + args.batch_rows]}).encode()
+             for i in range(0, len(rows) - args.batch_rows + 1, args.batch_rows)]
+
+    await drive(port, args.connections, min(args.requests, 200), '/gross-up', singles)  # warm up
+    seconds, latencies = await drive(port, args.connections, args.requests, '/gross-up', singles)
+    report('single', args.requests, seconds, latencies)
+
+    seconds, latencies = await drive(port, args.connections, args.batch_requests, '/gross-up/batch', batch)
+    report('batch', args.batch_requests, seconds, latencies, rows=args.batch_rows)
+
+    batches = asyncio.ensure_future(drive(port, 2, args.batch_requests, '/gross-up/batch', batch))
+    seconds, latencies = await drive(port, args.connections, args.requests, '/gross-up', singles)
+    report('mixed', args.requests, seconds, latencies)
+    await batches
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=5000, help='single-employee requests')
+    parser.add_argument('--batch-requests', type=int, default=40)
+    parser.add_argument('--batch-rows', type=int, default=5000, help='employees per batch request')
+    parser.add_argument('--workers', type=int, default=None, help='service worker processes (default: CPU count)')
+    parser.add_argument('--port', type=int, default=None, help='use a running service instead of starting one')
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        command = [sys.executable, '-m', 'payroll.service', '--host', HOST, '--port', str(port)]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    try:
+        asyncio.run(run(args, port))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+BENCHMARK: Payroll Hot-Path Suite
+==================================
+
+Times the hot paths on synthetic workforces (default 1k, 100k and 1M
+employees) and writes the results as JSON:
+
+    scalar          calculate_gross_up_salary() per row
+    scalar_paise    calculate_gross_up_paise() per row
+    batch           calculate_gross_up_batch() (NumPy when installed)
+    batch_paise     calculate_gross_up_batch_paise()
+    rules_scalar    compiled STANDARD.calculate() of payroll/components.py per row
+    rules_batch     compiled STANDARD.calculate_batch_paise()
+    reverse_batch   solve_gross_up_batch_paise() (target net -> split)
+    parallel        run_parallel() with --workers processes
+    receipts        GROSS_UP_TEMPLATE.render_rows() (rendering only, no disk)
+    storage_insert  SalaryStore.insert_many() of one salary month
+    storage_lookup  SalaryStore.get() of random (code, month, year)
+    import_employee `import employee` in a fresh interpreter
+    import_gui      `import payroll.gui` (tkinter + GUI modules, no window)
+    startup         whole `python -c "import employee"` process
+
+Per-row loops (scalar, receipts, storage) run on at most --cap rows of each
+workforce; rates are per row, so capped and full runs compare directly.
+
+With --baseline the run is compared against a saved results file and the
+script exits with status 1 when any benchmark is more than --max-slowdown
+(a fraction, 0.25 = 25%) slower than the baseline.
+
+Usage:
+    python benchmarks/bench_suite.py --output bench.json
+    python benchmarks/bench_suite.py --sizes 1k,100k --save-baseline baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --max-slowdown 0.25
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from payroll import core
+from payroll.components import STANDARD
+from payroll.core import (EMP_SALARY_COLUMNS, calculate_gross_up_salary, calculate_gross_up_batch,
+                          calculate_gross_up_paise, calculate_gross_up_batch_paise, paise_inputs)
+from payroll.parallel import run_parallel
+from payroll.receipts import GROSS_UP_TEMPLATE
+from payroll.reverse import solve_gross_up_batch_paise
+from payroll.storage import SalaryStore
+from bench_parallel import make_workforce
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = '1k,100k,1m'
+LOOKUPS = 10000
+
+IMPORT_PROBE = """
+import time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps((time.perf_counter() - start) * 1000))
+"""
+
+
+def parse_size(text):
+    """'1k' -> 1000, '1m' -> 1000000, '2500' -> 2500"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def best_of(repeat, function, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def entry(rows, seconds):
+    return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds > 0 else 0.0}
+
+
+def make_records(result, codes, month='Jan', year='2025'):
+    """One emp_salary record per employee, as the GUI would save it."""
+    blank = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+    for i, code in enumerate(codes):
+        record = dict(blank, code=code, name=f'Employee {code}', month=month, year=year,
+                      salary=f"{result['Gross Salary'][i]:.2f}", pf=f"{result['PF Amount'][i]:.2f}",
+                      net=f"{result['Net Salary'][i]:.2f}", reciept=f'receipt {code}')
+        yield record
+
+
+# ------------------------------------------------------------ benchmarks
+def bench_workforce(rows, args, results):
+    columns = make_workforce(rows)
+    codes = columns['code']
+    inputs = {name: values for name, values in columns.items() if name != 'code'}
+    small = min(rows, args.cap) if args.cap else rows
+    label = f'{rows}'
+
+    scalar_rows = [dict(zip(inputs, values)) for values in zip(*(values[:small] for values in inputs.values()))]
+    seconds = best_of(args.repeat, lambda: [calculate_gross_up_salary(row) for row in scalar_rows])
+    results[f'scalar/{label}'] = entry(small, seconds)
+    paise_rows = [paise_inputs(row) for row in scalar_rows]
+    seconds = best_of(args.repeat, lambda: [calculate_gross_up_paise(row) for row in paise_rows])
+    results[f'scalar_paise/{label}'] = entry(small, seconds)
+    # The compiled component definition should match the hand-written functions
+    seconds = best_of(args.repeat, lambda: [STANDARD.calculate(row) for row in scalar_rows])
+    results[f'rules_scalar/{label}'] = entry(small, seconds)
+
+    if core.np is not None:
+        float_columns = {name: core.np.asarray(values, dtype=core.np.float64) for name, values in inputs.items()}
+        paise_columns = {name: core.np.asarray(values, dtype=core.np.int64) * 100 for name, values in inputs.items()}
+    else:
+        float_columns = inputs
+        paise_columns = {name: [value * 100 for value in values] for name, values in inputs.items()}
+    results[f'batch/{label}'] = entry(rows, best_of(args.repeat, calculate_gross_up_batch, float_columns))
+    results[f'batch_paise/{label}'] = entry(rows, best_of(args.repeat, calculate_gross_up_batch_paise, paise_columns))
+    results[f'rules_batch/{label}'] = entry(rows, best_of(args.repeat, STANDARD.calculate_batch_paise, paise_columns))
+    targets = calculate_gross_up_batch_paise(paise_columns)
+    offers = {'Net Salary': targets['Net Salary'], 'PF Percentage': paise_columns['PF Percentage'],
+              'Other Deductions': paise_columns['Other Deductions']}
+    results[f'reverse_batch/{label}'] = entry(rows, best_of(args.repeat, solve_gross_up_batch_paise, offers))
+    results[f'parallel/{label}'] = entry(rows, best_of(args.repeat, lambda: run_parallel(
+        columns, workers=args.workers, chunk_size=args.chunk_size)))
+
+    result = calculate_gross_up_batch({name: values[:small] for name, values in inputs.items()})
+    render_columns = {field: result[field] for field in GROSS_UP_TEMPLATE.fields if field in result}
+    render_columns.update(code=codes[:small], month='Jan', year='2025', generated_on='31-01-2025')
+    seconds = best_of(args.repeat, lambda: [None for _ in GROSS_UP_TEMPLATE.render_rows(render_columns, small)])
+    results[f'receipts/{label}'] = entry(small, seconds)
+
+    records = list(make_records({key: result[key].tolist() for key in ('Gross Salary', 'PF Amount', 'Net Salary')},
+                                codes[:small]))
+    directory = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        best = float('inf')
+        for attempt in range(args.repeat):
+            with SalaryStore(os.path.join(directory, f'ems{attempt}.db')) as store:
+                start = time.perf_counter()
+                store.insert_many(records)
+                best = min(best, time.perf_counter() - start)
+        results[f'storage_insert/{label}'] = entry(small, best)
+
+        lookups = random.Random(1).choices(codes[:small], k=min(small, LOOKUPS))
+        with SalaryStore(os.path.join(directory, 'ems0.db')) as store:
+            seconds = best_of(args.repeat, lambda: [store.get(code, 'Jan', '2025') for code in lookups])
+        results[f'storage_lookup/{label}'] = entry(len(lookups), seconds)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def bench_startup(args, results):
+    env = dict(os.environ)
+    env.pop('DISPLAY', None)  # headless, like a batch server
+
+    def probe(module):
+        output = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        return json.loads(output.strip().splitlines()[-1]) / 1000
+
+    for name, module in (('import_employee', 'employee'), ('import_gui', 'payroll.gui')):
+        results[name] = entry(1, min(probe(module) for _ in range(args.repeat)))
+    results['startup'] = entry(1, best_of(args.repeat, lambda: subprocess.run(
+        [sys.executable, '-c', 'import employee'], cwd=ROOT, env=env, check=True)))
+
+
+# ------------------------------------------------------------ comparison
+def compare(results, baseline, max_slowdown):
+    """
+    [(name, baseline seconds per row, current seconds per row, ratio)] of
+    benchmarks in both runs, and the names slower than 1 + max_slowdown.
+    """
+    rows, regressions = [], []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None or not before['rows_per_second'] or not current['rows_per_second']:
+            continue
+        ratio = before['rows_per_second'] / current['rows_per_second']
+        rows.append((name, 1 / before['rows_per_second'], 1 / current['rows_per_second'], ratio))
+        if ratio > 1 + max_slowdown:
+            regressions.append(name)
+    return rows, regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': None if core.np is None else core.np.__version__,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'workforce sizes (default {DEFAULT_SIZES})')
+    parser.add_argument('--cap', type=int, default=100000, help='max rows for per-row loops (0 = no cap)')
+    parser.add_argument('--repeat', type=int, default=3, help='best of N runs')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--skip-startup', action='store_true', help='do not time imports in fresh interpreters')
+    parser.add_argument('--output', default=None, help='write results JSON here')
+    parser.add_argument('--save-baseline', default=None, help='also write the results as a baseline file')
+    parser.add_argument('--baseline', default=None, help='compare against this results file')
+    parser.add_argument('--max-slowdown', type=float, default=0.25,
+                        help='fail when a benchmark is this fraction slower than the baseline (default 0.25)')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for rows in map(parse_size, args.sizes.split(',')):
+        print(f"Benchmarking {rows:,} employees...", flush=True)
+        bench_workforce(rows, args, results)
+    if not args.skip_startup:
+        bench_startup(args, results)
+
+    print(f"\n{'Benchmark':<26}{'Rows':>10}{'Seconds':>12}{'Rows/s':>16}")
+    print("-" * 64)
+    for name, result in results.items():
+        print(f"{name:<26}{result['rows']:>10,}{result['seconds']:>12.4f}{result['rows_per_second']:>16,.0f}")
+
+    document = {'version': RESULTS_VERSION, 'environment': environment(), 'results': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(results, baseline['results'], args.max_slowdown)
+    print(f"\nAgainst {args.baseline} ({baseline['environment'].get('date', '?')}), "
+          f"max slowdown {args.max_slowdown:.0%}")
+    print(f"{'Benchmark':<26}{'Before':>14}{'Now':>14}{'Ratio':>8}")
+    for name, before, now, ratio in rows:
+        print(f"{name:<26}{before * 1e6:>12.3f}us{now * 1e6:>12.3f}us{ratio:>8.2f}"
+              f"{'  SLOWER' if name in regressions else ''}")
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Shared pytest fixtures for the root-level test files.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll import core
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    """Run the test once with NumPy and once with the plain-Python loops."""
+    if request.param == 'numpy':
+        if core.np is None:
+            pytest.skip("NumPy not installed")
+    else:
+        monkeypatch.setattr(core, 'np', None)
+    return request.param
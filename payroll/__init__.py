@@ -0,0 +1,34 @@
+"""
+Employee payroll package.
+
+payroll.core - gross-up calculation and record types (no tkinter)
+payroll.reverse - target net salary -> Basic/HRA/Allowances split
+payroll.components - salary components from payroll/components.json
+payroll.gui  - Tkinter EmployeeSystem window (imported only when started)
+"""
+
+from payroll.core import (
+    EMPLOYEE_FIELDS,
+    SALARY_FIELDS,
+    EMP_SALARY_COLUMNS,
+    EmpSalaryRecord,
+    Employee,
+    SalaryResult,
+    SALARY_INPUT_DEFAULTS,
+    SALARY_RESULT_KEYS,
+    calculate_gross_up_salary,
+    calculate_gross_up_batch,
+    PAISE_INPUT_DEFAULTS,
+    rupees_to_paise,
+    percent_to_basis_points,
+    paise_inputs,
+    paise_result_to_rupees,
+    calculate_gross_up_paise,
+    calculate_gross_up_batch_paise,
+)
+from payroll.reverse import (
+    REVERSE_INPUT_DEFAULTS,
+    solve_gross_up,
+    solve_gross_up_paise,
+    solve_gross_up_batch_paise,
+)
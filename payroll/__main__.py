@@ -0,0 +1,7 @@
+"""python -m payroll run ... - see payroll/cli.py."""
+
+import sys
+
+from payroll.cli import main
+
+sys.exit(main())
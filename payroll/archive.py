@@ -0,0 +1,336 @@
+"""
+Indexed receipt archive - one data file per month instead of one file per receipt.
+
+Layout of an archive directory:
+
+    2025-01.dat   receipts of Jan 2025, appended back to back (bytes as written)
+    2025-01.idx   fixed-size index records: code, offset, length
+
+Both files are append-only. A receipt is written to the .dat file before its
+index record, so after a crash the worst case is an unreferenced tail in the
+.dat file; the index is read up to the first record that points past the end
+of the data (or a torn last record), and the rest is cut off before the next
+append, so such a record cannot later resolve to another receipt's bytes. Saving a receipt again for the
+same (code, year, month) appends a new copy and the later index record wins.
+
+Lookups read the month's index into a dict once and serve receipts from a
+memory map of the .dat file, so get() is a dict lookup plus a memoryview
+slice - no seek, no read, no copy. One process writes an archive at a time.
+
+Usage:
+    with ReceiptArchive('receipts') as archive:
+        archive.append(1, 2025, 'Jan', text)
+        bytes(archive.get(1, 2025, 'Jan')).decode()
+
+    python -m payroll.archive import Salary_Receipt receipts
+    python -m payroll.archive extract receipts 2025 Jan out/ [--code 1 --code 2]
+"""
+
+import os
+import re
+import sys
+import glob
+import mmap
+import time
+import struct
+import argparse
+
+from payroll.instrument import probe, returned_count
+from payroll.migrate import MONTHS, to_month
+from payroll.receipts import GROSS_UP_TEMPLATE, write_files
+
+# code, offset, length
+INDEX_RECORD = struct.Struct('<qQI')
+
+_EMPLOYEE_ID = re.compile(rb'Employee Id\s*:\s*(\d+)')
+_SALARY_OF = re.compile(rb'Salary of\s*:\s*([A-Za-z]+|\d{1,2})-(\d{4})')
+
+
+def period_name(year, month):
+    """(2025, 'Jan') -> '2025-01'"""
+    return f'{int(year):04d}-{to_month(month):02d}'
+
+
+class _MonthFile:
+    """The .dat/.idx pair of one month."""
+
+    def __init__(self, directory, name):
+        self.data_path = os.path.join(directory, name + '.dat')
+        self.index_path = os.path.join(directory, name + '.idx')
+        self.entries = {}  # code -> (offset, length)
+        self.size = 0
+        self.index_size = 0
+        self.map = None
+        self.data_file = None
+        self.index_file = None
+        self._load()
+
+    def _load(self):
+        try:
+            self.size = os.path.getsize(self.data_path)
+            with open(self.index_path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            self.size = 0
+            return
+        raw = raw[:len(raw) - len(raw) % INDEX_RECORD.size]
+        entries = self.entries
+        file_size = self.size
+        end = 0
+        valid = 0
+        for code, offset, length in INDEX_RECORD.iter_unpack(raw):
+            if offset + length > file_size:
+                # Its data was lost (later records are newer still): append() cuts the index here
+                break
+            entries[code] = (offset, length)
+            end = max(end, offset + length)
+            valid += INDEX_RECORD.size
+        self.index_size = valid
+        # Data past the last indexed receipt was never committed
+        self.size = end
+
+    def view(self, code):
+        entry = self.entries.get(code)
+        if entry is None:
+            return None
+        offset, length = entry
+        if self.map is None or len(self.map) < offset + length:
+            if self.data_file is not None:
+                self.data_file.flush()
+            with open(self.data_path, 'rb') as f:
+                # Views handed out earlier keep the previous map alive
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self.map)[offset:offset + length]
+
+    def append(self, items):
+        if self.data_file is None:
+            self.data_file = open(self.data_path, 'ab')
+            self.index_file = open(self.index_path, 'ab')
+            if self.data_file.tell() > self.size:
+                # Drop an unreferenced tail left by an interrupted append
+                self.data_file.truncate(self.size)
+            if self.index_file.tell() > self.index_size:
+                self.index_file.truncate(self.index_size)
+        data = bytearray()
+        index = bytearray()
+        offset = self.size
+        new_entries = []
+        for code, text in items:
+            blob = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+            data += blob
+            index += INDEX_RECORD.pack(code, offset, len(blob))
+            new_entries.append((code, (offset, len(blob))))
+            offset += len(blob)
+        self.data_file.write(data)
+        self.data_file.flush()
+        self.index_file.write(index)
+        self.index_file.flush()
+        self.size = offset
+        self.index_size += len(index)
+        self.entries.update(new_entries)
+        return len(new_entries)
+
+    def close(self):
+        for f in (self.data_file, self.index_file):
+            if f is not None:
+                f.close()
+        self.data_file = self.index_file = None
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # a caller still holds a view; the map closes when it is released
+            self.map = None
+
+
+class ReceiptArchive:
+    """Receipts keyed by (code, year, month) in one data file per month."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._months = {}
+
+    def _month(self, year, month):
+        name = period_name(year, month)
+        month_file = self._months.get(name)
+        if month_file is None:
+            month_file = self._months[name] = _MonthFile(self.directory, name)
+        return month_file
+
+    def append(self, code, year, month, text):
+        """Add (or replace) one receipt."""
+        return self._month(year, month).append([(int(code), text)])
+
+    @probe('archive_write', returned_count)
+    def append_many(self, year, month, items):
+        """Add (code, text) pairs of one month with one write per file. Returns the count."""
+        return self._month(year, month).append((int(code), text) for code, text in items)
+
+    def get(self, code, year, month):
+        """The receipt as a read-only memoryview of the archive (None if missing)."""
+        return self._month(year, month).view(int(code))
+
+    def get_text(self, code, year, month):
+        view = self.get(code, year, month)
+        return None if view is None else str(view, 'utf-8')
+
+    def codes(self, year, month):
+        return sorted(self._month(year, month).entries)
+
+    def periods(self):
+        """[(year, 'Jan'), ...] of every month in the archive."""
+        found = []
+        for path in sorted(glob.glob(os.path.join(self.directory, '[0-9][0-9][0-9][0-9]-[0-9][0-9].idx'))):
+            year, month = os.path.basename(path)[:-4].split('-')
+            found.append((int(year), MONTHS[int(month) - 1]))
+        return found
+
+    def close(self):
+        for month_file in self._months.values():
+            month_file.close()
+        self._months = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def archive_receipts(result, codes, archive, month, year, generated_on=None, template=GROSS_UP_TEMPLATE):
+    """
+    Render the gross-up receipts of a payroll run into the archive.
+
+    Same inputs as payroll.receipts.write_receipts(), but one append per
+    month instead of one file per employee. Invalid rows get no receipt.
+    template is the receipt layout (ComponentSet.receipt_template for other
+    salary components).
+
+    Returns:
+        dict: 'written', 'skipped', 'seconds', 'receipts_per_second'
+    """
+    start = time.perf_counter()
+    codes = codes.tolist() if hasattr(codes, 'tolist') else list(codes)
+    invalid = set(result.get('Invalid Rows', ()))
+
+    columns = {field: result[field] for field in template.fields if field in result}
+    columns.update(code=codes, month=str(month), year=str(year),
+                   generated_on=generated_on or time.strftime("%d-%m-%Y"))
+    receipts = template.render_rows(columns, len(codes))
+    written = archive.append_many(year, month, ((code, text) for i, (code, text) in enumerate(zip(codes, receipts))
+                                                if i not in invalid))
+
+    seconds = time.perf_counter() - start
+    return {
+        'written': written,
+        'skipped': len(invalid),
+        'seconds': seconds,
+        'receipts_per_second': written / seconds if seconds > 0 else 0.0,
+    }
+
+
+def read_receipt_key(data):
+    """(code, year, month) from the header of a receipt, or None."""
+    employee_id = _EMPLOYEE_ID.search(data)
+    salary_of = _SALARY_OF.search(data)
+    if employee_id is None or salary_of is None:
+        return None
+    try:
+        month = MONTHS[to_month(salary_of.group(1).decode('ascii')) - 1]
+    except ValueError:
+        return None
+    return int(employee_id.group(1)), int(salary_of.group(2)), month
+
+
+def import_text_files(archive, paths):
+    """
+    Import receipt .txt files (e.g. Salary_Receipt/*.txt) into the archive.
+
+    The period is read from the receipt header and the employee code from the
+    <code>.txt file name (the header's Employee Id is used only when the name
+    is not a code - the sample receipts 3.txt and 7.txt carry a copied Id).
+    The bytes are stored unchanged. Files without a readable header are
+    skipped.
+
+    Args:
+        archive (ReceiptArchive): Target archive
+        paths: A directory (all *.txt in it) or an iterable of file paths
+
+    Returns:
+        dict: 'imported', 'skipped' (list of paths), 'seconds'
+    """
+    start = time.perf_counter()
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(os.path.join(paths, '*.txt')))
+    by_month = {}
+    skipped = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = read_receipt_key(data)
+        if key is None:
+            skipped.append(path)
+            continue
+        code, year, month = key
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem.isdigit():
+            code = int(stem)
+        by_month.setdefault((year, month), []).append((code, data))
+
+    imported = 0
+    for (year, month), items in sorted(by_month.items()):
+        imported += archive.append_many(year, month, items)
+    return {'imported': imported, 'skipped': skipped, 'seconds': time.perf_counter() - start}
+
+
+def extract_text_files(archive, year, month, directory, codes=None):
+    """
+    Write receipts of one month back out as <code>.txt files.
+
+    Args:
+        codes (iterable): Only these employees (default: every receipt of the month)
+
+    Returns:
+        int: Number of files written
+    """
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for code in (archive.codes(year, month) if codes is None else codes):
+        view = archive.get(code, year, month)
+        if view is not None:
+            files.append((os.path.join(directory, f'{int(code)}.txt'), view))
+    return write_files(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import receipts into or extract them from a receipt archive.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='import <code>.txt receipts from a directory')
+    importer.add_argument('source', help='directory of receipt .txt files (e.g. Salary_Receipt)')
+    importer.add_argument('archive', help='archive directory')
+
+    extractor = commands.add_parser('extract', help='write receipts of one month as .txt files')
+    extractor.add_argument('archive', help='archive directory')
+    extractor.add_argument('year', type=int)
+    extractor.add_argument('month', help="'Jan', 'January' or 1")
+    extractor.add_argument('target', help='directory to write <code>.txt files to')
+    extractor.add_argument('--code', type=int, action='append', help='only this employee (repeatable)')
+    args = parser.parse_args(argv)
+
+    with ReceiptArchive(args.archive) as archive:
+        if args.command == 'import':
+            summary = import_text_files(archive, args.source)
+            print(f"Imported {summary['imported']:,} receipts in {summary['seconds']:.2f}s, "
+                  f"skipped {len(summary['skipped']):,}")
+            for path in summary['skipped']:
+                print(f"  no receipt header: {path}")
+        else:
+            written = extract_text_files(archive, args.year, args.month, args.target, codes=args.code)
+            print(f"Wrote {written:,} receipts to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Bounded LRU cache of gross-up results, keyed on the salary structure.
+
+Most employees sit on a few hundred pay grades, so across a run the six
+inputs (Basic, HRA, OT, Other Allowances, PF%, Other Deductions) repeat
+heavily. GrossUpCache remembers the result per normalised input tuple:
+
+    - keys: the six inputs with defaults filled in, as floats (or ints in
+      exact paise mode), so {'Basic Pay': '50000'} and {'Basic Pay': 50000.0}
+      share an entry; exact mode converts like calculate_gross_up_paise(), so
+      fractional paise raise ValueError instead of being truncated
+    - LRU eviction at maxsize entries, with hit/miss counters (info())
+    - inputs the calculation rejects are cached too and raise ValueError again
+    - scalar results are read-only mappings (types.MappingProxyType); use
+      dict(result) for a private copy
+
+calculate_batch() serves the columnar paths: each distinct input row is
+looked up once and the result columns are fresh arrays, so callers may
+modify them. With NumPy installed the plain vectorised batch is usually
+faster than any per-row lookup - the batch cache pays off on the pure Python
+path and when the same structures recur across many chunks.
+
+Usage:
+    cache = GrossUpCache(maxsize=4096)
+    result = cache.calculate({'Basic Pay': 50000, 'PF Percentage': 12})
+    result = cache.calculate_batch(columns)
+    cache.info()    # CacheInfo(hits=..., misses=..., maxsize=4096, currsize=...)
+"""
+
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+
+from payroll import core
+from payroll.instrument import batch_rows, probe
+from payroll.core import (PAISE_INPUT_DEFAULTS, SALARY_INPUT_DEFAULTS, SALARY_RESULT_KEYS, _int64_column,
+                          _q_column, _whole_units, calculate_gross_up_paise, calculate_gross_up_salary)
+
+DEFAULT_MAXSIZE = 4096
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_CALCULATED_KEYS = SALARY_RESULT_KEYS[len(SALARY_INPUT_DEFAULTS):]
+
+
+class GrossUpCache:
+    """
+    LRU cache in front of calculate_gross_up_salary() (or, with exact=True,
+    calculate_gross_up_paise()). Safe to share between threads; hits are
+    counted without the lock, so under heavy contention info() may undercount.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, exact=False):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.exact = exact
+        self.hits = 0
+        self.misses = 0
+        self._defaults = tuple((PAISE_INPUT_DEFAULTS if exact else SALARY_INPUT_DEFAULTS).items())
+        self._names = tuple(name for name, default in self._defaults)
+        self._default_values = tuple(default for name, default in self._defaults)
+        self._calculate = calculate_gross_up_paise if exact else calculate_gross_up_salary
+        self._entries = OrderedDict()  # key -> MappingProxyType result, or error message
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def key(self, data):
+        """Normalised input tuple of one employee. Raises ValueError for inputs the calculation cannot convert."""
+        values = map(data.get, self._names, self._default_values)
+        if self.exact:
+            return tuple(map(_whole_units, values, self._names))
+        return tuple(map(float, values))
+
+    def _lookup(self, key):
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is not None:
+            try:
+                entries.move_to_end(key)
+            except KeyError:
+                pass  # evicted by another thread in between - still a valid result
+            self.hits += 1
+            return entry
+
+        with self._lock:
+            self.misses += 1
+
+        try:
+            entry = MappingProxyType(self._calculate(dict(zip(SALARY_INPUT_DEFAULTS, key))))
+        except ValueError as e:
+            entry = str(e)
+
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    @probe('gross_up_cached')
+    def calculate(self, data):
+        """Cached calculate_gross_up_salary(data); returns a read-only mapping."""
+        entry = self._lookup(self.key(data))
+        if isinstance(entry, str):
+            raise ValueError(entry)
+        return entry
+
+    @probe('gross_up_batch_cached', batch_rows)
+    def calculate_batch(self, columns):
+        """
+        Cached calculate_gross_up_batch(columns) (or calculate_gross_up_batch_paise()).
+
+        Returns the same columns, array types, 'Invalid Mask' and
+        'Invalid Rows' as the uncached batch function.
+        """
+        if 'Basic Pay' not in columns:
+            raise ValueError("Basic Pay column is required")
+        row_count = len(columns['Basic Pay'])
+        inputs = []
+        for name, default in self._defaults:
+            if name in columns:
+                values = columns[name]
+                if len(values) != row_count:
+                    raise ValueError(f"Column '{name}' has {len(values)} rows, expected {row_count}")
+                if self.exact:
+                    # As calculate_gross_up_batch_paise(): fractional paise fail the batch
+                    values = _int64_column(values, name) if core.np is not None else _q_column(values, name)
+                inputs.append(values.tolist() if hasattr(values, 'tolist') else values)
+            else:
+                inputs.append([default] * row_count)
+
+        # Distinct input rows -> position in `structures`
+        positions = {}
+        row_positions = array('q')
+        for key in zip(*inputs):
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(positions)
+            row_positions.append(position)
+
+        invalid_value = 0 if self.exact else float('nan')
+        structures = []
+        invalid_structures = set()
+        for key in positions:
+            if not self.exact:
+                key = tuple(map(float, key))
+            entry = self._lookup(key)
+            if isinstance(entry, str):
+                invalid_structures.add(len(structures))
+                structures.append(key + (invalid_value,) * len(_CALCULATED_KEYS))
+            else:
+                structures.append(tuple(entry[name] for name in SALARY_RESULT_KEYS))
+
+        invalid_rows = [i for i, position in enumerate(row_positions) if position in invalid_structures]
+        result = {}
+        np = core.np
+        if np is not None:
+            table = np.array(structures, dtype=np.int64 if self.exact else np.float64).reshape(-1, len(SALARY_RESULT_KEYS))
+            picked = table[np.frombuffer(row_positions, dtype=np.int64)] if row_count else table[:0]
+            for i, name in enumerate(SALARY_RESULT_KEYS):
+                result[name] = np.ascontiguousarray(picked[:, i])
+            invalid_mask = np.zeros(row_count, dtype=bool)
+            invalid_mask[invalid_rows] = True
+        else:
+            typecode = 'q' if self.exact else 'd'
+            for i, name in enumerate(SALARY_RESULT_KEYS):
+                values = [structure[i] for structure in structures]
+                result[name] = array(typecode, map(values.__getitem__, row_positions))
+            invalid_mask = [False] * row_count
+            for i in invalid_rows:
+                invalid_mask[i] = True
+        result['Invalid Mask'] = invalid_mask
+        result['Invalid Rows'] = invalid_rows
+        return result
@@ -0,0 +1,377 @@
+"""
+Headless month-end payroll run.
+
+    python -m payroll run --input salaries.csv --month Jan --year 2025 \\
+        --workers 8 --chunk-size 50000 --receipts archive
+
+Reads a CSV/XLSX salary sheet in chunks (payroll/pipeline.py), calculates
+each chunk with run_parallel() on --workers processes, saves the valid rows
+of the month to the emp_salary database (payroll/storage.py) and writes
+their receipts to a receipt archive (payroll/archive.py), to one .txt file
+per employee, or not at all. No display is needed.
+
+The sheet needs an employee code column (code, Employee Code, Emp_ID, ...)
+holding whole numbers, plus the salary columns accepted by the pipeline.
+The salary components are those of the GUI: payroll/components.json (or
+PAYROLL_COMPONENTS, or --components), so a Conveyance or conv column is
+calculated and saved in emp_salary.conv just as the form does. Columns
+named like emp_salary columns (name, designation, email, ...) are saved
+with the row. Rows with a missing or non-numeric code or non-numeric
+amounts, a code already used earlier in the sheet, and rows the calculation
+rejects or whose amounts overflow are reported and skipped.
+
+After every chunk a checkpoint (JSON, next to the database) records how many
+chunks are complete and the codes seen so far. Running the same command again after an interruption
+skips those chunks and carries on; saving a chunk twice is harmless because
+rows and receipts are replaced. The checkpoint is removed when the run
+completes; --restart ignores it.
+
+The run summary is printed to stdout as JSON (and written to --summary):
+status, rows, errors, error_rows (first MAX_ERROR_ROWS), stored, receipts,
+chunks, resumed_chunks, seconds, rows_per_second. Progress goes to stderr.
+
+Exit codes:
+    0  every row was calculated and saved
+    1  the run completed, but some rows had errors
+    2  bad command line (or an unusable --components file)
+    3  the input cannot be read (missing file, no Basic Pay or code column)
+    4  the run failed part-way (database/receipt error) - rerun to resume
+    130 interrupted (Ctrl+C) - rerun to resume
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from array import array
+
+from payroll.archive import ReceiptArchive, archive_receipts
+from payroll.components import STANDARD, load_components
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.migrate import MONTHS, to_month
+from payroll.parallel import run_parallel
+from payroll.pipeline import DEFAULT_CHUNK_SIZE, iter_salary_chunks, print_progress, read_salary_rows
+from payroll.receipts import write_receipts
+from payroll.storage import DEFAULT_DB_PATH, SalaryStore
+
+EXIT_OK = 0
+EXIT_ROW_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_INPUT = 3
+EXIT_FAILED = 4
+EXIT_INTERRUPTED = 130
+
+# Receipts go under Salary_Receipt/ next to employee.py, like the GUI's export
+DEFAULT_RECEIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Salary_Receipt')
+RECEIPT_MODES = ('archive', 'files', 'none')
+
+# Error rows listed in the summary (all of them are counted)
+MAX_ERROR_ROWS = 1000
+
+# Header name (lower case, spaces/underscores removed) of the employee code column
+CODE_COLUMNS = ('code', 'employeecode', 'empcode', 'employeeid', 'empid')
+
+
+class InputError(ValueError):
+    """The salary sheet cannot be used for a run."""
+
+
+def checkpoint_path(db_path, month, year):
+    """Checkpoint kept next to the database: ems.db -> ems.run-2025-01.json"""
+    return f'{os.path.splitext(db_path)[0]}.run-{int(year):04d}-{to_month(month):02d}.json'
+
+
+def _input_identity(input_path):
+    stat = os.stat(input_path)
+    return {'input': os.path.abspath(input_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_checkpoint(path, identity):
+    """The saved progress of the same run (same input file and settings), or None."""
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved if all(saved.get(key) == value for key, value in identity.items()) else None
+
+
+def save_checkpoint(path, state):
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def _column_positions(passthrough_header):
+    """(code position, {emp_salary column: position}) of the passthrough columns."""
+    code = None
+    columns = {}
+    for position, name in enumerate(passthrough_header):
+        normalized = name.lower().replace(' ', '').replace('_', '')
+        if code is None and normalized in CODE_COLUMNS:
+            code = position
+        elif name.lower() in EMP_SALARY_COLUMNS and name.lower() not in columns:
+            columns[name.lower()] = position
+    if code is None:
+        raise InputError(f"Input has no employee code column (one of: {', '.join(CODE_COLUMNS)})")
+    for name in ('code', 'month', 'year', 'salary', 'pf', 'net', 'reciept'):
+        columns.pop(name, None)  # set by the run
+    return code, columns
+
+
+def _to_code(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return int(str(value).strip())
+
+
+def _non_finite_rows(result, keys):
+    """Positions whose calculated amounts are not finite (e.g. Basic Pay 1e308 + HRA 1e308 overflows)."""
+    rows = set()
+    for key in keys:
+        values = result[key].tolist() if hasattr(result[key], 'tolist') else result[key]
+        rows.update(i for i, value in enumerate(values) if not math.isfinite(value))
+    return rows
+
+
+def _calculate_chunk(chunk, code_position, workers, components, seen):
+    """
+    Drop rows with a bad code, a code in `seen` (the codes of the run so far,
+    updated here) or unparseable amounts, then calculate the rest. Rows the
+    calculation rejects or whose amounts are not finite become 'Invalid Rows'.
+
+    Returns:
+        tuple: (result of run_parallel() in code order, passthrough rows in the
+            same order, [(row within the chunk, code, error)])
+    """
+    errors = []
+    parse_errors = set(chunk['parse_errors'])
+    keep = []
+    codes = []
+    for i, row in enumerate(chunk['passthrough']):
+        try:
+            code = _to_code(row[code_position])
+        except (TypeError, ValueError):
+            errors.append((i, row[code_position], 'BAD CODE'))
+            continue
+        if i in parse_errors:
+            errors.append((i, code, 'PARSE ERROR'))
+            continue
+        if code in seen:
+            errors.append((i, code, 'DUPLICATE CODE'))
+            continue
+        seen.add(code)
+        keep.append(i)
+        codes.append(code)
+
+    columns = {key: column if len(keep) == len(column) else array('d', (column[i] for i in keep))
+               for key, column in chunk['columns'].items()}
+    columns['code'] = codes
+    result = run_parallel(columns, workers=workers, chunk_size=max(1, -(-len(codes) // workers)),
+                          components=components)
+
+    # Such rows must not be saved or given a receipt
+    invalid = sorted(set(result['Invalid Rows']) | _non_finite_rows(result, components.calculated_keys))
+    result['Invalid Rows'] = invalid
+
+    # run_parallel() returns rows in (stable) code order
+    order = sorted(range(len(codes)), key=codes.__getitem__)
+    rows = [keep[i] for i in order]
+    for position in invalid:
+        errors.append((rows[position], int(result['code'][position]), 'INVALID'))
+    passthrough = [chunk['passthrough'][i] for i in rows]
+    return result, passthrough, errors
+
+
+def _records(result, passthrough, columns, month, year, components):
+    """emp_salary rows of the valid employees of a chunk, saved like the GUI form saves them."""
+    invalid = set(result['Invalid Rows'])
+    codes = result['code'].tolist() if hasattr(result['code'], 'tolist') else result['code']
+    blank = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+    # Calculated columns, then inputs with a legacy column (conv, medical)
+    saved = [('salary', result['Gross Salary']), ('net', result['Net Salary'])]
+    if 'PF Amount' in result:
+        saved.append(('pf', result['PF Amount']))
+    saved += [(component.column, result[component.key]) for component in components.components if component.column]
+    names = [name for name, _ in saved]
+    outputs = zip(codes, passthrough, *(values for _, values in saved))
+    for position, (code, row, *values) in enumerate(outputs):
+        if position in invalid:
+            continue
+        record = dict(blank, code=code, month=month, year=year)
+        record.update((name, f'{value:.2f}') for name, value in zip(names, values))
+        for name, index in columns.items():
+            value = row[index]
+            record[name] = '' if value is None else str(value)
+        yield record
+
+
+def run_batch(input_path, month, year, db_path=DEFAULT_DB_PATH, workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+              receipts='archive', receipt_dir=DEFAULT_RECEIPT_DIR, checkpoint=None, restart=False,
+              generated_on=None, progress=print_progress, components=STANDARD):
+    """
+    Calculate, save and issue receipts for one salary month of a salary sheet.
+
+    Args:
+        input_path (str): .csv or .xlsx salary sheet with a header row
+        month, year: Salary month ('Jan', 'January' or 1) and year
+        db_path (str): emp_salary database the month is saved to
+        workers (int): Calculation processes per chunk
+        chunk_size (int): Rows read, calculated and saved at a time
+        receipts (str): 'archive' (receipt_dir/archive), 'files'
+            (receipt_dir/<year>-<month>/<code>.txt) or 'none'
+        receipt_dir (str): Base directory for receipts
+        checkpoint (str): Progress file (default: checkpoint_path())
+        restart (bool): Ignore saved progress and start from the first chunk
+        generated_on (str): Date on the receipts (default: today)
+        progress (callable): progress(rows, errors, seconds) after each chunk, or None
+        components (ComponentSet): Salary components (main() passes
+            load_components(), like the GUI)
+
+    Returns:
+        dict: The run summary (see the module docstring)
+
+    Raises:
+        InputError, OSError: The input cannot be read
+    """
+    if receipts not in RECEIPT_MODES:
+        raise ValueError(f"receipts must be one of {RECEIPT_MODES}")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    month = MONTHS[to_month(month) - 1]
+    year = str(int(year))
+    checkpoint = checkpoint or checkpoint_path(db_path, month, year)
+    identity = dict(_input_identity(input_path), month=month, year=year, chunk_size=chunk_size, receipts=receipts,
+                    components=components.fingerprint)
+
+    state = None if restart else load_checkpoint(checkpoint, identity)
+    resumed = state['chunks'] if state else 0
+    state = state or dict(identity, chunks=0, rows=0, errors=0, error_rows=[], stored=0, receipts_written=0,
+                          codes=[])
+    seen = set(state['codes'])  # a code is saved once per run, even across chunks
+
+    start = time.perf_counter()
+    rows_this_run = 0
+    summary = {'status': 'running'}
+    chunks = iter_salary_chunks(read_salary_rows(input_path), chunk_size, components)
+    archive = ReceiptArchive(os.path.join(receipt_dir, 'archive')) if receipts == 'archive' else None
+    try:
+        with SalaryStore(db_path) as store:
+            code_position = columns = None
+            for number, chunk in enumerate(chunks):
+                if code_position is None:
+                    code_position, columns = _column_positions(chunk['passthrough_header'])
+                if number < resumed:
+                    continue  # completed before the interruption
+                result, passthrough, errors = _calculate_chunk(chunk, code_position, workers, components, seen)
+                state['stored'] += store.insert_many(
+                    _records(result, passthrough, columns, month, year, components), replace=True)
+                if archive is not None:
+                    state['receipts_written'] += archive_receipts(
+                        result, result['code'], archive, month, year, generated_on,
+                        template=components.receipt_template)['written']
+                elif receipts == 'files':
+                    state['receipts_written'] += write_receipts(
+                        result, result['code'], os.path.join(receipt_dir, f'{year}-{month}'), month, year,
+                        generated_on, template=components.receipt_template)['written']
+
+                state['chunks'] = number + 1
+                state['codes'] += [int(code) for code in result['code']]
+                state['rows'] += len(chunk['passthrough'])
+                state['errors'] += len(errors)
+                room = MAX_ERROR_ROWS - len(state['error_rows'])
+                state['error_rows'] += [{'row': chunk['first_row'] + i, 'code': code, 'error': error}
+                                        for i, code, error in sorted(errors, key=lambda e: e[0])[:max(room, 0)]]
+                save_checkpoint(checkpoint, state)
+                rows_this_run += len(chunk['passthrough'])
+                if progress is not None:
+                    progress(state['rows'], state['errors'], time.perf_counter() - start)
+        if code_position is None:
+            raise InputError("Input has no data rows")
+        summary['status'] = 'completed'
+        os.remove(checkpoint)
+    except KeyboardInterrupt:
+        summary['status'] = 'interrupted'
+    finally:
+        if archive is not None:
+            archive.close()
+
+    seconds = time.perf_counter() - start
+    summary.update(
+        month=month, year=year, input=identity['input'], rows=state['rows'], errors=state['errors'],
+        error_rows=state['error_rows'], stored=state['stored'], receipts=state['receipts_written'],
+        chunks=state['chunks'], resumed_chunks=resumed, rows_this_run=rows_this_run, seconds=seconds,
+        rows_per_second=rows_this_run / seconds if seconds > 0 else 0.0, checkpoint=checkpoint)
+    return summary
+
+
+def _emit(summary, path):
+    text = json.dumps(summary, indent=2)
+    print(text)
+    if path:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m payroll', description='Headless payroll runs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    runner = commands.add_parser('run', help='calculate, save and issue receipts for one salary month',
+                                 description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    runner.add_argument('--input', required=True, help='.csv or .xlsx salary sheet')
+    runner.add_argument('--month', required=True, help="'Jan', 'January' or 1")
+    runner.add_argument('--year', required=True, type=int)
+    runner.add_argument('--workers', type=int, default=1, help='calculation processes (default 1)')
+    runner.add_argument('--components', default=None,
+                        help='salary component definition (default: PAYROLL_COMPONENTS or payroll/components.json)')
+    runner.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    runner.add_argument('--receipts', choices=RECEIPT_MODES, default='archive')
+    runner.add_argument('--receipt-dir', default=DEFAULT_RECEIPT_DIR, help='base directory for receipts')
+    runner.add_argument('--db', default=DEFAULT_DB_PATH, help='emp_salary database (default: PAYROLL_DB or ems.db)')
+    runner.add_argument('--checkpoint', default=None, help='progress file (default: next to the database)')
+    runner.add_argument('--restart', action='store_true', help='ignore saved progress')
+    runner.add_argument('--generated-on', default=None, help='date on the receipts (default: today)')
+    runner.add_argument('--summary', default=None, help='also write the JSON summary here')
+    runner.add_argument('--quiet', action='store_true', help='no progress lines')
+    args = parser.parse_args(argv)
+
+    try:
+        to_month(args.month)
+    except ValueError as ex:
+        parser.error(str(ex))
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error('--workers and --chunk-size must be at least 1')
+
+    if not os.path.isfile(args.input):
+        return _fail(args, EXIT_INPUT, f"Cannot read {args.input}: no such file")
+    try:
+        components = load_components(args.components)
+    except (OSError, ValueError) as ex:
+        return _fail(args, EXIT_USAGE, f"Cannot load the salary components: {ex}")
+    try:
+        summary = run_batch(args.input, args.month, args.year, db_path=args.db, workers=args.workers,
+                            chunk_size=args.chunk_size, receipts=args.receipts, receipt_dir=args.receipt_dir,
+                            checkpoint=args.checkpoint, restart=args.restart, generated_on=args.generated_on,
+                            progress=None if args.quiet else print_progress, components=components)
+    except ValueError as ex:
+        # InputError, no Basic Pay column (map_header()), undecodable text
+        return _fail(args, EXIT_INPUT, f"Cannot use {args.input}: {ex}")
+    except Exception as ex:
+        return _fail(args, EXIT_FAILED, f"Run failed: {ex} - run the same command again to resume")
+
+    _emit(summary, args.summary)
+    if summary['status'] == 'interrupted':
+        print("Interrupted - run the same command again to resume", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    return EXIT_ROW_ERRORS if summary['errors'] else EXIT_OK
+
+
+def _fail(args, code, message):
+    print(message, file=sys.stderr)
+    _emit({'status': 'failed', 'error': message, 'exit_code': code}, args.summary)
+    return code
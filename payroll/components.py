@@ -0,0 +1,524 @@
+"""
+Salary components from a definition file, compiled to fast evaluators.
+
+The components of the gross-up - inclusions, rate deductions such as PF and
+fixed deductions - are listed in a JSON definition (payroll/components.json,
+or the file named by PAYROLL_COMPONENTS) instead of being written into the
+calculation, the form and the receipt by hand:
+
+    {"components": [
+        {"key": "Basic Pay", "type": "inclusion", "required": true},
+        {"key": "Conveyance", "type": "inclusion", "column": "conv"},
+        {"key": "PF Percentage", "type": "rate", "of": "Basic Pay", "amount": "PF Amount", "default": 12},
+        {"key": "Other Deductions", "type": "deduction"}
+    ]}
+
+Attributes of a component:
+    key       Input key of the calculation (and result key)
+    type      'inclusion', 'deduction' (fixed amount) or 'rate' (percentage)
+    label     Label of the form field (default: key)
+    receipt   Label of the receipt line (default: key); may use result
+              fields, e.g. "PF ({PF Percentage:.1f}%)"
+    default   Value used when the input is missing (default 0)
+    required  The input must be greater than 0 (like Basic Pay)
+    column    Legacy emp_salary column the form field is saved in (conv, medical)
+    of        rate only: inclusion the rate is charged on, or 'Total Inclusions'
+    amount    rate only: result key of the charged amount (default '<key> Amount')
+    gross_up  rate only: gross up for the rate (default true)
+
+Same formula as payroll/core.py, generalised:
+
+    Total Inclusions = sum of the inclusions, in definition order
+    <amount>         = <of> * rate / 100                      (each rate)
+    Gross Salary     = Total Inclusions / (1 - sum of the gross-up rates)
+    Total Deductions = rate amounts and deductions, in definition order
+    Net Salary       = Gross Salary - Total Deductions
+
+ComponentSet compiles a definition once into Python source for the scalar
+(float and exact paise) and columnar (NumPy, or plain Python loops)
+calculations - straight-line code with no per-component loop or lookup,
+like the hand-written functions in payroll/core.py, so it runs as fast as
+they do. STANDARD, the definition of the core's six components, gives
+bit-for-bit the results of payroll/core.py. The GUI form, the live
+recalculation and the receipt layout are built from the same ComponentSet.
+
+The batch paths take a ComponentSet too (`components=`, default STANDARD):
+payroll.pipeline, payroll.parallel, payroll.incremental, payroll.cli and
+payroll.service. Their command lines load the definition file like the GUI
+does, so a month run from the GUI and from `python -m payroll run` uses the
+same components. Only GrossUpCache (payroll/cache.py) is limited to STANDARD.
+
+Usage:
+    components = load_components()
+    result = components.calculate({'Basic Pay': 50000, 'Conveyance': 1600})
+    text = components.render_receipt(result, code=1, month='Jan', year='2025')
+    columns = components.calculate_batch_paise({'Basic Pay': basics, 'Medical': medical})
+"""
+
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import functools
+from array import array
+from collections import namedtuple
+
+from payroll import core
+from payroll.instrument import batch_rows, probe
+from payroll.core import BASIS_POINTS, SALARY_FIELDS, percent_to_basis_points, rupees_to_paise
+from payroll.receipts import GROSS_UP_HEADER, ReceiptTemplate, gross_up_body
+
+# Definition used by the GUI and the command-line runs. Override with PAYROLL_COMPONENTS.
+DEFAULT_COMPONENTS_PATH = os.environ.get(
+    'PAYROLL_COMPONENTS', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components.json'))
+
+INCLUSION = 'inclusion'
+DEDUCTION = 'deduction'
+RATE = 'rate'
+
+Component = namedtuple('Component', ['key', 'type', 'label', 'receipt', 'default', 'required', 'column',
+                                     'of', 'amount', 'gross_up'])
+
+_ATTRIBUTES = {
+    INCLUSION: {'key', 'type', 'label', 'receipt', 'default', 'required', 'column'},
+    DEDUCTION: {'key', 'type', 'label', 'receipt', 'default', 'required', 'column'},
+    RATE: {'key', 'type', 'label', 'receipt', 'default', 'required', 'column', 'of', 'amount', 'gross_up'},
+}
+
+# Result keys calculated for every definition
+TOTAL_KEYS = ('Total Inclusions', 'Total Deductions', 'Gross Salary', 'Net Salary')
+
+# The six components of calculate_gross_up_salary()
+STANDARD_DEFINITION = {
+    'components': [
+        {'key': 'Basic Pay', 'type': INCLUSION, 'required': True},
+        {'key': 'HRA', 'type': INCLUSION},
+        {'key': 'Over Time', 'type': INCLUSION},
+        {'key': 'Other Allowances', 'type': INCLUSION, 'label': 'Other Allow'},
+        {'key': 'PF Percentage', 'type': RATE, 'label': 'PF %', 'receipt': 'PF ({PF Percentage:.1f}%)',
+         'of': 'Basic Pay', 'amount': 'PF Amount', 'default': 12},
+        {'key': 'Other Deductions', 'type': DEDUCTION, 'label': 'Other Deduct'},
+    ],
+}
+
+
+class ComponentDefinitionError(ValueError):
+    """A component definition that cannot be compiled."""
+
+
+def _component(entry, position):
+    if not isinstance(entry, dict):
+        raise ComponentDefinitionError(f"component {position}: expected an object")
+    key, kind = entry.get('key'), entry.get('type')
+    if not isinstance(key, str) or not key.strip():
+        raise ComponentDefinitionError(f"component {position}: 'key' is required")
+    if kind not in _ATTRIBUTES:
+        raise ComponentDefinitionError(f"{key}: type must be one of {', '.join(_ATTRIBUTES)}")
+    unknown = set(entry) - _ATTRIBUTES[kind]
+    if unknown:
+        raise ComponentDefinitionError(f"{key}: unknown attribute(s) {', '.join(sorted(unknown))}")
+    default = entry.get('default', 0)
+    if isinstance(default, bool) or not isinstance(default, (int, float)) or default < 0:
+        raise ComponentDefinitionError(f"{key}: default must be a number >= 0")
+    if kind == RATE and default > 100:
+        raise ComponentDefinitionError(f"{key}: default must be between 0 and 100")
+    column = entry.get('column')
+    if column is not None and column not in SALARY_FIELDS:
+        raise ComponentDefinitionError(f"{key}: column must be one of {', '.join(SALARY_FIELDS)}")
+    return Component(
+        key=key,
+        type=kind,
+        label=str(entry.get('label', key)),
+        receipt=str(entry.get('receipt', key)),
+        default=default,
+        required=bool(entry.get('required', False)),
+        column=column,
+        of=entry.get('of') if kind == RATE else None,
+        amount=entry.get('amount', f'{key} Amount') if kind == RATE else None,
+        gross_up=bool(entry.get('gross_up', True)) if kind == RATE else False,
+    )
+
+
+def parse_definition(definition):
+    """Definition dict -> tuple of Components (raises ComponentDefinitionError)."""
+    entries = definition.get('components') if isinstance(definition, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ComponentDefinitionError("the definition needs a non-empty 'components' list")
+    components = tuple(_component(entry, position) for position, entry in enumerate(entries, 1))
+
+    names = set(TOTAL_KEYS)
+    for component in components:
+        for name in filter(None, (component.key, component.amount)):
+            if name in names:
+                raise ComponentDefinitionError(f"{name}: defined twice")
+            names.add(name)
+    inclusions = {component.key for component in components if component.type == INCLUSION}
+    if not inclusions:
+        raise ComponentDefinitionError("the definition needs at least one inclusion")
+    for component in components:
+        if component.type == RATE and component.of not in inclusions | {'Total Inclusions'}:
+            raise ComponentDefinitionError(f"{component.key}: 'of' must be an inclusion or 'Total Inclusions'")
+    columns = [component.column for component in components if component.column]
+    if len(columns) != len(set(columns)):
+        raise ComponentDefinitionError("two components are saved in the same column")
+    return components
+
+
+# ------------------------------------------------------------- compiler
+def _paise_default(component):
+    if component.type == RATE:
+        return percent_to_basis_points(component.default)
+    return rupees_to_paise(component.default)
+
+
+def _numpy_column(np, columns, name, default, row_count, dtype):
+    if name in columns:
+        if dtype is np.int64:
+            return core._int64_column(columns[name], name)  # no silent truncation of fractions
+        return np.asarray(columns[name], dtype=dtype)
+    return np.full(row_count, default, dtype=dtype)
+
+
+def _python_column(columns, name, default, row_count, typecode, convert):
+    if name in columns:
+        if typecode == 'q':
+            return core._q_column(columns[name], name)
+        return array(typecode, map(convert, columns[name]))
+    return array(typecode, [default]) * row_count
+
+
+class _Source:
+    """
+    Generates the evaluator source of one definition. Component i is the
+    variable c<i>; a rate's fraction is r<i> and its amount a<i>.
+    """
+
+    def __init__(self, components):
+        self.components = components
+        self.inputs = [f'c{i}' for i in range(len(components))]
+        self.names = {component.key: f'c{i}' for i, component in enumerate(components)}
+        self.names['Total Inclusions'] = 'total_inclusions'
+        self.rates = [(i, component) for i, component in enumerate(components) if component.type == RATE]
+        self.inclusions = [f'c{i}' for i, component in enumerate(components) if component.type == INCLUSION]
+        self.deductions = [f'a{i}' if component.type == RATE else f'c{i}'
+                           for i, component in enumerate(components) if component.type != INCLUSION]
+        self.outputs = ['total_inclusions'] + [f'a{i}' for i, _ in self.rates] + [
+            'total_deductions', 'gross_salary', 'net_salary']
+        self.result_keys = tuple(component.key for component in components) + ('Total Inclusions',) + tuple(
+            component.amount for _, component in self.rates) + ('Total Deductions', 'Gross Salary', 'Net Salary')
+
+    def defaults(self, exact):
+        return [_paise_default(component) if exact else float(component.default) for component in self.components]
+
+    def checks(self, exact):
+        """(condition, message) of each input check - the ValueErrors of payroll/core.py."""
+        top = BASIS_POINTS if exact else 100
+        checks = []
+        for i, component in enumerate(self.components):
+            if component.required:
+                checks.append((f'c{i} <= 0', f"{component.key} must be greater than 0"))
+            if component.type == RATE:
+                checks.append((f'c{i} < 0 or c{i} > {top}', f"{component.key} must be between 0 and 100"))
+        return checks
+
+    def amounts(self, exact):
+        lines = []
+        for i, component in self.rates:
+            base = self.names[component.of]
+            if exact:
+                lines.append(f'a{i} = (2 * {base} * c{i} + {BASIS_POINTS}) // {2 * BASIS_POINTS}')
+            else:
+                lines += [f'r{i} = c{i} / 100', f'a{i} = {base} * r{i}']
+        return lines
+
+    def rate(self, exact):
+        """Sum of the gross-up rates, or None."""
+        terms = [f'c{i}' if exact else f'r{i}' for i, component in self.rates if component.gross_up]
+        return ' + '.join(terms) or None
+
+    def rate_check(self, exact):
+        rates = [component for _, component in self.rates if component.gross_up]
+        if len(rates) == 1:
+            message = f"{rates[0].key} cannot be 100% or more (would result in infinite gross)"
+        else:
+            message = "Gross-up rates total 100% or more (would result in infinite gross)"
+        return f"rate >= {BASIS_POINTS if exact else '1.0'}", message
+
+    def gross(self, exact, divisor=None):
+        if self.rate(exact) is None:
+            return ['gross_salary = total_inclusions']
+        if exact:
+            return [f"divisor = {divisor or f'{BASIS_POINTS} - rate'}",
+                    f'gross_salary = (2 * total_inclusions * {BASIS_POINTS} + divisor) // (2 * divisor)']
+        return ['gross_salary = total_inclusions / (1 - rate)']
+
+    def result(self, names, extra=''):
+        items = ', '.join(f'{key!r}: {name}' for key, name in zip(self.result_keys, names))
+        return f'return {{{items}{extra}}}'
+
+    # ---------------------------------------------------------- scalar
+    def scalar(self, exact):
+        zero = '0' if exact else '0.0'
+        body = []
+        for i, (component, default) in enumerate(zip(self.components, self.defaults(exact))):
+            if exact:
+                body.append(f'c{i} = core._whole_units(data.get({component.key!r}, {default!r}), {component.key!r})')
+            else:
+                body.append(f'c{i} = float(data.get({component.key!r}, {default!r}))')
+        if not exact:
+            # NaN fails every comparison: reject non-finite inputs first, like payroll/core.py
+            body += [f"if not ({' and '.join(f'isfinite({name})' for name in self.inputs)}):",
+                     "    raise ValueError('Salary components must be finite numbers')"]
+        for condition, message in self.checks(exact):
+            body += [f'if {condition}:', f'    raise ValueError({message!r})']
+        body.append(f"total_inclusions = {' + '.join(self.inclusions)}")
+        body += self.amounts(exact)
+        if self.rate(exact) is not None:
+            condition, message = self.rate_check(exact)
+            body += [f'rate = {self.rate(exact)}', f'if {condition}:', f'    raise ValueError({message!r})']
+        body += self.gross(exact)
+        body.append(f"total_deductions = {' + '.join(self.deductions) or zero}")
+        body.append('net_salary = gross_salary - total_deductions')
+        body.append(self.result(self.inputs + self.outputs))
+        name = 'calculate_paise' if exact else 'calculate'
+        return f'def {name}(data):\n' + ''.join(f'    {line}\n' for line in body)
+
+    # ----------------------------------------------------------- numpy
+    def numpy(self, exact):
+        dtype = 'np.int64' if exact else 'np.float64'
+
+        def new(terms):
+            # Outputs must not share memory with the inputs (invalid rows are overwritten)
+            if len(terms) > 1:
+                return ' + '.join(terms)
+            return f'{terms[0]}.copy()' if terms else f'np.zeros(row_count, dtype={dtype})'
+
+        body = ['np = core.np']
+        for i, (component, default) in enumerate(zip(self.components, self.defaults(exact))):
+            body.append(f'c{i} = _numpy_column(np, columns, {component.key!r}, {default!r}, row_count, {dtype})')
+        masks = [f'({condition.replace(" or ", ") | (")})' for condition, _ in self.checks(exact)]
+        if not exact:
+            body.append(f"finite = {' & '.join(f'np.isfinite({name})' for name in self.inputs)}")
+            masks.insert(0, '~finite')
+        steps = [f'total_inclusions = {new(self.inclusions)}']
+        steps += self.amounts(exact)
+        if self.rate(exact) is not None:
+            steps.append(f'rate = {self.rate(exact)}')
+            masks.append(f'({self.rate_check(exact)[0]})')
+        steps.append(f"invalid_mask = {' | '.join(masks) or 'np.zeros(row_count, dtype=bool)'}")
+        if self.rate(exact) is None:
+            steps.append('gross_salary = total_inclusions.copy()')
+        elif exact:
+            steps.append('# Any positive divisor for invalid rows; they are zeroed below')
+            steps += self.gross(exact, divisor=f'np.where(invalid_mask, 1, {BASIS_POINTS} - rate)')
+        else:
+            steps += self.gross(exact)
+        steps.append(f'total_deductions = {new(self.deductions)}')
+        steps.append('net_salary = gross_salary - total_deductions')
+        if exact:
+            body += steps
+        else:
+            # Invalid rows may produce inf/NaN here; they are overwritten below
+            body.append("with np.errstate(divide='ignore', invalid='ignore', over='ignore'):")
+            body += ['    ' + line for line in steps]
+        body.append(f"for column in ({', '.join(self.outputs)}):")
+        body.append(f"    column[invalid_mask] = {'0' if exact else 'np.nan'}")
+        body.append(self.result(self.inputs + self.outputs,
+                                ", 'Invalid Mask': invalid_mask, 'Invalid Rows': np.flatnonzero(invalid_mask).tolist()"))
+        name = 'batch_paise_numpy' if exact else 'batch_numpy'
+        return f'def {name}(columns, row_count):\n' + ''.join(f'    {line}\n' for line in body)
+
+    # ---------------------------------------------------------- python
+    def python(self, exact):
+        """Column by column in list comprehensions, like the fallbacks in payroll/core.py."""
+        typecode, zero = ("'q'", '0') if exact else ("'d'", 'nan')
+        columns = {f'c{i}': f'column{i}' for i in range(len(self.inputs))}
+
+        def column(expression, names):
+            """Array of the expression per row over the named columns; invalid rows get zero."""
+            sources = [columns.get(name, name) for name in names] + ['invalid_mask']
+            return (f"array({typecode}, [{zero} if bad else {expression} for {', '.join(list(names) + ['bad'])}, "
+                    f"in zip({', '.join(sources)})])")
+
+        body = []
+        for i, (component, default) in enumerate(zip(self.components, self.defaults(exact))):
+            convert = 'int' if exact else 'float'
+            body.append(f'column{i} = _python_column(columns, {component.key!r}, {default!r}, row_count, '
+                        f'{typecode}, {convert})')
+
+        gross_up = [f'c{i}' for i, component in self.rates if component.gross_up]
+        if exact:
+            rate = ' + '.join(gross_up)
+        else:
+            rate = ' + '.join(f'{name} / 100' for name in gross_up)
+        rate = f'({rate})' if len(gross_up) > 1 else rate
+        checks = [condition for condition, _ in self.checks(exact)]
+        if gross_up:
+            checks.append(f"{rate} >= {BASIS_POINTS if exact else '1.0'}")
+        if not exact:
+            checks.append(f"not ({' and '.join(f'isfinite({name})' for name in self.inputs)})")
+        used = set(re.findall(r'\bc[0-9]+\b', ' '.join(checks)))
+        checked = [name for name in self.inputs if name in used]
+        if checks:
+            body.append(f"invalid_mask = [{' or '.join(checks)} for {', '.join(checked)}, in "
+                        f"zip({', '.join(columns[name] for name in checked)})]")
+        else:
+            body.append('invalid_mask = [False] * row_count')
+
+        sources = ', '.join(columns[name] for name in self.inclusions)
+        body.append(f"total_inclusions = array({typecode}, [{' + '.join(self.inclusions)} for "
+                    f"{', '.join(self.inclusions)}, in zip({sources})])")
+        for i, component in self.rates:
+            base = self.names[component.of]
+            if exact:
+                amount = f'(2 * {base} * c{i} + {BASIS_POINTS}) // {2 * BASIS_POINTS}'
+            else:
+                amount = f'{base} * (c{i} / 100)'
+            body.append(f'a{i} = {column(amount, [base, f"c{i}"])}')
+        if not gross_up:
+            body.append(f"gross_salary = {column('total_inclusions', ['total_inclusions'])}")
+        elif exact:
+            divisor = f'({BASIS_POINTS} - {rate})'
+            body.append('gross_salary = ' + column(
+                f'(2 * total_inclusions * {BASIS_POINTS} + {divisor}) // (2 * {divisor})',
+                ['total_inclusions'] + gross_up))
+        else:
+            body.append('gross_salary = ' + column(f'total_inclusions / (1 - {rate})', ['total_inclusions'] + gross_up))
+        deductions = ' + '.join(self.deductions) or ('0' if exact else '0.0')
+        body.append(f'total_deductions = {column(deductions, self.deductions)}')
+        body.append(f"net_salary = array({typecode}, [g - d for g, d in zip(gross_salary, total_deductions)])")
+        body += ['invalid_rows = [i for i, bad in enumerate(invalid_mask) if bad]',
+                 'for i in invalid_rows:', f'    total_inclusions[i] = {zero}']
+        body.append(self.result(list(columns.values()) + self.outputs,
+                                ", 'Invalid Mask': invalid_mask, 'Invalid Rows': invalid_rows"))
+        name = 'batch_paise_python' if exact else 'batch_python'
+        return f'def {name}(columns, row_count):\n' + ''.join(f'    {line}\n' for line in body)
+
+
+class ComponentSet:
+    """
+    A component definition compiled to evaluators.
+
+    Attributes:
+        components: Component tuple, in definition order
+        input_defaults: input key -> default in rupees / percent (like SALARY_INPUT_DEFAULTS)
+        paise_input_defaults: the same in paise / basis points (like PAISE_INPUT_DEFAULTS)
+        result_keys: keys of a result, in order (like SALARY_RESULT_KEYS)
+        calculated_keys: the result keys after the inputs (totals and rate amounts)
+        rate_keys: input keys that are percentages
+        amount_keys: result keys of the rate amounts
+        calculate(data): calculate_gross_up_salary() for these components
+        calculate_paise(data): calculate_gross_up_paise() for these components
+        receipt_template: ReceiptTemplate of the gross-up receipt
+        receipt_body_template: ReceiptTemplate of its body (no header)
+        source: the generated Python source
+        fingerprint: hex digest of the calculation and receipt lines - equal
+            fingerprints give equal results and receipts
+
+    A ComponentSet pickles as its definition, so it can be passed to worker
+    processes (run_parallel(), the service's pool); each process compiles a
+    definition once.
+    """
+
+    def __init__(self, definition):
+        self.components = parse_definition(definition)
+        self.definition_text = json.dumps(definition, sort_keys=True)
+        generator = _Source(self.components)
+        self.input_defaults = {component.key: component.default for component in self.components}
+        self.paise_input_defaults = {component.key: _paise_default(component) for component in self.components}
+        self.result_keys = generator.result_keys
+        self.calculated_keys = self.result_keys[len(self.components):]
+        self.rate_keys = tuple(component.key for component in self.components if component.type == RATE)
+        self.amount_keys = tuple(component.amount for component in self.components if component.type == RATE)
+        self.required_keys = tuple(component.key for component in self.components if component.required)
+
+        self.source = '\n'.join(method(exact) for method in (generator.scalar, generator.numpy, generator.python)
+                                for exact in (False, True))
+        namespace = {'core': core, 'array': array, 'nan': float('nan'), 'isfinite': math.isfinite,
+                     '_numpy_column': _numpy_column, '_python_column': _python_column}
+        exec(compile(self.source, '<payroll components>', 'exec'), namespace)
+        self.calculate = probe('gross_up')(namespace['calculate'])
+        self.calculate_paise = probe('gross_up')(namespace['calculate_paise'])
+        self._batch = {(False, True): namespace['batch_numpy'], (True, True): namespace['batch_paise_numpy'],
+                       (False, False): namespace['batch_python'], (True, False): namespace['batch_paise_python']}
+
+        inclusions = [(component.receipt, component.key) for component in self.components
+                      if component.type == INCLUSION]
+        deductions = [(component.receipt, component.amount if component.type == RATE else component.key)
+                      for component in self.components if component.type != INCLUSION]
+        self.receipt_body = gross_up_body(inclusions, deductions)
+        self.receipt_template = ReceiptTemplate(GROSS_UP_HEADER + self.receipt_body)
+        self.receipt_body_template = ReceiptTemplate(self.receipt_body)
+        self.fingerprint = hashlib.blake2b((self.source + self.receipt_body).encode('utf-8'),
+                                           digest_size=8).hexdigest()
+
+    def __reduce__(self):
+        return _compiled, (self.definition_text,)
+
+    def _calculate_batch(self, columns, exact):
+        required = self.required_keys or tuple(name for name in self.input_defaults if name in columns)[:1]
+        if not required:
+            raise ValueError("No component columns")
+        for name in required:
+            if name not in columns:
+                raise ValueError(f"{name} column is required")
+        row_count = len(columns[required[0]])
+        for name in columns:
+            if name in self.input_defaults and len(columns[name]) != row_count:
+                raise ValueError(f"Column '{name}' has {len(columns[name])} rows, expected {row_count}")
+        return self._batch[exact, core.np is not None](columns, row_count)
+
+    @probe('gross_up_batch', batch_rows)
+    def calculate_batch(self, columns):
+        """calculate_gross_up_batch() for these components (float64 / array('d') columns)."""
+        return self._calculate_batch(columns, False)
+
+    @probe('gross_up_batch', batch_rows)
+    def calculate_batch_paise(self, columns):
+        """calculate_gross_up_batch_paise() for these components (int64 / array('q') columns)."""
+        return self._calculate_batch(columns, True)
+
+    def paise_inputs(self, data):
+        """Rupee / percent inputs -> inputs of calculate_paise()."""
+        inputs = {}
+        for name in self.input_defaults:
+            if name in data:
+                convert = percent_to_basis_points if name in self.rate_keys else rupees_to_paise
+                inputs[name] = convert(data[name])
+        return inputs
+
+    def paise_result_to_rupees(self, result):
+        """Result of calculate_paise() -> the float rupee dict of calculate()."""
+        return {name: result[name] / 100 for name in self.result_keys}
+
+    def default_texts(self):
+        """Input key -> text of an empty form field ('' for a 0 default, '12' for PF)."""
+        return {name: f'{default:g}' if default else '' for name, default in self.input_defaults.items()}
+
+    def render_receipt(self, result, code, month, year, generated_on=None):
+        """render_receipt() of payroll/receipts.py with this set's receipt lines."""
+        values = dict(result, code=code, month=month, year=year,
+                      generated_on=generated_on or time.strftime("%d-%m-%Y"))
+        return self.receipt_template.render(values)
+
+
+@functools.lru_cache(maxsize=16)
+def _compiled(definition_text):
+    """ComponentSet of a definition in JSON text - unpickling compiles each definition once per process."""
+    return ComponentSet(json.loads(definition_text))
+
+
+def load_components(path=None):
+    """Compile a JSON component definition (default: DEFAULT_COMPONENTS_PATH)."""
+    path = path or DEFAULT_COMPONENTS_PATH
+    with open(path, encoding='utf-8') as f:
+        try:
+            definition = json.load(f)
+        except ValueError as ex:
+            raise ComponentDefinitionError(f"{path}: {ex}") from None
+    return ComponentSet(definition)
+
+
+STANDARD = ComponentSet(STANDARD_DEFINITION)
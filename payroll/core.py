@@ -0,0 +1,652 @@
+"""
+Payroll core - GUI-free gross-up calculation and record types.
+
+Nothing in this module imports tkinter, so batch workers, scripts and tests
+can use the calculation on headless servers:
+
+    from payroll.core import calculate_gross_up_salary
+"""
+
+import math
+from array import array
+from collections import namedtuple
+from collections.abc import Mapping
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from payroll.instrument import batch_rows, probe
+
+# NumPy is optional - batch calculation falls back to plain Python loops
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ========================================================================
+# RECORD TYPES
+# ========================================================================
+
+# Employee detail fields (the var_emp_* variables in the GUI, plus address)
+EMPLOYEE_FIELDS = ('code', 'designation', 'name', 'age', 'gender', 'email', 'hl',
+                   'dob', 'doj', 'exp', 'pid', 'contact', 'status', 'add')
+
+# Salary fields stored per month (legacy layout of emp_salary.sql)
+SALARY_FIELDS = ('month', 'year', 'salary', 'tdays', 'abs', 'medical', 'pf', 'conv', 'net', 'reciept')
+
+# All 24 columns of the emp_salary table, in table order
+EMP_SALARY_COLUMNS = EMPLOYEE_FIELDS + SALARY_FIELDS
+
+# One row of the emp_salary table
+EmpSalaryRecord = namedtuple('EmpSalaryRecord', EMP_SALARY_COLUMNS)
+
+# Input keys of calculate_gross_up_salary() and their defaults
+SALARY_INPUT_DEFAULTS = {
+    'Basic Pay': 0.0,
+    'HRA': 0.0,
+    'Over Time': 0.0,
+    'Other Allowances': 0.0,
+    'PF Percentage': 12.0,
+    'Other Deductions': 0.0,
+}
+
+# Keys of the result of calculate_gross_up_salary(), in order
+SALARY_RESULT_KEYS = tuple(SALARY_INPUT_DEFAULTS) + (
+    'Total Inclusions', 'PF Amount', 'Total Deductions', 'Gross Salary', 'Net Salary')
+
+
+class _SlotRecord(Mapping):
+    """
+    Read-only fixed-key record stored in __slots__, readable like a dict.
+
+    record['Gross Salary'], record.get(...), keys()/items(), dict(record),
+    ** unpacking and == against a dict all work as they do on a plain dict.
+    Records cannot be changed (like the cached results of GrossUpCache); use
+    to_dict() for a mutable copy (and for json.dump()).
+    """
+
+    __slots__ = ()
+    _KEYS = ()        # mapping keys, in order
+    _ATTRIBUTES = {}  # key -> slot name
+
+    def _assign(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Record of a dict (or any mapping) holding every key."""
+        return cls(*[mapping[key] for key in cls._KEYS])
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._ATTRIBUTES[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self._ATTRIBUTES
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def to_dict(self):
+        return {key: getattr(self, name) for key, name in self._ATTRIBUTES.items()}
+
+    copy = to_dict
+
+
+class SalaryResult(_SlotRecord):
+    """
+    Compact copy of a calculate_gross_up_salary() or calculate_gross_up_paise()
+    result, for callers that keep many of them: SalaryResult.from_mapping(result).
+
+    One slot per SALARY_RESULT_KEYS entry: result.net_salary is
+    result['Net Salary']. 120 bytes against 464 for the same dict (see
+    benchmarks/bench_memory.py).
+    """
+
+    __slots__ = ('basic_pay', 'hra', 'over_time', 'other_allowances', 'pf_percentage', 'other_deductions',
+                 'total_inclusions', 'pf_amount', 'total_deductions', 'gross_salary', 'net_salary')
+    _KEYS = SALARY_RESULT_KEYS
+    _ATTRIBUTES = dict(zip(SALARY_RESULT_KEYS, __slots__))
+
+    def __init__(self, basic_pay, hra, over_time, other_allowances, pf_percentage, other_deductions,
+                 total_inclusions, pf_amount, total_deductions, gross_salary, net_salary):
+        self._assign(basic_pay, hra, over_time, other_allowances, pf_percentage, other_deductions,
+                     total_inclusions, pf_amount, total_deductions, gross_salary, net_salary)
+
+
+class Employee(_SlotRecord):
+    """Employee details (EMPLOYEE_FIELDS) - employee.name is employee['name']."""
+
+    __slots__ = EMPLOYEE_FIELDS
+    _KEYS = EMPLOYEE_FIELDS
+    _ATTRIBUTES = {name: name for name in EMPLOYEE_FIELDS}
+
+    def __init__(self, code='', designation='', name='', age='', gender='', email='', hl='',
+                 dob='', doj='', exp='', pid='', contact='', status='', add=''):
+        self._assign(code, designation, name, age, gender, email, hl, dob, doj, exp, pid, contact, status, add)
+
+    @classmethod
+    def from_record(cls, record):
+        """The employee part of an EmpSalaryRecord."""
+        return cls(*record[:len(EMPLOYEE_FIELDS)])
+
+# ========================================================================
+# STANDALONE GROSS-UP PAYROLL CALCULATION MODULE
+# ========================================================================
+# Excel-Ready: This function can process salary data from Excel rows
+# Usage: result = calculate_gross_up_salary({'Basic Pay': 50000, 'PF Percentage': 12, ...})
+# ========================================================================
+
+@probe('gross_up')
+def calculate_gross_up_salary(data: dict) -> dict:
+    """
+    Calculate Gross-Up salary with Inclusion and Exclusion components.
+    
+    GROSS-UP FORMULA EXPLANATION:
+    ------------------------------
+    When net/take-home salary needs to be maintained, we use gross-up calculation:
+    
+    Gross Salary = Total Inclusions / (1 - Total Deduction Rate)
+    
+    Example:
+    - If Basic=50000, HRA=10000, OT=5000, Other=2000
+    - Total Inclusions = 67000
+    - If PF% = 12% (rate = 0.12)
+    - Gross = 67000 / (1 - 0.12) = 67000 / 0.88 = 76136.36
+    - PF Amount = Basic × 12% = 50000 × 0.12 = 6000
+    - Net Salary = Gross - PF - Other Deductions
+    
+    KEY PRINCIPLE:
+    - PF is ALWAYS calculated on Basic Pay only, NOT on Gross
+    - Gross-up ensures that inclusion components remain constant
+    - As deduction % increases, gross automatically increases to compensate
+    
+    Args:
+        data (dict): Input salary components with keys:
+            - 'Basic Pay' (float): Required - Base salary for PF calculation
+            - 'HRA' (float): Optional - House Rent Allowance
+            - 'Over Time' (float): Optional - Overtime pay
+            - 'Other Allowances' (float): Optional - Additional allowances
+            - 'PF Percentage' (float): Optional - Default 12%
+            - 'Other Deductions' (float): Optional - Additional deductions
+    
+    Returns:
+        dict: Calculated salary breakdown with keys:
+            - All input components (echoed back)
+            - 'PF Amount' (float): Calculated PF = Basic × PF%
+            - 'Total Inclusions' (float): Sum of all inclusion components
+            - 'Total Deductions' (float): PF + Other Deductions
+            - 'Gross Salary' (float): Grossed-up salary
+            - 'Net Salary' (float): Take-home = Gross - Total Deductions
+    
+    Excel Integration Example:
+    --------------------------
+    # If Excel has columns: Basic, HRA, OT, Other_Allow, PF_Percent
+    # Row data can be directly converted to dict:
+    excel_row = {'Basic Pay': row['Basic'], 'HRA': row['HRA'], ...}
+    result = calculate_gross_up_salary(excel_row)
+    """
+    
+    # Extract input values with defaults
+    basic_pay = float(data.get('Basic Pay', 0))
+    hra = float(data.get('HRA', 0))
+    over_time = float(data.get('Over Time', 0))
+    other_allowances = float(data.get('Other Allowances', 0))
+    pf_percentage = float(data.get('PF Percentage', 12))  # Default 12%
+    other_deductions = float(data.get('Other Deductions', 0))
+    
+    # Validation (NaN fails every comparison, so test for what is allowed)
+    if not all(map(math.isfinite, (basic_pay, hra, over_time, other_allowances, pf_percentage, other_deductions))):
+        raise ValueError("Salary components must be finite numbers")
+    if not basic_pay > 0:
+        raise ValueError("Basic Pay must be greater than 0")
+    if pf_percentage < 0 or pf_percentage > 100:
+        raise ValueError("PF Percentage must be between 0 and 100")
+    
+    # Calculate Total Inclusions (components that add to salary)
+    total_inclusions = basic_pay + hra + over_time + other_allowances
+    
+    # Calculate PF Amount (ALWAYS based on Basic Pay only)
+    pf_rate = pf_percentage / 100
+    pf_amount = basic_pay * pf_rate
+    
+    # GROSS-UP CALCULATION
+    # Formula: Gross = Inclusions / (1 - PF_Rate)
+    # This ensures that after PF deduction, employee gets the intended inclusions
+    if pf_rate >= 1.0:
+        raise ValueError("PF Percentage cannot be 100% or more (would result in infinite gross)")
+    
+    gross_salary = total_inclusions / (1 - pf_rate)
+    
+    # Calculate Total Deductions
+    total_deductions = pf_amount + other_deductions
+    
+    # Calculate Net/Take-Home Salary
+    net_salary = gross_salary - total_deductions
+    
+    # Return comprehensive breakdown
+    result = {
+        # Input components (for reference)
+        'Basic Pay': basic_pay,
+        'HRA': hra,
+        'Over Time': over_time,
+        'Other Allowances': other_allowances,
+        'PF Percentage': pf_percentage,
+        'Other Deductions': other_deductions,
+        
+        # Calculated values
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary
+    }
+    
+    return result
+
+# ========================================================================
+# BATCH (COLUMNAR) GROSS-UP CALCULATION
+# ========================================================================
+# Usage: result = calculate_gross_up_batch({'Basic Pay': [50000, 60000], 'PF Percentage': [12, 15], ...})
+# ========================================================================
+
+@probe('gross_up_batch', batch_rows)
+def calculate_gross_up_batch(columns: dict) -> dict:
+    """
+    Calculate Gross-Up salary for many employees at once.
+
+    Same formula as calculate_gross_up_salary(), but every input is a column
+    (NumPy array, array.array or list) instead of a single value. Each output
+    column is computed in one pass over the whole batch, using exactly the same
+    float operations in the same order, so every row matches the scalar
+    function bit-for-bit.
+
+    Invalid rows do NOT stop the batch. A row is invalid when the scalar
+    function would raise ValueError for it:
+        - any input is NaN or infinite
+        - Basic Pay <= 0
+        - PF Percentage < 0 or > 100
+        - PF Percentage >= 100 (infinite gross)
+    Calculated columns hold NaN for invalid rows.
+
+    Args:
+        columns (dict): Column name -> sequence of values. Uses the same keys as
+            calculate_gross_up_salary(). 'Basic Pay' is required, missing
+            columns use the scalar defaults (PF Percentage = 12, others = 0).
+
+    Returns:
+        dict: Column name -> array for all 11 keys returned by
+            calculate_gross_up_salary(), plus:
+            - 'Invalid Mask': True for every invalid row
+            - 'Invalid Rows' (list): Indices of the invalid rows
+        Arrays are NumPy float64 arrays when NumPy is installed, otherwise
+        array.array('d') (and a list of bools for the mask).
+    """
+    if 'Basic Pay' not in columns:
+        raise ValueError("Basic Pay column is required")
+    row_count = len(columns['Basic Pay'])
+    for name in columns:
+        if name in SALARY_INPUT_DEFAULTS and len(columns[name]) != row_count:
+            raise ValueError(f"Column '{name}' has {len(columns[name])} rows, expected {row_count}")
+
+    if np is not None:
+        return _gross_up_batch_numpy(columns, row_count)
+    return _gross_up_batch_python(columns, row_count)
+
+def _gross_up_batch_numpy(columns, row_count):
+    inputs = {}
+    for name, default in SALARY_INPUT_DEFAULTS.items():
+        if name in columns:
+            inputs[name] = np.asarray(columns[name], dtype=np.float64)
+        else:
+            inputs[name] = np.full(row_count, default, dtype=np.float64)
+
+    basic_pay = inputs['Basic Pay']
+    pf_percentage = inputs['PF Percentage']
+
+    finite = np.ones(row_count, dtype=bool)
+    for column in inputs.values():
+        finite &= np.isfinite(column)
+
+    # Same operation order as calculate_gross_up_salary(); invalid rows may
+    # produce inf/NaN here and are overwritten below
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        total_inclusions = basic_pay + inputs['HRA'] + inputs['Over Time'] + inputs['Other Allowances']
+        pf_rate = pf_percentage / 100
+        pf_amount = basic_pay * pf_rate
+        invalid_mask = ~finite | ~(basic_pay > 0) | (pf_percentage < 0) | (pf_percentage > 100) | (pf_rate >= 1.0)
+        gross_salary = total_inclusions / (1 - pf_rate)
+        total_deductions = pf_amount + inputs['Other Deductions']
+        net_salary = gross_salary - total_deductions
+
+    for column in (total_inclusions, pf_amount, total_deductions, gross_salary, net_salary):
+        column[invalid_mask] = np.nan
+
+    result = dict(inputs)
+    result.update({
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary,
+        'Invalid Mask': invalid_mask,
+        'Invalid Rows': np.flatnonzero(invalid_mask).tolist(),
+    })
+    return result
+
+def _gross_up_batch_python(columns, row_count):
+    inputs = {}
+    for name, default in SALARY_INPUT_DEFAULTS.items():
+        if name in columns:
+            inputs[name] = array('d', map(float, columns[name]))
+        else:
+            inputs[name] = array('d', [default]) * row_count
+
+    basic_pay = inputs['Basic Pay']
+    pf_percentage = inputs['PF Percentage']
+    nan = float('nan')
+
+    isfinite = math.isfinite
+    invalid_mask = [not (b > 0) or p < 0 or p > 100 or p / 100 >= 1.0
+                    or not (isfinite(b) and isfinite(h) and isfinite(ot) and isfinite(oa) and isfinite(p)
+                            and isfinite(od))
+                    for b, h, ot, oa, p, od in zip(basic_pay, inputs['HRA'], inputs['Over Time'],
+                                                   inputs['Other Allowances'], pf_percentage,
+                                                   inputs['Other Deductions'])]
+
+    total_inclusions = array('d', [b + h + ot + oa for b, h, ot, oa in
+                                   zip(basic_pay, inputs['HRA'], inputs['Over Time'], inputs['Other Allowances'])])
+    pf_amount = array('d', [b * (p / 100) for b, p in zip(basic_pay, pf_percentage)])
+    gross_salary = array('d', [nan if bad else ti / (1 - p / 100) for ti, p, bad in
+                               zip(total_inclusions, pf_percentage, invalid_mask)])
+    total_deductions = array('d', [pf + od for pf, od in zip(pf_amount, inputs['Other Deductions'])])
+    net_salary = array('d', [g - td for g, td in zip(gross_salary, total_deductions)])
+
+    invalid_rows = [i for i, bad in enumerate(invalid_mask) if bad]
+    for i in invalid_rows:
+        total_inclusions[i] = pf_amount[i] = total_deductions[i] = net_salary[i] = nan
+
+    result = dict(inputs)
+    result.update({
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary,
+        'Invalid Mask': invalid_mask,
+        'Invalid Rows': invalid_rows,
+    })
+    return result
+
+
+# ========================================================================
+# EXACT (FIXED-POINT) GROSS-UP CALCULATION
+# ========================================================================
+# Every amount is an integer number of paise and PF Percentage is an integer
+# number of basis points (1200 = 12.00%), so totals add up exactly.
+#
+# ROUNDING RULE: half up (ties toward +infinity), to the paisa, applied in
+# exactly two places - everything else is exact integer addition:
+#     PF Amount        = round(Basic * bp / 10000)
+#     Gross Salary     = round(Inclusions * 10000 / (10000 - bp))
+#     Total Deductions = PF Amount + Other Deductions
+#     Net Salary       = Gross Salary - Total Deductions
+# Rupee inputs are converted with the same rule on their decimal value
+# (rupees_to_paise('1.005') == 101), and percentages to basis points.
+#
+# Usage: result = calculate_gross_up_paise(paise_inputs({'Basic Pay': 50000, 'PF Percentage': 12}))
+# ========================================================================
+
+# Input keys of calculate_gross_up_paise() and their defaults (paise / basis points)
+PAISE_INPUT_DEFAULTS = {
+    'Basic Pay': 0,
+    'HRA': 0,
+    'Over Time': 0,
+    'Other Allowances': 0,
+    'PF Percentage': 1200,
+    'Other Deductions': 0,
+}
+
+BASIS_POINTS = 10000  # 100.00%
+
+_ONE = Decimal(1)
+
+
+def _round_div(numerator, denominator):
+    """numerator / denominator rounded half up (denominator > 0); ints or int64 arrays."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+@lru_cache(maxsize=65536)
+def _decimal_to_units(text, exponent):
+    return int(Decimal(text).scaleb(exponent).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def _whole_units(value, name='Value'):
+    """
+    int(value) for a whole number of paise / basis points (int, integral
+    float or Decimal, '1234' or '1234.0'). Raises ValueError for fractions
+    and non-finite values instead of silently truncating them - convert
+    rupees with rupees_to_paise() first.
+    """
+    if isinstance(value, int):
+        return value
+    try:
+        number = Decimal(value.strip()) if isinstance(value, str) else value
+        if number == int(number):
+            return int(number)
+    except (ArithmeticError, TypeError, ValueError):  # InvalidOperation, OverflowError (inf), NaN
+        pass
+    raise ValueError(f"{name} must be a whole number of paise/basis points, got {value!r}")
+
+
+def _int64_column(column, name):
+    """NumPy int64 column of _whole_units(); fractional float columns raise ValueError."""
+    values = np.asarray(column)
+    if values.dtype.kind == 'f':
+        if not (np.isfinite(values) & (values == np.trunc(values))).all():
+            raise ValueError(f"{name} must be whole numbers of paise/basis points")
+    elif values.dtype.kind not in 'iub':
+        return np.array([_whole_units(value, name) for value in values], dtype=np.int64)
+    return values.astype(np.int64)
+
+
+def _q_column(column, name):
+    """array('q') column of _whole_units()."""
+    try:
+        return array('q', column)  # ints only: floats raise TypeError
+    except TypeError:
+        return array('q', [_whole_units(value, name) for value in column])
+
+
+def rupees_to_paise(value):
+    """Rupees (int, float, str or Decimal) -> int paise, rounded half up."""
+    if isinstance(value, int):
+        return value * 100
+    return _decimal_to_units(str(value).strip(), 2)
+
+
+def percent_to_basis_points(value):
+    """12 -> 1200, '12.5' -> 1250 (rounded half up to 0.01%)."""
+    if isinstance(value, int):
+        return value * 100
+    return _decimal_to_units(str(value).strip(), 2)
+
+
+def paise_inputs(data: dict) -> dict:
+    """Rupee inputs of calculate_gross_up_salary() -> inputs of calculate_gross_up_paise()."""
+    inputs = {}
+    for name in SALARY_INPUT_DEFAULTS:
+        if name in data:
+            convert = percent_to_basis_points if name == 'PF Percentage' else rupees_to_paise
+            inputs[name] = convert(data[name])
+    return inputs
+
+
+def paise_result_to_rupees(result: dict) -> dict:
+    """Result of calculate_gross_up_paise() -> the float rupee dict of calculate_gross_up_salary()."""
+    return {name: result[name] / 100 for name in SALARY_RESULT_KEYS}
+
+
+@probe('gross_up')
+def calculate_gross_up_paise(data: dict) -> dict:
+    """
+    Exact gross-up calculation in integer paise.
+
+    Same formula and validation as calculate_gross_up_salary(), using the
+    rounding rule above instead of floating point.
+
+    Args:
+        data (dict): Same keys as calculate_gross_up_salary(); amounts in
+            paise (int) and 'PF Percentage' in basis points (int, default 1200).
+            Integral floats are accepted; fractions raise ValueError rather
+            than being truncated (convert rupees with paise_inputs()).
+
+    Returns:
+        dict: Same keys as calculate_gross_up_salary(), every value an int
+            (amounts in paise, 'PF Percentage' in basis points)
+    """
+    basic_pay, hra, over_time, other_allowances, pf_basis_points, other_deductions = (
+        _whole_units(data.get(name, default), name) for name, default in PAISE_INPUT_DEFAULTS.items())
+
+    if basic_pay <= 0:
+        raise ValueError("Basic Pay must be greater than 0")
+    if pf_basis_points < 0 or pf_basis_points > BASIS_POINTS:
+        raise ValueError("PF Percentage must be between 0 and 100")
+    if pf_basis_points == BASIS_POINTS:
+        raise ValueError("PF Percentage cannot be 100% or more (would result in infinite gross)")
+
+    total_inclusions = basic_pay + hra + over_time + other_allowances
+    pf_amount = _round_div(basic_pay * pf_basis_points, BASIS_POINTS)
+    gross_salary = _round_div(total_inclusions * BASIS_POINTS, BASIS_POINTS - pf_basis_points)
+    total_deductions = pf_amount + other_deductions
+    net_salary = gross_salary - total_deductions
+
+    return {
+        'Basic Pay': basic_pay,
+        'HRA': hra,
+        'Over Time': over_time,
+        'Other Allowances': other_allowances,
+        'PF Percentage': pf_basis_points,
+        'Other Deductions': other_deductions,
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary,
+    }
+
+
+@probe('gross_up_batch', batch_rows)
+def calculate_gross_up_batch_paise(columns: dict) -> dict:
+    """
+    Exact gross-up calculation for many employees at once.
+
+    Columnar version of calculate_gross_up_paise(), giving identical values
+    row for row. Inputs are integer paise / basis point columns; invalid rows
+    (same rules as calculate_gross_up_batch()) do not stop the batch and hold
+    0 in the calculated columns - check 'Invalid Mask'.
+
+    Returns:
+        dict: Column name -> NumPy int64 array (array.array('q') without
+            NumPy) for all 11 keys, plus 'Invalid Mask' and 'Invalid Rows'
+    """
+    if 'Basic Pay' not in columns:
+        raise ValueError("Basic Pay column is required")
+    row_count = len(columns['Basic Pay'])
+    for name in columns:
+        if name in PAISE_INPUT_DEFAULTS and len(columns[name]) != row_count:
+            raise ValueError(f"Column '{name}' has {len(columns[name])} rows, expected {row_count}")
+
+    if np is not None:
+        return _gross_up_batch_paise_numpy(columns, row_count)
+    return _gross_up_batch_paise_python(columns, row_count)
+
+def _gross_up_batch_paise_numpy(columns, row_count):
+    inputs = {}
+    for name, default in PAISE_INPUT_DEFAULTS.items():
+        if name in columns:
+            inputs[name] = _int64_column(columns[name], name)
+        else:
+            inputs[name] = np.full(row_count, default, dtype=np.int64)
+
+    basic_pay = inputs['Basic Pay']
+    pf_basis_points = inputs['PF Percentage']
+    invalid_mask = ~(basic_pay > 0) | (pf_basis_points < 0) | (pf_basis_points >= BASIS_POINTS)
+
+    total_inclusions = basic_pay + inputs['HRA'] + inputs['Over Time'] + inputs['Other Allowances']
+    pf_amount = _round_div(basic_pay * pf_basis_points, BASIS_POINTS)
+    # Any positive divisor for invalid rows; they are zeroed below
+    divisor = np.where(invalid_mask, 1, BASIS_POINTS - pf_basis_points)
+    gross_salary = _round_div(total_inclusions * BASIS_POINTS, divisor)
+    total_deductions = pf_amount + inputs['Other Deductions']
+    net_salary = gross_salary - total_deductions
+
+    for column in (total_inclusions, pf_amount, total_deductions, gross_salary, net_salary):
+        column[invalid_mask] = 0
+
+    result = dict(inputs)
+    result.update({
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary,
+        'Invalid Mask': invalid_mask,
+        'Invalid Rows': np.flatnonzero(invalid_mask).tolist(),
+    })
+    return result
+
+def _gross_up_batch_paise_python(columns, row_count):
+    inputs = {}
+    for name, default in PAISE_INPUT_DEFAULTS.items():
+        if name in columns:
+            inputs[name] = _q_column(columns[name], name)
+        else:
+            inputs[name] = array('q', [default]) * row_count
+
+    basic_pay = inputs['Basic Pay']
+    pf_basis_points = inputs['PF Percentage']
+    invalid_mask = [not (b > 0) or p < 0 or p >= BASIS_POINTS for b, p in zip(basic_pay, pf_basis_points)]
+
+    total_inclusions = array('q', [b + h + ot + oa for b, h, ot, oa in
+                                   zip(basic_pay, inputs['HRA'], inputs['Over Time'], inputs['Other Allowances'])])
+    pf_amount = array('q', [0 if bad else (2 * b * p + BASIS_POINTS) // (2 * BASIS_POINTS)
+                            for b, p, bad in zip(basic_pay, pf_basis_points, invalid_mask)])
+    gross_salary = array('q', [0 if bad else (2 * ti * BASIS_POINTS + (BASIS_POINTS - p)) // (2 * (BASIS_POINTS - p))
+                               for ti, p, bad in zip(total_inclusions, pf_basis_points, invalid_mask)])
+    total_deductions = array('q', [0 if bad else pf + od
+                                   for pf, od, bad in zip(pf_amount, inputs['Other Deductions'], invalid_mask)])
+    net_salary = array('q', [g - td for g, td in zip(gross_salary, total_deductions)])
+
+    invalid_rows = [i for i, bad in enumerate(invalid_mask) if bad]
+    for i in invalid_rows:
+        total_inclusions[i] = 0
+
+    result = dict(inputs)
+    result.update({
+        'Total Inclusions': total_inclusions,
+        'PF Amount': pf_amount,
+        'Total Deductions': total_deductions,
+        'Gross Salary': gross_salary,
+        'Net Salary': net_salary,
+        'Invalid Mask': invalid_mask,
+        'Invalid Rows': invalid_rows,
+    })
+    return result
@@ -0,0 +1,394 @@
+"""
+emp_salary behind any DB-API 2.0 driver, with a bounded connection pool.
+
+The original system talked to MariaDB through pymysql and opened a new
+connection for every button press. DBAPISalaryStore keeps at most pool_size
+connections open and shares them between threads:
+
+    - the SQL of every statement is built once per driver paramstyle and
+      passed unchanged on every call, on a cursor kept with its pooled
+      connection, so drivers that cache prepared statements by SQL text
+      (sqlite3's statement cache) parse each statement once per connection
+    - bulk writes go through executemany() in batches of batch_size rows,
+      one transaction per batch
+    - transient errors (lock wait timeouts, deadlocks, lost connections,
+      'database is locked') roll the transaction back, drop the connection
+      and retry with exponential backoff, up to `retries` times
+
+The same code runs on MariaDB (open_mariadb(), needs pymysql) and on a local
+SQLite file (open_sqlite(), the schema of payroll/storage.py), which is the
+stand-in used by the tests and by benchmarks/bench_dbapi.py.
+
+Usage:
+    with open_sqlite('ems.db', pool_size=4, batch_size=1000) as store:
+        store.insert_many(records)
+        row = store.get(1, month='Jan', year='2025')
+
+    store = open_mariadb(host='127.0.0.1', user='root', password='', database='ems')
+"""
+
+import time
+import queue
+import sqlite3
+import threading
+from itertools import islice
+from functools import lru_cache
+from contextlib import contextmanager
+
+from payroll.core import EMP_SALARY_COLUMNS, EmpSalaryRecord
+from payroll.instrument import probe, returned_count, returned_length
+from payroll.storage import DEFAULT_DB_PATH, SalaryStore, period_key, to_record
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_TIMEOUT = 30.0
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.05
+
+# MariaDB/MySQL error codes worth retrying: lock wait timeout, deadlock,
+# can't connect, server has gone away, lost connection (twice)
+TRANSIENT_ERROR_CODES = frozenset({1205, 1213, 2003, 2006, 2013, 2055})
+# Drivers without error codes (sqlite3): OperationalError messages worth retrying
+TRANSIENT_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+# Backticks quote identifiers in MariaDB and SQLite alike (`add` is a MariaDB keyword)
+_QUOTED_COLUMNS = ', '.join(f'`{name}`' for name in EMP_SALARY_COLUMNS)
+_UPDATE_ASSIGNMENTS = ', '.join(f'`{name}`=?' for name in EMP_SALARY_COLUMNS[1:])
+
+# Written with qmark placeholders; statements() converts them per driver
+_STATEMENTS = {
+    'insert': f'INSERT INTO emp_salary ({_QUOTED_COLUMNS}) VALUES ({", ".join("?" * len(EMP_SALARY_COLUMNS))})',
+    'update': f'UPDATE emp_salary SET {_UPDATE_ASSIGNMENTS} WHERE `code`=? AND `year`=? AND `month`=?',
+    'delete': 'DELETE FROM emp_salary WHERE `code`=?',
+    'delete_period': 'DELETE FROM emp_salary WHERE `code`=? AND `year`=? AND `month`=?',
+    'get': f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE `code`=?',
+    'get_period': f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE `code`=? AND `year`=? AND `month`=?',
+    'period': f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE `year`=? AND `month`=? ORDER BY `code`',
+    'count': 'SELECT COUNT(*) FROM emp_salary',
+}
+# REPLACE INTO is understood by both MariaDB and SQLite
+_STATEMENTS['replace'] = _STATEMENTS['insert'].replace('INSERT INTO', 'REPLACE INTO', 1)
+
+
+class PoolTimeout(TimeoutError):
+    """No pooled connection became free within the pool timeout."""
+
+
+@lru_cache(maxsize=None)
+def statements(paramstyle):
+    """
+    The store's SQL for a driver's paramstyle ('qmark' or 'format'/'pyformat').
+
+    Returns:
+        dict: statement name -> SQL text (the same str objects on every call)
+    """
+    if paramstyle == 'qmark':
+        return dict(_STATEMENTS)
+    if paramstyle in ('format', 'pyformat'):
+        return {name: sql.replace('?', '%s') for name, sql in _STATEMENTS.items()}
+    raise ValueError(f"Unsupported DB-API paramstyle: {paramstyle!r}")
+
+
+def is_transient(module, ex):
+    """True if a DB-API error from `module` is worth retrying on a new connection."""
+    if not isinstance(ex, module.OperationalError):
+        return False
+    code = ex.args[0] if ex.args else None
+    if isinstance(code, int):
+        return code in TRANSIENT_ERROR_CODES
+    message = str(ex).lower()
+    return any(text in message for text in TRANSIENT_MESSAGES)
+
+
+class _Pooled:
+    """A pooled connection and the cursor reused with it."""
+
+    __slots__ = ('connection', 'cursor')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor()
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    At most `size` DB-API connections, opened on first use and reused.
+
+    acquire() waits up to `timeout` seconds for a free connection. The most
+    recently released connection is handed out first, so a lightly used
+    pool keeps using the same few connections.
+    """
+
+    def __init__(self, connect, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.opened = 0
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._closed = False
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No free connection after {self.timeout}s (pool size {self.size})")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            pooled = _Pooled(self.connect())
+        except BaseException:
+            self._slots.release()
+            raise
+        self.opened += 1
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a connection to the pool, or close it (discard=True, or the pool is closed)."""
+        if discard or self._closed:
+            pooled.close()
+        else:
+            self._idle.put(pooled)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection (closed instead of returned if the block raises)."""
+        pooled = self.acquire()
+        try:
+            yield pooled.connection
+        except BaseException:
+            self.release(pooled, discard=True)
+            raise
+        self.release(pooled)
+
+    def idle(self):
+        """Number of open connections waiting in the pool."""
+        return self._idle.qsize()
+
+    def close(self):
+        """Close the idle connections; connections in use are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class DBAPISalaryStore:
+    """
+    emp_salary through a DB-API 2.0 module and a ConnectionPool.
+
+    Safe to share between threads. Methods match SalaryStore's.
+
+    Args:
+        module: The DB-API module (sqlite3, pymysql, ...) - for paramstyle and error types
+        connect (callable): Opens one connection of `module`
+        pool_size (int): Most connections open at once
+        batch_size (int): Rows per executemany() and transaction in insert_many()
+        retries (int): Retries of a transaction after a transient error
+        backoff (float): Seconds before the first retry, doubled for each next one
+        pool_timeout (float): Seconds to wait for a free connection
+    """
+
+    def __init__(self, module, connect, pool_size=DEFAULT_POOL_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, pool_timeout=DEFAULT_POOL_TIMEOUT):
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.module = module
+        self.sql = statements(module.paramstyle)
+        self.pool = ConnectionPool(connect, pool_size, pool_timeout)
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.retried = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def transaction(self, work):
+        """
+        Run work(cursor) and commit, retrying transient errors on a fresh connection.
+
+        Any error rolls the transaction back; other errors are raised at once.
+        The connection always goes back to the pool; after a transient error,
+        or KeyboardInterrupt and the like (which leave the transaction open),
+        it is closed instead of reused.
+
+        Returns:
+            The result of work(cursor)
+        """
+        attempt = 0
+        while True:
+            pooled = self.pool.acquire()
+            discard = True  # unless the transaction is committed or rolled back
+            try:
+                result = work(pooled.cursor)
+                pooled.connection.commit()
+                discard = False
+                return result
+            except Exception as ex:
+                transient = is_transient(self.module, ex)
+                try:
+                    pooled.connection.rollback()
+                except Exception:
+                    transient = True  # the connection is unusable - never reuse it
+                discard = transient
+                if not transient or attempt >= self.retries:
+                    raise
+            finally:
+                self.pool.release(pooled, discard=discard)
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+            self.retried += 1
+
+    # ---------------------------------------------------------------- writes
+    @probe('db_write')
+    def insert(self, record):
+        """Insert one record. Raises the driver's IntegrityError if it already exists."""
+        record = to_record(record)
+        self.transaction(lambda cursor: cursor.execute(self.sql['insert'], record))
+
+    @probe('db_write', returned_count)
+    def insert_many(self, records, replace=False):
+        """
+        Write a payroll run with executemany() in batches of batch_size rows.
+
+        Each batch is one transaction, retried on its own, so a run that fails
+        part-way keeps its earlier batches; with replace=True the same run
+        can simply be written again.
+
+        Args:
+            records (iterable): dicts, EmpSalaryRecords or 24-value sequences
+            replace (bool): Overwrite existing rows (same unique key) instead of failing
+
+        Returns:
+            int: Number of rows written
+        """
+        sql = self.sql['replace' if replace else 'insert']
+        records = map(to_record, records)
+        written = 0
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                return written
+            self.transaction(lambda cursor: cursor.executemany(sql, batch))
+            written += len(batch)
+
+    @probe('db_write')
+    def update(self, record):
+        """Update the row for the record's (code, year, month). Returns True if a row matched."""
+        record = to_record(record)
+        params = record[1:] + (record.code, record.year, record.month)
+
+        def work(cursor):
+            cursor.execute(self.sql['update'], params)
+            return cursor.rowcount
+        return self.transaction(work) > 0
+
+    @probe('db_write')
+    def delete(self, code, month=None, year=None):
+        """Delete one salary month of an employee, or every month when month/year are not given."""
+        if month is None and year is None:
+            sql, params = self.sql['delete'], (int(code),)
+        else:
+            sql, params = self.sql['delete_period'], (int(code), str(year), str(month))
+
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.rowcount
+        return self.transaction(work)
+
+    # ----------------------------------------------------------------- reads
+    def _fetchall(self, sql, params):
+        def work(cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        return [EmpSalaryRecord(*row) for row in self.transaction(work)]
+
+    @probe('db_read')
+    def get(self, code, month=None, year=None):
+        """
+        Return the record for code, or None.
+
+        Without month/year this is the latest salary month by (year, month),
+        as in SalaryStore.get().
+        """
+        if month is None and year is None:
+            records = self._fetchall(self.sql['get'], (int(code),))
+            return max(records, key=period_key, default=None)
+        records = self._fetchall(self.sql['get_period'], (int(code), str(year), str(month)))
+        return records[0] if records else None
+
+    def exists(self, code, month, year):
+        return self.get(code, month, year) is not None
+
+    @probe('db_read', returned_length)
+    def period(self, month, year):
+        """All records of one salary month, ordered by code."""
+        return self._fetchall(self.sql['period'], (str(year), str(month)))
+
+    def count(self):
+        def work(cursor):
+            cursor.execute(self.sql['count'])
+            return cursor.fetchone()[0]
+        return self.transaction(work)
+
+
+def open_sqlite(path=DEFAULT_DB_PATH, timeout=5.0, **options):
+    """
+    DBAPISalaryStore on a local SQLite file with the schema of payroll/storage.py.
+
+    Args:
+        path (str): Database file (created if missing, WAL mode)
+        timeout (float): Seconds a connection waits on a locked database
+            before raising 'database is locked'
+        **options: DBAPISalaryStore options (pool_size, batch_size, ...)
+    """
+    with SalaryStore(path):
+        pass  # creates the table and indexes, switches the file to WAL
+
+    def connect():
+        con = sqlite3.connect(path, timeout=timeout, cached_statements=256, check_same_thread=False)
+        con.execute('PRAGMA synchronous=NORMAL')
+        return con
+    return DBAPISalaryStore(sqlite3, connect, **options)
+
+
+def open_mariadb(host='127.0.0.1', user='root', password='', database='ems', port=3306, **options):
+    """
+    DBAPISalaryStore on the MariaDB emp_salary table of emp_salary.sql.
+
+    That table's primary key is `code`, so it holds one row per employee and
+    insert_many(replace=True) overwrites an employee's previous month.
+
+    Args:
+        host, user, password, database, port: pymysql.connect() arguments
+        **options: DBAPISalaryStore options (pool_size, batch_size, ...)
+    """
+    try:
+        import pymysql
+    except ImportError:
+        raise ImportError("The MariaDB backend needs pymysql: pip install pymysql") from None
+
+    def connect():
+        return pymysql.connect(host=host, user=user, password=password, database=database, port=port,
+                               charset='utf8mb4', autocommit=False)
+    return DBAPISalaryStore(pymysql, connect, **options)
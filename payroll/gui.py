@@ -0,0 +1,798 @@
+"""
+Employee Payroll Management System - Tkinter GUI.
+
+tkinter is only imported by this module. Start the window with main()
+(or run employee.py).
+"""
+
+from tkinter import *
+from tkinter import messagebox,ttk
+import sqlite3
+
+import os
+import tempfile
+
+from payroll.components import STANDARD, load_components
+from payroll.core import EMPLOYEE_FIELDS, Employee
+from payroll.instrument import stage
+from payroll.live import LIVE_DEBOUNCE_MS, LiveCalculation, changed_lines
+from payroll.receipts import write_files
+from payroll.journal import JournaledSalaryStore
+from payroll.storage import SalaryStore
+from payroll.paging import RecordPager
+from payroll.record_view import VirtualRecordView
+from payroll.search_index import index_path, open_index, parse_query
+from payroll.tasks import TaskRunner
+
+class EmployeeSystem:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Employee Payroll Management System")
+        self.root.geometry("1350x700+0+0") 
+        self.root.config(bg="white")
+        Title = Label(self.root, text="Employee Payroll Management System", font=("times new roman", 30, "bold"), bg="#262626", fg="white",anchor="w",padx=10)
+        Title.place(x=0, y=0, relwidth=1)
+        self.btn_show_emp = Button(self.root,command=self.view_all ,text="View All Records", font=("times new roman",15), bg="white", fg="black", padx=10)
+        self.btn_show_emp.place(x=1190, y=10,height=27,width=150)
+
+        # Progress of bulk jobs - shown only while one runs
+        self.progress=ttk.Progressbar(self.root,mode='determinate')
+        self.lbl_progress=Label(self.root,font=("times new roman",12),bg="#262626",fg="white",anchor="e")
+        self.btn_cancel=Button(self.root,command=self.cancel_tasks,text="Cancel",font=("times new roman",13),bg="white",fg="black")
+        
+        #Frame1
+        #Variables
+        self.var_emp_code=StringVar()
+        self.var_emp_designation=StringVar()
+        self.var_emp_name=StringVar()
+        self.var_emp_age=StringVar()
+        self.var_emp_gender=StringVar()
+        self.var_emp_email=StringVar()
+        self.var_emp_hl=StringVar()
+        self.var_emp_dob=StringVar()
+        self.var_emp_doj=StringVar()
+        self.var_emp_exp=StringVar()
+        self.var_emp_pid=StringVar()
+        self.var_emp_contact=StringVar()
+        self.var_emp_status=StringVar()
+        # Field -> variable of the employee entries (the address is a Text widget)
+        self.employee_vars={name:getattr(self,f'var_emp_{name}') for name in EMPLOYEE_FIELDS if name!='add'}
+        
+        Frame1=Frame(self.root,bd=5,relief=RIDGE,bg="white")
+        Frame1.place(x=10,y=70,width=750,height=650)
+        Title1 =Label(Frame1, text="Employee Details", font=("times new roman", 20, "bold"), bg="lightgray", fg="black",anchor="w",padx=10)
+        Title1.place(x=0, y=0, relwidth=1)
+
+        lbl_code = Label(Frame1, text="Employee Code", font=("times new roman", 20, "bold"), bg="white", fg="black",anchor="w",padx=10)
+        lbl_code.place(x=10, y=50)
+        self.entry_code = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_code, bg="light yellow", fg="black", justify="left")
+        self.entry_code.place(x=210, y=55,width=200)
+        self.btn_search = Button(Frame1, command=self.search, text="Search", font=("times new roman",17), bg="white", fg="black", padx=10)
+        self.btn_search.place(x=430, y=55,height=27)
+
+        # Type-ahead list: typing a name (or email:, designation:, location:, status:) in the
+        # Employee Code box suggests matching employees from the search index
+        self.suggested_codes=[]
+        self.lst_suggest=Listbox(Frame1,font=("times new roman",13),bg="white",fg="black",activestyle='none')
+        self.lst_suggest.bind('<<ListboxSelect>>',self.pick_suggestion)
+        self.entry_code.bind('<KeyRelease>',self.type_ahead)
+
+        #ROW 1
+        lbl_designation = Label(Frame1, text="Designation", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_designation.place(x=10, y=100)
+        entry_designation = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_designation, bg="light yellow", fg="black", justify="left").place(x=170, y=105,width=200)
+
+        lbl_DOB = Label(Frame1, text="D.O.B", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_DOB.place(x=380, y=100)
+        entry_DOB= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_dob, bg="light yellow", fg="black", justify="left").place(x=490, y=105)
+
+        #ROW 2
+        lbl_name= Label(Frame1, text="Name", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_name.place(x=10, y=150)
+        entry_name = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_name, bg="light yellow", fg="black", justify="left").place(x=170, y=155,width=200)
+
+        lbl_DOJ = Label(Frame1, text="D.O.J", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_DOJ.place(x=380, y=150)
+        entry_DOJ= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_doj, bg="light yellow", fg="black", justify="left").place(x=490, y=155)
+
+        #ROW 3
+        lbl_age= Label(Frame1, text="Age", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_age.place(x=10, y=200)
+        entry_age = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_age, bg="light yellow", fg="black", justify="left").place(x=170, y=205,width=200)
+
+        lbl_experince = Label(Frame1, text="Experince", font=("times new roman", 17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_experince.place(x=380, y=200)
+        entry_experince= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_exp, bg="light yellow", fg="black", justify="left").place(x=490, y=205)
+
+        #ROW 4
+        lbl_gender= Label(Frame1, text="Gender", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_gender.place(x=10, y=250)
+        entry_gender = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_gender, bg="light yellow", fg="black", justify="left").place(x=170, y=255,width=200)
+
+        lbl_proof = Label(Frame1, text="Proof ID", font=("times new roman", 17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_proof.place(x=380, y=250)
+        entry_proof= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_pid, bg="light yellow", fg="black", justify="left").place(x=490, y=255)
+
+        #ROW 5
+        lbl_email= Label(Frame1, text="Email", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_email.place(x=10, y=300)
+        entry_email = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_email, bg="light yellow", fg="black", justify="left").place(x=170, y=305,width=200)
+
+        lbl_contact = Label(Frame1, text="Contact", font=("times new roman", 17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_contact.place(x=380, y=300)
+        entry_contact= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_contact, bg="light yellow", fg="black", justify="left").place(x=490, y=305)
+
+        #ROW 6
+        lbl_hired= Label(Frame1, text="Hired Location", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_hired.place(x=10, y=350)
+        entry_hired = Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_hl, bg="light yellow", fg="black", justify="left").place(x=170, y=355,width=200)
+
+        lbl_status = Label(Frame1, text="Status", font=("times new roman", 17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_status.place(x=380, y=350)
+        entry_status= Entry(Frame1, font=("times new roman", 15, "bold"),textvariable=self.var_emp_status, bg="light yellow", fg="black", justify="left").place(x=490, y=355)
+
+        #ROW 7
+        lbl_add= Label(Frame1, text="Address", font=("times new roman",17), bg="white", fg="black", anchor="w", padx=10)
+        lbl_add.place(x=10, y=400)
+        self.entry_add = Text(Frame1, font=("times new roman", 15, "bold"), bg="light yellow", fg="black")
+        self.entry_add.place(x=170, y=405,width=525,height=150)
+
+        #Frame2
+        #Variables - Salary Components for Gross-Up Calculation
+        self.var_slr_month=StringVar()
+        self.var_slr_year=StringVar()
+        self.var_slr_basic=StringVar()  # Basic Pay (inclusion)
+        self.var_slr_hra=StringVar()  # HRA (inclusion)
+        self.var_slr_ot=StringVar()  # Over Time (inclusion)
+        self.var_slr_other_allow=StringVar()  # Other Allowances (inclusion)
+        self.var_slr_pf_percent=StringVar()  # PF percentage (exclusion, default 12%)
+        self.var_slr_other_deduct=StringVar()  # Other deductions (exclusion)
+        self.var_slr_gross=StringVar()  # Calculated Gross Salary
+        self.var_slr_pf_amount=StringVar()  # Calculated PF Amount
+        self.var_slr_net=StringVar()  # Net/Take-Home Salary
+        
+        # Legacy variables (kept for backward compatibility)
+        self.var_slr_salary=StringVar()  # Old salary field
+        self.var_slr_tdays=StringVar()
+        self.var_slr_abs=StringVar()
+        self.var_slr_medical=StringVar()
+        self.var_slr_pf=StringVar()  # Old PF amount field
+        self.var_slr_conv=StringVar()
+
+        # Salary components (payroll/components.json) drive the form fields,
+        # the calculation and the receipt
+        try:
+            self.components=load_components()
+        except (OSError,ValueError) as ex:
+            messagebox.showerror('Error',f'Salary components not loaded, using the standard set\n{ex}',parent=self.root)
+            self.components=STANDARD
+        # Each component uses the form variable above with its key or legacy column, else a new one
+        known_vars={'Basic Pay':self.var_slr_basic,'HRA':self.var_slr_hra,'Over Time':self.var_slr_ot,
+                    'Other Allowances':self.var_slr_other_allow,'PF Percentage':self.var_slr_pf_percent,
+                    'Other Deductions':self.var_slr_other_deduct,'PF Amount':self.var_slr_pf_amount}
+        column_vars={'medical':self.var_slr_medical,'conv':self.var_slr_conv}
+        self.salary_inputs={}
+        for component in self.components.components:
+            self.salary_inputs[component.key]=column_vars.get(component.column) or known_vars.get(component.key) or StringVar()
+        self.salary_outputs={'Gross Salary':self.var_slr_gross}
+        for key in self.components.amount_keys:
+            self.salary_outputs[key]=known_vars.get(key) or StringVar()
+        self.salary_outputs['Net Salary']=self.var_slr_net
+        for key,text in self.components.default_texts().items():
+            self.salary_inputs[key].set(text)
+
+        Frame2=Frame(self.root,bd=5,relief=RIDGE,bg="white")
+        Frame2.place(x=770,y=70,width=600,height=325)
+        Title2 =Label(Frame2, text="Employee Salary Details", font=("times new roman", 20, "bold"), bg="lightgray", fg="black",anchor="w",padx=10)
+        Title2.place(x=0, y=0, relwidth=1)
+
+        lbl_month = Label(Frame2, text="Month", font=("times new roman", 15), bg="white", fg="black",anchor="w",padx=10)
+        lbl_month.place(x=10, y=60)
+        entry_month = Entry(Frame2, font=("times new roman", 15, "bold"),textvariable=self.var_slr_month, bg="light yellow", fg="black", justify="left").place(x=80, y=62,width=100)
+        
+        lbl_year = Label(Frame2, text="Year", font=("times new roman", 15), bg="white", fg="black",anchor="w",padx=10)
+        lbl_year.place(x=200, y=60)
+        entry_year = Entry(Frame2, font=("times new roman", 15, "bold"),textvariable=self.var_slr_year, bg="light yellow", fg="black", justify="left").place(x=265, y=62,width=100)
+
+        #Component rows - input fields in two columns, then the calculated outputs
+        rates=[component for component in self.components.components if component.type=='rate']
+        if rates:
+            # The first rate (PF %) sits next to Month/Year
+            lbl_rate = Label(Frame2, text=rates[0].label, font=("times new roman", 15), bg="white", fg="black",anchor="w",padx=10)
+            lbl_rate.place(x=380, y=60)
+            entry_rate = Entry(Frame2, font=("times new roman", 15, "bold"),textvariable=self.salary_inputs[rates[0].key], bg="light yellow", fg="black", justify="left").place(x=450, y=62,width=100)
+        fields=[(component.label,self.salary_inputs[component.key],NORMAL) for component in self.components.components if component not in rates[:1]]
+        fields+=[(key,var,'readonly') for key,var in self.salary_outputs.items()]
+        step=min(35,175//((len(fields)+1)//2))
+        for i,(text,var,state) in enumerate(fields):
+            x,entry_x=(10,140) if i%2==0 else (310,425)
+            y=100+(i//2)*step
+            lbl_field = Label(Frame2, text=text, font=("times new roman",15), bg="white", fg="black", anchor="w", padx=10)
+            lbl_field.place(x=x, y=y)
+            entry_field = Entry(Frame2, state=state, font=("times new roman", 15, "bold"),textvariable=var, bg="light yellow", fg="black", justify="left").place(x=entry_x, y=y+2,width=125)
+
+        #Buttons
+        self.btn_calc = Button(Frame2, text="Calculate",command=self.calculate_gross_up, font=("times new roman",15), bg="yellow", fg="black", padx=10)
+        self.btn_calc.place(x=10, y=280,height=27,width=100)
+        self.btn_save = Button(Frame2, text="Save",command=self.save, font=("times new roman",15), bg="green", fg="white", padx=10)
+        self.btn_save.place(x=120, y=280,height=27,width=100)
+        self.btn_clear = Button(Frame2, text="Clear",command=self.clear, font=("times new roman",15), bg="orange", fg="black", padx=10)
+        self.btn_clear.place(x=230, y=280,height=27,width=100)
+        self.btn_update = Button(Frame2, text="Update",state=DISABLED,command=self.update, font=("times new roman",15), bg="cyan", fg="black", padx=10)
+        self.btn_update.place(x=340, y=280,height=27,width=100)
+        self.btn_delete = Button(Frame2, text="Delete",state=DISABLED,command=self.delete, font=("times new roman",15), bg="red", fg="black", padx=10)
+        self.btn_delete.place(x=450, y=280,height=27,width=100)
+        
+        #Frame3
+        Frame3=Frame(self.root,bd=5,relief=RIDGE,bg="white")
+        Frame3.place(x=770,y=400,width=600,height=320)
+
+        #Calculator frame
+        self.var_txt=StringVar()
+        self.var_operator=''
+        def btn_click(num):
+            self.var_operator=self.var_operator+str(num)
+            self.var_txt.set(self.var_operator)
+
+        def result():
+            res=str(eval(self.var_operator))
+            self.var_txt.set(res)
+            self.var_operator=''
+
+        def clear_cal():
+            self.var_txt.set('')
+            self.var_operator=''
+
+        cal_frame=Frame(Frame3,bg="white",bd=2,relief=RIDGE)
+        cal_frame.place(x=2,y=2,width=245,height=305)
+
+        txt_result=Entry(cal_frame,bg="light yellow",textvariable=self.var_txt,font=("times new roman",22,'bold'),justify='right')
+        txt_result.place(x=0,y=0,relwidth=1,height=52)
+
+        #=============ROW 1============================
+        btn_7=Button(cal_frame,text='7',command=lambda:btn_click(7),font=("times new roman",15,"bold")).place(x=0,y=58,width=60,height=55)
+        btn_8=Button(cal_frame,text='8',command=lambda:btn_click(8),font=("times new roman",15,"bold")).place(x=61,y=58,width=60,height=55)
+        btn_9=Button(cal_frame,text='9',command=lambda:btn_click(9),font=("times new roman",15,"bold")).place(x=122,y=58,width=60,height=55)
+        btn_div=Button(cal_frame,text='/',command=lambda:btn_click('/'),font=("times new roman",15,"bold")).place(x=183,y=58,width=60,height=55)
+
+        #=============ROW 2============================
+        btn_4=Button(cal_frame,text='4',command=lambda:btn_click(4),font=("times new roman",15,"bold")).place(x=0,y=118,width=60,height=55)
+        btn_5=Button(cal_frame,text='5',command=lambda:btn_click(5),font=("times new roman",15,"bold")).place(x=61,y=118,width=60,height=55)
+        btn_6=Button(cal_frame,text='6',command=lambda:btn_click(6),font=("times new roman",15,"bold")).place(x=122,y=118,width=60,height=55)
+        btn_mul=Button(cal_frame,text='*',command=lambda:btn_click('*'),font=("times new roman",15,"bold")).place(x=183,y=118,width=60,height=55)
+
+        #=============ROW 3============================
+        btn_1=Button(cal_frame,text='1',command=lambda:btn_click(1),font=("times new roman",15,"bold")).place(x=0,y=178,width=60,height=55)
+        btn_2=Button(cal_frame,text='2',command=lambda:btn_click(2),font=("times new roman",15,"bold")).place(x=61,y=178,width=60,height=55)
+        btn_3=Button(cal_frame,text='3',command=lambda:btn_click(3),font=("times new roman",15,"bold")).place(x=122,y=178,width=60,height=55)
+        btn_min=Button(cal_frame,text='-',command=lambda:btn_click('-'),font=("times new roman",15,"bold")).place(x=183,y=178,width=60,height=55)
+
+        #=============ROW 4============================
+        btn_0=Button(cal_frame,text='0',command=lambda:btn_click(0),font=("times new roman",15,"bold")).place(x=0,y=238,width=60,height=55)
+        btn_dot=Button(cal_frame,text='C',command=clear_cal,font=("times new roman",15,"bold")).place(x=61,y=238,width=60,height=55)
+        btn_eql=Button(cal_frame,text='+',command=lambda:btn_click('+'),font=("times new roman",15,"bold")).place(x=122,y=238,width=60,height=55)
+        btn_eql=Button(cal_frame,text='=',command=result,font=("times new roman",15,"bold")).place(x=183,y=238,width=60,height=55)
+
+        #=============Salary frame============================
+        
+        sal_frame=Frame(Frame3,bg="white",bd=2,relief=RIDGE)
+        sal_frame.place(x=250,y=2,width=330,height=305)
+        Title_sal =Label(sal_frame, text="Salary Reciept", font=("times new roman", 20, "bold"), bg="lightgray", fg="black",anchor="w",padx=10)
+        Title_sal.place(x=0, y=0, relwidth=1)
+
+        sal_frame2=Frame(sal_frame,bg='white',bd=2,relief=RIDGE)
+        sal_frame2.place(x=0,y=39,relwidth=1,height=230)
+
+        self.sample=f'''\tCompany Name, XYZ\n\tAddress: XYZ, Floor4
+    ---------------------------------------------
+     Employee Id\t\t:    1
+     Salary of\t\t:    Mon-YYYY
+     Generated On\t\t:    DD-MM-YYYY  
+    ---------------------------------------------
+     Total Days\t\t:    DD
+     Total Present\t\t:    DD
+     Total Absent\t\t:    DD
+     Convenience\t\t:    Rs.----
+     Medical\t\t:    Rs.----
+     PF\t\t:    Rs.----
+     Gross Payment\t\t:    Rs.------
+     Net Salary\t\t:    Rs.------
+    ---------------------------------------------
+     This Is A Computer Generated Slip,
+     It Does Not Require Any Signature.
+    '''
+
+        scroll_y=Scrollbar(sal_frame2,orient=VERTICAL)
+        scroll_y.pack(fill=Y,side=RIGHT)
+
+        self.txt_salary_recipt=Text(sal_frame2,font=("times new roman",13),bg="light yellow",yscrollcommand=scroll_y)
+        self.txt_salary_recipt.pack(fill=BOTH,expand=True)
+        scroll_y.config(command=self.txt_salary_recipt.yview)
+        self.txt_salary_recipt.insert(END,self.sample)
+        self.btn_print = Button(sal_frame,text="Print",command=self.print_reciept,state=DISABLED, font=("times new roman",15), bg="light blue", fg="black", padx=10)
+        self.btn_print.place(x=225, y=271,height=27,width=100)
+        self.btn_export = Button(sal_frame,text="Month Receipts",command=self.export_receipts, font=("times new roman",15), bg="light blue", fg="black", padx=10)
+        self.btn_export.place(x=5, y=271,height=27,width=150)
+
+        # Database writes, printing and bulk jobs run on background threads;
+        # these buttons are disabled while one is in flight
+        self.action_buttons=[self.btn_show_emp,self.btn_search,self.btn_calc,self.btn_save,self.btn_clear,
+                             self.btn_update,self.btn_delete,self.btn_print,self.btn_export]
+        self.button_states={}
+        self.tasks=TaskRunner(self.root,on_busy=self.set_busy,on_progress=self.show_progress)
+
+        # Live recalculation: a short pause in typing in any of the salary
+        # inputs (or the code/month/year of the receipt header) updates
+        # Gross/PF/Net and the receipt lines that changed
+        self.live=LiveCalculation(self.components)
+        self.live_job=None
+        self.filling=False  # set_form() is loading a saved record
+        for var in [*self.salary_inputs.values(),self.var_emp_code,self.var_slr_month,self.var_slr_year]:
+            var.trace_add('write',self.schedule_recalculate)
+
+        self.check_connection()
+    #============ all functions start hear============
+    def search(self):
+        self.hide_suggestions()
+        text=self.var_emp_code.get().strip()
+        if text=='':
+            messagebox.showerror("Error","Employee Code or name is required",parent=self.root)
+            return
+        if not text.isdigit():
+            codes=self.find_employees(text)
+            if len(codes)==0:
+                messagebox.showerror("Error",f"No employee matches '{text}'",parent=self.root)
+                return
+            if len(codes)>1:
+                self.show_suggestions(codes)
+                return
+            self.var_emp_code.set(codes[0])
+        try:
+            row=self.journal.get(self.var_emp_code.get())
+        except ValueError:
+            messagebox.showerror("Error","Employee Code must be a number",parent=self.root)
+            return
+        except Exception as ex:
+            messagebox.showerror("Error",f'Error due to: {str(ex)}',parent=self.root)
+            return
+        if row==None:
+            messagebox.showerror("Error","Invalid Employee Code, please try with another Employee Code",parent=self.root)
+            return
+        self.set_form(row)
+        self.btn_save.config(state=DISABLED)
+        self.btn_update.config(state=NORMAL)
+        self.btn_delete.config(state=NORMAL)
+        self.entry_code.config(state='readonly')
+        self.btn_print.config(state=NORMAL)
+
+    def find_employees(self, text, limit=8):
+        query=parse_query(text)
+        if not query:
+            return []
+        return self.index.search(**query, limit=limit)
+
+    def type_ahead(self, event):
+        if event.keysym=='Return':
+            self.search()
+            return
+        if event.keysym=='Escape':
+            self.hide_suggestions()
+            return
+        text=self.var_emp_code.get().strip()
+        if self.entry_code.cget('state')!=NORMAL or text=='' or text.isdigit():
+            self.hide_suggestions()
+            return
+        codes=self.find_employees(text)
+        if codes:
+            self.show_suggestions(codes)
+        else:
+            self.hide_suggestions()
+
+    def show_suggestions(self, codes):
+        self.suggested_codes=codes
+        self.lst_suggest.delete(0,END)
+        for code in codes:
+            self.lst_suggest.insert(END,self.index.describe(code))
+        self.lst_suggest.place(x=210,y=85,width=400,height=len(codes)*22+6)
+        self.lst_suggest.lift()
+
+    def hide_suggestions(self):
+        self.suggested_codes=[]
+        self.lst_suggest.place_forget()
+
+    def pick_suggestion(self, event):
+        selection=self.lst_suggest.curselection()
+        if not selection:
+            return
+        self.var_emp_code.set(self.suggested_codes[selection[0]])
+        self.search()
+
+    def index_changed(self):
+        # Saved index no longer matches - remove it until it is written back on exit
+        if not self.index_dirty:
+            self.index_dirty=True
+            try:
+                os.remove(index_path(self.store))
+            except OSError:
+                pass
+
+    def on_close(self):
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+        self.tasks.shutdown(wait=True)
+        try:
+            self.journal.close()  # compacts the save journal into the database
+        except Exception as ex:
+            messagebox.showerror('Error',f'Saved records could not be written to the database: {ex}\n'
+                                 'They stay in the save journal and are applied on the next start.',parent=self.root)
+        if self.index_dirty:
+            try:
+                self.index.stamp=self.store.stamp()
+                self.index.save(index_path(self.store))
+            except Exception:
+                pass
+        self.store.close()
+        self.root.destroy()
+
+    #============ background tasks ============
+    def set_busy(self, busy):
+        if busy:
+            self.button_states={btn:btn.cget('state') for btn in self.action_buttons}
+            for btn in self.action_buttons:
+                btn.config(state=DISABLED)
+            self.root.config(cursor='watch')
+        else:
+            for btn,state in self.button_states.items():
+                btn.config(state=state)
+            self.root.config(cursor='')
+            self.hide_progress()
+
+    def show_progress(self, task, done, total, text):
+        if not self.progress.winfo_ismapped():
+            self.lbl_progress.place(x=560, y=12,height=25,width=280)
+            self.progress.place(x=850, y=14,height=20,width=220)
+            self.btn_cancel.place(x=1080, y=10,height=27,width=100)
+            self.btn_cancel.config(state=NORMAL)
+        self.progress.config(maximum=total or 1,value=done)
+        self.lbl_progress.config(text=text)
+
+    def hide_progress(self):
+        self.progress.place_forget()
+        self.lbl_progress.place_forget()
+        self.btn_cancel.place_forget()
+
+    def cancel_tasks(self):
+        self.btn_cancel.config(state=DISABLED)
+        self.lbl_progress.config(text='Cancelling...')
+        self.tasks.cancel_all()
+
+    def task_failed(self, ex):
+        messagebox.showerror("Error",f'Error due to: {str(ex)}',parent=self.root)
+
+    def check_journal(self):
+        """Warn (once per error) when the saves in the journal cannot be written to the database."""
+        error=self.journal.compact_error
+        if error is not None and error is not self.journal_error:
+            messagebox.showwarning('Warning',f'Saved records are kept in the save journal but could not be written '
+                                   f'to the database yet: {error}',parent=self.root)
+        self.journal_error=error
+
+    def form_employee(self):
+        """The employee details in the form."""
+        return Employee(add=self.entry_add.get('1.0',END).rstrip('\n'),
+                        **{name:var.get() for name,var in self.employee_vars.items()})
+
+    def show_employee(self, employee):
+        for name,var in self.employee_vars.items():
+            var.set(employee[name])
+        self.entry_add.delete('1.0',END)
+        self.entry_add.insert(END,employee.add)
+
+    def form_record(self):
+        """Collect the form into an emp_salary row (dict of the 24 columns)."""
+        return {
+            **self.form_employee(),
+            'month': self.var_slr_month.get(),
+            'year': self.var_slr_year.get(),
+            'salary': self.var_slr_gross.get(),  # Gross Salary
+            'tdays': self.var_slr_tdays.get(),
+            'abs': self.var_slr_abs.get(),
+            'medical': self.var_slr_medical.get(),
+            'pf': self.var_slr_pf_amount.get(),  # PF Amount
+            'conv': self.var_slr_conv.get(),
+            'net': self.var_slr_net.get(),
+            'reciept': self.txt_salary_recipt.get('1.0',END),
+        }
+
+    def set_form(self, row):
+        """Fill the form from an emp_salary row - its saved Gross/PF/Net and receipt are shown as they are."""
+        # The fields below are traced: no live recalculation while (or for) loading
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+            self.live_job=None
+        self.filling=True
+        try:
+            self.show_employee(Employee.from_record(row))
+            self.var_slr_month.set(row.month)
+            self.var_slr_year.set(row.year)
+            # emp_salary keeps conv and medical but not the other components: those go back
+            # to their defaults rather than keep the previous employee's amounts
+            for key,text in self.components.default_texts().items():
+                self.salary_inputs[key].set(text)
+            self.var_slr_gross.set(row.salary)
+            self.var_slr_salary.set(row.salary)
+            self.var_slr_tdays.set(row.tdays)
+            self.var_slr_abs.set(row.abs)
+            self.var_slr_medical.set(row.medical)
+            self.var_slr_pf_amount.set(row.pf)
+            self.var_slr_pf.set(row.pf)
+            self.var_slr_conv.set(row.conv)
+            self.var_slr_net.set(row.net)
+            self.txt_salary_recipt.delete('1.0',END)
+            self.txt_salary_recipt.insert(END,row.reciept)
+        finally:
+            self.filling=False
+        # Recalculate only once an amount is edited
+        self.live.hold({name:var.get() for name,var in self.salary_inputs.items()},
+                       self.var_emp_code.get(),self.var_slr_month.get(),self.var_slr_year.get())
+    
+    def clear(self):
+        self.btn_save.config(state=NORMAL)
+        self.btn_update.config(state=DISABLED)
+        self.btn_delete.config(state=DISABLED)
+        self.entry_code.config(state=NORMAL)
+        self.btn_print.config(state=DISABLED)
+        self.show_employee(Employee())
+  
+        # Clear gross-up salary fields
+        self.var_slr_month.set('')
+        self.var_slr_year.set('')
+        for key,text in self.components.default_texts().items():
+            self.salary_inputs[key].set(text)  # PF % back to its default
+        for var in self.salary_outputs.values():
+            var.set('')
+        
+        # Clear legacy fields (if needed)
+        self.var_slr_salary.set('')
+        self.var_slr_tdays.set('')
+        self.var_slr_abs.set('')
+        self.var_slr_medical.set('')
+        self.var_slr_pf.set('')
+        self.var_slr_conv.set('')
+        self.txt_salary_recipt.delete('1.0',END)
+        self.txt_salary_recipt.insert(END,self.sample)
+        self.live.reset()
+
+    def view_all(self):
+        # Only one records window - bring it back to the front if already open
+        if getattr(self,'window',None) is not None and self.window.winfo_exists():
+            self.window.lift()
+            self.show()
+            return
+        self.window = Toplevel(self.root) 
+        self.window.title("Employee Payroll Management System")
+        self.window.geometry("1000x500+120+80") 
+        self.window.config(bg="white")
+        Title = Label(self.window, text="All Employee Details", font=("times new roman", 30, "bold"), bg="#262626", fg="white",anchor="w",padx=10)
+        Title.pack(side=TOP,fill=X)
+        self.window.focus_force()
+
+        # Rows are fetched page by page as the user scrolls (see payroll/record_view.py);
+        # the journal merges the saves it has not compacted yet into each page
+        self.dataframe=VirtualRecordView(self.window,RecordPager(self.journal))
+        self.dataframe.pack(fill=BOTH,expand=1)
+
+    def update(self):
+        if self.var_emp_code.get()=='' or self.var_slr_net.get()=='' or self.var_emp_name.get()=='':
+            messagebox.showerror('Error','Employee details are required',parent=self.root)
+            return
+        record=self.form_record()
+        period=f'{self.var_slr_month.get()}-{self.var_slr_year.get()}'
+
+        def work(task):
+            store=self.journal
+            return store.get(record['code']) if store.update(record) else None
+
+        def done(latest):
+            if latest==None:
+                messagebox.showerror('Error',f'No record for this Employee Code in {period}',parent=self.root)
+                return
+            self.index.update(latest)
+            self.index_changed()
+            messagebox.showinfo('Success','Record updated successfully',parent=self.root)
+            self.check_journal()
+
+        self.tasks.submit(work,on_done=done,on_error=self.task_failed)
+    
+    def delete(self):
+        if self.var_emp_code.get()=='':
+            messagebox.showerror('Error','Employee Code is required',parent=self.root)
+            return
+        op=messagebox.askyesno("Confirm",f"Do you really want to delete this record ({self.var_slr_month.get()}-{self.var_slr_year.get()})?",parent=self.root)
+        if op!=True:
+            return
+        code,month,year=self.var_emp_code.get(),self.var_slr_month.get(),self.var_slr_year.get()
+
+        def work(task):
+            store=self.journal
+            store.delete(code,month,year)
+            return store.get(code)  # other salary months of the same employee
+
+        def done(latest):
+            if latest==None:
+                self.index.remove(code)
+            else:
+                self.index.update(latest)
+            self.index_changed()
+            messagebox.showinfo('Delete','Employee record deleted successfully',parent=self.root)
+            self.clear()
+            self.check_journal()
+
+        self.tasks.submit(work,on_done=done,on_error=self.task_failed)
+
+    def save(self):
+        if self.var_emp_code.get()=='' or self.var_slr_net.get()=='' or self.var_emp_name.get()=='':
+            messagebox.showerror('Error','Employee details are required (press Calculate before saving)',parent=self.root)
+            return
+        record=self.form_record()
+        period=f'{self.var_slr_month.get()}-{self.var_slr_year.get()}'
+
+        def work(task):
+            store=self.journal
+            store.insert(record)
+            return store.get(record['code'])
+
+        def done(latest):
+            self.index.update(latest)
+            self.index_changed()
+            messagebox.showinfo('Success','Record added successfully',parent=self.root)
+            self.btn_print.config(state=NORMAL)
+            self.check_journal()
+
+        def failed(ex):
+            if isinstance(ex,ValueError):
+                messagebox.showerror('Error','Employee Code must be a number',parent=self.root)
+            elif isinstance(ex,sqlite3.IntegrityError):
+                messagebox.showerror('Error',f'This Employee Code already has a record for {period}, use Update instead',parent=self.root)
+            else:
+                self.task_failed(ex)
+
+        self.tasks.submit(work,on_done=done,on_error=failed)
+
+    def export_receipts(self):
+        """Write every saved receipt of the month/year in the form to Salary_Receipt/<year>-<month>/."""
+        month,year=self.var_slr_month.get().strip(),self.var_slr_year.get().strip()
+        if month=='' or year=='':
+            messagebox.showerror('Error','Month and Year are required',parent=self.root)
+            return
+        directory=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),'Salary_Receipt',f'{year}-{month}')
+
+        def work(task, chunk_size=500):
+            records=self.journal.period(month,year)
+            os.makedirs(directory,exist_ok=True)
+            written=0
+            for start in range(0,len(records),chunk_size):
+                task.check()
+                chunk=records[start:start+chunk_size]
+                written+=write_files([(os.path.join(directory,f'{record.code}.txt'),record.reciept.encode('utf-8'))
+                                      for record in chunk if record.reciept])
+                task.progress(start+len(chunk),len(records),f'Receipts {start+len(chunk):,} / {len(records):,}')
+            return written
+
+        def done(written):
+            if written==0:
+                messagebox.showinfo('Receipts',f'No saved receipts for {month}-{year}',parent=self.root)
+            else:
+                messagebox.showinfo('Receipts',f'{written:,} receipts written to {directory}',parent=self.root)
+
+        def cancelled():
+            messagebox.showinfo('Receipts','Export cancelled',parent=self.root)
+
+        self.show_progress(None,0,1,f'Receipts {month}-{year}...')
+        self.tasks.submit(work,on_done=done,on_error=self.task_failed,on_cancel=cancelled,bulk=True)
+
+    def calculate_gross_up(self):
+        """
+        GUI wrapper for gross-up salary calculation.
+        Uses the exact (paise) mode of the standalone gross-up calculation.
+        """
+        # Validate required fields
+        required=[component for component in self.components.components if component.required or component.type=='rate']
+        if any(self.salary_inputs[component.key].get()=='' for component in required):
+            messagebox.showerror('Error',f"{' and '.join(component.label for component in required)} are required fields")
+            return
+        
+        try:
+            # Prepare input data dictionary for the calculation function
+            components=self.components
+            input_data={key:float(self.salary_inputs[key].get() or default) for key,default in components.input_defaults.items()}
+            
+            # Exact paise calculation, so the form, receipt and saved record agree to the paisa
+            result=components.paise_result_to_rupees(components.calculate_paise(components.paise_inputs(input_data)))
+            
+            # Update GUI fields with calculated values
+            for key,var in self.salary_outputs.items():
+                var.set(str(round(result[key], 2)))
+            
+            # Update the salary receipt
+            new_sample=components.render_receipt(result,self.var_emp_code.get(),self.var_slr_month.get(),self.var_slr_year.get())
+            self.txt_salary_recipt.delete('1.0',END)
+            self.txt_salary_recipt.insert(END,new_sample)
+            
+        except ValueError as e:
+            messagebox.showerror('Error', f'Invalid input: Please enter valid numbers\n{str(e)}')
+        except Exception as e:
+            messagebox.showerror('Error', f'Calculation error: {str(e)}')
+    
+    def schedule_recalculate(self, *args):
+        """Variable trace: (re)start the debounce timer."""
+        if self.filling:
+            return
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+        self.live_job=self.root.after(LIVE_DEBOUNCE_MS,self.recalculate)
+
+    def recalculate(self):
+        """Live update of Gross/PF/Net and the receipt - no popups while typing."""
+        self.live_job=None
+        texts={name:var.get() for name,var in self.salary_inputs.items()}
+        update=self.live.recalculate(texts,self.var_emp_code.get(),self.var_slr_month.get(),self.var_slr_year.get())
+        if update is None:
+            return  # parsed inputs unchanged
+        for key,var in self.salary_outputs.items():
+            value='' if update.result is None else str(round(update.result[key],2))
+            if var.get()!=value:
+                var.set(value)
+        if update.lines is None:
+            return  # keep the last receipt until the inputs are valid again
+
+        # Rewrite only the receipt lines that differ
+        current=self.txt_salary_recipt.get('1.0','end-1c').split('\n')
+        changes=changed_lines(current,update.lines)
+        if changes is None:
+            self.txt_salary_recipt.delete('1.0',END)
+            self.txt_salary_recipt.insert(END,'\n'.join(update.lines))
+        else:
+            for number,text in changes:
+                self.txt_salary_recipt.delete(f'{number}.0',f'{number}.end')
+                self.txt_salary_recipt.insert(f'{number}.0',text)
+
+    def check_connection(self):
+        # Open (or create) the local SQLite database
+        try:
+            self.store=SalaryStore()
+            # Save/Update/Delete go through a group-committed journal (payroll/journal.py),
+            # replayed into the database here if the last session crashed
+            self.journal=JournaledSalaryStore(self.store.path)
+            self.journal_error=None  # last compaction error shown by check_journal()
+            self.index=open_index(self.store)
+            self.index_dirty=False
+            self.root.protocol("WM_DELETE_WINDOW",self.on_close)
+        except Exception as ex:
+            messagebox.showerror("Error",f'Error due to: {str(ex)}',parent=self.root)
+
+    def show(self):
+        try:
+            self.dataframe.refresh()
+        except Exception as ex:
+            messagebox.showerror("Error",f'Error due to: {str(ex)}',parent=self.window)
+    
+    def print_reciept(self):
+        text=self.txt_salary_recipt.get('1.0',END)
+
+        def work(task):
+            # Handing the file to the print spooler can take seconds
+            with stage('print'):
+                temp_file=tempfile.mktemp(".txt")
+                with open(temp_file,'w') as f:
+                    f.write(text)
+                os.startfile(temp_file,'print')
+
+        self.tasks.submit(work,on_error=self.task_failed)
+
+
+def main():
+    """Create the Tk root window and run the GUI."""
+    root = Tk()
+    obj = EmployeeSystem(root)
+    root.mainloop()
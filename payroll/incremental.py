@@ -0,0 +1,286 @@
+"""
+Incremental payroll runs - recompute only employees whose inputs changed.
+
+A state database keeps, per employee code, a digest of the calculation
+inputs from the last committed run together with that run's results and
+rendered receipt body (see GROSS_UP_BODY in payroll/receipts.py). The next
+run hashes every employee's inputs and:
+
+    - recomputes and re-renders employees that are new or whose digest changed
+    - carries forward the stored results and receipt body for everyone else
+      (only the receipt header - code, period, date - is rendered again)
+    - drops employees that are no longer in the run
+
+When the run is for the same period as the last committed run, unchanged
+employees' receipts are already in the archive and are not written again.
+
+The state is updated in one transaction at the end of the run, after the
+receipts are written, so an interrupted run leaves the last committed state
+in place and the next run simply recomputes the same employees.
+
+Runs use the six standard components unless given another ComponentSet
+(payroll/components.py); its fingerprint is part of the digests, so
+changing the definition recomputes every employee.
+
+Usage:
+    with PayrollState('payroll_state.db') as state:
+        report = run_incremental(columns, state, 'Feb', 2025, archive=archive)
+        print(format_report(report))
+"""
+
+import time
+import struct
+import sqlite3
+import hashlib
+from array import array
+from datetime import datetime
+
+from payroll import core
+from payroll.components import STANDARD
+from payroll.core import SALARY_RESULT_KEYS
+from payroll.migrate import MONTHS, to_month
+from payroll.receipts import GROSS_UP_HEADER_TEMPLATE
+
+# Part of every digest - bump when the formula changes so everything is recomputed
+DIGEST_VERSION = b'gross-up/1'
+
+INPUT_RECORD = struct.Struct('<6d')
+RESULT_RECORD = struct.Struct(f'<{len(SALARY_RESULT_KEYS)}d')
+
+STATE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS payroll_state (
+    code INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL,
+    result BLOB,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS payroll_run (
+    id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    committed_at TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    recomputed INTEGER NOT NULL,
+    reused INTEGER NOT NULL,
+    removed INTEGER NOT NULL
+);
+'''
+
+SQL_DIGESTS = 'SELECT code, digest FROM payroll_state'
+SQL_STATE = 'SELECT code, result, body FROM payroll_state'
+SQL_STATE_RESULTS = 'SELECT code, result FROM payroll_state'
+SQL_UPSERT_STATE = 'INSERT OR REPLACE INTO payroll_state (code, digest, result, body) VALUES (?, ?, ?, ?)'
+SQL_DELETE_STATE = 'DELETE FROM payroll_state WHERE code=?'
+SQL_INSERT_RUN = ('INSERT INTO payroll_run (year, month, committed_at, rows, recomputed, reused, removed) '
+                  'VALUES (?, ?, ?, ?, ?, ?, ?)')
+SQL_LAST_RUN = 'SELECT year, month, committed_at, rows, recomputed, reused, removed FROM payroll_run ORDER BY id DESC LIMIT 1'
+
+
+def input_digest(values, version=DIGEST_VERSION, record=INPUT_RECORD):
+    """Digest of one employee's calculation inputs (floats, input_defaults order)."""
+    return hashlib.blake2b(version + record.pack(*values), digest_size=16).digest()
+
+
+def _state_format(components):
+    """(digest version, input record, result record) of a component set; STANDARD keeps DIGEST_VERSION."""
+    if components.fingerprint == STANDARD.fingerprint:
+        return DIGEST_VERSION, INPUT_RECORD, RESULT_RECORD
+    return (DIGEST_VERSION + b'/' + components.fingerprint.encode('ascii'),
+            struct.Struct(f'<{len(components.input_defaults)}d'), struct.Struct(f'<{len(components.result_keys)}d'))
+
+
+class PayrollState:
+    """Per-employee input digests, results and receipt bodies of the last committed run."""
+
+    def __init__(self, path):
+        self.path = path
+        self.con = sqlite3.connect(path)
+        self.con.execute('PRAGMA journal_mode=WAL')
+        self.con.execute('PRAGMA synchronous=NORMAL')
+        self.con.executescript(STATE_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.con.close()
+
+    def digests(self):
+        """code -> input digest"""
+        return dict(self.con.execute(SQL_DIGESTS))
+
+    def carried_forward(self, codes, bodies=True, record=RESULT_RECORD):
+        """
+        code -> (result tuple, or None for an invalid row; receipt body or None)
+        for the given codes. With bodies=False the receipt bodies are not read.
+        record is the struct the results were packed with.
+        """
+        wanted = set(codes)
+        rows = [row for row in self.con.execute(SQL_STATE if bodies else SQL_STATE_RESULTS) if row[0] in wanted]
+        results = record.iter_unpack(b''.join(row[1] for row in rows if row[1] is not None))
+        return {row[0]: (None if row[1] is None else next(results), row[2] if bodies else None) for row in rows}
+
+    def last_run(self):
+        """The last committed run as a dict, or None."""
+        row = self.con.execute(SQL_LAST_RUN).fetchone()
+        if row is None:
+            return None
+        year, month, committed_at, rows, recomputed, reused, removed = row
+        return {'year': year, 'month': MONTHS[month - 1], 'committed_at': committed_at, 'rows': rows,
+                'recomputed': recomputed, 'reused': reused, 'removed': removed}
+
+    def commit(self, updates, removed, year, month, report):
+        """Write the run's changes and its report row in one transaction."""
+        with self.con:
+            self.con.executemany(SQL_UPSERT_STATE, updates)
+            self.con.executemany(SQL_DELETE_STATE, ((code,) for code in removed))
+            self.con.execute(SQL_INSERT_RUN, (int(year), to_month(month), datetime.now().isoformat(timespec='seconds'),
+                                              report['rows'], report['recomputed'], report['reused'],
+                                              report['removed']))
+
+
+def run_incremental(columns, state, month, year, archive=None, generated_on=None, components=STANDARD):
+    """
+    Gross-up run that only recomputes employees whose inputs changed.
+
+    Args:
+        columns (dict): 'code' column (unique employee codes) plus the input
+            columns of components.calculate_batch(); missing inputs use the
+            usual defaults
+        state (PayrollState): Digests and results of the last committed run
+        month, year: Salary period of this run
+        archive (ReceiptArchive): Optional - receipts are written here
+        generated_on (str): Date shown on new receipts (default: today)
+        components (ComponentSet): Salary components (default: the six of
+            calculate_gross_up_batch())
+
+    Returns:
+        dict: Run report - 'rows', 'recomputed' ('added' + 'changed'),
+            'reused', 'removed', 'invalid', 'receipts_written', 'seconds',
+            'rows_per_second', and 'result' (columnar, like run_parallel():
+            'code', the result keys, 'Invalid Mask', 'Invalid Rows')
+    """
+    start = time.perf_counter()
+    if 'code' not in columns:
+        raise ValueError("code column is required")
+    codes = [int(code) for code in (columns['code'].tolist() if hasattr(columns['code'], 'tolist') else columns['code'])]
+    row_count = len(codes)
+    if len(set(codes)) != row_count:
+        raise ValueError("Employee codes must be unique within a run")
+
+    version, input_record, result_record = _state_format(components)
+    result_keys = components.result_keys
+    inputs = []
+    for name, default in components.input_defaults.items():
+        values = columns.get(name)
+        if values is None:
+            inputs.append([float(default)] * row_count)
+        else:
+            if len(values) != row_count:
+                raise ValueError(f"Column '{name}' has {len(values)} rows, expected {row_count}")
+            inputs.append([float(v) for v in (values.tolist() if hasattr(values, 'tolist') else values)])
+    digests = [input_digest(values, version, input_record) for values in zip(*inputs)]
+
+    # ----------------------------------------------------- what changed
+    previous = state.digests()
+    recompute = [i for i, (code, digest) in enumerate(zip(codes, digests)) if previous.get(code) != digest]
+    added = sum(1 for i in recompute if codes[i] not in previous)
+    current = set(codes)
+    removed = [code for code in previous if code not in current]
+    recompute_set = set(recompute)
+    reuse = [i for i in range(row_count) if i not in recompute_set]
+
+    row_values = [None] * row_count  # a value per result key
+    bodies = [None] * row_count
+    invalid = [False] * row_count
+    nan_results = (float('nan'),) * len(components.calculated_keys)
+
+    # ------------------------------------------------------- recompute
+    fresh = components.calculate_batch({name: [column[i] for i in recompute]
+                                        for name, column in zip(components.input_defaults, inputs)})
+    fresh_columns = [fresh[key].tolist() if hasattr(fresh[key], 'tolist') else list(fresh[key])
+                     for key in result_keys]
+    fresh_invalid = set(fresh['Invalid Rows'])
+    fresh_bodies = components.receipt_body_template.render_rows(dict(zip(result_keys, fresh_columns)),
+                                                                len(recompute))
+    for j, (i, values, body) in enumerate(zip(recompute, zip(*fresh_columns), fresh_bodies)):
+        row_values[i] = values
+        if j in fresh_invalid:
+            invalid[i] = True
+        else:
+            bodies[i] = body
+
+    # --------------------------------------------------- carry forward
+    # Bodies are only needed when carried-forward receipts are written
+    last = state.last_run()
+    same_period = last is not None and (last['year'], to_month(last['month'])) == (int(year), to_month(month))
+    stored = state.carried_forward((codes[i] for i in reuse), bodies=archive is not None and not same_period,
+                                   record=result_record)
+    for i in reuse:
+        result, body = stored[codes[i]]
+        if result is None:
+            invalid[i] = True
+            row_values[i] = tuple(column[i] for column in inputs) + nan_results
+        else:
+            row_values[i] = result
+            bodies[i] = body
+
+    # -------------------------------------------------------- receipts
+    receipts_written = 0
+    if archive is not None:
+        write = [i for i in range(row_count) if not invalid[i] and (i in recompute_set or not same_period)]
+        headers = GROSS_UP_HEADER_TEMPLATE.render_rows(
+            {'code': [codes[i] for i in write], 'month': str(month), 'year': str(year),
+             'generated_on': generated_on or time.strftime("%d-%m-%Y")}, len(write))
+        receipts_written = archive.append_many(year, month, ((codes[i], header + bodies[i])
+                                                             for i, header in zip(write, headers)))
+
+    # ---------------------------------------------------------- commit
+    report = {
+        'rows': row_count,
+        'recomputed': len(recompute),
+        'added': added,
+        'changed': len(recompute) - added,
+        'reused': len(reuse),
+        'removed': len(removed),
+        'invalid': sum(invalid),
+        'receipts_written': receipts_written,
+    }
+    updates = ((codes[i], digests[i],
+                None if invalid[i] else result_record.pack(*row_values[i]), bodies[i])
+               for i in recompute)
+    state.commit(updates, removed, year, month, report)
+
+    np = core.np
+    result = {'code': codes}
+    if np is not None:
+        table = np.array(row_values, dtype=np.float64).reshape(row_count, len(result_keys))
+        for k, key in enumerate(result_keys):
+            result[key] = np.ascontiguousarray(table[:, k])
+    else:
+        for key, column in zip(result_keys, zip(*row_values) if row_count else [()] * len(result_keys)):
+            result[key] = array('d', column)
+    result['Invalid Mask'] = np.array(invalid, dtype=bool) if np is not None else invalid
+    result['Invalid Rows'] = [i for i, bad in enumerate(invalid) if bad]
+
+    seconds = time.perf_counter() - start
+    report.update({
+        'seconds': seconds,
+        'rows_per_second': row_count / seconds if seconds > 0 else 0.0,
+        'result': result,
+    })
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of run_incremental()."""
+    return (f"{report['rows']:,} employees in {report['seconds']:.2f}s "
+            f"({report['rows_per_second']:,.0f} rows/s)\n"
+            f"  reused      {report['reused']:>10,}\n"
+            f"  recomputed  {report['recomputed']:>10,}  ({report['added']:,} added, {report['changed']:,} changed)\n"
+            f"  removed     {report['removed']:>10,}\n"
+            f"  invalid     {report['invalid']:>10,}\n"
+            f"  receipts    {report['receipts_written']:>10,} written")
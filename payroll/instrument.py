@@ -0,0 +1,313 @@
+"""
+Per-stage timing for payroll runs.
+
+Counts calls, items and time spent in each stage of a run - parsing the
+input sheet, the gross-up math, receipt rendering, file writes, database
+writes and reads, printing - with a log2 histogram of call durations:
+
+    with Capture() as run:
+        run_payroll_file('salaries.csv', 'out.csv')
+    print(format_summary(run.report))
+    json.dump(run.report, f)
+
+The stages are marked where they are defined: probe() wraps a function
+(or method) and times it while instrumentation is enabled -
+
+    @probe('receipt_write', items=lambda summary, args: summary['written'])
+    def write_receipts(...):
+
+enable() and disable() only switch a flag, so every reference to a probed
+function is timed - names imported before enable(), bound methods, the
+evaluators a ComponentSet compiles. Switched off (the default) a probe costs
+one flag test per call (about 0.1 us, against 1.5 us for one scalar
+gross-up). Calls inside run_parallel() worker processes are not seen (the
+'parallel' stage covers them).
+
+Times are inclusive: a stage that calls another (write_receipts() ->
+write_files()) includes the inner stage's time. Generator stages (parsing)
+are timed per next(), i.e. per chunk produced.
+
+Rare call sites that are not functions of their own use stage():
+
+    with stage('print'):
+        os.startfile(path, 'print')
+
+Capture can also run cProfile and tracemalloc for the run; their top
+entries are added to the report.
+
+Usage from the command line:
+    python -m payroll.pipeline salaries.csv out.csv --instrument --profile --json stats.json
+"""
+
+import io
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+# Histogram bucket b counts calls that took < 2**b microseconds (and >= 2**(b-1))
+HISTOGRAM_BUCKETS = 32
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {}
+
+# Code flag of generator functions (inspect.CO_GENERATOR; inspect is slow to import)
+_CO_GENERATOR = 0x20
+
+
+class StageStats:
+    """Counters and duration histogram of one stage."""
+
+    __slots__ = ('calls', 'items', 'seconds', 'min', 'max', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.seconds = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds, items):
+        self.calls += 1
+        self.items += items
+        self.seconds += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (seconds) of the histogram bucket holding the given fraction of calls."""
+        wanted = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= wanted:
+                return min((2 ** bucket) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'items': self.items,
+            'seconds': self.seconds,
+            'mean_seconds': self.seconds / self.calls if self.calls else 0.0,
+            'min_seconds': self.min if self.calls else 0.0,
+            'max_seconds': self.max,
+            'p50_seconds': self.percentile(0.5),
+            'p99_seconds': self.percentile(0.99),
+            'items_per_second': self.items / self.seconds if self.seconds > 0 else 0.0,
+            'histogram_us': {f'<{2 ** bucket}': count for bucket, count in enumerate(self.histogram) if count},
+        }
+
+
+def record(name, seconds, items=1):
+    """Add one call of `seconds` to a stage."""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = StageStats()
+        stats.add(seconds, items)
+
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+@contextmanager
+def _untimed(name):
+    yield
+
+
+def stage(name):
+    """Context manager timing a block as one call of a stage (a no-op when disabled)."""
+    return _timed(name) if _enabled else _untimed(name)
+
+
+# ---------------------------------------------------------------- probes
+def batch_rows(result, args):
+    """items of a batch calculation: its row count."""
+    return len(result['Invalid Mask'])
+
+
+def returned_count(count, args):
+    """items of a function returning how many it wrote or applied."""
+    return count
+
+
+def returned_length(records, args):
+    """items of a function returning a list."""
+    return len(records)
+
+
+def probe(name, items=None):
+    """
+    Decorator timing each call as one call of stage `name` while enabled.
+
+    Args:
+        name (str): Stage name in the report
+        items (callable): items(result, args) counted per call (None counts 1);
+            generator functions are timed per next() and get each value
+    """
+    def decorate(function):
+        if function.__code__.co_flags & _CO_GENERATOR:
+            @functools.wraps(function)
+            def probed_generator(*args, **kwargs):
+                iterator = function(*args, **kwargs)
+                if not _enabled:
+                    yield from iterator
+                    return
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        value = next(iterator)
+                    except StopIteration:
+                        return
+                    record(name, time.perf_counter() - start, items(value, args) if items else 1)
+                    yield value
+            return probed_generator
+
+        @functools.wraps(function)
+        def probed(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            record(name, time.perf_counter() - start, items(result, args) if items else 1)
+            return result
+        return probed
+    return decorate
+
+
+def enable():
+    """Start timing the probed functions."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop timing; the collected stats are kept until reset()."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Drop all collected stats."""
+    with _lock:
+        _stats.clear()
+
+
+def stats():
+    """stage name -> stats dict (see StageStats.as_dict())"""
+    with _lock:
+        return {name: stage_stats.as_dict() for name, stage_stats in sorted(_stats.items())}
+
+
+# -------------------------------------------------------------- capture
+class Capture:
+    """
+    Collect stage stats (and optionally a cProfile / tracemalloc capture)
+    for the duration of a with-block. The result is in .report afterwards.
+
+    Args:
+        profile (bool): Run cProfile; the report gets the top functions by
+            cumulative time
+        memory (bool): Run tracemalloc; the report gets the peak and the top
+            allocation sites
+        top (int): Entries kept from the profile and memory captures
+    """
+
+    def __init__(self, profile=False, memory=False, top=20):
+        self.profile = profile
+        self.memory = memory
+        self.top = top
+        self.report = None
+        self._profiler = None
+        self._was_enabled = False
+
+    def __enter__(self):
+        self._was_enabled = _enabled
+        reset()
+        enable()
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.report = {'seconds': seconds, 'stages': stats()}
+        if self._profiler is not None:
+            self.report['profile'] = _profile_entries(self._profiler, self.top)
+        if self.memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.report['memory'] = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top': [{'where': str(statistic.traceback[0]), 'bytes': statistic.size, 'blocks': statistic.count}
+                        for statistic in snapshot.statistics('lineno')[:self.top]],
+            }
+        if not self._was_enabled:
+            disable()
+
+
+def _profile_entries(profiler, top):
+    import pstats
+    statistics = pstats.Stats(profiler, stream=io.StringIO())
+    entries = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in statistics.stats.items():
+        entries.append({'function': f'{filename}:{line}({function})', 'calls': calls,
+                        'own_seconds': own, 'cumulative_seconds': cumulative})
+    entries.sort(key=lambda entry: entry['cumulative_seconds'], reverse=True)
+    return entries[:top]
+
+
+def _duration(seconds):
+    if seconds >= 1:
+        return f'{seconds:.2f}s'
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.1f}ms'
+    return f'{seconds * 1e6:.1f}us'
+
+
+def format_summary(report):
+    """Text table of a Capture report."""
+    lines = [f"Run took {report['seconds']:.3f}s",
+             f"{'Stage':<22}{'Calls':>10}{'Items':>12}{'Seconds':>10}{'Share':>8}{'Mean':>11}{'p99':>11}"]
+    for name, stage_stats in sorted(report['stages'].items(), key=lambda item: -item[1]['seconds']):
+        share = stage_stats['seconds'] / report['seconds'] if report['seconds'] > 0 else 0.0
+        lines.append(f"{name:<22}{stage_stats['calls']:>10,}{stage_stats['items']:>12,}"
+                     f"{stage_stats['seconds']:>10.3f}{share:>8.0%}"
+                     f"{_duration(stage_stats['mean_seconds']):>11}{_duration(stage_stats['p99_seconds']):>11}")
+    if 'memory' in report:
+        memory = report['memory']
+        lines.append(f"\nMemory peak {memory['peak_bytes'] / 2**20:.1f} MiB")
+        for entry in memory['top'][:10]:
+            lines.append(f"  {entry['bytes'] / 2**10:>10.1f} KiB  {entry['where']}")
+    if 'profile' in report:
+        lines.append("\nTop functions by cumulative time")
+        for entry in report['profile'][:10]:
+            lines.append(f"  {entry['cumulative_seconds']:>8.3f}s {entry['calls']:>9,}  {entry['function']}")
+    return '\n'.join(lines)
@@ -0,0 +1,574 @@
+"""
+Append-only journal with group commit in front of the emp_salary store.
+
+At month-end many clerks save at once, and committing every save to the
+database costs one fsync per employee. JournaledSalaryStore instead appends
+each insert/update/delete to a journal file and makes it durable together
+with every other save that arrived within max_delay seconds - one write and
+one fsync per group:
+
+    - a save is checked (duplicate month, missing row) and becomes visible to
+      reads at once, then waits until its group is on disk
+    - the commit thread closes a group once it holds as many saves as the
+      previous group (the clerks currently saving) or max_batch, and after
+      max_delay seconds at the latest; saves arriving during an fsync form
+      the next group
+    - a compaction thread applies the journal to the SQLite store (one
+      transaction) every compact_interval seconds or compact_entries
+      entries, then deletes the applied journal segments
+    - reads merge the entries not yet compacted over the store; count() and
+      page() (sorted, filtered pages for RecordPager) do it in SQLite, with
+      the entries copied to a TEMP table of the read connection
+
+Journal layout: a directory of segments (000001.log, 000002.log, ...), each
+a sequence of entries framed as payload length, CRC-32 and a JSON payload.
+Writers append to the newest segment; compaction seals it and starts the
+next. Opening the store replays every segment left by a crash into the
+database; a torn or corrupt entry ends a segment (it was never
+acknowledged). Replaying is idempotent, so a crash during compaction only
+means some entries are applied twice.
+
+Usage:
+    with JournaledSalaryStore('ems.db') as store:  # from any number of threads
+        store.insert(record)
+        store.update(record)
+        store.delete(1, 'Jan', '2025')
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import sqlite3
+import threading
+
+from payroll.core import EMP_SALARY_COLUMNS, EmpSalaryRecord
+from payroll.instrument import probe, returned_count, returned_length
+from payroll.storage import (DEFAULT_DB_PATH, SQL_DELETE_PERIOD, SQL_UPDATE, SQL_UPSERT, SalaryStore,
+                             _count_query, _page_query, period_key, to_record)
+
+DEFAULT_MAX_DELAY = 0.005
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_COMPACT_ENTRIES = 10000
+DEFAULT_COMPACT_INTERVAL = 1.0
+
+_QUOTED_COLUMNS = ', '.join(f'"{name}"' for name in EMP_SALARY_COLUMNS)
+
+# Entries not yet compacted, for count() and page(): a deleted row hides the
+# stored row without adding one. _row orders them after every stored row.
+OVERLAY_SCHEMA = f'''
+CREATE TEMP TABLE IF NOT EXISTS journal_overlay (
+    {_QUOTED_COLUMNS}, _row INTEGER, deleted INTEGER,
+    PRIMARY KEY ("code", "year", "month")
+)'''
+_BLANK_RECORD = EmpSalaryRecord(*[''] * len(EMP_SALARY_COLUMNS))
+SQL_OVERLAY_INSERT = (f'INSERT INTO temp.journal_overlay ({_QUOTED_COLUMNS}, _row, deleted) '
+                      f'VALUES ({", ".join("?" * (len(EMP_SALARY_COLUMNS) + 2))})')
+MERGED_SOURCE = (f'(SELECT rowid AS _row, {_QUOTED_COLUMNS} FROM main.emp_salary AS s WHERE NOT EXISTS ('
+                 f'SELECT 1 FROM temp.journal_overlay AS o '
+                 f'WHERE o."code"=s."code" AND o."year"=s."year" AND o."month"=s."month") '
+                 f'UNION ALL SELECT _row, {_QUOTED_COLUMNS} FROM temp.journal_overlay WHERE NOT deleted)')
+
+# payload length, CRC-32 of the payload
+ENTRY_HEADER = struct.Struct('<II')
+
+SEGMENT_SUFFIX = '.log'
+
+
+def journal_path(path):
+    """Journal directory kept next to the database: ems.db -> ems.journal"""
+    return os.path.splitext(path)[0] + '.journal'
+
+
+def encode_entry(operation):
+    """One framed journal entry for an operation list such as ['insert', [24 values]]."""
+    payload = json.dumps(operation, separators=(',', ':')).encode('utf-8')
+    return ENTRY_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_segment(path):
+    """
+    Operations of one segment, up to the first torn or corrupt entry.
+
+    Returns:
+        tuple: (operations, length of the valid prefix in bytes)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    operations = []
+    offset = 0
+    while offset + ENTRY_HEADER.size <= len(data):
+        length, crc = ENTRY_HEADER.unpack_from(data, offset)
+        payload = data[offset + ENTRY_HEADER.size:offset + ENTRY_HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        operations.append(json.loads(payload))
+        offset += ENTRY_HEADER.size + length
+    return operations, offset
+
+
+def apply_operations(con, operations):
+    """Apply journal operations to an emp_salary connection in one transaction (idempotent)."""
+    with con:
+        for operation in operations:
+            kind = operation[0]
+            if kind == 'insert':
+                con.execute(SQL_UPSERT, operation[1])
+            elif kind == 'update':
+                record = operation[1]
+                con.execute(SQL_UPDATE, record[1:] + [record[0], record[15], record[14]])
+            elif kind == 'delete':
+                con.executemany(SQL_DELETE_PERIOD, [(operation[1], year, month) for year, month in operation[2]])
+            else:
+                raise ValueError(f"Unknown journal operation: {kind!r}")
+
+
+def _fsync_directory(directory):
+    # Makes a new segment's directory entry durable (not possible on Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _Group:
+    """Entries committed together by one write + fsync."""
+
+    __slots__ = ('entries', 'operations', 'undo', 'last_seq', 'opened', 'done', 'error')
+
+    def __init__(self):
+        self.entries = []
+        self.operations = []
+        self.undo = []  # (key, overlay entry it replaced or None), in order
+        self.last_seq = 0
+        self.opened = 0.0
+        self.done = threading.Event()
+        self.error = None
+
+
+class JournaledSalaryStore:
+    """
+    emp_salary saves through a group-committed journal, safe to share between threads.
+
+    Reads and writes match SalaryStore's. A journal write that fails leaves
+    the store read-only: the saves not yet on disk raise the error and
+    disappear from reads, and later saves raise the same error.
+
+    A compaction that fails keeps its entries in the journal (and in reads)
+    and is retried; its error is kept in compact_error until a compaction
+    succeeds. close() raises it if the final compaction fails too - the
+    entries are then applied when the store is next opened.
+
+    Args:
+        path (str): SQLite database (see payroll/storage.py)
+        directory (str): Journal directory (default: journal_path(path))
+        max_delay (float): Longest time a group stays open for more saves
+        max_batch (int): Entries that close a group early
+        compact_entries (int): Journal entries that trigger a compaction
+        compact_interval (float): Seconds between compactions of a non-empty journal
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, directory=None, max_delay=DEFAULT_MAX_DELAY,
+                 max_batch=DEFAULT_MAX_BATCH, compact_entries=DEFAULT_COMPACT_ENTRIES,
+                 compact_interval=DEFAULT_COMPACT_INTERVAL):
+        self.path = path
+        self.directory = directory or journal_path(path)
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.compact_entries = compact_entries
+        self.compact_interval = compact_interval
+        self.groups = 0        # groups committed (= fsyncs)
+        self.entries = 0       # entries committed
+        self.compactions = 0
+        self.compact_error = None  # exception of the last compaction, None once one succeeds
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._reader = SalaryStore(path, check_same_thread=False)
+        self._reader.con.execute(OVERLAY_SCHEMA)
+        self._writer = SalaryStore(path, check_same_thread=False)
+        self._segment_number = 0
+        self.replayed = self._replay()
+
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._compact_lock = threading.Lock()
+        self._compact_wanted = threading.Event()
+        self._overlay = {}     # (code, year, month) -> [seq, record or None]
+        self._by_code = {}     # code -> keys in _overlay
+        self._overlay_changes = 0  # bumped on every overlay change
+        self._overlay_copied = 0   # _overlay_changes when journal_overlay was last filled
+        self._seq = 0
+        self._applied_seq = 0  # operations up to this seq are in the database
+        self._group = _Group()
+        self._closing = False
+        self._failed = None
+
+        self._file_lock = threading.Lock()  # the open segment, its operations and the sealed ones
+        self._segment = None
+        self._segment_size = 0  # bytes of committed entries in the open segment
+        self._segment_operations = []
+        self._segment_seq = 0  # seq of the last operation written to the open segment
+        self._sealed = []      # (segment path, operations, last seq) awaiting compaction
+        self._open_segment()
+
+        self._committer = threading.Thread(target=self._commit_loop, name='payroll-journal-commit', daemon=True)
+        self._compactor = threading.Thread(target=self._compact_loop, name='payroll-journal-compact', daemon=True)
+        self._committer.start()
+        self._compactor.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Commit the open group, compact the whole journal and close the store.
+
+        Raises the compaction error if the journal could not be applied; the
+        store is closed anyway and the journal replayed on the next open.
+        """
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            self._wake.notify_all()
+        self._committer.join()
+        self._compact_wanted.set()
+        self._compactor.join()
+        try:
+            self.compact()
+        except Exception as ex:
+            self.compact_error = ex
+        with self._file_lock:
+            os.close(self._segment)
+            if not self._sealed:
+                os.remove(self._segment_path(self._segment_number))
+        self._reader.close()
+        self._writer.close()
+        if self.compact_error is not None:
+            raise self.compact_error
+
+    # ---------------------------------------------------------- segments
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f'{number:06d}{SEGMENT_SUFFIX}')
+
+    def _segments(self):
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _replay(self):
+        """Apply the segments left by an earlier process, then delete them. Returns the entry count."""
+        operations = []
+        segments = self._segments()
+        for segment in segments:
+            operations += read_segment(segment)[0]
+        if segments:
+            apply_operations(self._writer.con, operations)
+            for segment in segments:
+                os.remove(segment)
+            self._segment_number = int(os.path.basename(segments[-1])[:-len(SEGMENT_SUFFIX)])
+        return len(operations)
+
+    def _open_segment(self):
+        self._segment_number += 1
+        self._segment = os.open(self._segment_path(self._segment_number),
+                                os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+        self._segment_size = 0
+        _fsync_directory(self.directory)
+
+    # ------------------------------------------------------------ writes
+    def _lookup(self, key):
+        entry = self._overlay.get(key)
+        if entry is not None:
+            return entry[1]
+        return self._reader.get(key[0], key[2], key[1])
+
+    def _enqueue(self, changes, operation):
+        """
+        Record an operation in the overlay and the open group. Called with _lock held.
+
+        Args:
+            changes (list): (key, record or None for a delete) per row
+            operation (list): The journal entry
+        """
+        self._seq += 1
+        seq = self._seq
+        group = self._group
+        for key, record in changes:
+            entry = self._overlay.get(key)
+            self._overlay[key] = [seq, record]
+            self._by_code.setdefault(key[0], set()).add(key)
+            group.undo.append((key, entry))
+        self._overlay_changes += 1
+        if not group.entries:
+            group.opened = time.monotonic()
+        group.entries.append(encode_entry(operation))
+        group.operations.append(operation)
+        group.last_seq = seq
+        self._wake.notify_all()
+        return group
+
+    def _check_writable(self):
+        if self._failed is not None:
+            raise self._failed
+        if self._closing:
+            raise RuntimeError("Journal is closed")
+
+    @staticmethod
+    def _wait(group):
+        group.done.wait()
+        if group.error is not None:
+            raise group.error
+
+    @probe('db_write')
+    def insert(self, record):
+        """Insert one record. Raises sqlite3.IntegrityError if (code, year, month) exists."""
+        record = to_record(record)
+        key = (record.code, record.year, record.month)
+        with self._lock:
+            self._check_writable()
+            if self._lookup(key) is not None:
+                raise sqlite3.IntegrityError(
+                    f"UNIQUE constraint failed: emp_salary has code {record.code} for {record.month}-{record.year}")
+            group = self._enqueue([(key, record)], ['insert', list(record)])
+        self._wait(group)
+
+    @probe('db_write')
+    def update(self, record):
+        """Update the row for the record's (code, year, month). Returns True if a row changed."""
+        record = to_record(record)
+        key = (record.code, record.year, record.month)
+        with self._lock:
+            self._check_writable()
+            if self._lookup(key) is None:
+                return False
+            group = self._enqueue([(key, record)], ['update', list(record)])
+        self._wait(group)
+        return True
+
+    @probe('db_write')
+    def delete(self, code, month=None, year=None):
+        """Delete one salary month of an employee, or every month when month/year are not given."""
+        code = int(code)
+        with self._lock:
+            self._check_writable()
+            if month is None and year is None:
+                keys = [key for key in self._by_code.get(code, ()) if self._overlay[key][1] is not None]
+                keys += [key for key in ((r.code, r.year, r.month) for r in self._reader.history(code))
+                         if key not in self._overlay]
+            else:
+                key = (code, str(year), str(month))
+                keys = [key] if self._lookup(key) is not None else []
+            if not keys:
+                return 0
+            group = self._enqueue([(key, None) for key in keys],
+                                  ['delete', code, [[key[1], key[2]] for key in keys]])
+        self._wait(group)
+        return len(keys)
+
+    # ------------------------------------------------------------- reads
+    @probe('db_read')
+    def get(self, code, month=None, year=None):
+        """Return the record for code (latest salary month if month/year not given), or None."""
+        code = int(code)
+        with self._lock:
+            if month is not None or year is not None:
+                return self._lookup((code, str(year), str(month)))
+            records = {(record.code, record.year, record.month): record for record in self._reader.history(code)}
+            for key in self._by_code.get(code, ()):
+                record = self._overlay[key][1]
+                if record is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = record
+            # Last saved first, so max() breaks ties the way SalaryStore.get() does
+            return max(reversed(list(records.values())), key=period_key, default=None)
+
+    def exists(self, code, month, year):
+        return self.get(code, month, year) is not None
+
+    @probe('db_read', returned_length)
+    def period(self, month, year):
+        """All records of one salary month, ordered by code."""
+        year, month = str(year), str(month)
+        with self._lock:
+            records = {record.code: record for record in self._reader.period(month, year)}
+            for key, entry in self._overlay.items():
+                if key[1] == year and key[2] == month:
+                    if entry[1] is None:
+                        records.pop(key[0], None)
+                    else:
+                        records[key[0]] = entry[1]
+        return [records[code] for code in sorted(records)]
+
+    def _source(self):
+        """Table (or merged subquery) count() and page() read. Called with _lock held."""
+        if not self._overlay:
+            return 'emp_salary', 'rowid'
+        if self._overlay_copied != self._overlay_changes:
+            rows = []
+            for (code, year, month), (seq, record) in self._overlay.items():
+                deleted = record is None
+                if deleted:
+                    record = _BLANK_RECORD._replace(code=code, year=year, month=month)
+                rows.append((*record, (1 << 62) + seq, deleted))
+            with self._reader.con:
+                self._reader.con.execute('DELETE FROM temp.journal_overlay')
+                self._reader.con.executemany(SQL_OVERLAY_INSERT, rows)
+            self._overlay_copied = self._overlay_changes
+        return MERGED_SOURCE, '_row'
+
+    def count(self, filter_column=None, filter_text=None):
+        """Number of records (matching the filter), see SalaryStore.count()."""
+        with self._lock:
+            source, _ = self._source()
+            if source == 'emp_salary':
+                return self._reader.count(filter_column, filter_text)
+            return self._reader.con.execute(*_count_query(source, filter_column, filter_text)).fetchone()[0]
+
+    def page(self, offset, limit, sort=None, descending=False, filter_column=None, filter_text=None):
+        """One page of the merged records, sorted and filtered in SQLite - see SalaryStore.page()."""
+        with self._lock:
+            sql, params = _page_query(*self._source(), offset, limit, sort, descending, filter_column, filter_text)
+            return [EmpSalaryRecord(*row) for row in self._reader.con.execute(sql, params)]
+
+    def pending(self):
+        """Number of saves not yet compacted into the database."""
+        with self._lock:
+            return len(self._overlay)
+
+    # ------------------------------------------------- background threads
+    def _commit_loop(self):
+        # A group waits for as many saves as the previous one held (the number
+        # of clerks saving at once), for at most max_delay - a lone save is
+        # committed at once.
+        expected = 1
+        while True:
+            with self._lock:
+                while not self._group.entries and not self._closing:
+                    self._wake.wait()
+                if not self._group.entries:
+                    return
+                deadline = self._group.opened + self.max_delay
+                while len(self._group.entries) < min(expected, self.max_batch) and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                group, self._group = self._group, _Group()
+            expected = len(group.entries)
+            self._commit(group)
+
+    def _commit(self, group):
+        try:
+            with self._file_lock:
+                data = b''.join(group.entries)
+                view = memoryview(data)
+                try:
+                    while view:
+                        view = view[os.write(self._segment, view):]
+                    os.fsync(self._segment)
+                except OSError:
+                    try:
+                        # Do not leave part of the group for a replay to apply
+                        os.ftruncate(self._segment, self._segment_size)
+                    except OSError:
+                        pass
+                    raise
+                self._segment_size += len(data)
+                self._segment_operations += group.operations
+                self._segment_seq = group.last_seq
+                unapplied = len(self._segment_operations) + sum(len(ops) for _, ops, _ in self._sealed)
+        except OSError as ex:
+            with self._lock:
+                self._failed = ex
+                # Neither this group nor the saves queued behind it will be
+                # committed: take them out of reads, newest first
+                pending, self._group = self._group, _Group()
+                for failed in (pending, group):
+                    self._roll_back(failed)
+                    failed.error = ex
+            pending.done.set()
+        else:
+            self.groups += 1
+            self.entries += len(group.entries)
+            if unapplied >= self.compact_entries:
+                self._compact_wanted.set()
+        group.done.set()
+
+    def _roll_back(self, group):
+        """Undo a group's overlay changes. Called with _lock held."""
+        self._overlay_changes += 1
+        for key, previous in reversed(group.undo):
+            if previous is None or previous[0] <= self._applied_seq:
+                # Nothing before it, or what was before is now in the database
+                del self._overlay[key]
+                keys = self._by_code[key[0]]
+                keys.discard(key)
+                if not keys:
+                    del self._by_code[key[0]]
+            else:
+                self._overlay[key] = previous
+
+    def _compact_loop(self):
+        while not self._closing:
+            self._compact_wanted.wait(self.compact_interval)
+            self._compact_wanted.clear()
+            if self._closing:
+                return
+            try:
+                self.compact()
+            except Exception as ex:
+                # The entries stay in the journal and in reads; the next compaction retries
+                self.compact_error = ex
+
+    @probe('db_compact', returned_count)
+    def compact(self):
+        """
+        Apply the committed journal entries to the database and delete their segments.
+
+        Returns:
+            int: Entries applied
+        """
+        with self._compact_lock:
+            with self._file_lock:
+                if self._segment_operations:
+                    os.close(self._segment)
+                    self._sealed.append((self._segment_path(self._segment_number), self._segment_operations,
+                                         self._segment_seq))
+                    self._segment_operations = []
+                    self._open_segment()
+                sealed = list(self._sealed)
+            if not sealed:
+                return 0
+            operations = [operation for _, segment_operations, _ in sealed for operation in segment_operations]
+            apply_operations(self._writer.con, operations)
+            with self._file_lock:
+                del self._sealed[:len(sealed)]
+            for path, _, _ in sealed:
+                os.remove(path)
+            self._forget(sealed[-1][2])
+            self.compactions += 1
+            self.compact_error = None
+            return len(operations)
+
+    def _forget(self, applied_seq):
+        """Drop overlay entries whose latest operation is now in the database."""
+        with self._lock:
+            self._applied_seq = applied_seq
+            self._overlay_changes += 1
+            for key in [key for key, entry in self._overlay.items() if entry[0] <= applied_seq]:
+                del self._overlay[key]
+                keys = self._by_code[key[0]]
+                keys.discard(key)
+                if not keys:
+                    del self._by_code[key[0]]
@@ -0,0 +1,122 @@
+"""
+Live recalculation for the salary form.
+
+The GUI traces the salary inputs of its component set (see
+payroll/components.py) and, after a short pause in typing
+(LIVE_DEBOUNCE_MS), asks LiveCalculation for an update:
+
+    - the field texts are parsed into exact paise inputs; if they equal the
+      last parsed inputs nothing is recalculated (e.g. '50000' -> '50000.0')
+    - the GUI also traces the employee code, month and year: when only those
+      change, the last result is rendered again with the new receipt header
+    - otherwise the result and the receipt lines are produced, and
+      changed_lines() tells the GUI which lines of the receipt Text widget
+      actually differ, so only those are rewritten
+
+Nothing here imports tkinter.
+
+Usage:
+    live = LiveCalculation(load_components())
+    update = live.recalculate(texts, code, month, year)
+    if update is not None and update.result is not None:
+        for number, text in changed_lines(current_lines, update.lines) or []:
+            ...
+"""
+
+from collections import namedtuple
+from decimal import InvalidOperation
+
+from payroll.components import STANDARD
+from payroll.core import percent_to_basis_points, rupees_to_paise
+
+# Pause in typing before recalculating
+LIVE_DEBOUNCE_MS = 150
+
+# result: rupee dict of the component set's result keys, or None when the
+# inputs are incomplete/invalid; lines: receipt lines (None with no result)
+LiveUpdate = namedtuple('LiveUpdate', ['result', 'lines'])
+
+
+def parse_salary_inputs(texts, components=STANDARD):
+    """
+    Field texts -> paise inputs tuple (components.input_defaults order), or None.
+
+    Empty fields use the defaults (PF 12%); an empty required field (Basic
+    Pay) or text that is not a number gives None.
+    """
+    values = []
+    try:
+        for name, default in components.input_defaults.items():
+            text = str(texts.get(name, '')).strip()
+            if text == '':
+                if name in components.required_keys:
+                    return None
+                text = default
+            values.append(percent_to_basis_points(text) if name in components.rate_keys else rupees_to_paise(text))
+    except (InvalidOperation, ValueError):
+        return None
+    return tuple(values)
+
+
+def changed_lines(old_lines, new_lines):
+    """
+    [(line number from 1, new text)] of lines that differ, or None when the
+    line counts differ and the whole text has to be replaced.
+    """
+    if len(old_lines) != len(new_lines):
+        return None
+    return [(number, new) for number, (old, new) in enumerate(zip(old_lines, new_lines), 1) if old != new]
+
+
+class LiveCalculation:
+    """Remembers the last parsed inputs and receipt header so unchanged edits cost nothing."""
+
+    def __init__(self, components=STANDARD):
+        self.components = components
+        self.reset()
+
+    def reset(self):
+        self.inputs = None
+        self.header = None
+        self.result = None
+
+    def hold(self, texts, code, month, year):
+        """
+        Take the current fields as already shown (a loaded record): nothing
+        is calculated or rendered until an input changes.
+        """
+        self.inputs = parse_salary_inputs(texts, self.components)
+        self.header = (str(code).strip(), str(month).strip(), str(year).strip())
+        self.result = None
+
+    def recalculate(self, texts, code, month, year, generated_on=None):
+        """
+        LiveUpdate for the current field texts and receipt header, or None
+        when neither changed since the last call (a header change without a
+        valid result has nothing to render and also gives None).
+        """
+        inputs = parse_salary_inputs(texts, self.components)
+        header = (str(code).strip(), str(month).strip(), str(year).strip())
+        if inputs == self.inputs:
+            if header == self.header or self.result is None:
+                self.header = header
+                return None
+            self.header = header
+            return LiveUpdate(self.result, self.render(code, month, year, generated_on))
+        self.inputs = inputs
+        self.header = header
+        self.result = None
+        if inputs is None:
+            return LiveUpdate(None, None)
+        try:
+            components = self.components
+            self.result = components.paise_result_to_rupees(
+                components.calculate_paise(dict(zip(components.input_defaults, inputs))))
+        except ValueError:
+            # Still being typed (e.g. Basic Pay '0' on the way to '0.5')
+            return LiveUpdate(None, None)
+        return LiveUpdate(self.result, self.render(code, month, year, generated_on))
+
+    def render(self, code, month, year, generated_on=None):
+        """Receipt lines of the last result."""
+        return self.components.render_receipt(self.result, code, month, year, generated_on=generated_on).split('\n')
@@ -0,0 +1,465 @@
+"""
+Typed emp_salary schema and migration from the text-typed legacy table.
+
+Every column of the original emp_salary table (emp_salary.sql) is `text`.
+The typed schema stores:
+    - money as INTEGER paise          (salary, medical, pf, conv, net)
+    - day counts as INTEGER           (tdays, abs)
+    - age, year and month as INTEGER  (month 1-12)
+    - dob/doj as DATE                 (ISO text 'YYYY-MM-DD')
+    - the receipt in its own table    (salary_receipt), out of the hot row
+
+The legacy column names are still readable through the emp_salary_legacy
+view, which returns the same 24 text columns as the old table (money as
+'12345.67', month as 'Jan', ...).
+
+Usage:
+    python -m payroll.migrate old_dump.sql ems_typed.db
+    python -m payroll.migrate ems.db ems_typed.db --batch-size 20000
+
+The source can be a SQLite database with the legacy emp_salary table (see
+payroll/storage.py) or a phpMyAdmin/mysqldump .sql file with INSERT
+statements. Rows are converted in streaming batches and progress is
+reported in rows per second. Values that cannot be converted are stored as
+NULL and counted per column in the summary.
+"""
+
+import re
+import math
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import date, datetime
+from functools import lru_cache
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from payroll.core import EMP_SALARY_COLUMNS
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Legacy text columns converted to paise
+MONEY_COLUMNS = ('salary', 'medical', 'pf', 'conv', 'net')
+
+# Typed columns of employee_salary, in order
+TYPED_COLUMNS = ('code', 'designation', 'name', 'age', 'gender', 'email', 'hl', 'dob', 'doj', 'exp',
+                 'pid', 'contact', 'status', 'add', 'month', 'year', 'salary_paise', 'tdays', 'abs',
+                 'medical_paise', 'pf_paise', 'conv_paise', 'net_paise')
+
+TYPED_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS employee_salary (
+    "code" INTEGER NOT NULL,
+    "designation" TEXT NOT NULL DEFAULT '',
+    "name" TEXT NOT NULL DEFAULT '',
+    "age" INTEGER,
+    "gender" TEXT NOT NULL DEFAULT '',
+    "email" TEXT NOT NULL DEFAULT '',
+    "hl" TEXT NOT NULL DEFAULT '',
+    "dob" DATE,
+    "doj" DATE,
+    "exp" TEXT NOT NULL DEFAULT '',
+    "pid" TEXT NOT NULL DEFAULT '',
+    "contact" TEXT NOT NULL DEFAULT '',
+    "status" TEXT NOT NULL DEFAULT '',
+    "add" TEXT NOT NULL DEFAULT '',
+    "month" INTEGER NOT NULL CHECK ("month" BETWEEN 1 AND 12),
+    "year" INTEGER NOT NULL,
+    "salary_paise" INTEGER,
+    "tdays" INTEGER,
+    "abs" INTEGER,
+    "medical_paise" INTEGER,
+    "pf_paise" INTEGER,
+    "conv_paise" INTEGER,
+    "net_paise" INTEGER,
+    PRIMARY KEY ("code", "year", "month")
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_employee_salary_period ON employee_salary ("year", "month");
+
+CREATE TABLE IF NOT EXISTS salary_receipt (
+    "code" INTEGER NOT NULL,
+    "year" INTEGER NOT NULL,
+    "month" INTEGER NOT NULL,
+    "receipt" TEXT NOT NULL,
+    PRIMARY KEY ("code", "year", "month")
+);
+
+CREATE VIEW IF NOT EXISTS emp_salary_legacy AS
+SELECT s."code", s."designation", s."name",
+       COALESCE(CAST(s."age" AS TEXT), '') AS "age",
+       s."gender", s."email", s."hl",
+       COALESCE(s."dob", '') AS "dob", COALESCE(s."doj", '') AS "doj",
+       s."exp", s."pid", s."contact", s."status", s."add",
+       substr('JanFebMarAprMayJunJulAugSepOctNovDec', s."month" * 3 - 2, 3) AS "month",
+       CAST(s."year" AS TEXT) AS "year",
+       CASE WHEN s."salary_paise" IS NULL THEN '' ELSE printf('%.2f', s."salary_paise" / 100.0) END AS "salary",
+       COALESCE(CAST(s."tdays" AS TEXT), '') AS "tdays",
+       COALESCE(CAST(s."abs" AS TEXT), '') AS "abs",
+       CASE WHEN s."medical_paise" IS NULL THEN '' ELSE printf('%.2f', s."medical_paise" / 100.0) END AS "medical",
+       CASE WHEN s."pf_paise" IS NULL THEN '' ELSE printf('%.2f', s."pf_paise" / 100.0) END AS "pf",
+       CASE WHEN s."conv_paise" IS NULL THEN '' ELSE printf('%.2f', s."conv_paise" / 100.0) END AS "conv",
+       CASE WHEN s."net_paise" IS NULL THEN '' ELSE printf('%.2f', s."net_paise" / 100.0) END AS "net",
+       COALESCE(r."receipt", '') AS "reciept"
+FROM employee_salary s
+LEFT JOIN salary_receipt r ON r."code" = s."code" AND r."year" = s."year" AND r."month" = s."month";
+'''
+
+_QUOTED_TYPED_COLUMNS = ', '.join(f'"{name}"' for name in TYPED_COLUMNS)
+_QUOTED_LEGACY_COLUMNS = ', '.join(f'"{name}"' for name in EMP_SALARY_COLUMNS)
+_PREFIXED_TYPED_COLUMNS = ', '.join(f's."{name}"' for name in TYPED_COLUMNS)
+
+SQL_GET_TYPED = (f'SELECT {_PREFIXED_TYPED_COLUMNS}, '
+                 'COALESCE(r."receipt", \'\') FROM employee_salary s '
+                 'LEFT JOIN salary_receipt r ON r."code" = s."code" AND r."year" = s."year" AND r."month" = s."month" '
+                 'WHERE s."code" = ? AND s."year" = ? AND s."month" = ?')
+
+SQL_INSERT_TYPED = (f'INSERT OR REPLACE INTO employee_salary ({_QUOTED_TYPED_COLUMNS}) '
+                    f'VALUES ({", ".join("?" * len(TYPED_COLUMNS))})')
+SQL_INSERT_RECEIPT = 'INSERT OR REPLACE INTO salary_receipt ("code", "year", "month", "receipt") VALUES (?, ?, ?, ?)'
+
+DEFAULT_BATCH_SIZE = 10000
+
+_DATE_FORMATS = ('%d-%b-%Y', '%d %b %Y', '%d %B %Y')
+_NUMERIC_DATE = re.compile(r'(\d{1,4})[-/.](\d{1,2})[-/.](\d{1,4})$')
+_PLAIN_AMOUNT = re.compile(r'-?\d+(?:\.\d{1,2})?$')
+
+
+# ========================================================================
+# VALUE CONVERTERS (text -> typed). Each raises ValueError on bad input.
+# ========================================================================
+
+@lru_cache(maxsize=65536)
+def _text_to_paise(text):
+    text = text.strip().replace(',', '')
+    if text.lower().startswith('rs.'):
+        text = text[3:].strip()
+    elif text.startswith('₹'):
+        text = text[1:].strip()
+    if text == '':
+        return None
+    if _PLAIN_AMOUNT.match(text):
+        # Up to 2 decimals - exact without Decimal
+        rupees, _, paisa = text.partition('.')
+        paise = abs(int(rupees)) * 100 + int(paisa.ljust(2, '0') or 0)
+        return -paise if text.startswith('-') else paise
+    try:
+        return int(Decimal(text).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Not an amount: {text!r}") from None
+
+
+def to_paise(text):
+    """'Rs.91,322.58' -> 9132258. Rounds half-up to the nearest paisa. '' -> None."""
+    return _text_to_paise(str(text))
+
+
+def paise_to_text(paise):
+    """9132258 -> '91322.58' (exact, no float rounding)."""
+    if paise is None:
+        return ''
+    sign = '-' if paise < 0 else ''
+    rupees, paisa = divmod(abs(paise), 100)
+    return f'{sign}{rupees}.{paisa:02d}'
+
+
+def to_int(text):
+    """'28' or '28.0' -> 28. '' -> None."""
+    text = str(text).strip()
+    if text == '':
+        return None
+    value = float(text)
+    if not math.isfinite(value) or value != int(value):  # int() of inf raises OverflowError
+        raise ValueError(f"Not a whole number: {text!r}")
+    return int(value)
+
+
+def to_month(text):
+    """'Jan', 'January', '1' or '01' -> 1."""
+    text = str(text).strip()
+    if text.isdigit() and 1 <= int(text) <= 12:
+        return int(text)
+    prefix = text[:3].title()
+    if prefix in MONTHS:
+        return MONTHS.index(prefix) + 1
+    raise ValueError(f"Not a month: {text!r}")
+
+
+@lru_cache(maxsize=65536)
+def _text_to_date(text):
+    text = text.strip()
+    if text == '':
+        return None
+    match = _NUMERIC_DATE.match(text)
+    if match:
+        first, month, last = match.groups()
+        day, year = (last, first) if len(first) == 4 else (first, last)
+        if len(year) == 4:
+            return date(int(year), int(month), int(day)).isoformat()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Not a date: {text!r}")
+
+
+def to_date(text):
+    """'21-03-2025', '21/03/2025' or '2025-03-21' -> '2025-03-21'. '' -> None."""
+    return _text_to_date(str(text))
+
+
+# Legacy column -> converter. Text columns are copied as-is.
+_CONVERTERS = {
+    'code': int,
+    'age': to_int,
+    'dob': to_date,
+    'doj': to_date,
+    'month': to_month,
+    'year': to_int,
+    'salary': to_paise,
+    'tdays': to_int,
+    'abs': to_int,
+    'medical': to_paise,
+    'pf': to_paise,
+    'conv': to_paise,
+    'net': to_paise,
+}
+
+# Columns a row cannot be stored without
+_REQUIRED = ('code', 'month', 'year')
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def convert_row(values, errors):
+    """
+    Convert one legacy row (24 text values in emp_salary order).
+
+    Args:
+        values (sequence): Legacy row
+        errors (dict): Column -> count of unconvertible values, updated in place
+
+    Returns:
+        tuple: (typed_row, receipt_text), or None if code/month/year are unusable
+    """
+    typed = []
+    for name, value in zip(EMP_SALARY_COLUMNS[:-1], values):
+        if value is None:
+            value = ''
+        converter = _CONVERTERS.get(name)
+        if converter is None:
+            typed.append(str(value))
+            continue
+        try:
+            converted = converter(value)
+            if isinstance(converted, int) and not _INT64_MIN <= converted <= _INT64_MAX:
+                raise OverflowError(f"{name} out of range: {value!r}")  # SQLite INTEGER is 64-bit
+            typed.append(converted)
+        except (TypeError, ValueError, OverflowError):
+            errors[name] = errors.get(name, 0) + 1
+            if name in _REQUIRED:
+                return None
+            typed.append(None)
+    if typed[15] is None:  # year is required
+        errors['year'] = errors.get('year', 0) + 1
+        return None
+    receipt = values[-1] or ''
+    return typed, receipt
+
+
+# ========================================================================
+# SOURCES - each yields legacy rows (24 values) one at a time
+# ========================================================================
+
+def iter_sqlite_rows(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Rows of the legacy emp_salary table in a SQLite database."""
+    con = sqlite3.connect(path)
+    try:
+        cursor = con.execute(f'SELECT {_QUOTED_LEGACY_COLUMNS} FROM emp_salary')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        con.close()
+
+
+_SQL_TOKEN = re.compile(r"""'((?:[^'\\]|\\.|'')*)'|(NULL)|(-?[0-9][0-9.eE+-]*)|(\()|(\))""", re.S | re.I)
+_SQL_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def _unescape(text):
+    return re.sub(r"\\(.)|''", lambda m: _SQL_ESCAPES.get(m.group(1), m.group(1)) if m.group(1) else "'", text, flags=re.S)
+
+
+def _iter_insert_tuples(statement):
+    values_at = re.search(r'\bVALUES\b', statement, re.I)
+    if values_at is None:
+        return
+    row = None
+    for match in _SQL_TOKEN.finditer(statement, values_at.end()):
+        quoted, null, number, open_paren, close_paren = match.groups()
+        if open_paren:
+            row = []
+        elif close_paren:
+            if row is not None:
+                yield tuple(row)
+            row = None
+        elif row is not None:
+            if null:
+                row.append(None)
+            elif number is not None:
+                row.append(number)
+            else:
+                row.append(_unescape(quoted))
+
+
+def iter_sql_dump_rows(path):
+    """
+    Rows of `INSERT INTO emp_salary ...` statements in a MySQL/MariaDB dump.
+
+    Reads one statement at a time, so memory is bounded by the largest
+    INSERT statement, not by the dump size.
+    """
+    statement = []
+    in_insert = False
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not in_insert:
+                if re.match(r'\s*INSERT\s+INTO\s+`?emp_salary`?', line, re.I):
+                    in_insert = True
+                    statement = []
+                else:
+                    continue
+            statement.append(line)
+            if line.rstrip().endswith(';'):
+                in_insert = False
+                yield from _iter_insert_tuples(''.join(statement))
+        if in_insert:
+            yield from _iter_insert_tuples(''.join(statement))
+
+
+def iter_legacy_rows(source):
+    """Pick the reader from the source file type (.sql dump or SQLite database)."""
+    if source.lower().endswith('.sql'):
+        return iter_sql_dump_rows(source)
+    return iter_sqlite_rows(source)
+
+
+# ========================================================================
+# MIGRATION
+# ========================================================================
+
+def create_typed_schema(con):
+    con.executescript(TYPED_SCHEMA)
+
+
+def print_progress(rows, skipped, seconds):
+    rate = rows / seconds if seconds > 0 else 0.0
+    print(f"  {rows:,} rows migrated ({skipped:,} skipped) in {seconds:.1f}s - {rate:,.0f} rows/s", file=sys.stderr)
+
+
+def migrate(source, target, batch_size=DEFAULT_BATCH_SIZE, progress=print_progress):
+    """
+    Convert a text-typed emp_salary source into the typed schema.
+
+    Args:
+        source (str): .sql dump or SQLite database with the legacy emp_salary table
+        target (str): SQLite database for the typed tables (created if missing)
+        batch_size (int): Rows converted and written per transaction
+        progress (callable): Called as progress(rows, skipped, seconds) after
+            each batch. Pass None to disable.
+
+    Returns:
+        dict: 'rows' migrated, 'skipped' rows (no usable code/month/year),
+            'errors' (column -> values stored as NULL), 'seconds', 'rows_per_second'
+    """
+    start = time.perf_counter()
+    errors = {}
+    rows = skipped = 0
+    con = sqlite3.connect(target)
+    try:
+        con.execute('PRAGMA journal_mode=WAL')
+        create_typed_schema(con)
+        batch = []
+        receipts = []
+
+        def flush():
+            with con:
+                con.executemany(SQL_INSERT_TYPED, batch)
+                con.executemany(SQL_INSERT_RECEIPT, receipts)
+            batch.clear()
+            receipts.clear()
+            if progress is not None:
+                progress(rows, skipped, time.perf_counter() - start)
+
+        for values in iter_legacy_rows(source):
+            converted = convert_row(values, errors)
+            if converted is None:
+                skipped += 1
+                continue
+            typed, receipt = converted
+            batch.append(typed)
+            if receipt:
+                receipts.append((typed[0], typed[15], typed[14], receipt))
+            rows += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch or rows == 0:
+            flush()
+    finally:
+        con.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'skipped': skipped,
+        'errors': errors,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0,
+    }
+
+
+def _legacy_text(name, value):
+    """Format one typed column the way the emp_salary_legacy view does."""
+    if name == 'code':
+        return value
+    if name == 'month':
+        return MONTHS[value - 1]
+    if name.endswith('_paise'):
+        return paise_to_text(value)
+    return '' if value is None else str(value)
+
+
+def read_legacy(con, code, month, year):
+    """Read one row as an emp_salary-style dict of text values.
+
+    Looks the row up on the typed primary key rather than filtering the
+    emp_salary_legacy view, whose text columns are computed and so cannot use
+    an index; the values are formatted here to match the view.
+    """
+    cursor = con.execute(SQL_GET_TYPED, (int(code), int(year), to_month(month)))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    values = [_legacy_text(name, value) for name, value in zip(TYPED_COLUMNS, row)]
+    return dict(zip(EMP_SALARY_COLUMNS, values + [row[-1]]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Migrate a text-typed emp_salary table to the typed schema.')
+    parser.add_argument('source', help='.sql dump or SQLite database with the legacy emp_salary table')
+    parser.add_argument('target', help='SQLite database to write the typed tables to')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    summary = migrate(args.source, args.target, batch_size=args.batch_size)
+    print(f"Migrated {summary['rows']:,} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s), skipped {summary['skipped']:,}")
+    for name, count in sorted(summary['errors'].items()):
+        print(f"  {name}: {count:,} values could not be converted")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Paged, cached access to stored records for large views.
+
+RecordPager sits between a table widget and SalaryStore. The widget asks for
+rows by position (rows(start, stop)); the pager fetches whole pages from
+SQLite with the current sort and filter, and keeps the most recently used
+pages in a small LRU cache so scrolling back and forth does not hit the
+database again. No tkinter here - the widget lives in payroll/record_view.py.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_PAGE_SIZE = 200
+DEFAULT_CACHE_PAGES = 16
+
+
+class RecordPager:
+    """Positional access to a sorted/filtered SalaryStore, one page at a time."""
+
+    def __init__(self, store, page_size=DEFAULT_PAGE_SIZE, cache_pages=DEFAULT_CACHE_PAGES):
+        self.store = store
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.sort = 'code'
+        self.descending = False
+        self.filter_column = None
+        self.filter_text = ''
+        self.pages = OrderedDict()
+        self.queries = 0  # pages fetched from the database (for tests/diagnostics)
+        self._count = None
+
+    def refresh(self):
+        """Forget cached pages and row count (call after the table changed)."""
+        self.pages.clear()
+        self._count = None
+
+    def set_sort(self, column, descending=False):
+        if (column, descending) != (self.sort, self.descending):
+            self.sort, self.descending = column, descending
+            self.refresh()
+
+    def set_filter(self, column, text):
+        text = text or ''
+        if (column, text) != (self.filter_column, self.filter_text):
+            self.filter_column, self.filter_text = column, text
+            self.refresh()
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.store.count(self.filter_column, self.filter_text)
+        return self._count
+
+    def _page(self, number):
+        page = self.pages.get(number)
+        if page is not None:
+            self.pages.move_to_end(number)
+            return page
+        page = self.store.page(number * self.page_size, self.page_size, self.sort, self.descending,
+                               self.filter_column, self.filter_text)
+        self.queries += 1
+        self.pages[number] = page
+        if len(self.pages) > self.cache_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def rows(self, start, stop):
+        """Records at positions start..stop-1 of the current sort/filter."""
+        start = max(0, start)
+        stop = min(stop, len(self))
+        result = []
+        for number in range(start // self.page_size, (stop - 1) // self.page_size + 1 if stop > start else 0):
+            page = self._page(number)
+            first = number * self.page_size
+            result.extend(page[max(start - first, 0):stop - first])
+        return result
@@ -0,0 +1,154 @@
+"""
+Multi-process payroll run, sharded by employee code.
+
+The employee set is ordered by `code` (the emp_salary primary key) and cut
+into contiguous shards of chunk_size employees. Each shard is sent to a
+process pool as raw float64/int64 buffers, calculated with
+ComponentSet.calculate_batch() (payroll/components.py; by default the six
+components of calculate_gross_up_batch()) and sent back as raw buffers - no
+per-employee dicts are pickled in either direction. Shards are reassembled in code order,
+so the output order never depends on which worker finishes first.
+
+Usage:
+    result = run_parallel({'code': codes, 'Basic Pay': basic, ...}, workers=8, chunk_size=50000)
+    result['code']        # codes in ascending order
+    result['Net Salary']  # net salary for each code
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from payroll import core
+from payroll.components import STANDARD
+from payroll.instrument import probe
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _calculate_shard(payload):
+    """Worker entry point: raw input buffers in, raw result buffers out."""
+    input_buffers, row_count, components = payload
+    columns = {}
+    for key, buffer in input_buffers.items():
+        column = array('d')
+        column.frombytes(buffer)
+        columns[key] = column
+    result = components.calculate_batch(columns)
+    # Only the calculated columns go back (the inputs are echoed by the parent)
+    output_buffers = {key: result[key].tobytes() for key in components.calculated_keys}
+    invalid = bytearray(row_count)
+    for i in result['Invalid Rows']:
+        invalid[i] = 1
+    return output_buffers, bytes(invalid)
+
+
+def _sort_by_code(columns, input_defaults):
+    """Return (codes, inputs) ordered by code, with missing inputs filled with defaults."""
+    codes = columns['code']
+    row_count = len(codes)
+    for key in input_defaults:
+        if key in columns and len(columns[key]) != row_count:
+            raise ValueError(f"Column '{key}' has {len(columns[key])} rows, expected {row_count}")
+
+    np = core.np
+    if np is not None:
+        codes = np.asarray(codes, dtype=np.int64)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        if row_count > 1 and (codes[1:] == codes[:-1]).any():
+            raise ValueError(f"Duplicate employee code {int(codes[1:][codes[1:] == codes[:-1]][0])}")
+        inputs = {}
+        for key, default in input_defaults.items():
+            if key in columns:
+                inputs[key] = np.asarray(columns[key], dtype=np.float64)[order]
+            else:
+                inputs[key] = np.full(row_count, default, dtype=np.float64)
+        return codes, inputs
+
+    codes = array('q', codes)
+    order = sorted(range(row_count), key=codes.__getitem__)
+    codes = array('q', [codes[i] for i in order])
+    for previous, code in zip(codes, codes[1:]):
+        if previous == code:
+            raise ValueError(f"Duplicate employee code {code}")
+    inputs = {}
+    for key, default in input_defaults.items():
+        if key in columns:
+            column = columns[key]
+            inputs[key] = array('d', [float(column[i]) for i in order])
+        else:
+            inputs[key] = array('d', [default]) * row_count
+    return codes, inputs
+
+
+def _shard_payloads(inputs, row_count, chunk_size, components):
+    for start in range(0, row_count, chunk_size):
+        stop = min(start + chunk_size, row_count)
+        yield {key: column[start:stop].tobytes() for key, column in inputs.items()}, stop - start, components
+
+
+@probe('parallel', lambda result, args: len(result['code']))
+def run_parallel(columns, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, components=STANDARD):
+    """
+    Calculate gross-up salary for the whole employee set across processes.
+
+    Args:
+        columns (dict): 'code' (employee codes, unique) plus the input columns
+            of components.calculate_batch(). Missing inputs use the usual defaults.
+        workers (int): Worker processes. None = os.cpu_count(). 1 = run in
+            this process without a pool.
+        chunk_size (int): Employees per shard
+        components (ComponentSet): Salary components (default: the six of
+            calculate_gross_up_batch())
+
+    Returns:
+        dict: Same keys as components.calculate_batch(), plus 'code'. All columns
+            are ordered by ascending code; 'Invalid Rows' are positions in
+            that order and 'Invalid Codes' the matching employee codes.
+    """
+    if 'code' not in columns:
+        raise ValueError("code column is required")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    workers = workers or os.cpu_count() or 1
+
+    codes, inputs = _sort_by_code(columns, components.input_defaults)
+    row_count = len(codes)
+    payloads = _shard_payloads(inputs, row_count, chunk_size, components)
+
+    if workers == 1:
+        shard_results = map(_calculate_shard, payloads)
+        return _assemble(codes, inputs, shard_results, components.calculated_keys)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, i.e. code order
+        return _assemble(codes, inputs, pool.map(_calculate_shard, payloads), components.calculated_keys)
+
+
+def _assemble(codes, inputs, shard_results, calculated_keys):
+    buffers = {key: [] for key in calculated_keys}
+    invalid = bytearray()
+    for output_buffers, shard_invalid in shard_results:
+        for key in calculated_keys:
+            buffers[key].append(output_buffers[key])
+        invalid += shard_invalid
+
+    np = core.np
+    result = {'code': codes}
+    result.update(inputs)
+    for key in calculated_keys:
+        data = b''.join(buffers[key])
+        if np is not None:
+            result[key] = np.frombuffer(data, dtype=np.float64)
+        else:
+            result[key] = array('d')
+            result[key].frombytes(data)
+
+    invalid_rows = [i for i, flag in enumerate(invalid) if flag]
+    if np is not None:
+        result['Invalid Mask'] = np.frombuffer(bytes(invalid), dtype=np.bool_)
+    else:
+        result['Invalid Mask'] = [bool(flag) for flag in invalid]
+    result['Invalid Rows'] = invalid_rows
+    result['Invalid Codes'] = [int(codes[i]) for i in invalid_rows]
+    return result
@@ -0,0 +1,388 @@
+"""
+Streaming payroll run - CSV/XLSX in, gross-up results out.
+
+The run is three stages chained as generators, so only one chunk of rows is
+ever held in memory no matter how big the salary sheet is:
+
+    read_salary_rows()  ->  iter_salary_chunks()  ->  iter_payroll_results()  ->  writer
+
+Usage:
+    summary = run_payroll_file('salaries.csv', 'payroll_output.csv', chunk_size=50000)
+    print(summary['rows'], summary['rows_per_second'])
+
+Input columns are matched to the keys used by calculate_gross_up_salary()
+('Basic Pay', 'HRA', 'Over Time', 'Other Allowances', 'PF Percentage',
+'Other Deductions'). The Excel-style names from GROSS_UP_DOCUMENTATION.md
+(Basic_Pay, Over_Time, Other_Allow, PF_Percent, Other_Deduct) are accepted too.
+Every other column (employee code, name, ...) is passed through to the output.
+
+The functions take a `components` ComponentSet (payroll/components.py) for
+other salary components; its keys, form labels and emp_salary columns are
+matched too (a 'conv' column feeds Conveyance). The default is STANDARD, the
+six components above. The command line, like the GUI, uses the definition
+file (load_components(), or --components).
+
+XLSX support needs openpyxl (pip install openpyxl); CSV needs nothing extra.
+
+From the command line (--instrument prints per-stage timings, see
+payroll/instrument.py):
+    python -m payroll.pipeline salaries.csv payroll_output.csv --instrument --json stats.json
+"""
+
+import csv
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from array import array
+
+from payroll.components import STANDARD, load_components
+from payroll.instrument import probe
+
+# Header name (lower case, spaces/underscores removed) -> calculation key
+COLUMN_ALIASES = {
+    'basicpay': 'Basic Pay',
+    'basic': 'Basic Pay',
+    'hra': 'HRA',
+    'overtime': 'Over Time',
+    'ot': 'Over Time',
+    'otherallowances': 'Other Allowances',
+    'otherallow': 'Other Allowances',
+    'pfpercentage': 'PF Percentage',
+    'pfpercent': 'PF Percentage',
+    'pf%': 'PF Percentage',
+    'otherdeductions': 'Other Deductions',
+    'otherdeduct': 'Other Deductions',
+}
+
+# Calculated columns appended to every output row of a STANDARD run (in
+# general: the ComponentSet's calculated_keys, then Status)
+OUTPUT_COLUMNS = STANDARD.calculated_keys + ('Status',)
+
+
+def _normalize(name):
+    return name.lower().replace(' ', '').replace('_', '')
+
+
+def header_aliases(components=STANDARD):
+    """Normalized header name -> input key: COLUMN_ALIASES plus each component's key, label and column."""
+    aliases = {alias: key for alias, key in COLUMN_ALIASES.items() if key in components.input_defaults}
+    for component in components.components:
+        for name in filter(None, (component.key, component.label, component.column)):
+            aliases.setdefault(_normalize(name), component.key)
+    return aliases
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Invalid rows listed in the run summary (all of them are counted)
+MAX_INVALID_ROWS = 1000
+
+
+def map_header(header, components=STANDARD):
+    """
+    Match input headers to the input keys of components (see header_aliases()).
+
+    Returns:
+        tuple: (salary_index, passthrough_index) where salary_index maps each
+            calculation key to its column position and passthrough_index is
+            the list of (position, header) for all other columns.
+    """
+    aliases = header_aliases(components)
+    salary_index = {}
+    passthrough_index = []
+    for position, name in enumerate(header):
+        name = '' if name is None else str(name).strip()
+        key = aliases.get(_normalize(name))
+        if key is not None and key not in salary_index:
+            salary_index[key] = position
+        else:
+            passthrough_index.append((position, name))
+    for key in components.required_keys:
+        if key not in salary_index:
+            raise ValueError(f"Input has no {key} column (header: {list(header)})")
+    return salary_index, passthrough_index
+
+
+def _iter_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f)
+
+
+def _iter_xlsx(path):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Reading .xlsx files needs openpyxl: pip install openpyxl") from None
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_salary_rows(path):
+    """
+    Yield raw rows (header first) from a CSV or XLSX salary sheet, one at a time.
+    """
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xlsm'):
+        return _iter_xlsx(path)
+    return _iter_csv(path)
+
+
+def _to_float(value, default):
+    if value is None or value == '':
+        return default
+    value = float(value)
+    if not math.isfinite(value):  # 'nan', 'inf', '1e400'
+        raise ValueError(f"Not a finite number: {value}")
+    return value
+
+
+@probe('parse', lambda chunk, args: len(chunk['passthrough']))
+def iter_salary_chunks(rows, chunk_size=DEFAULT_CHUNK_SIZE, components=STANDARD):
+    """
+    Group raw rows into fixed-size columnar chunks for components.calculate_batch().
+
+    Args:
+        rows (iterable): Raw rows, header first (e.g. from read_salary_rows())
+        chunk_size (int): Rows per chunk
+        components (ComponentSet): Salary components the columns are read for
+
+    Yields:
+        dict: {
+            'columns': {input key: array('d')},
+            'passthrough': list of tuples with the non-salary values of each row,
+            'passthrough_header': list of the non-salary column names,
+            'parse_errors': list of row indices (within the chunk) with non-numeric values,
+            'first_row': index of the chunk's first data row in the file,
+        }
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    salary_index, passthrough_index = map_header(header, components)
+    defaults = [(key, salary_index.get(key), default) for key, default in components.input_defaults.items()]
+    passthrough_header = [name for _, name in passthrough_index]
+
+    first_row = 0
+    while True:
+        columns = {key: array('d') for key in components.input_defaults}
+        passthrough = []
+        parse_errors = []
+        for row in rows:
+            if not row or all(value in (None, '') for value in row):
+                continue  # skip blank lines
+            width = len(row)
+            for key, position, default in defaults:
+                value = row[position] if position is not None and position < width else None
+                try:
+                    columns[key].append(_to_float(value, default))
+                except (TypeError, ValueError):
+                    columns[key].append(0.0)
+                    if not parse_errors or parse_errors[-1] != len(passthrough):
+                        parse_errors.append(len(passthrough))
+            passthrough.append(tuple(row[position] if position < width else '' for position, _ in passthrough_index))
+            if len(passthrough) == chunk_size:
+                break
+        if not passthrough:
+            return
+        yield {
+            'columns': columns,
+            'passthrough': passthrough,
+            'passthrough_header': passthrough_header,
+            'parse_errors': parse_errors,
+            'first_row': first_row,
+        }
+        first_row += len(passthrough)
+
+
+def iter_payroll_results(chunks, cache=None, components=STANDARD):
+    """
+    Run components.calculate_batch() over every chunk.
+
+    Yields the chunk dict with 'result' (the batch result) and
+    'output_columns' (the calculated columns, then 'Status') added.
+    Rows with non-numeric input are added to the result's 'Invalid Rows'.
+    With a payroll.cache.GrossUpCache, results come from the cache instead;
+    the cache holds STANDARD results only.
+    """
+    if cache is not None and components.fingerprint != STANDARD.fingerprint:
+        raise ValueError("GrossUpCache only holds results of the standard components")
+    calculate = components.calculate_batch if cache is None else cache.calculate_batch
+    output_columns = components.calculated_keys + ('Status',)
+    for chunk in chunks:
+        result = calculate(chunk['columns'])
+        if chunk['parse_errors']:
+            invalid_rows = sorted(set(result['Invalid Rows']) | set(chunk['parse_errors']))
+            for i in chunk['parse_errors']:
+                result['Invalid Mask'][i] = True
+                for key in output_columns[:-1]:
+                    result[key][i] = float('nan')
+            result['Invalid Rows'] = invalid_rows
+        chunk['result'] = result
+        chunk['output_columns'] = output_columns
+        yield chunk
+
+
+def _result_rows(chunk):
+    result = chunk['result']
+    outputs = [result[key].tolist() if hasattr(result[key], 'tolist') else result[key]
+               for key in chunk['output_columns'][:-1]]
+    invalid = set(result['Invalid Rows'])
+    parse_errors = set(chunk['parse_errors'])
+    for i, (passthrough, *values) in enumerate(zip(chunk['passthrough'], *outputs)):
+        if i in invalid:
+            status = 'PARSE ERROR' if i in parse_errors else 'INVALID'
+            yield passthrough + ('',) * len(values) + (status,)
+        else:
+            yield passthrough + tuple(values) + ('OK',)
+
+
+class CsvResultWriter:
+    """Append result chunks to a CSV file."""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.header_written = False
+
+    @probe('output_write', lambda _, args: len(args[1]['passthrough']))
+    def write_chunk(self, chunk):
+        if not self.header_written:
+            self.writer.writerow(list(chunk['passthrough_header']) + list(chunk['output_columns']))
+            self.header_written = True
+        self.writer.writerows(_result_rows(chunk))
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxResultWriter:
+    """Append result chunks to an XLSX file using openpyxl's write-only mode."""
+
+    def __init__(self, path):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("Writing .xlsx files needs openpyxl: pip install openpyxl") from None
+        self.path = path
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('Payroll')
+        self.header_written = False
+
+    @probe('output_write', lambda _, args: len(args[1]['passthrough']))
+    def write_chunk(self, chunk):
+        if not self.header_written:
+            self.sheet.append(list(chunk['passthrough_header']) + list(chunk['output_columns']))
+            self.header_written = True
+        for row in _result_rows(chunk):
+            self.sheet.append(row)
+
+    @probe('output_write', lambda _, args: 0)
+    def close(self):
+        self.workbook.save(self.path)
+
+
+def open_result_writer(path):
+    """Pick a CSV or XLSX writer from the file extension."""
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        return XlsxResultWriter(path)
+    return CsvResultWriter(path)
+
+
+def print_progress(rows, invalid, seconds):
+    """Default progress callback - one line per chunk on stderr."""
+    rate = rows / seconds if seconds > 0 else 0.0
+    print(f"  {rows:,} rows ({invalid:,} invalid) in {seconds:.1f}s - {rate:,.0f} rows/s", file=sys.stderr)
+
+
+def run_payroll_file(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, progress=print_progress, cache=None,
+                     components=STANDARD):
+    """
+    Stream a salary sheet through the gross-up calculation into an output file.
+
+    Memory use is bounded by chunk_size, not by the size of the input.
+
+    Args:
+        input_path (str): .csv or .xlsx salary sheet with a header row
+        output_path (str): .csv or .xlsx file for the results
+        chunk_size (int): Rows calculated per batch
+        progress (callable): Called as progress(rows, invalid, seconds) after
+            each chunk. Pass None to disable.
+        cache (GrossUpCache): Optional result cache shared across chunks
+            (STANDARD components only)
+        components (ComponentSet): Salary components (default: STANDARD)
+
+    Returns:
+        dict: Run summary with 'rows', 'invalid', 'invalid_rows' (file row
+            numbers of the first MAX_INVALID_ROWS, 0 = first data row), 'chunks',
+            'seconds', 'rows_per_second'
+    """
+    start = time.perf_counter()
+    rows = invalid = chunks = 0
+    invalid_rows = []
+    writer = open_result_writer(output_path)
+    try:
+        salary_chunks = iter_salary_chunks(read_salary_rows(input_path), chunk_size, components)
+        for chunk in iter_payroll_results(salary_chunks, cache, components):
+            writer.write_chunk(chunk)
+            rows += len(chunk['passthrough'])
+            invalid += len(chunk['result']['Invalid Rows'])
+            room = MAX_INVALID_ROWS - len(invalid_rows)
+            invalid_rows.extend(chunk['first_row'] + i for i in chunk['result']['Invalid Rows'][:max(room, 0)])
+            chunks += 1
+            if progress is not None:
+                progress(rows, invalid, time.perf_counter() - start)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'invalid': invalid,
+        'invalid_rows': invalid_rows,
+        'chunks': chunks,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the gross-up calculation over a CSV/XLSX salary sheet.')
+    parser.add_argument('input', help='.csv or .xlsx salary sheet')
+    parser.add_argument('output', help='.csv or .xlsx file for the results')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--components', default=None,
+                        help='component definition (default: PAYROLL_COMPONENTS or payroll/components.json)')
+    parser.add_argument('--instrument', action='store_true', help='print per-stage timings at the end')
+    parser.add_argument('--profile', action='store_true', help='also run cProfile (implies --instrument)')
+    parser.add_argument('--memory', action='store_true', help='also run tracemalloc (implies --instrument)')
+    parser.add_argument('--json', default=None, help='write the run summary (and stage timings) as JSON here')
+    args = parser.parse_args(argv)
+
+    components = load_components(args.components)
+    from payroll.instrument import Capture, format_summary
+    if args.instrument or args.profile or args.memory:
+        with Capture(profile=args.profile, memory=args.memory) as run:
+            summary = run_payroll_file(args.input, args.output, chunk_size=args.chunk_size, components=components)
+        summary['instrumentation'] = run.report
+    else:
+        summary = run_payroll_file(args.input, args.output, chunk_size=args.chunk_size, components=components)
+
+    print(f"{summary['rows']:,} rows ({summary['invalid']:,} invalid) in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s)")
+    if 'instrumentation' in summary:
+        print(format_summary(summary['instrumentation']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Receipt text parser and bulk importer into the typed schema.
+
+Salary history that only survives as receipt text - Salary_Receipt/*.txt
+files and the `reciept` column of the legacy emp_salary table - is parsed
+back into typed rows (see payroll/migrate.py). Both receipt layouts are
+recognised:
+
+    legacy    Total Days / Total Present / Total Absent / Convenience /
+              Medical / PF / Gross Payment / Net Salary
+    gross_up  the GROSS_UP_RECEIPT layout of payroll/receipts.py (Basic Pay,
+              HRA, ..., PF (12.0%), ..., Net Salary (Take-Home)), with the
+              Conveyance/Medical lines of payroll/components.json
+
+A receipt is read line by line as "label : value" pairs (str.partition,
+several times faster than a regex over the text); amounts are stored as
+exact paise. Receipts that cannot be parsed (unknown layout,
+missing period or net salary, placeholder amounts such as 'Rs.----') are
+reported with the reason and skipped - the import carries on.
+
+Sources are streamed in chunks of chunk_size receipts to a process pool
+(workers read the files themselves, so only paths travel to them); the
+parent writes each parsed chunk in one transaction. Rows that already exist
+in employee_salary keep their values - receipt amounts only fill columns
+that are NULL - and an existing stored receipt is not replaced.
+
+Usage:
+    python -m payroll.receipt_parser ems_typed.db --files Salary_Receipt --column ems.db --workers 4
+
+    summary = import_receipts('ems_typed.db', files='Salary_Receipt', column_source='old_dump.sql')
+    for source, reason in summary['malformed']:
+        print(source, reason)
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import argparse
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from payroll.core import percent_to_basis_points
+from payroll.migrate import create_typed_schema, iter_legacy_rows, to_date, to_int, to_month, to_paise
+
+DEFAULT_CHUNK_SIZE = 500
+
+LEGACY = 'legacy'
+GROSS_UP = 'gross_up'
+
+# Money in paise, pf_percent in basis points (12.0% -> 1200); None when the
+# receipt does not have the line
+ParsedReceipt = namedtuple('ParsedReceipt', [
+    'source', 'layout', 'code', 'year', 'month', 'generated_on',
+    'tdays', 'present', 'absent',
+    'basic', 'hra', 'ot', 'other_allow', 'conv', 'medical', 'gross',
+    'pf_percent', 'pf', 'other_deduct', 'total_deduct', 'net', 'text',
+])
+
+# Receipt label -> ParsedReceipt field and converter
+_FIELDS = {
+    'Employee Id': ('code', int),
+    'Generated On': ('generated_on', to_date),
+    'Total Days': ('tdays', to_int),
+    'Total Present': ('present', to_int),
+    'Total Absent': ('absent', to_int),
+    'Convenience': ('conv', to_paise),
+    'Conveyance': ('conv', to_paise),  # payroll/components.json
+    'Medical': ('medical', to_paise),
+    'PF': ('pf', to_paise),
+    'Gross Payment': ('gross', to_paise),
+    'Net Salary': ('net', to_paise),
+    'Basic Pay': ('basic', to_paise),
+    'HRA': ('hra', to_paise),
+    'Over Time': ('ot', to_paise),
+    'Other Allowances': ('other_allow', to_paise),
+    'Gross Salary': ('gross', to_paise),
+    'Other Deductions': ('other_deduct', to_paise),
+    'Total Deductions': ('total_deduct', to_paise),
+    'Net Salary (Take-Home)': ('net', to_paise),
+}
+
+_PF_PERCENT = re.compile(r'PF \(([0-9.]+)%\)$')
+_SALARY_OF = re.compile(r'([A-Za-z]+)-([0-9]{4})$')
+
+SQL_UPSERT_SALARY = '''
+INSERT INTO employee_salary ("code", "year", "month", "salary_paise", "tdays", "abs",
+                             "medical_paise", "pf_paise", "conv_paise", "net_paise")
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT ("code", "year", "month") DO UPDATE SET
+    "salary_paise" = COALESCE("salary_paise", excluded."salary_paise"),
+    "tdays" = COALESCE("tdays", excluded."tdays"),
+    "abs" = COALESCE("abs", excluded."abs"),
+    "medical_paise" = COALESCE("medical_paise", excluded."medical_paise"),
+    "pf_paise" = COALESCE("pf_paise", excluded."pf_paise"),
+    "conv_paise" = COALESCE("conv_paise", excluded."conv_paise"),
+    "net_paise" = COALESCE("net_paise", excluded."net_paise")
+'''
+SQL_INSERT_RECEIPT = 'INSERT OR IGNORE INTO salary_receipt ("code", "year", "month", "receipt") VALUES (?, ?, ?, ?)'
+
+# Gross-up components have no column in employee_salary
+BREAKDOWN_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS gross_up_breakdown (
+    "code" INTEGER NOT NULL,
+    "year" INTEGER NOT NULL,
+    "month" INTEGER NOT NULL,
+    "basic_paise" INTEGER,
+    "hra_paise" INTEGER,
+    "ot_paise" INTEGER,
+    "other_allow_paise" INTEGER,
+    "pf_basis_points" INTEGER,
+    "other_deduct_paise" INTEGER,
+    "total_deduct_paise" INTEGER,
+    PRIMARY KEY ("code", "year", "month")
+) WITHOUT ROWID;
+'''
+SQL_INSERT_BREAKDOWN = 'INSERT OR REPLACE INTO gross_up_breakdown VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+
+class ReceiptFormatError(ValueError):
+    """A receipt text that cannot be read back into a record."""
+
+
+def parse_receipt(text, source=None, code=None, year=None, month=None):
+    """
+    Parse one receipt.
+
+    Args:
+        text (str): Receipt text in the legacy or gross-up layout
+        source: Where the text came from (kept in the result)
+        code, year, month: Known key of the receipt - used instead of the
+            header (e.g. the <code>.txt file name or the emp_salary row)
+
+    Returns:
+        ParsedReceipt
+
+    Raises:
+        ReceiptFormatError: Unknown layout, missing key or net salary, or a
+            value that is not a number/date
+    """
+    values = dict.fromkeys(ParsedReceipt._fields)
+    salary_of = None
+    for line in text.split('\n'):
+        label, colon, value = line.partition(':')
+        if not colon:
+            continue
+        label = label.strip()
+        value = value.strip()
+        field = _FIELDS.get(label)
+        if field is None:
+            if label == 'Salary of':
+                salary_of = value
+                continue
+            pf_percent = _PF_PERCENT.match(label)
+            if pf_percent is None:
+                continue  # 'Address', text lines
+            values['pf_percent'] = percent_to_basis_points(pf_percent.group(1))
+            field = ('pf', to_paise)
+        name, converter = field
+        try:
+            values[name] = converter(value)
+        except (TypeError, ValueError):
+            raise ReceiptFormatError(f"bad {label}: {value!r}") from None
+
+    if values['basic'] is not None or values['pf_percent'] is not None:
+        layout = GROSS_UP
+    elif 'Gross Payment' in text:
+        layout = LEGACY
+    else:
+        raise ReceiptFormatError("unknown receipt layout")
+
+    if year is None or month is None:
+        match = _SALARY_OF.match(salary_of or '')
+        if match is None:
+            raise ReceiptFormatError(f"bad Salary of: {salary_of!r}")
+        try:
+            month = to_month(match.group(1))
+        except ValueError:
+            raise ReceiptFormatError(f"bad Salary of: {salary_of!r}") from None
+        year = int(match.group(2))
+    if code is not None:
+        values['code'] = int(code)
+    elif values['code'] is None:
+        raise ReceiptFormatError("no Employee Id")
+    if values['net'] is None:
+        raise ReceiptFormatError("no Net Salary")
+
+    values.update(source=source, layout=layout, year=int(year), month=to_month(month), text=text)
+    return ParsedReceipt(**values)
+
+
+def typed_rows(receipt):
+    """(employee_salary row, salary_receipt row, gross_up_breakdown row or None) for SQL_* statements."""
+    key = (receipt.code, receipt.year, receipt.month)
+    salary = key + (receipt.gross, receipt.tdays, receipt.absent, receipt.medical, receipt.pf, receipt.conv,
+                    receipt.net)
+    breakdown = None
+    if receipt.layout == GROSS_UP:
+        breakdown = key + (receipt.basic, receipt.hra, receipt.ot, receipt.other_allow, receipt.pf_percent,
+                           receipt.other_deduct, receipt.total_deduct)
+    return salary, key + (receipt.text,), breakdown
+
+
+# ========================================================================
+# SOURCES - each yields work items for _parse_chunk()
+# ========================================================================
+
+def iter_receipt_files(paths):
+    """('file', path) for a directory's *.txt files (streamed) or an iterable of paths."""
+    if isinstance(paths, str):
+        with os.scandir(paths) as entries:
+            for entry in entries:
+                if entry.name.endswith('.txt') and entry.is_file():
+                    yield ('file', entry.path)
+        return
+    for path in paths:
+        yield ('file', path)
+
+
+def iter_receipt_column(source):
+    """
+    ('text', label, code, year, month, receipt) for every non-empty `reciept`
+    of a legacy emp_salary table (.sql dump or SQLite database).
+    """
+    for values in iter_legacy_rows(source):
+        text = values[-1]
+        if not text:
+            continue
+        code, month, year = values[0], values[14], values[15]
+        label = f'emp_salary code={code} {month}-{year}'
+        # Unusable key columns are read from the receipt header instead
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            code = None
+        try:
+            year, month = to_int(year), to_month(month)
+        except (TypeError, ValueError):
+            year = month = None
+        yield ('text', label, code, year, month, text)
+
+
+def _parse_item(item):
+    if item[0] == 'file':
+        path = item[1]
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        stem = os.path.splitext(os.path.basename(path))[0]
+        # The file name is the code; the header's Employee Id may be a copy
+        return parse_receipt(text, source=path, code=int(stem) if stem.isdigit() else None)
+    _, source, code, year, month, text = item
+    return parse_receipt(text, source=source, code=code, year=year, month=month)
+
+
+def _parse_chunk(items):
+    """Parse a chunk of work items -> (parsed receipts, [(source, reason)])."""
+    parsed, malformed = [], []
+    for item in items:
+        try:
+            parsed.append(_parse_item(item))
+        except (OSError, ReceiptFormatError) as e:
+            malformed.append((item[1], str(e)))
+    return parsed, malformed
+
+
+def _chunks(items, chunk_size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_parsed_chunks(items, workers, chunk_size):
+    if workers == 1:
+        yield from map(_parse_chunk, _chunks(items, chunk_size))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # At most 2 chunks per worker in flight, so memory stays bounded
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ========================================================================
+# IMPORT
+# ========================================================================
+
+def print_progress(rows, malformed, seconds):
+    rate = rows / seconds if seconds > 0 else 0.0
+    print(f"  {rows:,} receipts imported ({malformed:,} malformed) in {seconds:.1f}s - {rate:,.0f}/s", file=sys.stderr)
+
+
+def import_receipts(target, files=None, column_source=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    progress=print_progress):
+    """
+    Parse receipts and write them into the typed schema.
+
+    Args:
+        target (str): SQLite database with the typed tables (created if missing)
+        files: Directory of receipt .txt files, or an iterable of paths
+        column_source (str): .sql dump or SQLite database whose emp_salary
+            `reciept` column is parsed
+        workers (int): Parser processes. None = os.cpu_count(). 1 = in this process.
+        chunk_size (int): Receipts per parse task and per transaction
+        progress (callable): Called as progress(rows, malformed, seconds)
+            after each chunk. Pass None to disable.
+
+    Returns:
+        dict: 'imported', 'legacy', 'gross_up' (counts), 'malformed'
+            (list of (source, reason)), 'seconds', 'rows_per_second'
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than 0")
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    def items():
+        if files is not None:
+            yield from iter_receipt_files(files)
+        if column_source is not None:
+            yield from iter_receipt_column(column_source)
+
+    counts = {LEGACY: 0, GROSS_UP: 0}
+    malformed = []
+    con = sqlite3.connect(target)
+    try:
+        con.execute('PRAGMA journal_mode=WAL')
+        create_typed_schema(con)
+        con.executescript(BREAKDOWN_SCHEMA)
+        for parsed, bad in _iter_parsed_chunks(items(), workers, chunk_size):
+            rows = [typed_rows(receipt) for receipt in parsed]
+            with con:
+                con.executemany(SQL_UPSERT_SALARY, (salary for salary, _, _ in rows))
+                con.executemany(SQL_INSERT_RECEIPT, (receipt for _, receipt, _ in rows))
+                con.executemany(SQL_INSERT_BREAKDOWN, (breakdown for _, _, breakdown in rows if breakdown))
+            for receipt in parsed:
+                counts[receipt.layout] += 1
+            malformed.extend(bad)
+            if progress is not None:
+                progress(counts[LEGACY] + counts[GROSS_UP], len(malformed), time.perf_counter() - start)
+    finally:
+        con.close()
+
+    imported = counts[LEGACY] + counts[GROSS_UP]
+    seconds = time.perf_counter() - start
+    return {
+        'imported': imported,
+        'legacy': counts[LEGACY],
+        'gross_up': counts[GROSS_UP],
+        'malformed': malformed,
+        'seconds': seconds,
+        'rows_per_second': imported / seconds if seconds > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Parse salary receipts into the typed emp_salary schema.')
+    parser.add_argument('target', help='SQLite database for the typed tables')
+    parser.add_argument('--files', help='directory of receipt .txt files (e.g. Salary_Receipt)')
+    parser.add_argument('--column', help='.sql dump or SQLite database whose emp_salary receipts are parsed')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    if args.files is None and args.column is None:
+        parser.error('give --files and/or --column')
+
+    summary = import_receipts(args.target, files=args.files, column_source=args.column, workers=args.workers,
+                              chunk_size=args.chunk_size)
+    print(f"Imported {summary['imported']:,} receipts ({summary['legacy']:,} legacy, "
+          f"{summary['gross_up']:,} gross-up) in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_second']:,.0f}/s), {len(summary['malformed']):,} malformed")
+    for source, reason in summary['malformed']:
+        print(f"  {source}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
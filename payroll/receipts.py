@@ -0,0 +1,213 @@
+"""
+Salary receipt rendering - single receipts for the GUI and bulk runs.
+
+The receipt layout is written once (GROSS_UP_RECEIPT) with named fields and
+compiled once into a %-format string plus a field order. Rendering a
+receipt is then a single `format % values` with no per-receipt parsing,
+which is what makes 100k-receipt runs cheap.
+
+Bulk runs render straight from the columnar result of
+calculate_gross_up_batch()/run_parallel() and hand finished receipts to a
+thread pool in chunks. Each worker writes its files with one
+os.open/os.write/os.close each and no Python text-file layer.
+
+Usage:
+    text = render_receipt(result, code=1, month='Jan', year='2025')
+    summary = write_receipts(batch_result, codes, 'Salary_Receipt/2025-Jan', 'Jan', '2025')
+"""
+
+import os
+import time
+import string
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from payroll.instrument import probe, returned_count
+
+DEFAULT_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 2000
+
+# Receipt shown in the GUI and written by bulk runs, in two parts: the header
+# (code, month, year and generated_on) and the body, which depends only on the
+# keys of calculate_gross_up_salary() - so an unchanged employee's body can be
+# reused from an earlier run (see payroll/incremental.py).
+GROSS_UP_HEADER = '''\tCompany Name, XYZ\n\tAddress: XYZ, Floor4
+    ---------------------------------------------
+     Employee Id\t\t:    {code}
+     Salary of\t\t:    {month}-{year}
+     Generated On\t\t:    {generated_on}  
+'''
+
+_RULE = '    ---------------------------------------------\n'
+
+
+def gross_up_body(inclusions, deductions):
+    """
+    Receipt body for a set of components: GROSS_UP_BODY below for the six
+    of calculate_gross_up_salary(), ComponentSet.receipt_body for a
+    definition of payroll/components.py.
+
+    Args:
+        inclusions: (label, result key) of each inclusion line
+        deductions: (label, result key) of each deduction line above Total Deductions
+    """
+    lines = [_RULE, '     SALARY BREAKDOWN (Gross-Up Calculation)\n', _RULE, '     Inclusion Components:\n']
+    lines += [f'     {label}\t\t:    Rs.{{{key}:.2f}}\n' for label, key in inclusions]
+    lines += [_RULE, '     Gross Salary\t\t:    Rs.{Gross Salary:.2f}\n', _RULE, '     Deductions:\n']
+    lines += [f'     {label}\t\t:    Rs.{{{key}:.2f}}\n' for label, key in deductions]
+    lines += ['     Total Deductions\t\t:    Rs.{Total Deductions:.2f}\n', _RULE,
+              '     Net Salary (Take-Home)\t:    Rs.{Net Salary:.2f}\n', _RULE,
+              '     This Is A Computer Generated Slip,\n', '     It Does Not Require Any Signature.\n    ']
+    return ''.join(lines)
+
+
+GROSS_UP_BODY = gross_up_body(
+    [('Basic Pay', 'Basic Pay'), ('HRA', 'HRA'), ('Over Time', 'Over Time'), ('Other Allowances', 'Other Allowances')],
+    [('PF ({PF Percentage:.1f}%)', 'PF Amount'), ('Other Deductions', 'Other Deductions')])
+
+GROSS_UP_RECEIPT = GROSS_UP_HEADER + GROSS_UP_BODY
+
+
+class ReceiptTemplate:
+    """
+    A receipt layout compiled to a %-format string.
+
+    Only '{field}' and '{field:.Nf}' placeholders are supported - enough for
+    receipts and directly expressible as %s / %.Nf.
+    """
+
+    def __init__(self, layout):
+        parts = []
+        fields = []
+        for literal, field, spec, conversion in string.Formatter().parse(layout):
+            parts.append(literal.replace('%', '%%'))
+            if field is None:
+                continue
+            if conversion or not (spec == '' or (spec.startswith('.') and spec.endswith('f') and spec[1:-1].isdigit())):
+                raise ValueError(f"Unsupported receipt placeholder: {{{field}:{spec}}}")
+            parts.append('%' + (spec or 's'))
+            fields.append(field)
+        self.layout = layout
+        self.fields = tuple(fields)
+        self.format = ''.join(parts)
+
+    def render(self, values):
+        """Render from a mapping with every field."""
+        return self.format % tuple(values[field] for field in self.fields)
+
+    def render_rows(self, columns, row_count):
+        """
+        Yield one receipt per row from columnar values.
+
+        Args:
+            columns (dict): field -> sequence (per row) or a single str used for every row
+            row_count (int): Number of receipts
+        """
+        fmt = self.format
+        per_row = []
+        for field in self.fields:
+            value = columns[field]
+            if isinstance(value, str):
+                per_row.append([value] * row_count)
+            else:
+                per_row.append(value.tolist() if hasattr(value, 'tolist') else value)
+        for values in zip(*per_row):
+            yield fmt % values
+
+
+GROSS_UP_TEMPLATE = ReceiptTemplate(GROSS_UP_RECEIPT)
+GROSS_UP_HEADER_TEMPLATE = ReceiptTemplate(GROSS_UP_HEADER)
+GROSS_UP_BODY_TEMPLATE = ReceiptTemplate(GROSS_UP_BODY)
+
+
+@probe('receipt_render')
+def render_receipt(result, code, month, year, generated_on=None):
+    """
+    Render one gross-up receipt.
+
+    Args:
+        result (dict): Output of calculate_gross_up_salary()
+        code, month, year: Shown in the receipt header
+        generated_on (str): Date shown on the receipt (default: today, DD-MM-YYYY)
+    """
+    values = dict(result, code=code, month=month, year=year,
+                  generated_on=generated_on or time.strftime("%d-%m-%Y"))
+    return GROSS_UP_TEMPLATE.render(values)
+
+
+@probe('file_write', returned_count)
+def write_files(paths_and_data):
+    """Write (path, bytes) pairs with one os.open/os.write/os.close each. Returns the count."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    for path, data in paths_and_data:
+        fd = os.open(path, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    return len(paths_and_data)
+
+
+@probe('receipt_write', lambda summary, args: summary['written'])
+def write_receipts(result, codes, directory, month, year, generated_on=None,
+                   workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, template=GROSS_UP_TEMPLATE):
+    """
+    Render and write one <code>.txt receipt per employee of a payroll run.
+
+    Receipts are rendered in chunks on the calling thread while earlier
+    chunks are written by a thread pool. Invalid rows (result['Invalid Rows'])
+    get no receipt.
+
+    Args:
+        result (dict): Columnar result of calculate_gross_up_batch()/run_parallel()
+        codes (sequence): Employee code of each row
+        directory (str): Output directory (created if missing)
+        month, year (str): Salary period shown on the receipts
+        generated_on (str): Date shown on the receipts (default: today)
+        workers (int): Writer threads
+        chunk_size (int): Receipts per write task
+        template (ReceiptTemplate): Receipt layout (e.g. ComponentSet.receipt_template
+            for a result of payroll/components.py)
+
+    Returns:
+        dict: 'written', 'skipped', 'seconds', 'receipts_per_second'
+    """
+    start = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+    codes = codes.tolist() if hasattr(codes, 'tolist') else list(codes)
+    row_count = len(codes)
+    invalid = set(result.get('Invalid Rows', ()))
+
+    columns = {field: result[field] for field in template.fields if field in result}
+    columns.update(code=codes, month=str(month), year=str(year),
+                   generated_on=generated_on or time.strftime("%d-%m-%Y"))
+    receipts = template.render_rows(columns, row_count)
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # At most 2 chunks per worker in flight, so memory stays bounded
+        pending = deque()
+        chunk = []
+        for i, (code, text) in enumerate(zip(codes, receipts)):
+            if i in invalid:
+                continue
+            chunk.append((os.path.join(directory, f'{code}.txt'), text.encode('utf-8')))
+            if len(chunk) == chunk_size:
+                pending.append(pool.submit(write_files, chunk))
+                chunk = []
+                if len(pending) >= workers * 2:
+                    written += pending.popleft().result()
+        if chunk:
+            pending.append(pool.submit(write_files, chunk))
+        while pending:
+            written += pending.popleft().result()
+
+    seconds = time.perf_counter() - start
+    return {
+        'written': written,
+        'skipped': len(invalid),
+        'seconds': seconds,
+        'receipts_per_second': written / seconds if seconds > 0 else 0.0,
+    }
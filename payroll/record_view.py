@@ -0,0 +1,183 @@
+"""
+Virtualized record table for "View All Records".
+
+A plain ttk.Treeview needs every row inserted up front, which freezes the Tk
+mainloop for tens of thousands of employees. VirtualRecordView keeps only the
+visible rows plus a prefetch margin in the Treeview and pulls the rest from a
+RecordPager (payroll/paging.py) as the user scrolls. Clicking a heading sorts
+and the filter bar filters - both run in SQLite, not in Tcl.
+"""
+
+from tkinter import *
+from tkinter import ttk
+
+from payroll.core import EMP_SALARY_COLUMNS
+
+COLUMN_HEADINGS = {
+    'code': 'Employee Code',
+    'designation': 'Designation',
+    'name': 'Name',
+    'age': 'Age',
+    'gender': 'Gender',
+    'email': 'Email',
+    'hl': 'Hired Location',
+    'dob': 'Date of Birth',
+    'doj': 'Date of Joining',
+    'exp': 'Experience',
+    'pid': 'Proof ID',
+    'contact': 'Contact',
+    'status': 'Status',
+    'add': 'Address',
+    'month': 'Month',
+    'year': 'Year',
+    'salary': 'Salary',
+    'tdays': 'Total Days',
+    'abs': 'Absents',
+    'medical': 'Medical',
+    'pf': 'Provisional Fund',
+    'conv': 'Convenience',
+    'net': 'Net Salary',
+    'reciept': 'Reciept',
+}
+
+ANY_COLUMN = 'Any (Name, Designation, Email, Location, Status)'
+
+
+class VirtualRecordView(Frame):
+    """Treeview that only holds the rows around the visible window."""
+
+    def __init__(self, parent, pager, visible_rows=20, prefetch=40):
+        Frame.__init__(self, parent, bg="white")
+        self.pager = pager
+        self.visible_rows = visible_rows
+        self.prefetch = prefetch
+        self.top = 0                 # position of the first visible row
+        self.window_start = 0        # position of the first row held in the Treeview
+        self.window_stop = 0
+
+        # Filter bar
+        bar = Frame(self, bg="white")
+        bar.pack(side=TOP, fill=X)
+        Label(bar, text="Filter", font=("times new roman", 13), bg="white").pack(side=LEFT, padx=5)
+        self.var_filter_column = StringVar(value=ANY_COLUMN)
+        filter_columns = [ANY_COLUMN] + [COLUMN_HEADINGS[name] for name in EMP_SALARY_COLUMNS]
+        ttk.Combobox(bar, textvariable=self.var_filter_column, values=filter_columns, state='readonly', width=40).pack(side=LEFT)
+        self.var_filter_text = StringVar()
+        entry_filter = Entry(bar, textvariable=self.var_filter_text, font=("times new roman", 13), bg="light yellow")
+        entry_filter.pack(side=LEFT, padx=5)
+        entry_filter.bind('<Return>', lambda event: self.apply_filter())
+        Button(bar, text="Apply", command=self.apply_filter, font=("times new roman", 12)).pack(side=LEFT)
+        Button(bar, text="Clear", command=self.clear_filter, font=("times new roman", 12)).pack(side=LEFT, padx=5)
+        self.lbl_count = Label(bar, text="", font=("times new roman", 12), bg="white")
+        self.lbl_count.pack(side=RIGHT, padx=5)
+
+        # Table with our own vertical scrollbar - it spans every record, not
+        # just the rows in the Treeview
+        Scrollx = Scrollbar(self, orient=HORIZONTAL)
+        self.Scrolly = Scrollbar(self, orient=VERTICAL, command=self.on_scroll)
+        Scrollx.pack(side=BOTTOM, fill=X)
+        self.Scrolly.pack(side=RIGHT, fill=Y)
+
+        self.tree = ttk.Treeview(self, columns=EMP_SALARY_COLUMNS, height=visible_rows, show='headings',
+                                 xscrollcommand=Scrollx.set)
+        for name in EMP_SALARY_COLUMNS:
+            self.tree.heading(name, text=COLUMN_HEADINGS[name], command=lambda column=name: self.sort_by(column))
+            self.tree.column(name, width=100)
+        Scrollx.config(command=self.tree.xview)
+        self.tree.pack(fill=BOTH, expand=1)
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>', '<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.tree.bind(sequence, self.on_key_or_wheel)
+        self.tree.bind('<Configure>', self.on_resize)
+
+        self.refresh()
+
+    # ------------------------------------------------------------- data
+    def refresh(self):
+        """Reload from storage, keeping the scroll position if possible."""
+        self.pager.refresh()
+        self.window_start = self.window_stop = 0
+        self.lbl_count.config(text=f"{len(self.pager):,} records")
+        self.scroll_to(self.top, force=True)
+
+    def sort_by(self, column):
+        descending = self.pager.sort == column and not self.pager.descending
+        self.pager.set_sort(column, descending)
+        for name in EMP_SALARY_COLUMNS:
+            arrow = (' ▼' if descending else ' ▲') if name == column else ''
+            self.tree.heading(name, text=COLUMN_HEADINGS[name] + arrow)
+        self.top = 0
+        self.refresh()
+
+    def apply_filter(self):
+        label = self.var_filter_column.get()
+        column = None
+        for name, heading in COLUMN_HEADINGS.items():
+            if heading == label:
+                column = name
+        self.pager.set_filter(column, self.var_filter_text.get().strip())
+        self.top = 0
+        self.refresh()
+
+    def clear_filter(self):
+        self.var_filter_text.set('')
+        self.var_filter_column.set(ANY_COLUMN)
+        self.apply_filter()
+
+    # -------------------------------------------------------- scrolling
+    def scroll_to(self, top, force=False):
+        total = len(self.pager)
+        top = max(0, min(int(top), total - self.visible_rows))
+        self.top = top
+        bottom = min(top + self.visible_rows, total)
+        if force or top < self.window_start or bottom > self.window_stop:
+            self.load_window(max(0, top - self.prefetch), min(total, bottom + self.prefetch))
+        held = self.window_stop - self.window_start
+        if held:
+            self.tree.yview_moveto((top - self.window_start) / held)
+        if total:
+            self.Scrolly.set(top / total, bottom / total)
+        else:
+            self.Scrolly.set(0, 1)
+
+    def load_window(self, start, stop):
+        """Put rows start..stop-1 into the Treeview, reusing existing items."""
+        rows = self.pager.rows(start, stop)
+        items = self.tree.get_children()
+        for item, row in zip(items, rows):
+            self.tree.item(item, values=row)
+        if len(rows) > len(items):
+            for row in rows[len(items):]:
+                self.tree.insert('', END, values=row)
+        elif len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        self.window_start, self.window_stop = start, start + len(rows)
+
+    def on_scroll(self, *args):
+        total = len(self.pager)
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.visible_rows if args[2] == 'pages' else 1)
+            self.scroll_to(self.top + step)
+
+    def on_key_or_wheel(self, event):
+        steps = {'Up': -1, 'Down': 1, 'Prior': -self.visible_rows, 'Next': self.visible_rows}
+        if event.keysym == 'Home':
+            self.scroll_to(0)
+        elif event.keysym == 'End':
+            self.scroll_to(len(self.pager))
+        elif event.keysym in steps:
+            self.scroll_to(self.top + steps[event.keysym])
+        elif event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return 'break'
+
+    def on_resize(self, event):
+        # Treeview rows are ~20px; keep enough rows loaded to fill the widget
+        rows = max(1, event.height // 20 - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.scroll_to(self.top)
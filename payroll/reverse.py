@@ -0,0 +1,259 @@
+"""
+Reverse gross-up: the salary split that gives a target take-home.
+
+Offers are negotiated on Net Salary. Given the target net, PF%, Other
+Deductions and a split policy, these functions return Basic Pay, HRA and
+Other Allowances such that calculate_gross_up_paise() of the result gives
+exactly the target net, to the paisa.
+
+Split policy (per employee, so it can be a column in bulk use):
+    'HRA Percentage'        HRA as a percentage of Basic (default 40%)
+    'Allowance Percentage'  Other Allowances as a percentage of Basic (default 0%)
+    'Over Time'             Fixed amount (default 0)
+
+Closed form: with k = 1 / (1 - PF rate), net = k * (Basic * (1 + hra% +
+allowance%) + OT) - Basic * PF rate - Other Deductions, which is solved for
+Basic directly in integer arithmetic. Other Allowances then takes up the
+rounding remainder, so the forward calculation lands exactly on the target.
+The remainder is a few paise on top of the allowance percentage (more at PF
+rates below 1%, where the step below moves Basic by up to Rs.100).
+
+One exception needs a step: gross is rounded from inclusions * k, and with
+k > 1 some gross amounts (about PF% of them) cannot be produced by any
+whole-paise inclusions. When the required gross is one of them, Basic is
+lowered to where the PF amount is one paisa smaller - the required gross
+moves by one paisa to an amount that can be produced. That takes one step
+for PF below 50% (a few more above).
+
+Same conventions as the exact mode in payroll/core.py: amounts in paise,
+percentages in basis points (1200 = 12.00%).
+
+Usage:
+    result = solve_gross_up({'Net Salary': 60000, 'PF Percentage': 12, 'HRA Percentage': 50})
+    result['Basic Pay'], result['HRA'], result['Other Allowances']
+
+    columns = solve_gross_up_batch_paise({'Net Salary': nets, 'PF Percentage': new_pf})
+"""
+
+from array import array
+
+from payroll import core
+from payroll.core import (BASIS_POINTS, SALARY_RESULT_KEYS, _round_div, calculate_gross_up_batch_paise,
+                          calculate_gross_up_paise, paise_result_to_rupees, percent_to_basis_points,
+                          rupees_to_paise)
+
+# Input keys of the solver and their defaults (paise / basis points)
+REVERSE_INPUT_DEFAULTS = {
+    'Net Salary': 0,
+    'PF Percentage': 1200,
+    'Other Deductions': 0,
+    'Over Time': 0,
+    'HRA Percentage': 4000,
+    'Allowance Percentage': 0,
+}
+
+_PERCENT_KEYS = ('PF Percentage', 'HRA Percentage', 'Allowance Percentage')
+
+# Result columns copied from the inputs; the rest are 0 for rows the solver rejects
+_ECHOED_KEYS = ('Over Time', 'PF Percentage', 'Other Deductions')
+_SOLVED_KEYS = tuple(key for key in SALARY_RESULT_KEYS if key not in _ECHOED_KEYS)
+
+
+# Upper bound on Basic steps - only PF rates above 99% need more (and are rejected)
+MAX_STEPS = 102
+
+# Net is aimed this many paise low by the closed form, so the remainder left
+# for Other Allowances is never negative
+_SLACK = 2
+
+
+def _estimate_basic(net, other_deductions, pf, hra_pct, allowance_pct, over_time):
+    """Closed-form Basic (floor) for a net _SLACK paise below the target; ints or int64 arrays."""
+    numerator = ((net + other_deductions - _SLACK) * (BASIS_POINTS - pf) - over_time * BASIS_POINTS) * BASIS_POINTS
+    denominator = BASIS_POINTS * (BASIS_POINTS + hra_pct + allowance_pct) - pf * (BASIS_POINTS - pf)
+    return numerator // denominator
+
+
+def _inclusions_for_gross(gross, pf):
+    """Smallest total inclusions whose rounded gross is >= gross."""
+    return -((-(2 * gross - 1) * (BASIS_POINTS - pf)) // (2 * BASIS_POINTS))
+
+
+def _basic_below_pf(pf_amount, pf):
+    """Largest Basic whose PF amount is pf_amount - 1."""
+    return -((-(2 * pf_amount - 1) * BASIS_POINTS) // (2 * pf)) - 1
+
+
+def _max_steps(pf):
+    """Basic steps that always reach an achievable gross (1 in k gross amounts is achievable)."""
+    return min(BASIS_POINTS // (BASIS_POINTS - pf) + 2, MAX_STEPS)
+
+
+def _check_inputs(net, pf, hra_pct, allowance_pct, over_time):
+    if net <= 0:
+        raise ValueError("Net Salary must be greater than 0")
+    if pf < 0 or pf >= BASIS_POINTS:
+        raise ValueError("PF Percentage must be at least 0 and below 100")
+    if hra_pct < 0 or allowance_pct < 0 or over_time < 0:
+        raise ValueError("Split percentages and Over Time cannot be negative")
+
+
+def solve_gross_up_paise(data: dict) -> dict:
+    """
+    Exact reverse gross-up for one employee.
+
+    Args:
+        data (dict): REVERSE_INPUT_DEFAULTS keys; 'Net Salary' is required.
+            Amounts in paise, percentages in basis points.
+
+    Returns:
+        dict: calculate_gross_up_paise() result of the solved split - its
+            'Net Salary' equals the target
+
+    Raises:
+        ValueError: Invalid inputs, or a target too small for the policy
+            (e.g. below Over Time plus deductions)
+    """
+    values = {name: int(data.get(name, default)) for name, default in REVERSE_INPUT_DEFAULTS.items()}
+    net, pf = values['Net Salary'], values['PF Percentage']
+    hra_pct, allowance_pct = values['HRA Percentage'], values['Allowance Percentage']
+    over_time, other_deductions = values['Over Time'], values['Other Deductions']
+    _check_inputs(net, pf, hra_pct, allowance_pct, over_time)
+
+    basic = _estimate_basic(net, other_deductions, pf, hra_pct, allowance_pct, over_time)
+    for _ in range(_max_steps(pf)):
+        if basic <= 0:
+            raise ValueError("Net Salary is too small for the split policy")
+        pf_amount = _round_div(basic * pf, BASIS_POINTS)
+        gross = net + other_deductions + pf_amount
+        inclusions = _inclusions_for_gross(gross, pf)
+        if _round_div(inclusions * BASIS_POINTS, BASIS_POINTS - pf) == gross:
+            break
+        basic = _basic_below_pf(pf_amount, pf)
+    else:
+        raise ValueError("No whole-paise split reaches this Net Salary")
+
+    hra = _round_div(basic * hra_pct, BASIS_POINTS)
+    allowances = inclusions - basic - hra - over_time
+    if allowances < 0:
+        raise ValueError("Net Salary is too small for the split policy")
+    return calculate_gross_up_paise({'Basic Pay': basic, 'HRA': hra, 'Over Time': over_time,
+                                     'Other Allowances': allowances, 'PF Percentage': pf,
+                                     'Other Deductions': other_deductions})
+
+
+def solve_gross_up(data: dict) -> dict:
+    """
+    Reverse gross-up with rupee inputs and outputs.
+
+    Same keys as solve_gross_up_paise(); amounts in rupees and percentages in
+    percent (12 = 12%). Returns the float rupee dict of
+    calculate_gross_up_salary().
+    """
+    inputs = {}
+    for name in REVERSE_INPUT_DEFAULTS:
+        if name in data:
+            convert = percent_to_basis_points if name in _PERCENT_KEYS else rupees_to_paise
+            inputs[name] = convert(data[name])
+    return paise_result_to_rupees(solve_gross_up_paise(inputs))
+
+
+def solve_gross_up_batch_paise(columns: dict) -> dict:
+    """
+    Exact reverse gross-up for many employees at once.
+
+    Columnar version of solve_gross_up_paise() with identical results row
+    for row - e.g. to re-split every offer after a PF policy change. Rows
+    the solver rejects do not stop the batch; they hold 0 in every column
+    except the echoed Over Time, PF Percentage and Other Deductions - check
+    'Invalid Mask'.
+
+    Returns:
+        dict: Same as calculate_gross_up_batch_paise() for the solved split
+            (11 int64 / array('q') columns, 'Invalid Mask', 'Invalid Rows')
+    """
+    if 'Net Salary' not in columns:
+        raise ValueError("Net Salary column is required")
+    row_count = len(columns['Net Salary'])
+    for name in columns:
+        if name in REVERSE_INPUT_DEFAULTS and len(columns[name]) != row_count:
+            raise ValueError(f"Column '{name}' has {len(columns[name])} rows, expected {row_count}")
+
+    if core.np is not None:
+        return _solve_batch_numpy(columns, row_count)
+    return _solve_batch_python(columns, row_count)
+
+
+def _solve_batch_numpy(columns, row_count):
+    np = core.np
+    inputs = {}
+    for name, default in REVERSE_INPUT_DEFAULTS.items():
+        if name in columns:
+            inputs[name] = np.asarray(columns[name], dtype=np.int64)
+        else:
+            inputs[name] = np.full(row_count, default, dtype=np.int64)
+    net, pf = inputs['Net Salary'], inputs['PF Percentage']
+    hra_pct, allowance_pct = inputs['HRA Percentage'], inputs['Allowance Percentage']
+    over_time, other_deductions = inputs['Over Time'], inputs['Other Deductions']
+
+    invalid = ((net <= 0) | (pf < 0) | (pf >= BASIS_POINTS) | (hra_pct < 0) | (allowance_pct < 0)
+               | (over_time < 0))
+    # Harmless values for invalid rows so the arithmetic below cannot divide by zero
+    pf = np.where(invalid, 0, pf)
+    basic = _estimate_basic(net, other_deductions, pf, np.where(invalid, 0, hra_pct),
+                            np.where(invalid, 0, allowance_pct), over_time)
+
+    pending = ~invalid
+    inclusions = np.zeros(row_count, dtype=np.int64)
+    for _ in range(_max_steps(int(pf.max(initial=0)))):
+        invalid |= pending & (basic <= 0)
+        pending &= ~invalid
+        if not pending.any():
+            break
+        rows = np.flatnonzero(pending)
+        row_pf = pf[rows]
+        pf_amount = _round_div(basic[rows] * row_pf, BASIS_POINTS)
+        gross = net[rows] + other_deductions[rows] + pf_amount
+        row_inclusions = _inclusions_for_gross(gross, row_pf)
+        reached = _round_div(row_inclusions * BASIS_POINTS, BASIS_POINTS - row_pf) == gross
+        inclusions[rows[reached]] = row_inclusions[reached]
+        pending[rows[reached]] = False
+        step = rows[~reached]
+        basic[step] = _basic_below_pf(pf_amount[~reached], row_pf[~reached])
+    invalid |= pending
+
+    hra = _round_div(basic * hra_pct, BASIS_POINTS)
+    allowances = inclusions - basic - hra - over_time
+    invalid |= allowances < 0
+
+    result = calculate_gross_up_batch_paise({'Basic Pay': np.where(invalid, 1, basic), 'HRA': hra,
+                                             'Over Time': over_time, 'Other Allowances': allowances,
+                                             'PF Percentage': pf, 'Other Deductions': other_deductions})
+    for key in _SOLVED_KEYS:
+        result[key][invalid] = 0
+    for key in _ECHOED_KEYS:
+        result[key] = inputs[key]
+    result['Invalid Mask'] = invalid
+    result['Invalid Rows'] = np.flatnonzero(invalid).tolist()
+    return result
+
+
+def _solve_batch_python(columns, row_count):
+    inputs = {name: columns[name] if name in columns else [default] * row_count
+              for name, default in REVERSE_INPUT_DEFAULTS.items()}
+    result = {key: array('q', bytes(8 * row_count)) for key in SALARY_RESULT_KEYS}
+    invalid_mask = [False] * row_count
+    for i, values in enumerate(zip(*inputs.values())):
+        row = dict(zip(REVERSE_INPUT_DEFAULTS, values))
+        for key in _ECHOED_KEYS:
+            result[key][i] = int(row[key])
+        try:
+            solved = solve_gross_up_paise(row)
+        except ValueError:
+            invalid_mask[i] = True
+            continue
+        for key in SALARY_RESULT_KEYS:
+            result[key][i] = solved[key]
+    result['Invalid Mask'] = invalid_mask
+    result['Invalid Rows'] = [i for i, bad in enumerate(invalid_mask) if bad]
+    return result
@@ -0,0 +1,242 @@
+"""
+In-memory employee search index.
+
+Lookups by name prefix, email, designation, hired location and status
+without touching SQLite:
+
+    - names: a sorted list of (name word, code) searched with bisect, so
+      'kum' finds 'Ravi Kumar' as well as 'Kumaran S'
+    - email / designation / hl / status: hash maps of value -> set of codes
+
+One entry is kept per employee code (its latest salary month). The GUI
+updates the index on save/update/delete, and it is pickled to disk next to
+the database (ems.db -> ems.idx) so start-up does not rebuild it from every
+row. A stamp of the table (row count, last rowid and the change counter the
+database's triggers keep, so edits by any program count) is saved with it; when
+the stamp no longer matches, the index is rebuilt. The GUI removes the saved
+file on its first change and writes it back on exit, so a crash leads to a
+rebuild rather than a stale index.
+
+Usage:
+    index = open_index(store)
+    index.search(name='ravi', status='active')     # -> [codes]
+    index.search(**parse_query('designation:clerk ra'))
+"""
+
+import os
+import pickle
+from bisect import bisect_left, insort
+
+from payroll.storage import period_key
+
+# Fields looked up by exact (case-insensitive) value
+EXACT_FIELDS = ('email', 'designation', 'hl', 'status')
+
+# Query prefixes accepted by parse_query() -> field
+QUERY_FIELDS = {
+    'email': 'email',
+    'designation': 'designation',
+    'hl': 'hl',
+    'location': 'hl',
+    'status': 'status',
+    'name': 'name',
+}
+
+_FORMAT_VERSION = 1
+
+
+def normalize(text):
+    return ' '.join(str(text).lower().split())
+
+
+def parse_query(text):
+    """
+    'designation:clerk status:active ra' -> {'designation': 'clerk', 'status': 'active', 'name': 'ra'}
+
+    Words without a known 'field:' prefix form the name prefix.
+    """
+    query = {}
+    name_words = []
+    for word in str(text).split():
+        field, sep, value = word.partition(':')
+        if sep and field.lower() in QUERY_FIELDS:
+            query[QUERY_FIELDS[field.lower()]] = value
+        else:
+            name_words.append(word)
+    if name_words:
+        query['name'] = ' '.join(name_words)
+    return query
+
+
+class EmployeeIndex:
+    """Name-prefix and exact-field lookups over employee records."""
+
+    def __init__(self):
+        self.employees = {}  # code -> (name, email, designation, hl, status)
+        self.names = []      # sorted (name word onwards, code)
+        self.exact = {field: {} for field in EXACT_FIELDS}
+        self.stamp = None
+
+    def __len__(self):
+        return len(self.employees)
+
+    @staticmethod
+    def _entry(record):
+        get = record.get if isinstance(record, dict) else lambda name: getattr(record, name)
+        return int(get('code')), (str(get('name')),) + tuple(str(get(field)) for field in EXACT_FIELDS)
+
+    @staticmethod
+    def _name_keys(name):
+        # Every word start, so any part of the name can be prefix-searched
+        words = normalize(name).split()
+        return [' '.join(words[i:]) for i in range(len(words))] or ['']
+
+    # ----------------------------------------------------------- updates
+    def add(self, record):
+        """Add or replace the employee in record (anything with the emp_salary field names)."""
+        code, entry = self._entry(record)
+        if code in self.employees:
+            if self.employees[code] == entry:
+                return
+            self.remove(code)
+        self.employees[code] = entry
+        for key in self._name_keys(entry[0]):
+            insort(self.names, (key, code))
+        for field, value in zip(EXACT_FIELDS, entry[1:]):
+            self.exact[field].setdefault(normalize(value), set()).add(code)
+
+    update = add
+
+    def remove(self, code):
+        code = int(code)
+        entry = self.employees.pop(code, None)
+        if entry is None:
+            return
+        for key in self._name_keys(entry[0]):
+            i = bisect_left(self.names, (key, code))
+            if i < len(self.names) and self.names[i] == (key, code):
+                del self.names[i]
+        for field, value in zip(EXACT_FIELDS, entry[1:]):
+            codes = self.exact[field].get(normalize(value))
+            if codes is not None:
+                codes.discard(code)
+                if not codes:
+                    del self.exact[field][normalize(value)]
+
+    def bulk_load(self, records):
+        """Replace the index contents; later records for a code win. Sorts once."""
+        self.employees = {}
+        for record in records:
+            code, entry = self._entry(record)
+            self.employees[code] = entry
+        self.names = sorted((key, code) for code, entry in self.employees.items() for key in self._name_keys(entry[0]))
+        self.exact = {field: {} for field in EXACT_FIELDS}
+        for code, entry in self.employees.items():
+            for field, value in zip(EXACT_FIELDS, entry[1:]):
+                self.exact[field].setdefault(normalize(value), set()).add(code)
+
+    # ----------------------------------------------------------- queries
+    def _name_prefix(self, prefix):
+        prefix = normalize(prefix)
+        i = bisect_left(self.names, (prefix,))
+        names = self.names
+        while i < len(names) and names[i][0].startswith(prefix):
+            yield names[i][1]
+            i += 1
+
+    def search(self, name=None, email=None, designation=None, hl=None, status=None, limit=50):
+        """
+        Codes of employees matching every given condition.
+
+        Args:
+            name (str): Prefix of any word of the name (case-insensitive)
+            email, designation, hl, status (str): Exact value (case-insensitive)
+            limit (int): Maximum codes returned
+
+        Returns:
+            list: Codes, in name order when name is given, else ascending
+        """
+        candidates = None
+        for field, value in zip(EXACT_FIELDS, (email, designation, hl, status)):
+            if value is None:
+                continue
+            codes = self.exact[field].get(normalize(value), set())
+            candidates = codes if candidates is None else candidates & codes
+            if not candidates:
+                return []
+
+        if name is None:
+            return sorted(candidates or ())[:limit] if candidates is not None else []
+
+        found = []
+        seen = set()
+        for code in self._name_prefix(name):
+            if code in seen or (candidates is not None and code not in candidates):
+                continue
+            seen.add(code)
+            found.append(code)
+            if len(found) == limit:
+                break
+        return found
+
+    def describe(self, code):
+        """'12 - Ravi Kumar (Clerk)' for type-ahead lists."""
+        name, email, designation, hl, status = self.employees[int(code)]
+        return f"{code} - {name} ({designation})" if designation else f"{code} - {name}"
+
+    # ------------------------------------------------------- persistence
+    def save(self, path):
+        data = {'version': _FORMAT_VERSION, 'stamp': self.stamp, 'employees': self.employees,
+                'names': self.names, 'exact': self.exact}
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format in {path}")
+        index = cls()
+        index.stamp = data['stamp']
+        index.employees = data['employees']
+        index.names = data['names']
+        index.exact = data['exact']
+        return index
+
+
+def index_path(store):
+    """Index file kept next to the store's database: ems.db -> ems.idx"""
+    return os.path.splitext(store.path)[0] + '.idx'
+
+
+def build_index(store):
+    """Build an index from every record in the store (latest salary month per code wins)."""
+    latest = {}
+    for record in store.iter_records():
+        current = latest.get(record.code)
+        if current is None or period_key(record) >= period_key(current):
+            latest[record.code] = record
+    index = EmployeeIndex()
+    index.bulk_load(latest.values())
+    index.stamp = store.stamp()
+    return index
+
+
+def open_index(store, path=None):
+    """Load the saved index if it matches the store, otherwise rebuild and save it."""
+    path = path or index_path(store)
+    try:
+        index = EmployeeIndex.load(path)
+        if index.stamp == store.stamp():
+            return index
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, KeyError):
+        pass
+    index = build_index(store)
+    try:
+        index.save(path)
+    except OSError:
+        pass
+    return index
@@ -0,0 +1,342 @@
+"""
+Local HTTP/JSON service for the gross-up calculation.
+
+    python -m payroll.service --port 8080 --workers 4
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health            {"status": "ok"}
+    POST /gross-up          one employee: {"Basic Pay": 50000, "HRA": 10000, ...}
+                            -> the result keys of the salary components
+    POST /gross-up/batch    {"rows": [{"Basic Pay": 50000, ...}, ...]}
+                            -> {"rows": n, "invalid": k,
+                                "results": [{...} or null, ...],
+                                "errors": [{"row": i, "error": "..."}, ...]}
+
+Inputs use the input keys of the salary components (numbers or numeric
+strings; missing keys take the usual defaults). The components are those of
+the GUI - payroll/components.json, PAYROLL_COMPONENTS or --components - and
+GrossUpService() defaults to STANDARD, the six of calculate_gross_up_salary(). A bad single record gets
+400 with {"error": "..."}; bad rows of a batch do not fail the batch - they
+get null and an entry in "errors".
+
+The server is a plain asyncio stream server speaking HTTP/1.1 with
+keep-alive (no web framework needed). A single record is calculated on the
+event loop - it takes microseconds. A batch body of INLINE_BYTES or more is
+handed, unparsed, to a process pool which decodes the JSON, runs
+ComponentSet.calculate_batch() and encodes the response, so a batch of
+thousands of rows never blocks the loop and other requests keep being
+served meanwhile. The service binds to localhost by default and has no
+authentication: do not expose it beyond the machine.
+
+Load test: benchmarks/bench_service.py.
+"""
+
+import sys
+import json
+import math
+import signal
+import asyncio
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from payroll.components import STANDARD, load_components
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Batch bodies smaller than this (about 50 rows) are cheaper to calculate
+# on the event loop than to send to a worker process
+INLINE_BYTES = 8192
+
+MAX_BODY_BYTES = 32 * 1024 * 1024
+MAX_BATCH_ROWS = 200000
+MAX_HEADER_LINES = 100
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(ValueError):
+    """A request the service answers with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _encode(value):
+    return json.dumps(value, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+def _decode(body):
+    try:
+        return json.loads(body)
+    except ValueError as ex:  # includes UnicodeDecodeError
+        raise HTTPError(400, f"Body is not valid JSON: {ex}")
+
+
+def salary_inputs(data, components=STANDARD):
+    """Input dict for components.calculate() from one JSON object."""
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object of salary components")
+    inputs = {}
+    for key in components.input_defaults:
+        value = data.get(key)
+        if value is None or value == '':
+            continue
+        if isinstance(value, bool):
+            raise ValueError(f"{key} must be a number")
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a number")
+        if not math.isfinite(value):
+            raise ValueError(f"{key} must be a finite number")
+        inputs[key] = value
+    return inputs
+
+
+def calculate_record(data, components=STANDARD):
+    """Result dict for one JSON object. Raises ValueError for bad input."""
+    result = components.calculate(salary_inputs(data, components))
+    if not all(map(math.isfinite, result.values())):
+        raise ValueError("Result is not a finite number")
+    return result
+
+
+def calculate_rows(rows, components=STANDARD):
+    """
+    Calculate a batch of JSON objects in one components.calculate_batch() call.
+
+    Returns:
+        dict: 'rows', 'invalid', 'results' (a dict per row, None for bad
+            rows) and 'errors' ([{'row': i, 'error': message}])
+    """
+    input_defaults = components.input_defaults
+    columns = {key: array('d') for key in input_defaults}
+    errors = {}
+    for i, row in enumerate(rows):
+        try:
+            inputs = salary_inputs(row, components)
+        except ValueError as ex:
+            errors[i] = str(ex)
+            inputs = {}  # placeholder, never returned
+        for key, default in input_defaults.items():
+            columns[key].append(inputs.get(key, default))
+
+    result = components.calculate_batch(columns)
+    for i in result['Invalid Rows']:
+        if i not in errors:
+            try:
+                # Same validation as the batch: the scalar function has the message
+                components.calculate({key: column[i] for key, column in columns.items()})
+            except ValueError as ex:
+                errors[i] = str(ex)
+
+    result_keys = components.result_keys
+    values = [result[key].tolist() if hasattr(result[key], 'tolist') else list(result[key]) for key in result_keys]
+    results = []
+    for i, row in enumerate(zip(*values)):
+        if i not in errors and not all(map(math.isfinite, row)):
+            # Finite inputs can still overflow (Basic Pay 1e308 + HRA 1e308); JSON has no inf
+            errors[i] = "Result is not a finite number"
+        results.append(None if i in errors else dict(zip(result_keys, row)))
+    return {
+        'rows': len(results),
+        'invalid': len(errors),
+        'results': results,
+        'errors': [{'row': i, 'error': errors[i]} for i in sorted(errors)],
+    }
+
+
+def batch_response(body, components=STANDARD):
+    """Worker entry point: raw request body in, (status, JSON bytes) out."""
+    try:
+        request = _decode(body)
+        rows = request.get('rows') if isinstance(request, dict) else None
+        if not isinstance(rows, list):
+            raise HTTPError(400, 'Expected {"rows": [...]}')
+        if len(rows) > MAX_BATCH_ROWS:
+            raise HTTPError(413, f"At most {MAX_BATCH_ROWS} rows per batch")
+        return 200, _encode(calculate_rows(rows, components))
+    except HTTPError as ex:
+        return ex.status, _encode({'error': str(ex)})
+
+
+def record_response(body, components=STANDARD):
+    try:
+        return 200, _encode(calculate_record(_decode(body), components))
+    except HTTPError as ex:
+        return ex.status, _encode({'error': str(ex)})
+    except ValueError as ex:
+        return 400, _encode({'error': str(ex)})
+
+
+async def read_request(reader):
+    """(method, path, body, keep_alive) of the next request, or None at end of connection."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, 'Malformed request line')
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(400, 'Too many header lines')
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, 'Bad Content-Length')
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b''
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+    return method, target.split('?', 1)[0], body, keep_alive
+
+
+class GrossUpService:
+    """
+    The HTTP service. start() binds the socket; the process pool is created
+    on the first large batch.
+
+    Usage:
+        service = GrossUpService(workers=4)
+        await service.start('127.0.0.1', 8080)
+        await service.serve_forever()
+    """
+
+    def __init__(self, workers=None, inline_bytes=INLINE_BYTES, components=STANDARD):
+        self.workers = workers
+        self.inline_bytes = inline_bytes
+        self.components = components
+        self.pool = None
+        self.server = None
+        self.requests = 0
+        self.offloaded = 0
+        self._connections = {}  # handler task -> writer
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Idle keep-alive clients would hold wait_closed() open: hang up on them
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def respond(self, method, path, body):
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(405, 'Use GET')
+            return 200, _encode({'status': 'ok'})
+        if path not in ('/gross-up', '/gross-up/batch'):
+            raise HTTPError(404, f"No endpoint {path}")
+        if method != 'POST':
+            raise HTTPError(405, 'Use POST')
+        if path == '/gross-up':
+            return record_response(body, self.components)
+        if len(body) < self.inline_bytes:
+            return batch_response(body, self.components)
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.offloaded += 1
+        # The ComponentSet pickles as its definition; each worker compiles it once
+        return await asyncio.get_running_loop().run_in_executor(self.pool, batch_response, body, self.components)
+
+    async def handle(self, reader, writer):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as ex:
+                    # The rest of the stream cannot be trusted: answer and hang up
+                    request, keep_alive = None, False
+                    status, payload = ex.status, _encode({'error': str(ex)})
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is not None:
+                    method, path, body, keep_alive = request
+                    try:
+                        status, payload = await self.respond(method, path, body)
+                    except HTTPError as ex:
+                        status, payload = ex.status, _encode({'error': str(ex)})
+                    except Exception as ex:
+                        status, payload = 500, _encode({'error': f"{type(ex).__name__}: {ex}"})
+                elif keep_alive:
+                    break  # client closed the connection
+                self.requests += 1
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                             + payload)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, components=STANDARD):
+    service = GrossUpService(workers=workers, components=components)
+    host, port = await service.start(host, port)
+    try:
+        # SIGTERM shuts down like Ctrl+C, so the worker processes exit too
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    print(f"Gross-up service on http://{host}:{port}", file=sys.stderr, flush=True)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local HTTP/JSON service for the gross-up calculation.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'interface to bind (default {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None, help='batch worker processes (default: CPU count)')
+    parser.add_argument('--components', default=None,
+                        help='salary component definition (default: PAYROLL_COMPONENTS or payroll/components.json)')
+    args = parser.parse_args(argv)
+    try:
+        components = load_components(args.components)
+    except (OSError, ValueError) as ex:
+        parser.error(f"cannot load the salary components: {ex}")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, components))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Embedded SQLite storage for the emp_salary table.
+
+Same 24 columns as emp_salary.sql, stored in a local SQLite file instead of a
+MariaDB server. The database runs in WAL mode, every statement is a fixed
+parameterised SQL string (compiled once and reused from sqlite3's statement
+cache) and whole payroll runs are written with a single executemany() in one
+transaction.
+
+One row is kept per employee per salary month: (code, year, month) is unique.
+Overwriting a month updates its row in place, so rowid stays the save order.
+
+Usage:
+    with SalaryStore('ems.db') as store:
+        store.insert_many(records)             # whole month in one transaction
+        row = store.get(1, month='Jan', year='2025')
+"""
+
+import os
+import sqlite3
+
+from payroll.core import EMP_SALARY_COLUMNS, EmpSalaryRecord
+from payroll.instrument import probe, returned_count, returned_length
+
+# Default database file, next to employee.py. Override with PAYROLL_DB.
+DEFAULT_DB_PATH = os.environ.get(
+    'PAYROLL_DB', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ems.db'))
+
+_QUOTED_COLUMNS = ', '.join(f'"{name}"' for name in EMP_SALARY_COLUMNS)
+
+_COLUMN_DEFINITIONS = ',\n    '.join(['"code" INTEGER NOT NULL'] + [f'"{name}" TEXT NOT NULL' for name in EMP_SALARY_COLUMNS[1:]])
+_UPDATE_ASSIGNMENTS = ', '.join(f'"{name}"=?' for name in EMP_SALARY_COLUMNS[1:])
+_UPSERT_ASSIGNMENTS = ', '.join(f'"{name}"=excluded."{name}"' for name in EMP_SALARY_COLUMNS
+                                if name not in ('code', 'year', 'month'))
+
+# Latest salary month first: 'Jan', 'January' and '1' are all month 1, and
+# ties (the same month spelled differently) go to the last saved row
+_MONTHS = 'JANFEBMARAPRMAYJUNJULAUGSEPOCTNOVDEC'
+_LATEST_FIRST = ('CAST("year" AS INTEGER) DESC, '
+                 'CASE WHEN trim("month") GLOB \'[0-9]*\' THEN CAST(trim("month") AS INTEGER) '
+                 f'ELSE (instr(\'{_MONTHS}\', upper(substr(trim("month"), 1, 3))) + 2) / 3 END DESC, rowid DESC')
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS emp_salary (
+    {_COLUMN_DEFINITIONS}
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_emp_salary_code ON emp_salary ("code", "year", "month");
+CREATE INDEX IF NOT EXISTS idx_emp_salary_period ON emp_salary ("year", "month");
+
+-- Counts every row written, updated or deleted by any program, for stamp()
+CREATE TABLE IF NOT EXISTS emp_salary_changes (
+    "id" INTEGER PRIMARY KEY CHECK ("id" = 0),
+    "changes" INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO emp_salary_changes VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS emp_salary_inserted AFTER INSERT ON emp_salary
+    BEGIN UPDATE emp_salary_changes SET "changes" = "changes" + 1; END;
+CREATE TRIGGER IF NOT EXISTS emp_salary_updated AFTER UPDATE ON emp_salary
+    BEGIN UPDATE emp_salary_changes SET "changes" = "changes" + 1; END;
+CREATE TRIGGER IF NOT EXISTS emp_salary_deleted AFTER DELETE ON emp_salary
+    BEGIN UPDATE emp_salary_changes SET "changes" = "changes" + 1; END;
+'''
+
+SQL_INSERT = f'INSERT INTO emp_salary ({_QUOTED_COLUMNS}) VALUES ({", ".join("?" * len(EMP_SALARY_COLUMNS))})'
+SQL_UPSERT = f'{SQL_INSERT} ON CONFLICT ("code", "year", "month") DO UPDATE SET {_UPSERT_ASSIGNMENTS}'
+SQL_UPDATE = f'UPDATE emp_salary SET {_UPDATE_ASSIGNMENTS} WHERE "code"=? AND "year"=? AND "month"=?'
+SQL_DELETE = 'DELETE FROM emp_salary WHERE "code"=?'
+SQL_DELETE_PERIOD = 'DELETE FROM emp_salary WHERE "code"=? AND "year"=? AND "month"=?'
+SQL_GET = f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE "code"=? ORDER BY {_LATEST_FIRST} LIMIT 1'
+SQL_GET_PERIOD = f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE "code"=? AND "year"=? AND "month"=?'
+SQL_HISTORY = f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE "code"=? ORDER BY rowid'
+SQL_PERIOD = f'SELECT {_QUOTED_COLUMNS} FROM emp_salary WHERE "year"=? AND "month"=? ORDER BY "code"'
+SQL_ALL = f'SELECT {_QUOTED_COLUMNS} FROM emp_salary ORDER BY "code", rowid LIMIT ? OFFSET ?'
+SQL_COUNT = 'SELECT COUNT(*) FROM emp_salary'
+
+# Text columns that hold numbers - sorted numerically in page()
+NUMERIC_COLUMNS = ('age', 'year', 'salary', 'tdays', 'abs', 'medical', 'pf', 'conv', 'net')
+
+
+def period_key(record):
+    """(year, month number) of a record, the order get() picks the latest salary month by."""
+    try:
+        year = int(record.year)
+    except ValueError:
+        year = 0
+    month = str(record.month).strip()
+    return year, int(month) if month.isdigit() else (_MONTHS.find(month[:3].upper()) + 3) // 3
+
+
+def to_record(values):
+    """
+    Build an EmpSalaryRecord from a dict (column -> value) or a 24-value sequence.
+
+    Missing dict columns become ''. Everything except code is stored as text,
+    like the original MariaDB table.
+    """
+    if isinstance(values, dict):
+        values = [values.get(name, '') for name in EMP_SALARY_COLUMNS]
+    if len(values) != len(EMP_SALARY_COLUMNS):
+        raise ValueError(f"Expected {len(EMP_SALARY_COLUMNS)} values, got {len(values)}")
+    code, *rest = values
+    return EmpSalaryRecord(int(code), *('' if value is None else str(value) for value in rest))
+
+
+class SalaryStore:
+    """
+    emp_salary table in a local SQLite file.
+
+    A store is used by one thread at a time. Background threads open their
+    own store on the same file (WAL lets them write while the GUI reads);
+    check_same_thread=False allows closing such a store from another thread.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, check_same_thread=True):
+        self.path = path
+        self.con = sqlite3.connect(path, cached_statements=256, check_same_thread=check_same_thread)
+        self.con.execute('PRAGMA journal_mode=WAL')
+        self.con.execute('PRAGMA synchronous=NORMAL')
+        self.con.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.con.close()
+
+    # ---------------------------------------------------------------- writes
+    @probe('db_write')
+    def insert(self, record):
+        """Insert one record. Raises sqlite3.IntegrityError if (code, year, month) exists."""
+        with self.con:
+            self.con.execute(SQL_INSERT, to_record(record))
+
+    @probe('db_write', returned_count)
+    def insert_many(self, records, replace=False):
+        """
+        Insert a whole payroll run with one executemany() in one transaction.
+
+        Args:
+            records (iterable): dicts, EmpSalaryRecords or 24-value sequences
+            replace (bool): Overwrite existing (code, year, month) rows instead of failing
+
+        Returns:
+            int: Number of rows written
+        """
+        with self.con:
+            cursor = self.con.executemany(SQL_UPSERT if replace else SQL_INSERT, map(to_record, records))
+        return cursor.rowcount
+
+    @probe('db_write')
+    def update(self, record):
+        """Update the row for the record's (code, year, month). Returns True if a row changed."""
+        record = to_record(record)
+        with self.con:
+            cursor = self.con.execute(SQL_UPDATE, record[1:] + (record.code, record.year, record.month))
+        return cursor.rowcount > 0
+
+    @probe('db_write')
+    def delete(self, code, month=None, year=None):
+        """Delete one salary month of an employee, or every month when month/year are not given."""
+        with self.con:
+            if month is None and year is None:
+                cursor = self.con.execute(SQL_DELETE, (int(code),))
+            else:
+                cursor = self.con.execute(SQL_DELETE_PERIOD, (int(code), str(year), str(month)))
+        return cursor.rowcount
+
+    # ----------------------------------------------------------------- reads
+    @probe('db_read')
+    def get(self, code, month=None, year=None):
+        """Return the record for code (latest salary month if month/year not given), or None."""
+        if month is None and year is None:
+            row = self.con.execute(SQL_GET, (int(code),)).fetchone()
+        else:
+            row = self.con.execute(SQL_GET_PERIOD, (int(code), str(year), str(month))).fetchone()
+        return None if row is None else EmpSalaryRecord(*row)
+
+    def exists(self, code, month, year):
+        return self.get(code, month, year) is not None
+
+    def history(self, code):
+        """Every salary month of code, in the order they were saved."""
+        return [EmpSalaryRecord(*row) for row in self.con.execute(SQL_HISTORY, (int(code),))]
+
+    @probe('db_read', returned_length)
+    def period(self, month, year):
+        """All records of one salary month, ordered by code."""
+        return [EmpSalaryRecord(*row) for row in self.con.execute(SQL_PERIOD, (str(year), str(month)))]
+
+    def all(self, limit=-1, offset=0):
+        """All records ordered by code (optionally one page of them)."""
+        return [EmpSalaryRecord(*row) for row in self.con.execute(SQL_ALL, (limit, offset))]
+
+    def iter_records(self):
+        """Every record in insertion order (later months of a code come later)."""
+        yield from map(EmpSalaryRecord._make, self.con.execute(f'SELECT {_QUOTED_COLUMNS} FROM emp_salary ORDER BY rowid'))
+
+    def stamp(self):
+        """(row count, last rowid, change counter) - changes whenever a row is added, updated or deleted."""
+        return tuple(self.con.execute('SELECT COUNT(*), MAX(rowid), (SELECT "changes" FROM emp_salary_changes) '
+                                      'FROM emp_salary').fetchone())
+
+    def count(self, filter_column=None, filter_text=None):
+        """Number of records (matching the filter, see page())."""
+        if not filter_text:
+            return self.con.execute(SQL_COUNT).fetchone()[0]
+        return self.con.execute(*_count_query('emp_salary', filter_column, filter_text)).fetchone()[0]
+
+    def page(self, offset, limit, sort=None, descending=False, filter_column=None, filter_text=None):
+        """
+        One page of records, sorted and filtered in SQLite.
+
+        Args:
+            offset (int): Rows to skip
+            limit (int): Rows to return
+            sort (str): Column to sort by (default code). Numeric text
+                columns such as net and salary sort as numbers.
+            descending (bool): Reverse the sort
+            filter_column (str): Column to filter on, or None for any of name,
+                designation, email, hl and status
+            filter_text (str): Keep rows whose filter column contains this text
+
+        Returns:
+            list: EmpSalaryRecords
+        """
+        sql, params = _page_query('emp_salary', 'rowid', offset, limit, sort, descending, filter_column, filter_text)
+        return [EmpSalaryRecord(*row) for row in self.con.execute(sql, params)]
+
+
+# Columns searched when filtering without a column
+_DEFAULT_FILTER_COLUMNS = ('name', 'designation', 'email', 'hl', 'status')
+
+
+def _count_query(source, filter_column, filter_text):
+    """(SQL, params) of count() over source - emp_salary or a subquery with its columns."""
+    where, params = _filter_clause(filter_column, filter_text)
+    return f'SELECT COUNT(*) FROM {source} {where}', params
+
+
+def _page_query(source, row, offset, limit, sort, descending, filter_column, filter_text):
+    """(SQL, params) of page() over source; ties are ordered by its row column (rowid for emp_salary)."""
+    sort = sort or 'code'
+    if sort not in EMP_SALARY_COLUMNS:
+        raise ValueError(f"Unknown column: {sort}")
+    key = f'CAST("{sort}" AS REAL)' if sort in NUMERIC_COLUMNS else f'"{sort}"'
+    direction = 'DESC' if descending else 'ASC'
+    where, params = _filter_clause(filter_column, filter_text)
+    sql = (f'SELECT {_QUOTED_COLUMNS} FROM {source} {where} '
+           f'ORDER BY {key} {direction}, {row} {direction} LIMIT ? OFFSET ?')
+    return sql, params + (limit, offset)
+
+
+def _filter_clause(filter_column, filter_text):
+    if not filter_text:
+        return '', ()
+    if filter_column is not None and filter_column not in EMP_SALARY_COLUMNS:
+        raise ValueError(f"Unknown column: {filter_column}")
+    columns = (filter_column,) if filter_column else _DEFAULT_FILTER_COLUMNS
+    pattern = '%' + filter_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    where = ' OR '.join(f"CAST(\"{name}\" AS TEXT) LIKE ? ESCAPE '\\'" for name in columns)
+    return f'WHERE {where}', (pattern,) * len(columns)
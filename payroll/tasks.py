@@ -0,0 +1,154 @@
+"""
+Background tasks for the Tk window.
+
+Slow work (database writes, bulk receipt exports, printing) runs on a small
+thread pool; everything that touches widgets runs on the Tk thread. Results,
+errors and progress are handed back through root.after() polling:
+
+    - a worker finishing puts (task, outcome, value) on a queue
+    - progress reports only overwrite the task's latest value, so a fast
+      worker cannot flood the event loop
+    - each poll handles callbacks for at most FRAME_BUDGET seconds and then
+      yields back to Tk, so the window keeps redrawing (< 50 ms per frame,
+      provided the callbacks themselves are short)
+    - polling only runs while tasks are in flight
+
+Worker functions receive their Task as the first argument and call
+task.progress(done, total) and task.check() (raises TaskCancelled once the
+user pressed Cancel) between chunks of work.
+
+Only .after() is needed from `root`, so the runner can be driven by a fake
+scheduler in tests.
+
+Usage:
+    runner = TaskRunner(root, on_busy=set_buttons_disabled, on_progress=update_bar)
+    runner.submit(export, month, year, on_done=show_summary, bulk=True)
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 15
+FRAME_BUDGET = 0.02  # seconds of callbacks per poll
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check() in a worker after the task was cancelled."""
+
+
+class Task:
+    """Handle of one submitted task, shared by the worker and the Tk thread."""
+
+    def __init__(self, name, bulk, on_done, on_error, on_cancel):
+        self.name = name
+        self.bulk = bulk
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self._cancel = threading.Event()
+        self._progress = None       # latest (done, total, text) from the worker
+        self._shown_progress = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    # ------------------------------------------------- called by workers
+    def check(self):
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def progress(self, done, total=None, text=''):
+        self._progress = (done, total, text)
+
+
+class TaskRunner:
+    """Thread pool whose results are delivered on the Tk thread via root.after()."""
+
+    def __init__(self, root, max_workers=2, on_busy=None, on_progress=None):
+        self.root = root
+        self.on_busy = on_busy
+        self.on_progress = on_progress
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='payroll-task')
+        self.tasks = []
+        self._finished = queue.SimpleQueue()
+        self._polling = False
+
+    @property
+    def busy(self):
+        return bool(self.tasks)
+
+    def submit(self, function, *args, on_done=None, on_error=None, on_cancel=None, bulk=False, name=None):
+        """
+        Run function(task, *args) on the pool.
+
+        on_done(result), on_error(exception) and on_cancel() are called on
+        the Tk thread. Bulk tasks report progress through on_progress.
+        """
+        task = Task(name or getattr(function, '__name__', 'task'), bulk, on_done, on_error, on_cancel)
+        if not self.tasks and self.on_busy is not None:
+            self.on_busy(True)
+        self.tasks.append(task)
+        self.executor.submit(self._run, task, function, args)
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+        return task
+
+    def _run(self, task, function, args):
+        try:
+            task.check()
+            result = function(task, *args)
+        except TaskCancelled:
+            self._finished.put((task, 'cancelled', None))
+        except BaseException as e:
+            self._finished.put((task, 'error', e))
+        else:
+            self._finished.put((task, 'done', result))
+
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+
+    def _poll(self):
+        try:
+            self._deliver(time.perf_counter() + FRAME_BUDGET)
+        finally:
+            if self.tasks or not self._finished.empty():
+                # Come straight back if callbacks are still queued, else at the normal rate
+                self.root.after(1 if not self._finished.empty() else POLL_MS, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self, deadline):
+        if self.on_progress is not None:
+            for task in self.tasks:
+                if task.bulk and task._progress is not None and task._progress != task._shown_progress:
+                    task._shown_progress = task._progress
+                    self.on_progress(task, *task._progress)
+
+        while time.perf_counter() < deadline:
+            try:
+                task, outcome, value = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            self.tasks.remove(task)
+            # Idle first, so callbacks can set button states of their own
+            if not self.tasks and self.on_busy is not None:
+                self.on_busy(False)
+            if outcome == 'done' and task.on_done is not None:
+                task.on_done(value)
+            elif outcome == 'error' and task.on_error is not None:
+                task.on_error(value)
+            elif outcome == 'cancelled' and task.on_cancel is not None:
+                task.on_cancel()
+
+    def shutdown(self, wait=True):
+        """Cancel everything and stop the pool (callbacks are not delivered any more)."""
+        self.cancel_all()
+        self.executor.shutdown(wait=wait)
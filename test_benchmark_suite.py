@@ -0,0 +1,40 @@
+"""
+TEST FILE: Benchmark Suite Smoke Test
+======================================
+
+Runs benchmarks/bench_suite.py on a tiny workforce: the JSON file has every
+benchmark, a matching baseline passes and a much faster baseline fails.
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+import bench_suite
+
+
+def test_suite_writes_json_and_compares(tmp_path):
+    output = tmp_path / 'bench.json'
+    args = ['--sizes', '200', '--repeat', '1', '--workers', '1', '--skip-startup']
+    assert bench_suite.main(args + ['--output', str(output)]) == 0
+
+    document = json.loads(output.read_text())
+    names = {name.split('/')[0] for name in document['results']}
+    assert names == {'scalar', 'scalar_paise', 'rules_scalar', 'batch', 'batch_paise', 'rules_batch',
+                     'reverse_batch', 'parallel', 'receipts', 'storage_insert', 'storage_lookup'}
+    assert all(result['rows'] == 200 for result in document['results'].values())
+
+    # Generous tolerance against itself passes; a baseline 100x faster fails
+    assert bench_suite.main(args + ['--baseline', str(output), '--max-slowdown', '50']) == 0
+    for result in document['results'].values():
+        result['rows_per_second'] *= 100
+    faster = tmp_path / 'faster.json'
+    faster.write_text(json.dumps(document))
+    assert bench_suite.main(args + ['--baseline', str(faster)]) == 1
+
+
+def test_parse_size():
+    assert [bench_suite.parse_size(text) for text in ('1k', '100K', '1m', '2500', '1.5k')] == [
+        1000, 100000, 1000000, 2500, 1500]
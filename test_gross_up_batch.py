@@ -0,0 +1,89 @@
+"""
+TEST FILE: Batch (Columnar) Gross-Up Calculation
+=================================================
+
+Checks that calculate_gross_up_batch() matches calculate_gross_up_salary()
+bit-for-bit and reports invalid rows instead of stopping the batch.
+Runs with NumPy when installed and always with the plain Python fallback.
+"""
+
+import sys
+import os
+import math
+from array import array
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import calculate_gross_up_salary, calculate_gross_up_batch
+
+
+SAMPLE_ROWS = [
+    {'Basic Pay': 50000, 'HRA': 10000, 'Over Time': 5000, 'Other Allowances': 2000, 'PF Percentage': 12, 'Other Deductions': 1000},
+    {'Basic Pay': 60000, 'HRA': 15000, 'Over Time': 0, 'Other Allowances': 5000, 'PF Percentage': 15, 'Other Deductions': 0},
+    {'Basic Pay': 30000, 'HRA': 0, 'Over Time': 0, 'Other Allowances': 0, 'PF Percentage': 12, 'Other Deductions': 0},
+    {'Basic Pay': 12345.67, 'HRA': 2469.13, 'Over Time': 333.33, 'Other Allowances': 0.01, 'PF Percentage': 12.5, 'Other Deductions': 99.99},
+    {'Basic Pay': 0.1, 'HRA': 0.2, 'Over Time': 0.3, 'Other Allowances': 0.7, 'PF Percentage': 0, 'Other Deductions': 0.3},
+]
+
+OUTPUT_KEYS = ['Basic Pay', 'HRA', 'Over Time', 'Other Allowances', 'PF Percentage', 'Other Deductions',
+               'Total Inclusions', 'PF Amount', 'Total Deductions', 'Gross Salary', 'Net Salary']
+
+
+def to_columns(rows, typecode='d'):
+    keys = dict.fromkeys(key for row in rows for key in row)
+    return {key: array(typecode, [row.get(key, 0) for row in rows]) for key in keys}
+
+
+def test_batch_matches_scalar_bit_for_bit(engine):
+    """Every output column equals the scalar result exactly"""
+    result = calculate_gross_up_batch(to_columns(SAMPLE_ROWS))
+
+    assert result['Invalid Rows'] == []
+    for i, row in enumerate(SAMPLE_ROWS):
+        expected = calculate_gross_up_salary(row)
+        for key in OUTPUT_KEYS:
+            assert float(result[key][i]).hex() == expected[key].hex(), (i, key)
+
+
+def test_missing_columns_use_scalar_defaults(engine):
+    """Only Basic Pay given - PF defaults to 12%, everything else to 0"""
+    result = calculate_gross_up_batch({'Basic Pay': [30000, 45000]})
+    for i, basic in enumerate([30000, 45000]):
+        expected = calculate_gross_up_salary({'Basic Pay': basic})
+        for key in OUTPUT_KEYS:
+            assert float(result[key][i]) == expected[key]
+
+
+def test_invalid_rows_are_masked_not_raised(engine):
+    """Bad rows come back in the mask and index list, good rows still compute"""
+    rows = [
+        {'Basic Pay': 50000, 'PF Percentage': 12},
+        {'Basic Pay': 0, 'PF Percentage': 12},       # Basic <= 0
+        {'Basic Pay': 40000, 'PF Percentage': -1},   # PF below 0
+        {'Basic Pay': 40000, 'PF Percentage': 100},  # PF >= 100
+        {'Basic Pay': 40000, 'PF Percentage': 150},  # PF above 100
+        {'Basic Pay': -5, 'PF Percentage': 10},      # Basic <= 0
+        {'Basic Pay': 35000, 'PF Percentage': 10},
+        {'Basic Pay': math.nan, 'PF Percentage': 10},  # NaN fails every comparison
+        {'Basic Pay': 35000, 'PF Percentage': math.nan},
+        {'Basic Pay': 35000, 'HRA': math.inf, 'PF Percentage': 10},
+    ]
+    result = calculate_gross_up_batch(to_columns(rows))
+
+    assert result['Invalid Rows'] == [1, 2, 3, 4, 5, 7, 8, 9]
+    assert [bool(flag) for flag in result['Invalid Mask']] == [False] + [True] * 5 + [False] + [True] * 3
+    for i in result['Invalid Rows']:
+        with pytest.raises(ValueError):
+            calculate_gross_up_salary(rows[i])
+        assert math.isnan(result['Gross Salary'][i])
+        assert math.isnan(result['Net Salary'][i])
+    assert result['Net Salary'][6] == calculate_gross_up_salary(rows[6])['Net Salary']
+
+
+def test_column_length_mismatch():
+    with pytest.raises(ValueError):
+        calculate_gross_up_batch({'Basic Pay': [1, 2, 3], 'HRA': [1, 2]})
+    with pytest.raises(ValueError):
+        calculate_gross_up_batch({'HRA': [1, 2]})
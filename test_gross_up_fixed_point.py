@@ -0,0 +1,131 @@
+"""
+TEST FILE: Exact (Integer Paise) Gross-Up Calculation
+======================================================
+
+Checks the fixed-point mode of payroll/core.py: the documented half-up
+rounding rule against a Decimal reference, scalar/batch agreement with and
+without NumPy, and exact totals.
+"""
+
+import sys
+import os
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll import core
+from payroll.core import (calculate_gross_up_paise, calculate_gross_up_batch_paise, calculate_gross_up_salary,
+                          paise_inputs, paise_result_to_rupees, rupees_to_paise, percent_to_basis_points)
+
+OUTPUT_KEYS = ['Basic Pay', 'HRA', 'Over Time', 'Other Allowances', 'PF Percentage', 'Other Deductions',
+               'Total Inclusions', 'PF Amount', 'Total Deductions', 'Gross Salary', 'Net Salary']
+
+
+def reference(row):
+    """The rounding rule written out with Decimal."""
+    def half_up(value):
+        return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    inclusions = row['Basic Pay'] + row['HRA'] + row['Over Time'] + row['Other Allowances']
+    pf_amount = half_up(Decimal(row['Basic Pay']) * row['PF Percentage'] / 10000)
+    gross = half_up(Decimal(inclusions) * 10000 / (10000 - row['PF Percentage']))
+    return {'PF Amount': pf_amount, 'Gross Salary': gross,
+            'Net Salary': gross - pf_amount - row['Other Deductions']}
+
+
+def random_rows(count, seed=7):
+    rng = random.Random(seed)
+    return [{'Basic Pay': rng.randrange(1, 50_000_00), 'HRA': rng.randrange(0, 20_000_00),
+             'Over Time': rng.randrange(0, 5_000_00), 'Other Allowances': rng.randrange(0, 3_000_00),
+             'PF Percentage': rng.randrange(0, 10000), 'Other Deductions': rng.randrange(0, 1_000_00)}
+            for _ in range(count)]
+
+
+def test_conversions():
+    assert rupees_to_paise(50000) == 5000000
+    assert rupees_to_paise('1.005') == 101          # half up on the decimal value
+    assert rupees_to_paise(1.005) == 101            # floats use their shortest repr
+    assert rupees_to_paise(' 12345.67 ') == 1234567
+    assert percent_to_basis_points(12) == 1200
+    assert percent_to_basis_points('12.505') == 1251
+    assert paise_inputs({'Basic Pay': 50000, 'PF Percentage': 12.5}) == {'Basic Pay': 5000000, 'PF Percentage': 1250}
+
+
+def test_documented_example_and_ties():
+    result = calculate_gross_up_paise(paise_inputs({'Basic Pay': 50000, 'HRA': 10000, 'Over Time': 5000,
+                                                    'Other Allowances': 2000, 'PF Percentage': 12,
+                                                    'Other Deductions': 1000}))
+    assert result['Gross Salary'] == 7613636         # 7613636.36... rounds down
+    assert result['PF Amount'] == 600000
+    assert result['Net Salary'] == 6913636
+    assert result['Net Salary'] + result['Total Deductions'] == result['Gross Salary']
+
+    # 2 paise / 0.80 = 2.5 -> 3;  1 paisa x 50% = 0.5 -> 1
+    tie = calculate_gross_up_paise({'Basic Pay': 1, 'HRA': 1, 'PF Percentage': 2000})
+    assert tie['Gross Salary'] == 3
+    assert calculate_gross_up_paise({'Basic Pay': 1, 'PF Percentage': 5000})['PF Amount'] == 1
+
+
+def test_matches_decimal_reference_and_float_mode():
+    for row in random_rows(2000):
+        result = calculate_gross_up_paise(row)
+        for key, value in reference(row).items():
+            assert result[key] == value, (row, key)
+
+        # Within half a paisa of the float calculation
+        rupees = paise_result_to_rupees(result)
+        expected = calculate_gross_up_salary({key: value / 100 for key, value in row.items()})
+        assert abs(rupees['Gross Salary'] - expected['Gross Salary']) <= 0.005 + 1e-9
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        calculate_gross_up_paise({'Basic Pay': 0})
+    with pytest.raises(ValueError):
+        calculate_gross_up_paise({'Basic Pay': 100, 'PF Percentage': 10000})
+    with pytest.raises(ValueError):
+        calculate_gross_up_paise({'Basic Pay': 100, 'PF Percentage': -1})
+
+    # Fractional paise are rejected, not truncated
+    assert calculate_gross_up_paise({'Basic Pay': 123400.0, 'HRA': '500'}) == \
+        calculate_gross_up_paise({'Basic Pay': 123400, 'HRA': 500})
+    for bad in (123499.99, '1234.5', float('inf'), float('nan'), 'abc'):
+        with pytest.raises(ValueError):
+            calculate_gross_up_paise({'Basic Pay': bad})
+
+
+def test_batch_matches_scalar(engine):
+    rows = random_rows(500)
+    rows[3]['Basic Pay'] = 0
+    rows[7]['PF Percentage'] = 10000
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+
+    result = calculate_gross_up_batch_paise(columns)
+
+    assert result['Invalid Rows'] == [3, 7]
+    for i, row in enumerate(rows):
+        if i in (3, 7):
+            assert result['Net Salary'][i] == 0 and result['Gross Salary'][i] == 0
+            continue
+        expected = calculate_gross_up_paise(row)
+        assert [int(result[key][i]) for key in OUTPUT_KEYS] == [expected[key] for key in OUTPUT_KEYS], i
+
+    # Department totals are exact sums of the per-employee values
+    valid = [i for i in range(len(rows)) if i not in (3, 7)]
+    assert sum(int(result['Net Salary'][i]) for i in valid) == sum(calculate_gross_up_paise(rows[i])['Net Salary']
+                                                                   for i in valid)
+
+
+def test_batch_rejects_fractional_paise(engine):
+    assert list(calculate_gross_up_batch_paise({'Basic Pay': [5000000.0]})['Gross Salary']) == \
+        list(calculate_gross_up_batch_paise({'Basic Pay': [5000000]})['Gross Salary'])
+    with pytest.raises(ValueError):
+        calculate_gross_up_batch_paise({'Basic Pay': [5000000, 123499.99]})
+
+
+def test_batch_defaults(engine):
+    result = calculate_gross_up_batch_paise({'Basic Pay': [5000000]})
+    assert int(result['PF Percentage'][0]) == 1200
+    assert int(result['Gross Salary'][0]) == calculate_gross_up_paise({'Basic Pay': 5000000})['Gross Salary']
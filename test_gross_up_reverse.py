@@ -0,0 +1,78 @@
+"""
+TEST FILE: Reverse Gross-Up Solver
+===================================
+
+Checks payroll/reverse.py: the solved Basic/HRA/Allowances give exactly the
+target net through the forward calculation, the split policy is followed,
+and the batch solver (NumPy and pure Python) matches the scalar one.
+"""
+
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll import core
+from payroll.core import SALARY_RESULT_KEYS, calculate_gross_up_paise, calculate_gross_up_salary
+from payroll.reverse import solve_gross_up, solve_gross_up_batch_paise, solve_gross_up_paise
+
+
+def offers(count, seed=7):
+    rng = random.Random(seed)
+    return {
+        'Net Salary': [rng.randrange(1500000, 40000000) for _ in range(count)],
+        'PF Percentage': [rng.choice([0, 1, 100, 1000, 1200, 1250, 1500, 2400, 6000]) for _ in range(count)],
+        'Other Deductions': [rng.randrange(0, 250000) for _ in range(count)],
+        'HRA Percentage': [rng.choice([0, 4000, 5000]) for _ in range(count)],
+        'Allowance Percentage': [rng.choice([0, 1500]) for _ in range(count)],
+        'Over Time': [rng.choice([0, 350000]) for _ in range(count)],
+    }
+
+
+def test_rupee_offer_hits_target():
+    result = solve_gross_up({'Net Salary': 60000, 'PF Percentage': 12, 'HRA Percentage': 50})
+    assert result['Net Salary'] == 60000
+    assert result['HRA'] == round(result['Basic Pay'] * 0.5, 2)
+    assert 0 <= result['Other Allowances'] < 0.05
+    forward = calculate_gross_up_salary({key: result[key] for key in
+                                         ('Basic Pay', 'HRA', 'Over Time', 'Other Allowances', 'PF Percentage')})
+    assert round(forward['Net Salary'], 2) == 60000
+
+
+def test_every_offer_exact_to_the_paisa():
+    columns = offers(3000)
+    for i in range(3000):
+        row = {name: values[i] for name, values in columns.items()}
+        result = solve_gross_up_paise(row)
+        assert result['Net Salary'] == row['Net Salary']
+        assert result == calculate_gross_up_paise({key: result[key] for key in core.PAISE_INPUT_DEFAULTS})
+        assert result['HRA'] == (2 * result['Basic Pay'] * row['HRA Percentage'] + 10000) // 20000
+        assert result['Other Allowances'] >= result['Basic Pay'] * row['Allowance Percentage'] // 10000
+
+
+def test_rejected_offers():
+    with pytest.raises(ValueError):
+        solve_gross_up_paise({'Net Salary': 0})
+    with pytest.raises(ValueError):
+        solve_gross_up_paise({'Net Salary': 100000, 'PF Percentage': 10000})
+    with pytest.raises(ValueError, match='too small'):
+        solve_gross_up_paise({'Net Salary': 100000, 'Over Time': 500000})
+
+
+def test_batch_matches_scalar(engine):
+    columns = offers(2000, seed=11)
+    columns['Net Salary'][5] = -1
+    columns['Over Time'][9] = 10 ** 9
+    result = solve_gross_up_batch_paise(columns)
+    assert result['Invalid Rows'] == [5, 9]
+    for i in range(2000):
+        row = {name: values[i] for name, values in columns.items()}
+        if i in (5, 9):
+            assert result['Net Salary'][i] == 0 and result['Basic Pay'][i] == 0
+            assert result['Other Deductions'][i] == row['Other Deductions']
+            continue
+        expected = solve_gross_up_paise(row)
+        assert [int(result[key][i]) for key in SALARY_RESULT_KEYS] == [expected[key] for key in SALARY_RESULT_KEYS]
@@ -0,0 +1,108 @@
+"""
+TEST FILE: Indexed Receipt Archive
+===================================
+
+Checks payroll/archive.py: importing Salary_Receipt/*.txt, byte-exact
+extraction, replacing receipts, recovery from an interrupted append and
+archiving a whole payroll run.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.archive import (INDEX_RECORD, ReceiptArchive, archive_receipts, extract_text_files,
+                             import_text_files, read_receipt_key)
+from payroll.core import calculate_gross_up_batch, calculate_gross_up_salary
+from payroll.receipts import render_receipt
+
+RECEIPT_DIR = os.path.join(os.path.dirname(__file__), 'Salary_Receipt')
+
+
+def test_import_and_extract_round_trip(tmp_path):
+    (tmp_path / 'notes.txt').write_text('not a receipt')
+    with ReceiptArchive(str(tmp_path / 'archive')) as archive:
+        summary = import_text_files(archive, RECEIPT_DIR)
+        assert summary['imported'] == 10 and summary['skipped'] == []
+        assert archive.periods() == [(2025, 'Jan')]
+        assert archive.codes(2025, 'January') == list(range(1, 11))
+
+        written = extract_text_files(archive, 2025, 1, str(tmp_path / 'out'))
+        assert written == 10
+
+        assert import_text_files(archive, [str(tmp_path / 'notes.txt')])['skipped'] == [str(tmp_path / 'notes.txt')]
+        assert archive.get(99, 2025, 'Jan') is None
+
+    for name in os.listdir(RECEIPT_DIR):
+        with open(os.path.join(RECEIPT_DIR, name), 'rb') as original, open(tmp_path / 'out' / name, 'rb') as copy:
+            assert copy.read() == original.read()
+
+
+def test_replace_and_reopen(tmp_path):
+    path = str(tmp_path / 'archive')
+    with ReceiptArchive(path) as archive:
+        archive.append(5, 2025, 'Feb', 'first')
+        assert archive.get_text(5, 2025, 'Feb') == 'first'
+        archive.append(5, 2025, 'Feb', 'second version')
+        archive.append(6, 2025, 'Feb', 'other')
+        assert archive.get_text(5, 2025, 'Feb') == 'second version'
+
+    with ReceiptArchive(path) as archive:
+        view = archive.get(5, 2025, 'Feb')
+        assert isinstance(view, memoryview) and view.readonly
+        assert bytes(view) == b'second version'
+        assert archive.codes(2025, 'Feb') == [5, 6]
+
+
+def test_interrupted_append_is_ignored(tmp_path):
+    path = str(tmp_path / 'archive')
+    with ReceiptArchive(path) as archive:
+        archive.append(1, 2025, 'Mar', 'kept')
+
+    # Data written without its index record, then a torn index record
+    with open(os.path.join(path, '2025-03.dat'), 'ab') as f:
+        f.write(b'lost receipt')
+    with open(os.path.join(path, '2025-03.idx'), 'ab') as f:
+        f.write(INDEX_RECORD.pack(2, 4, 12)[:7])
+
+    with ReceiptArchive(path) as archive:
+        assert archive.codes(2025, 'Mar') == [1]
+        archive.append(3, 2025, 'Mar', 'after crash')
+    with ReceiptArchive(path) as archive:
+        assert archive.codes(2025, 'Mar') == [1, 3]
+        assert archive.get_text(3, 2025, 'Mar') == 'after crash'
+    assert os.path.getsize(os.path.join(path, '2025-03.idx')) == 2 * INDEX_RECORD.size
+
+
+def test_archive_payroll_run(tmp_path):
+    result = calculate_gross_up_batch({'Basic Pay': [50000, 0, 42000], 'PF Percentage': [12, 12, 10]})
+    with ReceiptArchive(str(tmp_path / 'archive')) as archive:
+        summary = archive_receipts(result, [11, 12, 13], archive, 'Apr', '2025', generated_on='30-04-2025')
+        assert (summary['written'], summary['skipped']) == (2, 1)
+        assert archive.codes(2025, 'Apr') == [11, 13]
+
+        text = archive.get_text(13, 2025, 'Apr')
+        expected = render_receipt(calculate_gross_up_salary({'Basic Pay': 42000, 'PF Percentage': 10}),
+                                  13, 'Apr', '2025', generated_on='30-04-2025')
+        assert text == expected
+        assert read_receipt_key(text.encode()) == (13, 2025, 'Apr')
+
+
+def test_index_past_truncated_data_is_cut_off(tmp_path):
+    path = str(tmp_path / 'archive')
+    with ReceiptArchive(path) as archive:
+        archive.append(1, 2025, 'Apr', 'kept')
+        archive.append(2, 2025, 'Apr', 'lost with the tail')
+
+    # The .dat tail is gone, its index record is not
+    with open(os.path.join(path, '2025-04.dat'), 'r+b') as f:
+        f.truncate(4)
+
+    with ReceiptArchive(path) as archive:
+        assert archive.codes(2025, 'Apr') == [1]
+        archive.append(3, 2025, 'Apr', 'appended after the loss')
+    with ReceiptArchive(path) as archive:
+        assert archive.codes(2025, 'Apr') == [1, 3] and archive.get(2, 2025, 'Apr') is None
+        assert archive.get_text(3, 2025, 'Apr') == 'appended after the loss'
+    assert os.path.getsize(os.path.join(path, '2025-04.idx')) == 2 * INDEX_RECORD.size
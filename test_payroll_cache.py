@@ -0,0 +1,128 @@
+"""
+TEST FILE: Gross-Up Result Cache
+=================================
+
+Checks payroll/cache.py: LRU eviction and counters, read-only results,
+cached errors, and that cached calculations accept and reject the same
+inputs as the uncached functions and match their results.
+"""
+
+import sys
+import os
+import math
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.cache import GrossUpCache
+from payroll.core import (SALARY_RESULT_KEYS, calculate_gross_up_batch, calculate_gross_up_batch_paise,
+                          calculate_gross_up_paise, calculate_gross_up_salary)
+from payroll.pipeline import run_payroll_file
+
+
+def graded_columns(rows, seed=3):
+    rng = random.Random(seed)
+    grades = [(20000 + 2500 * g, 4000 + 500 * g, [10, 12, 15][g % 3]) for g in range(20)]
+    picked = [rng.choice(grades) for _ in range(rows)]
+    return {'Basic Pay': [g[0] for g in picked], 'HRA': [g[1] for g in picked],
+            'PF Percentage': [g[2] for g in picked], 'Other Deductions': [rng.choice([0, 500]) for _ in picked]}
+
+
+def test_scalar_hits_misses_and_eviction():
+    cache = GrossUpCache(maxsize=2)
+    first = cache.calculate({'Basic Pay': 50000, 'HRA': 10000})
+    again = cache.calculate({'Basic Pay': '50000', 'HRA': 10000.0, 'PF Percentage': 12})
+    assert again is first
+    assert dict(first) == calculate_gross_up_salary({'Basic Pay': 50000, 'HRA': 10000})
+    assert cache.info() == (1, 1, 2, 1)
+
+    cache.calculate({'Basic Pay': 60000})
+    cache.calculate({'Basic Pay': 50000, 'HRA': 10000})   # refresh - 60000 is now oldest
+    cache.calculate({'Basic Pay': 70000})                 # evicts 60000
+    assert len(cache) == 2
+    cache.calculate({'Basic Pay': 60000})
+    assert cache.info().misses == 4
+
+
+def test_results_are_read_only():
+    cache = GrossUpCache()
+    result = cache.calculate({'Basic Pay': 50000})
+    with pytest.raises(TypeError):
+        result['Net Salary'] = 0
+    copy = dict(result)
+    copy['Net Salary'] = 0
+    assert cache.calculate({'Basic Pay': 50000})['Net Salary'] != 0
+
+
+def test_invalid_inputs_raise_every_time():
+    cache = GrossUpCache()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Basic Pay"):
+            cache.calculate({'Basic Pay': 0})
+    assert cache.info().hits == 1
+
+
+def test_batch_matches_uncached(engine):
+    columns = graded_columns(2000)
+    columns['Basic Pay'][5] = 0
+    columns['PF Percentage'][9] = 100
+    cache = GrossUpCache()
+
+    result = cache.calculate_batch(columns)
+    expected = calculate_gross_up_batch(columns)
+
+    assert result['Invalid Rows'] == expected['Invalid Rows'] == [5, 9]
+    assert list(result['Invalid Mask']) == list(expected['Invalid Mask'])
+    assert type(result['Net Salary']) is type(expected['Net Salary'])
+    for name in SALARY_RESULT_KEYS:
+        for got, want in zip(result[name], expected[name]):
+            assert (math.isnan(got) and math.isnan(want)) or float(got).hex() == float(want).hex(), name
+    distinct = len(set(zip(*(columns[name] for name in ('Basic Pay', 'HRA', 'PF Percentage', 'Other Deductions')))))
+    assert cache.info().misses == distinct
+
+    # A second chunk with the same pay grades is all hits
+    cache.calculate_batch(graded_columns(500, seed=4))
+    assert cache.info().misses == distinct
+
+
+def test_exact_mode_batch(engine):
+    columns = {name: [int(v * 100) for v in values] for name, values in graded_columns(300).items()}
+    columns['PF Percentage'] = [v * 100 for v in graded_columns(300)['PF Percentage']]
+    result = GrossUpCache(exact=True).calculate_batch(columns)
+    expected = calculate_gross_up_batch_paise(columns)
+    for name in SALARY_RESULT_KEYS:
+        assert list(result[name]) == list(expected[name]), name
+
+
+def test_pipeline_with_cache(tmp_path):
+    source = tmp_path / 'in.csv'
+    source.write_text('Emp_ID,Basic_Pay,PF_Percent\n1,50000,12\n2,60000,15\n3,abc,12\n4,50000,12\n')
+    cache = GrossUpCache()
+    run_payroll_file(str(source), str(tmp_path / 'cached.csv'), chunk_size=2, progress=None, cache=cache)
+    run_payroll_file(str(source), str(tmp_path / 'plain.csv'), chunk_size=2, progress=None)
+    assert (tmp_path / 'cached.csv').read_text() == (tmp_path / 'plain.csv').read_text()
+    assert cache.info().hits >= 1
+
+
+def test_exact_mode_converts_like_the_engine(engine):
+    cache = GrossUpCache(exact=True)
+    for value in (5000000.5, '5000000.5', 'abc'):
+        with pytest.raises(ValueError, match="whole number of paise"):
+            cache.calculate({'Basic Pay': value})
+        with pytest.raises(ValueError, match="whole number of paise"):
+            calculate_gross_up_paise({'Basic Pay': value})
+    expected = calculate_gross_up_paise({'Basic Pay': 5000000, 'HRA': 100})
+    assert dict(cache.calculate({'Basic Pay': '5000000.0', 'HRA': 100.0})) == expected
+    assert dict(cache.calculate({'Basic Pay': 5000000.0, 'HRA': '100'})) == expected
+    assert cache.info().hits == 1
+
+    for columns in ({'Basic Pay': [5000000.5, 100.9]}, {'Basic Pay': ['5000000', '100.5']}):
+        with pytest.raises(ValueError, match="whole number"):
+            cache.calculate_batch(columns)
+        with pytest.raises(ValueError, match="whole number"):
+            calculate_gross_up_batch_paise(columns)
+    for columns in ({'Basic Pay': [5000000.0, 100.0]}, {'Basic Pay': ['5000000.0', '100']}):
+        result = cache.calculate_batch(columns)
+        assert list(result['Gross Salary']) == list(calculate_gross_up_batch_paise(columns)['Gross Salary'])
@@ -0,0 +1,136 @@
+"""
+TEST FILE: Headless Payroll Run
+================================
+
+Checks payroll/cli.py: a run calculates, saves and archives a salary sheet
+chunk by chunk with the salary components of the definition file, reports
+bad rows in the JSON summary and exit code, and an interrupted run resumes
+from the last completed chunk.
+"""
+
+import sys
+import os
+import csv
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.archive import ReceiptArchive
+from payroll.cli import EXIT_INPUT, EXIT_OK, EXIT_ROW_ERRORS, EXIT_USAGE, checkpoint_path, main, run_batch
+from payroll.storage import SalaryStore
+
+
+def write_sheet(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Emp Code', 'Name', 'Designation', 'Basic Pay', 'HRA', 'PF Percentage'])
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    return write_sheet(tmp_path / 'salaries.csv', [[code, f'Employee {code}', 'Clerk', 50000, 10000, 12]
+                                                   for code in range(1, 11)])
+
+
+def run(tmp_path, sheet, *extra):
+    return main(['run', '--input', sheet, '--month', 'Jan', '--year', '2025', '--chunk-size', '4', '--quiet',
+                 '--db', str(tmp_path / 'ems.db'), '--receipt-dir', str(tmp_path / 'receipts'), *extra])
+
+
+def test_run_saves_and_archives_a_month(tmp_path, sheet, capsys):
+    assert run(tmp_path, sheet, '--summary', str(tmp_path / 'summary.json')) == EXIT_OK
+    summary = json.loads(capsys.readouterr().out)
+    assert summary == json.loads((tmp_path / 'summary.json').read_text())
+    assert summary['status'] == 'completed' and summary['rows'] == summary['stored'] == summary['receipts'] == 10
+    assert summary['errors'] == 0 and summary['chunks'] == 3 and summary['rows_per_second'] > 0
+    assert not os.path.exists(summary['checkpoint'])
+
+    with SalaryStore(str(tmp_path / 'ems.db')) as store:
+        record = store.get(7)
+        assert (record.name, record.designation, record.month, record.year) == ('Employee 7', 'Clerk', 'Jan', '2025')
+        assert record.salary == f"{60000 / 0.88:.2f}" and record.reciept == ''
+    with ReceiptArchive(str(tmp_path / 'receipts' / 'archive')) as archive:
+        assert archive.codes(2025, 'Jan') == list(range(1, 11))
+        assert 'Employee Id\t\t:    7\n' in archive.get_text(7, 2025, 'Jan')
+
+
+def test_bad_rows_and_bad_input(tmp_path, capsys):
+    sheet = write_sheet(tmp_path / 'salaries.csv', [[1, 'A', '', 50000, 0, 12], ['X', 'B', '', 50000, 0, 12],
+                                                    [2, 'C', '', 'abc', 0, 12], [1, 'D', '', 50000, 0, 12],
+                                                    [3, 'E', '', 50000, 0, 150]])
+    assert run(tmp_path, sheet, '--receipts', 'none') == EXIT_ROW_ERRORS
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['stored'] == 1 and summary['receipts'] == 0
+    assert [(e['row'], e['code'], e['error']) for e in summary['error_rows']] == [
+        (1, 'X', 'BAD CODE'), (2, 2, 'PARSE ERROR'), (3, 1, 'DUPLICATE CODE'), (4, 3, 'INVALID')]
+
+    assert run(tmp_path, str(tmp_path / 'missing.csv')) == EXIT_INPUT
+    no_code = tmp_path / 'no_code.csv'
+    no_code.write_text('Name,Basic Pay\nA,50000\n')
+    assert run(tmp_path, str(no_code)) == EXIT_INPUT
+    with pytest.raises(SystemExit):
+        run(tmp_path, sheet, '--month', 'Smarch')
+
+
+def test_interrupted_run_resumes(tmp_path, sheet):
+    db = str(tmp_path / 'ems.db')
+    options = dict(db_path=db, chunk_size=4, receipt_dir=str(tmp_path / 'receipts'))
+
+    def interrupt_after_first_chunk(rows, errors, seconds):
+        raise KeyboardInterrupt
+
+    summary = run_batch(sheet, 'Jan', 2025, progress=interrupt_after_first_chunk, **options)
+    assert summary['status'] == 'interrupted' and summary['chunks'] == 1
+    assert os.path.exists(checkpoint_path(db, 'Jan', 2025))
+
+    summary = run_batch(sheet, 'January', '2025', progress=None, **options)
+    assert summary['status'] == 'completed' and summary['resumed_chunks'] == 1
+    assert summary['rows'] == 10 and summary['rows_this_run'] == 6 and summary['receipts'] == 10
+    with SalaryStore(db) as store:
+        assert store.count() == 10
+    assert not os.path.exists(checkpoint_path(db, 'Jan', 2025))
+
+
+def test_run_uses_the_component_definition(tmp_path, capsys):
+    definition = tmp_path / 'components.json'
+    definition.write_text(json.dumps({'components': [
+        {'key': 'Basic Pay', 'type': 'inclusion', 'required': True},
+        {'key': 'Conveyance', 'type': 'inclusion', 'column': 'conv'},
+        {'key': 'PF Percentage', 'type': 'rate', 'of': 'Basic Pay', 'amount': 'PF Amount', 'default': 12}]}))
+    sheet = tmp_path / 'salaries.csv'
+    sheet.write_text('code,Name,Basic Pay,conv\n1,A,50000,1600\n')
+    assert run(tmp_path, str(sheet), '--components', str(definition)) == EXIT_OK
+    assert json.loads(capsys.readouterr().out)['stored'] == 1
+
+    with SalaryStore(str(tmp_path / 'ems.db')) as store:
+        record = store.get(1)
+        assert record.conv == '1600.00' and record.salary == f"{51600 / 0.88:.2f}" and record.pf == '6000.00'
+    with ReceiptArchive(str(tmp_path / 'receipts' / 'archive')) as archive:
+        assert 'Conveyance\t\t:    Rs.1600.00' in archive.get_text(1, 2025, 'Jan')
+
+    definition.write_text('{"components": []}')
+    assert run(tmp_path, str(sheet), '--components', str(definition)) == EXIT_USAGE
+
+
+def test_codes_are_unique_across_chunks_and_resumes(tmp_path):
+    rows = [[code, f'Employee {code}', 'Clerk', 50000, 10000, 12] for code in (1, 2, 3, 4, 5, 2, 6, 7, 8)]
+    rows[7][3:5] = [1e308, 1e308]  # finite amounts whose gross overflows
+    sheet = write_sheet(tmp_path / 'salaries.csv', rows)
+    db = str(tmp_path / 'ems.db')
+    options = dict(db_path=db, chunk_size=4, receipt_dir=str(tmp_path / 'receipts'))
+
+    def interrupt_after_first_chunk(rows, errors, seconds):
+        raise KeyboardInterrupt
+
+    assert run_batch(sheet, 'Jan', 2025, progress=interrupt_after_first_chunk, **options)['chunks'] == 1
+    summary = run_batch(sheet, 'Jan', 2025, progress=None, **options)
+    assert summary['status'] == 'completed' and summary['resumed_chunks'] == 1
+    assert [(e['row'], e['code'], e['error']) for e in summary['error_rows']] == [
+        (5, 2, 'DUPLICATE CODE'), (7, 7, 'INVALID')]
+    assert summary['stored'] == summary['receipts'] == 7
+    with SalaryStore(db) as store:
+        assert store.count() == 7 and store.get(2).name == 'Employee 2' and store.get(7) is None
@@ -0,0 +1,171 @@
+"""
+TEST FILE: Salary Component Definitions
+========================================
+
+Checks payroll/components.py: the compiled STANDARD definition gives exactly
+the results and errors of the hand-written calculation (scalar, exact and
+columnar, NumPy and pure Python), the default definition file adds the
+Conveyance/Medical allowances to the calculation and the receipt, other
+rules compile to the expected formula, and bad definitions are rejected.
+"""
+
+import sys
+import os
+import json
+import math
+import pickle
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.components import STANDARD, ComponentDefinitionError, ComponentSet, load_components
+from payroll.core import (SALARY_RESULT_KEYS, calculate_gross_up_batch, calculate_gross_up_batch_paise,
+                          calculate_gross_up_paise, calculate_gross_up_salary, paise_inputs)
+from payroll.live import LiveCalculation
+from payroll.receipt_parser import parse_receipt
+from payroll.receipts import GROSS_UP_BODY
+
+
+def salary_rows(count, seed=11):
+    rng = random.Random(seed)
+    return [{'Basic Pay': rng.choice([rng.uniform(1, 200000), round(rng.uniform(1, 200000), 2), 0, -5]),
+             'HRA': rng.uniform(0, 50000), 'Over Time': rng.choice([0, rng.uniform(0, 9000)]),
+             'Other Allowances': rng.uniform(0, 5000), 'Other Deductions': rng.uniform(0, 3000),
+             'PF Percentage': rng.choice([0, 10, 12, 12.5, 99.99, 100, 120, -1])} for _ in range(count)]
+
+
+def outcome(function, data):
+    try:
+        return function(data)
+    except ValueError as ex:
+        return str(ex)
+
+
+def same(a, b):
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b)) and len(a) == len(b)
+
+
+def test_standard_matches_hand_written_functions(engine):
+    rows = salary_rows(2000)
+    for row in rows:
+        assert outcome(STANDARD.calculate, row) == outcome(calculate_gross_up_salary, row)
+        exact = paise_inputs(row)
+        assert outcome(STANDARD.calculate_paise, exact) == outcome(calculate_gross_up_paise, exact)
+
+    columns = {name: [row[name] for row in rows] for name in rows[0]}
+    expected, result = calculate_gross_up_batch(columns), STANDARD.calculate_batch(columns)
+    assert list(result) == list(expected)
+    assert all(same(list(result[key]), list(expected[key])) for key in SALARY_RESULT_KEYS)
+    assert result['Invalid Rows'] == expected['Invalid Rows'] and result['Invalid Rows']
+
+    exact_columns = {name: [paise_inputs(row)[name] for row in rows] for name in rows[0]}
+    expected, result = calculate_gross_up_batch_paise(exact_columns), STANDARD.calculate_batch_paise(exact_columns)
+    assert all(list(result[key]) == list(expected[key]) for key in SALARY_RESULT_KEYS)
+    assert result['Invalid Rows'] == expected['Invalid Rows']
+
+    # Inputs are not overwritten by the invalid-row fill
+    assert list(result['Basic Pay']) == exact_columns['Basic Pay']
+    with pytest.raises(ValueError, match='Basic Pay column is required'):
+        STANDARD.calculate_batch({'HRA': [1.0]})
+
+    # NaN and infinity fail like the hand-written checks (NaN fails every comparison)
+    base = {'Basic Pay': 50000.0, 'HRA': 100.0, 'PF Percentage': 12.0}
+    odd = [dict(base, HRA=math.nan), dict(base, **{'Basic Pay': math.inf}), dict(base, **{'PF Percentage': math.nan})]
+    for row in odd:
+        assert outcome(STANDARD.calculate, row) == 'Salary components must be finite numbers'
+    columns = {name: [row[name] for row in odd + [base]] for name in base}
+    invalid = STANDARD.calculate_batch(columns)['Invalid Rows']
+    assert invalid == calculate_gross_up_batch(columns)['Invalid Rows'] == [0, 1, 2]
+
+    assert STANDARD.result_keys == SALARY_RESULT_KEYS
+    assert STANDARD.receipt_body == GROSS_UP_BODY
+
+
+def test_default_definition_adds_conveyance_and_medical(engine):
+    components = load_components()
+    assert components.result_keys[3:5] == ('Conveyance', 'Medical')
+    assert {c.key: c.column for c in components.components if c.column} == {'Conveyance': 'conv', 'Medical': 'medical'}
+    assert components.default_texts()['PF Percentage'] == '12' and components.default_texts()['Medical'] == ''
+    assert components.fingerprint != STANDARD.fingerprint
+    copy = pickle.loads(pickle.dumps(components))  # how worker processes get it
+    assert copy.fingerprint == components.fingerprint and copy.calculated_keys == STANDARD.calculated_keys
+
+    result = components.calculate_paise({'Basic Pay': 5000000, 'Conveyance': 160000, 'Medical': 125000})
+    assert result['Total Inclusions'] == 5285000
+    assert result['Gross Salary'] == 6005682  # 52850.00 / 0.88
+    assert result['Net Salary'] == 6005682 - 600000
+
+    batch = components.calculate_batch_paise({'Basic Pay': [5000000, 0], 'Medical': [125000, 125000]})
+    assert list(batch['Total Inclusions']) == [5125000, 0] and batch['Invalid Rows'] == [1]
+
+    # The receipt has the new lines and reads back into the legacy conv/medical columns
+    text = components.render_receipt(components.paise_result_to_rupees(result), 7, 'Jan', '2025', '31-01-2025')
+    assert 'Conveyance\t\t:    Rs.1600.00' in text and 'Medical\t\t:    Rs.1250.00' in text
+    parsed = parse_receipt(text)
+    assert (parsed.conv, parsed.medical, parsed.basic, parsed.net) == (160000, 125000, 5000000, 5405682)
+
+    # The form's live recalculation uses the same definition
+    live = LiveCalculation(components)
+    texts = {'Basic Pay': '50000', 'Conveyance': '1600', 'Medical': '1250'}
+    update = live.recalculate(texts, 7, 'Jan', '2025', generated_on='31-01-2025')
+    assert update.lines == text.split('\n')
+
+
+def test_rules_compile_to_the_formula(engine):
+    components = ComponentSet({'components': [
+        {'key': 'Basic Pay', 'type': 'inclusion', 'required': True},
+        {'key': 'Meal', 'type': 'inclusion', 'default': 1000},
+        {'key': 'PF Percentage', 'type': 'rate', 'of': 'Basic Pay', 'amount': 'PF Amount', 'default': 12},
+        {'key': 'ESI', 'type': 'rate', 'of': 'Total Inclusions', 'default': 0.75, 'receipt': 'ESI ({ESI:.2f}%)'},
+        {'key': 'Professional Tax', 'type': 'rate', 'of': 'Basic Pay', 'gross_up': False},
+        {'key': 'Loan', 'type': 'deduction', 'default': 500},
+    ]})
+    assert components.result_keys == ('Basic Pay', 'Meal', 'PF Percentage', 'ESI', 'Professional Tax', 'Loan',
+                                      'Total Inclusions', 'PF Amount', 'ESI Amount', 'Professional Tax Amount',
+                                      'Total Deductions', 'Gross Salary', 'Net Salary')
+    result = components.calculate({'Basic Pay': 40000, 'Professional Tax': 0.5})
+    assert result['Total Inclusions'] == 41000
+    assert result['PF Amount'] == 40000 * (12 / 100)
+    assert result['ESI Amount'] == 41000 * (0.75 / 100)
+    assert result['Professional Tax Amount'] == 200
+    assert result['Gross Salary'] == 41000 / (1 - (12 / 100 + 0.75 / 100))  # Professional Tax is not grossed up
+    assert result['Total Deductions'] == result['PF Amount'] + result['ESI Amount'] + 200 + 500
+    assert result['Net Salary'] == result['Gross Salary'] - result['Total Deductions']
+    assert 'ESI (0.75%)\t\t:    Rs.307.50' in components.render_receipt(result, 1, 'Jan', '2025')
+
+    rows = [{'Basic Pay': 4000000, 'ESI': 75}, {'Basic Pay': 4000000, 'PF Percentage': 9000, 'ESI': 1000},
+            {'Basic Pay': 1, 'Meal': 0, 'Loan': 0}]
+    batch = components.calculate_batch_paise({name: [row.get(name, components.paise_input_defaults[name])
+                                                     for row in rows] for name in components.input_defaults})
+    for i, row in enumerate(rows):
+        expected = outcome(components.calculate_paise, row)
+        if isinstance(expected, str):
+            assert i in batch['Invalid Rows'] and 'total 100% or more' in expected
+        else:
+            assert [batch[key][i] for key in components.result_keys] == list(expected.values())
+
+
+def test_bad_definitions_are_rejected(tmp_path):
+    inclusion = {'key': 'Basic Pay', 'type': 'inclusion'}
+    for definition, message in [
+        ({}, "non-empty 'components'"),
+        ({'components': [{'key': 'Basic Pay', 'type': 'bonus'}]}, 'type must be one of'),
+        ({'components': [dict(inclusion, of='HRA')]}, 'unknown attribute'),
+        ({'components': [inclusion, inclusion]}, 'defined twice'),
+        ({'components': [inclusion, {'key': 'Net Salary', 'type': 'deduction'}]}, 'defined twice'),
+        ({'components': [{'key': 'Loan', 'type': 'deduction'}]}, 'at least one inclusion'),
+        ({'components': [inclusion, {'key': 'PF', 'type': 'rate', 'of': 'Loan'}]}, "'of' must be"),
+        ({'components': [inclusion, {'key': 'PF', 'type': 'rate', 'of': 'Basic Pay', 'default': 150}]}, 'between'),
+        ({'components': [dict(inclusion, column='bonus')]}, 'column must be one of'),
+    ]:
+        with pytest.raises(ComponentDefinitionError, match=message):
+            ComponentSet(definition)
+
+    path = tmp_path / 'components.json'
+    path.write_text('{"components": [')
+    with pytest.raises(ComponentDefinitionError, match='components.json'):
+        load_components(str(path))
+    path.write_text(json.dumps({'components': [inclusion]}))
+    assert load_components(str(path)).calculate({'Basic Pay': 5})['Net Salary'] == 5.0
@@ -0,0 +1,180 @@
+"""
+TEST FILE: Pooled DB-API Storage
+=================================
+
+Checks payroll/dbapi.py on the SQLite stand-in: the same CRUD as
+SalaryStore on the same file, executemany() batching, the bounded
+connection pool under concurrent use (and after an interrupted
+transaction), and retries of transient errors (injected by a flaky
+connection wrapper).
+"""
+
+import sys
+import os
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.dbapi import ConnectionPool, DBAPISalaryStore, PoolTimeout, is_transient, open_sqlite, statements
+from payroll.storage import SalaryStore
+
+
+def make_record(code, month='Jan', year='2025', net='70136.36'):
+    record = {name: f'{name}-{code}' for name in EMP_SALARY_COLUMNS}
+    record.update({'code': code, 'month': month, 'year': year, 'net': net})
+    return record
+
+
+class FlakyConnection:
+    """sqlite3 connection whose cursors fail the next `failures[0]` executemany() calls."""
+
+    def __init__(self, con, failures, calls):
+        self.con, self.failures, self.calls = con, failures, calls
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __init__(self):
+                self.cursor = connection.con.cursor()
+
+            def executemany(self, sql, rows):
+                connection.calls.append(len(rows))
+                if connection.failures[0]:
+                    connection.failures[0] -= 1
+                    raise sqlite3.OperationalError('database is locked')
+                return self.cursor.executemany(sql, rows)
+
+            def __getattr__(self, name):
+                return getattr(self.cursor, name)
+        return Cursor()
+
+    def __getattr__(self, name):
+        return getattr(self.con, name)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'ems.db')
+
+
+def test_crud_matches_salary_store(path):
+    with open_sqlite(path, pool_size=2) as store:
+        store.insert(make_record(1))
+        with pytest.raises(sqlite3.IntegrityError):
+            store.insert(make_record(1))
+        store.insert(make_record(1, month='Feb'))
+        store.insert(make_record(1, month='Dec', year='2024'))
+
+        assert store.get(1).month == 'Feb'  # latest salary month
+        assert store.get(1, 'Jan', '2025').net == '70136.36'
+        assert store.update(make_record(1, net='80000.00'))
+        assert not store.update(make_record(2))
+        assert store.exists(1, 'Jan', '2025') and not store.exists(2, 'Jan', '2025')
+
+        with SalaryStore(path) as plain:  # same table, same file
+            assert plain.get(1, 'Jan', '2025').net == '80000.00'
+            plain.insert(make_record(3))
+        assert [record.code for record in store.period('Jan', '2025')] == [1, 3]
+        assert store.count() == 4
+
+        assert store.delete(1, 'Jan', '2025') == 1
+        assert store.delete(1) == 2
+        assert store.get(1) is None
+        assert store.pool.opened == 1  # one thread, one connection
+
+
+def test_insert_many_batches_and_retries(path):
+    failures, calls = [0], []
+    open_sqlite(path).close()
+    store = DBAPISalaryStore(sqlite3, lambda: FlakyConnection(sqlite3.connect(path), failures, calls),
+                             batch_size=400, backoff=0)
+
+    assert store.insert_many(make_record(code) for code in range(1, 1001)) == 1000
+    assert calls == [400, 400, 200]
+
+    # A transient error rolls the batch back and retries it on a new connection
+    calls.clear()
+    failures[0] = 2
+    records = [make_record(code, month='Feb') for code in range(1, 1001)]
+    assert store.insert_many(records) == 1000
+    assert calls == [400, 400, 400, 400, 200] and store.retried == 2
+    assert store.pool.opened == 3
+    assert store.count() == 2000
+
+    # replace=True rewrites existing rows; a duplicate without it fails at once
+    assert store.insert_many([make_record(5, net='1.00')], replace=True) == 1
+    assert store.get(5, 'Jan', '2025').net == '1.00'
+    calls.clear()
+    with pytest.raises(sqlite3.IntegrityError):
+        store.insert_many([make_record(5)])
+    assert calls == [1] and store.retried == 2
+
+    # Retries are bounded
+    failures[0] = 10
+    with pytest.raises(sqlite3.OperationalError, match='locked'):
+        store.insert_many([make_record(9999)])
+    assert store.retried == 2 + store.retries
+    failures[0] = 0
+    assert store.count() == 2000
+    store.close()
+
+
+def test_pool_is_bounded_under_concurrent_use(path):
+    with open_sqlite(path, pool_size=3) as store:
+        store.insert_many(make_record(code) for code in range(1, 101))
+        errors = []
+
+        def lookups():
+            try:
+                for code in range(1, 101):
+                    assert store.get(code, 'Jan', '2025').code == code
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert 1 <= store.pool.opened <= 3 and store.pool.idle() == store.pool.opened
+
+    pool = ConnectionPool(lambda: sqlite3.connect(':memory:'), size=1, timeout=0.01)
+    with pool.connection():
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+    with pool.connection() as con:
+        assert con.execute('SELECT 1').fetchone() == (1,)
+    assert pool.opened == 1
+    pool.close()
+
+    # Ctrl+C inside a transaction: the connection is not leaked, and not reused
+    with open_sqlite(path, pool_size=1, pool_timeout=0.01) as store:
+        def interrupted(cursor):
+            cursor.execute('DELETE FROM emp_salary')
+            raise KeyboardInterrupt
+        with pytest.raises(KeyboardInterrupt):
+            store.transaction(interrupted)
+        assert store.pool.idle() == 0
+        assert store.get(1, 'Jan', '2025').code == 1 and store.pool.opened == 2
+
+
+def test_statements_and_transient_errors():
+    assert statements('qmark')['get_period'].endswith('`code`=? AND `year`=? AND `month`=?')
+    assert statements('pyformat')['get_period'].endswith('`code`=%s AND `year`=%s AND `month`=%s')
+    assert statements('format') is statements('format')
+    with pytest.raises(ValueError, match='paramstyle'):
+        statements('named')
+
+    assert is_transient(sqlite3, sqlite3.OperationalError('database is locked'))
+    assert not is_transient(sqlite3, sqlite3.OperationalError('no such table: emp_salary'))
+    assert not is_transient(sqlite3, sqlite3.IntegrityError('UNIQUE constraint failed'))
+    # MariaDB errors carry a numeric code: deadlock and lost connection retry, syntax errors do not
+    assert is_transient(sqlite3, sqlite3.OperationalError(1213, 'Deadlock found'))
+    assert is_transient(sqlite3, sqlite3.OperationalError(2013, 'Lost connection to server'))
+    assert not is_transient(sqlite3, sqlite3.OperationalError(1064, 'You have an error in your SQL syntax'))
@@ -0,0 +1,122 @@
+"""
+TEST FILE: Incremental Payroll Runs
+====================================
+
+Checks payroll/incremental.py: only new or changed employees are
+recomputed, carried-forward results and receipts match a full run, removed
+employees leave the state, an uncommitted run changes nothing, and runs
+with other salary components keep their own digests.
+"""
+
+import sys
+import os
+import math
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.archive import ReceiptArchive
+from payroll.components import load_components
+from payroll.core import SALARY_RESULT_KEYS, calculate_gross_up_salary
+from payroll.incremental import PayrollState, format_report, run_incremental
+from payroll.receipts import render_receipt
+
+
+def workforce(count):
+    return {
+        'code': list(range(1, count + 1)),
+        'Basic Pay': [20000 + 1000 * (i % 50) for i in range(count)],
+        'HRA': [5000 + 100 * (i % 7) for i in range(count)],
+        'PF Percentage': [12] * count,
+    }
+
+
+def assert_matches_full_run(report, columns):
+    result = report['result']
+    for i, code in enumerate(columns['code']):
+        row = {name: values[i] for name, values in columns.items() if name != 'code'}
+        try:
+            expected = calculate_gross_up_salary(row)
+        except ValueError:
+            assert i in result['Invalid Rows']
+            continue
+        for key in SALARY_RESULT_KEYS:
+            assert float(result[key][i]).hex() == float(expected[key]).hex(), (code, key)
+
+
+def test_only_changed_employees_recomputed(tmp_path):
+    columns = workforce(200)
+    with PayrollState(str(tmp_path / 'state.db')) as state, ReceiptArchive(str(tmp_path / 'archive')) as archive:
+        first = run_incremental(columns, state, 'Jan', 2025, archive=archive, generated_on='31-01-2025')
+        assert (first['recomputed'], first['reused'], first['added']) == (200, 0, 200)
+        assert first['receipts_written'] == 200
+
+        # Two raises, one new joiner, one leaver (code 200)
+        columns['Basic Pay'][4] += 500
+        columns['HRA'][9] = 0
+        for name in columns:
+            columns[name].pop()
+        columns['code'].append(500)
+        columns['Basic Pay'].append(45000)
+        columns['HRA'].append(9000)
+        columns['PF Percentage'].append(15)
+
+        second = run_incremental(columns, state, 'Feb', 2025, archive=archive, generated_on='28-02-2025')
+        assert (second['recomputed'], second['changed'], second['added']) == (3, 2, 1)
+        assert (second['reused'], second['removed']) == (197, 1)
+        assert 'reused' in format_report(second)
+        assert_matches_full_run(second, columns)
+
+        # New month: every receipt is written, carried-forward ones with the new header
+        assert second['receipts_written'] == 200
+        row = {'Basic Pay': columns['Basic Pay'][0], 'HRA': columns['HRA'][0], 'PF Percentage': 12}
+        assert archive.get_text(1, 2025, 'Feb') == render_receipt(calculate_gross_up_salary(row), 1, 'Feb', '2025',
+                                                                  generated_on='28-02-2025')
+        assert 200 not in state.digests()
+
+        # Re-running the same month only writes the recomputed receipts
+        columns['Basic Pay'][0] += 1
+        third = run_incremental(columns, state, 'Feb', 2025, archive=archive, generated_on='01-03-2025')
+        assert (third['recomputed'], third['receipts_written']) == (1, 1)
+        assert state.last_run()['recomputed'] == 1
+
+
+def test_invalid_rows_are_tracked(tmp_path):
+    columns = workforce(5)
+    columns['Basic Pay'][2] = 0
+    with PayrollState(str(tmp_path / 'state.db')) as state:
+        run_incremental(columns, state, 'Jan', 2025)
+        again = run_incremental(columns, state, 'Jan', 2025)
+    assert again['reused'] == 5
+    assert again['result']['Invalid Rows'] == [2]
+    assert math.isnan(again['result']['Net Salary'][2])
+    assert again['result']['Basic Pay'][2] == 0
+
+
+def test_duplicate_codes_rejected(tmp_path):
+    columns = workforce(3)
+    columns['code'][2] = 1
+    with PayrollState(str(tmp_path / 'state.db')) as state:
+        with pytest.raises(ValueError):
+            run_incremental(columns, state, 'Jan', 2025)
+        assert state.digests() == {} and state.last_run() is None
+
+
+def test_other_components_and_definition_change(tmp_path):
+    components = load_components()  # payroll/components.json: adds Conveyance and Medical
+    columns = dict(workforce(20), Conveyance=[1600] * 20)
+    with PayrollState(str(tmp_path / 'state.db')) as state, ReceiptArchive(str(tmp_path / 'archive')) as archive:
+        run_incremental(columns, state, 'Jan', 2025, archive=archive, components=components)
+        report = run_incremental(columns, state, 'Feb', 2025, archive=archive, generated_on='28-02-2025',
+                                 components=components)
+        assert (report['recomputed'], report['reused']) == (0, 20)
+        expected = components.calculate({'Basic Pay': 20000, 'HRA': 5000, 'PF Percentage': 12, 'Conveyance': 1600})
+        assert [report['result'][key][0] for key in components.result_keys] == list(expected.values())
+        assert archive.get_text(1, 2025, 'Feb') == components.render_receipt(expected, 1, 'Feb', '2025',
+                                                                             generated_on='28-02-2025')
+
+        # Back to the six standard components: nothing carried forward from the other definition
+        report = run_incremental(workforce(20), state, 'Mar', 2025)
+        assert report['recomputed'] == 20
+        assert_matches_full_run(report, workforce(20))
@@ -0,0 +1,77 @@
+"""
+TEST FILE: Per-Stage Instrumentation
+=====================================
+
+Checks payroll/instrument.py: disabled records nothing, enabled counts calls
+(also through names bound before enable(), methods and the evaluators of a
+ComponentSet), and a capture produces a text and JSON-ready report.
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import employee
+from payroll import instrument, pipeline
+from payroll.components import load_components
+from payroll.instrument import Capture, format_summary, stage
+from payroll.storage import SalaryStore
+
+
+def test_switch_and_early_bound_references():
+    calculate = employee.calculate_gross_up_salary  # bound before enable()
+    components = load_components()
+    instrument.reset()
+    calculate({'Basic Pay': 50000})
+    components.calculate({'Basic Pay': 50000})
+    with stage('print'):
+        pass
+    assert instrument.stats() == {}
+
+    instrument.enable()
+    try:
+        calculate({'Basic Pay': 50000})
+        components.calculate({'Basic Pay': 50000})
+        components.calculate_paise({'Basic Pay': 5000000})
+        components.calculate_batch({'Basic Pay': [50000, 60000]})
+    finally:
+        instrument.disable()
+    assert not instrument.is_enabled()
+    stages = instrument.stats()
+    assert stages['gross_up']['calls'] == 3
+    assert (stages['gross_up_batch']['calls'], stages['gross_up_batch']['items']) == (1, 2)
+
+    calculate({'Basic Pay': 50000})
+    assert instrument.stats()['gross_up']['calls'] == 3
+
+
+def test_capture_counts_stages(tmp_path):
+    source = tmp_path / 'salaries.csv'
+    source.write_text('code,Basic Pay,HRA\n' + ''.join(f'{i},{20000 + i},5000\n' for i in range(250)))
+
+    with Capture(profile=True, memory=True) as run:
+        for basic in (30000, 40000, 50000):
+            employee.calculate_gross_up_salary({'Basic Pay': basic})
+        pipeline.run_payroll_file(str(source), str(tmp_path / 'out.csv'), chunk_size=100, progress=None)
+        with SalaryStore(str(tmp_path / 'ems.db')) as store:
+            store.insert({'code': 1, 'month': 'Jan', 'year': '2025'})
+            store.get(1, 'Jan', '2025')
+        with stage('print'):
+            pass
+    assert not instrument.is_enabled()
+
+    stages = run.report['stages']
+    assert stages['gross_up']['calls'] == 3
+    assert (stages['parse']['calls'], stages['parse']['items']) == (3, 250)
+    assert (stages['gross_up_batch']['calls'], stages['gross_up_batch']['items']) == (3, 250)
+    assert stages['output_write']['items'] == 250
+    assert stages['db_write']['calls'] == stages['db_read']['calls'] == stages['print']['calls'] == 1
+    assert sum(stages['gross_up']['histogram_us'].values()) == 3
+    assert stages['gross_up']['p99_seconds'] <= stages['gross_up']['max_seconds']
+    assert run.report['profile'] and run.report['memory']['peak_bytes'] > 0
+
+    text = format_summary(run.report)
+    assert 'parse' in text and 'Memory peak' in text
+    json.dumps(run.report)
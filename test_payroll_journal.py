@@ -0,0 +1,192 @@
+"""
+TEST FILE: Group-Committed Save Journal
+========================================
+
+Checks payroll/journal.py: saves, updates and deletes behave like
+SalaryStore's and are readable before compaction, concurrent saves share
+group commits, compaction moves the journal into the database, a journal
+left by a crash (including a torn last entry) is replayed, a save that
+cannot be committed leaves no trace, and compaction errors are reported.
+"""
+
+import sys
+import os
+import shutil
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll import journal
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.journal import JournaledSalaryStore, apply_operations, encode_entry, journal_path, read_segment
+from payroll.storage import SalaryStore, to_record
+
+
+def make_record(code, month='Jan', year='2025', net='70136.36'):
+    record = {name: f'{name}-{code}' for name in EMP_SALARY_COLUMNS}
+    record.update({'code': code, 'month': month, 'year': year, 'net': net})
+    return record
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'ems.db')
+
+
+def test_saves_are_readable_before_compaction(path):
+    with SalaryStore(path) as plain:
+        plain.insert(make_record(1, month='Dec', year='2024'))
+        plain.insert(make_record(2))
+
+    with JournaledSalaryStore(path, compact_interval=60) as store:
+        store.insert(make_record(1))
+        with pytest.raises(sqlite3.IntegrityError):
+            store.insert(make_record(1))
+        with pytest.raises(sqlite3.IntegrityError):
+            store.insert(make_record(2))
+        assert store.get(1).month == 'Jan'  # latest salary month, still in the journal
+        assert store.update(make_record(2, net='1.00'))
+        assert not store.update(make_record(3))
+        assert store.get(2).net == '1.00'
+        assert [record.code for record in store.period('Jan', '2025')] == [1, 2]
+
+        with SalaryStore(path) as plain:
+            assert plain.count() == 2 and plain.get(2).net == '70136.36'  # not compacted yet
+        assert store.pending() == 2
+
+        assert store.delete(1, 'Jan', '2025') == 1
+        assert store.get(1).month == 'Dec'
+        assert store.delete(1, 'Jan', '2025') == 0
+        store.insert(make_record(1, month='Feb'))
+        store.insert(make_record(1, month='Nov', year='2024'))
+        assert store.get(1).month == 'Feb'  # by (year, month), not by the order saved
+        assert store.delete(1) == 3
+        assert store.get(1) is None and store.period('Dec', '2024') == []
+
+        assert store.compact() == 6
+        assert store.pending() == 0
+        assert store.get(2).net == '1.00'
+
+    with SalaryStore(path) as plain:
+        assert [(r.code, r.month, r.net) for r in plain.iter_records()] == [(2, 'Jan', '1.00')]
+    assert os.listdir(journal_path(path)) == []
+
+
+def test_concurrent_saves_share_group_commits(path):
+    with JournaledSalaryStore(path, max_delay=0.02, compact_entries=150, compact_interval=60) as store:
+        errors = []
+
+        def clerk(first):
+            try:
+                for code in range(first, first + 50):
+                    store.insert(make_record(code))
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=clerk, args=(1 + 50 * i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert store.entries == 400
+        assert store.groups < 400 / 2  # far fewer fsyncs than saves
+        assert len(store.period('Jan', '2025')) == 400
+    assert store.compactions >= 1  # reached compact_entries in the background or on close
+
+    with SalaryStore(path) as plain:
+        assert plain.count() == 400
+
+
+def test_crash_replay(path, tmp_path):
+    store = JournaledSalaryStore(path, compact_interval=60)
+    for code in range(1, 4):
+        store.insert(make_record(code))
+    store.update(make_record(2, net='2.00'))
+    store.delete(3)
+    # Acknowledged saves are in the journal: copy it as a crashed process would leave it
+    crashed = str(tmp_path / 'crashed.db')
+    shutil.copytree(journal_path(path), journal_path(crashed))
+    store.close()
+
+    segment = os.path.join(journal_path(crashed), sorted(os.listdir(journal_path(crashed)))[-1])
+    with open(segment, 'ab') as f:
+        f.write(encode_entry(['insert', list(to_record(make_record(9)))])[:-3])  # torn last entry
+    operations, valid = read_segment(segment)
+    assert len(operations) == 5 and valid < os.path.getsize(segment)
+
+    with JournaledSalaryStore(crashed) as recovered:
+        assert recovered.replayed == 5
+        assert recovered.get(2).net == '2.00' and recovered.get(3) is None and recovered.get(9) is None
+    with SalaryStore(crashed) as plain, SalaryStore(path) as original:
+        assert list(plain.iter_records()) == list(original.iter_records())
+
+        # Entries applied twice (crash during compaction) give the same table
+        apply_operations(plain.con, operations)
+        assert list(plain.iter_records()) == list(original.iter_records())
+
+
+def test_failed_commit_and_failed_compaction(path, monkeypatch):
+    store = JournaledSalaryStore(path, compact_interval=60)
+    store.insert(make_record(1))
+
+    def broken_fsync(fd):
+        raise OSError(5, 'Input/output error')
+
+    # A group that cannot be made durable is taken back out of reads
+    monkeypatch.setattr(os, 'fsync', broken_fsync)
+    with pytest.raises(OSError):
+        store.update(make_record(1, net='1.00'))
+    monkeypatch.undo()
+    assert store.get(1).net == '70136.36' and store.pending() == 1
+    with pytest.raises(OSError):
+        store.insert(make_record(2))  # read-only from now on
+    assert store.get(2) is None
+
+    # A failed compaction keeps the entries and reports the error until one succeeds
+    def broken_apply(con, operations):
+        raise sqlite3.OperationalError('disk I/O error')
+
+    monkeypatch.setattr(journal, 'apply_operations', broken_apply)
+    with pytest.raises(sqlite3.OperationalError):
+        store.compact()
+    store._compact_wanted.set()
+    for _ in range(200):
+        if store.compact_error is not None:
+            break
+        threading.Event().wait(0.01)
+    assert isinstance(store.compact_error, sqlite3.OperationalError) and store.get(1) is not None
+    with pytest.raises(sqlite3.OperationalError):
+        store.close()  # the final compaction fails too
+    monkeypatch.undo()
+
+    # ... and the journal is applied on the next open
+    with JournaledSalaryStore(path) as store:
+        assert store.replayed == 1 and store.compact_error is None
+    with SalaryStore(path) as plain:
+        assert plain.count() == 1 and plain.get(1).net == '70136.36'
+
+
+def test_pages_merge_the_journal(path):
+    with SalaryStore(path) as plain:
+        plain.insert_many([make_record(code, net=str(code)) for code in range(1, 6)])
+
+    with JournaledSalaryStore(path, compact_interval=60) as store:
+        assert store.count() == 5 and [r.code for r in store.page(0, 10)] == [1, 2, 3, 4, 5]
+        store.insert(make_record(6, net='0.5'))
+        store.update(make_record(2, net='100'))
+        store.delete(4, 'Jan', '2025')
+        assert store.pending() == 3
+
+        assert store.count() == 5
+        assert [r.code for r in store.page(0, 10, sort='net')] == [6, 1, 3, 5, 2]
+        assert [r.code for r in store.page(1, 2, sort='net', descending=True)] == [5, 3]
+        assert store.page(0, 10, filter_column='net', filter_text='100')[0].code == 2
+        assert store.count('name', 'name-6') == 1 and store.count('name', 'name-4') == 0
+
+        store.compact()
+        assert store.pending() == 0
+        assert [r.code for r in store.page(0, 10, sort='net')] == [6, 1, 3, 5, 2]
@@ -0,0 +1,81 @@
+"""
+TEST FILE: Live Recalculation
+==============================
+
+Checks payroll/live.py: field texts are parsed exactly, unchanged inputs
+are not recalculated, a new code/month/year re-renders the receipt header,
+incomplete inputs give no result, a loaded record is left as saved until an
+amount is edited, and only the receipt lines that differ are reported.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import calculate_gross_up_paise, paise_inputs, paise_result_to_rupees
+from payroll.live import LiveCalculation, changed_lines, parse_salary_inputs
+from payroll.receipts import render_receipt
+
+
+def texts(basic='50000', hra='20000', pf=''):
+    return {'Basic Pay': basic, 'HRA': hra, 'Over Time': '', 'Other Allowances': '',
+            'PF Percentage': pf, 'Other Deductions': ''}
+
+
+def test_parse_salary_inputs():
+    assert parse_salary_inputs(texts()) == (5000000, 2000000, 0, 0, 1200, 0)
+    assert parse_salary_inputs(texts(basic=' 50000.005 ', pf='12.5'))[::4] == (5000001, 1250)
+    assert parse_salary_inputs(texts(basic='')) is None
+    assert parse_salary_inputs(texts(hra='20,000')) is None
+    assert parse_salary_inputs(texts(pf='nan')) is None
+
+
+def test_recalculates_only_when_inputs_change():
+    live = LiveCalculation()
+    update = live.recalculate(texts(), 7, 'Jan', '2025', generated_on='31-01-2025')
+    expected = paise_result_to_rupees(calculate_gross_up_paise(paise_inputs({'Basic Pay': 50000, 'HRA': 20000})))
+    assert update.result == expected
+    assert '\n'.join(update.lines) == render_receipt(expected, 7, 'Jan', '2025', generated_on='31-01-2025')
+
+    # Same amounts typed differently - nothing to do
+    assert live.recalculate(texts(basic='50000.00', pf='12'), 7, 'Jan', '2025') is None
+
+    # Code/month/year edited after the amounts - same result, new receipt header
+    update = live.recalculate(texts(), 8, 'Feb', '2025', generated_on='31-01-2025')
+    assert update.result == expected
+    assert '\n'.join(update.lines) == render_receipt(expected, 8, 'Feb', '2025', generated_on='31-01-2025')
+    assert live.recalculate(texts(), 8, 'Feb', '2025') is None
+
+    # Incomplete or rejected input clears the result once
+    assert live.recalculate(texts(basic='0'), 7, 'Jan', '2025') == (None, None)
+    assert live.recalculate(texts(basic='-'), 7, 'Jan', '2025') == (None, None)
+    assert live.recalculate(texts(basic=''), 7, 'Jan', '2025') is None
+
+    live.reset()
+    assert live.recalculate(texts(), 7, 'Jan', '2025').result == expected
+
+
+def test_loaded_record_is_not_recalculated():
+    # A record loaded into the form: fields reset to their defaults, saved totals shown
+    live = LiveCalculation()
+    live.hold(texts(basic='', hra=''), 7, 'Jan', '2025')
+    assert live.recalculate(texts(basic='', hra=''), 7, 'Jan', '2025') is None
+    assert live.recalculate(texts(basic='', hra=''), 7, 'Feb', '2025') is None  # no result to re-render
+
+    # Editing an amount calculates from the form as it is now
+    update = live.recalculate(texts(hra=''), 7, 'Feb', '2025')
+    assert update.result == paise_result_to_rupees(calculate_gross_up_paise(paise_inputs({'Basic Pay': 50000})))
+
+
+def test_changed_lines():
+    live = LiveCalculation()
+    before = live.recalculate(texts(), 7, 'Jan', '2025', generated_on='31-01-2025').lines
+    after = live.recalculate(texts(hra='21000'), 7, 'Jan', '2025', generated_on='31-01-2025').lines
+    changes = changed_lines(before, after)
+    assert changes and len(changes) < len(after) // 2
+    for number, text in changes:
+        before[number - 1] = text
+    assert before == after
+    assert changed_lines(after, after) == []
+    assert changed_lines(after[:-1], after) is None
@@ -0,0 +1,96 @@
+"""
+TEST FILE: Typed emp_salary Schema and Migration
+=================================================
+
+Checks payroll/migrate.py: value converters, migration from a SQLite
+legacy table and from a MariaDB dump, and the legacy read view.
+"""
+
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.migrate import migrate, read_legacy, to_paise, paise_to_text, to_month, to_date
+from payroll.storage import SalaryStore
+
+RECEIPT_1 = open(os.path.join(os.path.dirname(__file__), 'Salary_Receipt', '1.txt')).read()
+
+
+def legacy_row(code, **values):
+    row = dict(zip(EMP_SALARY_COLUMNS, [''] * len(EMP_SALARY_COLUMNS)))
+    row.update({'code': code, 'name': f'Emp {code}', 'age': '30', 'dob': '01-02-1990', 'doj': '21/03/2020',
+                'month': 'Jan', 'year': '2025', 'salary': '100000', 'tdays': '31', 'abs': '3',
+                'medical': '4000', 'pf': '5000', 'conv': '10000', 'net': '91322.58', 'reciept': RECEIPT_1})
+    row.update(values)
+    return row
+
+
+def test_converters():
+    assert to_paise('Rs.91,322.58') == 9132258
+    assert to_paise('0.005') == 1          # half-up
+    assert to_paise('') is None
+    assert paise_to_text(9132258) == '91322.58'
+    assert paise_to_text(-5) == '-0.05'
+    assert to_month('January') == to_month('01') == 1
+    assert to_date('21-03-2025') == '2025-03-21'
+    with pytest.raises(ValueError):
+        to_paise('abc')
+
+
+def test_migrate_sqlite_source_and_legacy_view(tmp_path):
+    source = str(tmp_path / 'ems.db')
+    target = str(tmp_path / 'typed.db')
+    with SalaryStore(source) as store:
+        store.insert_many([legacy_row(1), legacy_row(2, salary='Rs.1,234.50', age='n/a'),
+                           legacy_row(3, month='??'), legacy_row(4, tdays='inf', abs='1e400', net='1e400')])
+
+    summary = migrate(source, target, batch_size=2, progress=None)
+
+    assert summary['rows'] == 3
+    assert summary['skipped'] == 1
+    assert summary['errors'] == {'age': 1, 'month': 1, 'tdays': 1, 'abs': 1, 'net': 1}
+
+    con = sqlite3.connect(target)
+    types = {row[1]: row[2] for row in con.execute('PRAGMA table_info(employee_salary)')}
+    assert types['net_paise'] == 'INTEGER' and types['dob'] == 'DATE'
+    assert 'reciept' not in types
+    assert con.execute('SELECT salary_paise, net_paise, tdays, dob, month FROM employee_salary WHERE code=1').fetchone() == \
+        (10000000, 9132258, 31, '1990-02-01', 1)
+
+    legacy = read_legacy(con, 1, 'Jan', 2025)
+    assert list(legacy) == list(EMP_SALARY_COLUMNS)
+    assert (legacy['salary'], legacy['tdays'], legacy['abs'], legacy['medical'], legacy['pf'], legacy['conv']) == \
+        ('100000.00', '31', '3', '4000.00', '5000.00', '10000.00')
+    assert legacy['reciept'] == RECEIPT_1
+    assert read_legacy(con, 2, 'Jan', 2025)['salary'] == '1234.50'
+    assert read_legacy(con, 9, 'Jan', 2025) is None
+    for row in con.execute('SELECT * FROM emp_salary_legacy'):
+        assert read_legacy(con, row[0], row[14], row[15]) == dict(zip(EMP_SALARY_COLUMNS, row))
+
+
+def test_migrate_mariadb_dump(tmp_path):
+    dump = tmp_path / 'ems.sql'
+    header = open(os.path.join(os.path.dirname(__file__), 'emp_salary.sql')).read()
+    columns = ', '.join(f'`{name}`' for name in EMP_SALARY_COLUMNS)
+
+    def sql_value(value):
+        if isinstance(value, int):
+            return str(value)
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\t', '\\t') + "'"
+
+    rows = [legacy_row(1, name="O'Brien"), legacy_row(2, add='Line 1, (Floor 4)')]
+    values = ',\n'.join('(' + ', '.join(sql_value(row[name]) for name in EMP_SALARY_COLUMNS) + ')' for row in rows)
+    dump.write_text(header + f'\nINSERT INTO `emp_salary` ({columns}) VALUES\n{values};\n')
+
+    summary = migrate(str(dump), str(tmp_path / 'typed.db'), progress=None)
+
+    assert summary['rows'] == 2
+    con = sqlite3.connect(str(tmp_path / 'typed.db'))
+    assert read_legacy(con, 1, 'Jan', 2025)['name'] == "O'Brien"
+    assert read_legacy(con, 2, 'Jan', 2025)['add'] == 'Line 1, (Floor 4)'
+    assert read_legacy(con, 2, 'Jan', 2025)['reciept'] == RECEIPT_1
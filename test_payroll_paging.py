@@ -0,0 +1,74 @@
+"""
+TEST FILE: Paged Record Access for View All Records
+====================================================
+
+Checks SalaryStore.page()/count() and the RecordPager used by the
+virtualized records window.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.paging import RecordPager
+from payroll.storage import SalaryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SalaryStore(str(tmp_path / 'ems.db')) as store:
+        records = []
+        for code in range(1, 1001):
+            record = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+            record.update({'code': code, 'name': f'Emp {code:04d}', 'designation': 'Clerk' if code % 2 else 'Manager',
+                           'month': 'Jan', 'year': '2025', 'net': str(code * 7 % 1000 + 0.5)})
+            records.append(record)
+        store.insert_many(records)
+        yield store
+
+
+def test_page_sort_and_filter(store):
+    assert [r.code for r in store.page(0, 3)] == [1, 2, 3]
+    assert [r.code for r in store.page(10, 3, descending=True)] == [990, 989, 988]
+
+    by_net = store.page(0, 1000, sort='net')
+    nets = [float(r.net) for r in by_net]
+    assert nets == sorted(nets)  # numeric, not text order
+
+    assert store.count('designation', 'Manager') == 500
+    assert store.count(None, 'Emp 01') == 100  # searches name by default
+    assert store.count('name', '%') == 0       # LIKE wildcards are literal
+    with pytest.raises(ValueError):
+        store.page(0, 10, sort='code; DROP TABLE emp_salary')
+
+
+def test_pager_fetches_only_needed_pages(store):
+    pager = RecordPager(store, page_size=50, cache_pages=4)
+    assert len(pager) == 1000
+
+    rows = pager.rows(120, 160)
+    assert [r.code for r in rows] == list(range(121, 161))
+    assert pager.queries == 2            # pages 2 and 3 only
+
+    pager.rows(130, 150)
+    assert pager.queries == 2            # served from cache
+
+    pager.rows(990, 1200)
+    assert [r.code for r in pager.rows(990, 1200)] == list(range(991, 1001))
+
+    pager.set_sort('name', descending=True)
+    assert pager.rows(0, 1)[0].code == 1000
+    pager.set_filter('designation', 'Clerk')
+    assert len(pager) == 500
+    assert all(r.designation == 'Clerk' for r in pager.rows(0, 500))
+
+
+def test_pager_cache_is_bounded(store):
+    pager = RecordPager(store, page_size=10, cache_pages=3)
+    for start in range(0, 1000, 10):
+        pager.rows(start, start + 10)
+    assert len(pager.pages) == 3
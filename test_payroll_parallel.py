@@ -0,0 +1,65 @@
+"""
+TEST FILE: Multi-Process Payroll Run
+=====================================
+
+Checks payroll/parallel.py: sharding by employee code, deterministic output
+order and equality with the single-process calculation.
+"""
+
+import sys
+import os
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import calculate_gross_up_salary
+from payroll.parallel import run_parallel
+
+
+def make_workforce(count, seed=7):
+    rng = random.Random(seed)
+    codes = list(range(1, count + 1))
+    rng.shuffle(codes)
+    return {
+        'code': codes,
+        'Basic Pay': [rng.choice([0, 25000, 30000.5, 45000, 70000]) for _ in codes],
+        'HRA': [rng.randrange(0, 20000) for _ in codes],
+        'Over Time': [rng.random() * 5000 for _ in codes],
+        'PF Percentage': [rng.choice([10, 12, 12.5, 15]) for _ in codes],
+    }
+
+
+def test_output_sorted_by_code_and_matches_scalar(engine):
+    columns = make_workforce(250)
+    result = run_parallel(columns, workers=1, chunk_size=40)
+
+    assert list(result['code']) == sorted(columns['code'])
+    position = {code: i for i, code in enumerate(columns['code'])}
+    for out_index, code in enumerate(result['code']):
+        i = position[int(code)]
+        row = {key: columns[key][i] for key in ('Basic Pay', 'HRA', 'Over Time', 'PF Percentage')}
+        if row['Basic Pay'] <= 0:
+            assert out_index in result['Invalid Rows']
+            continue
+        expected = calculate_gross_up_salary(row)
+        assert result['Net Salary'][out_index] == expected['Net Salary']
+        assert result['Gross Salary'][out_index] == expected['Gross Salary']
+    assert result['Invalid Codes'] == [int(result['code'][i]) for i in result['Invalid Rows']]
+
+
+def test_process_pool_is_deterministic():
+    """Same output regardless of worker count and chunk size"""
+    columns = make_workforce(1000)
+    single = run_parallel(columns, workers=1, chunk_size=1000)
+    pooled = run_parallel(columns, workers=3, chunk_size=97)
+
+    assert list(pooled['code']) == list(single['code'])
+    assert pooled['Net Salary'].tobytes() == single['Net Salary'].tobytes()
+    assert pooled['Invalid Rows'] == single['Invalid Rows']
+
+
+def test_duplicate_codes_rejected(engine):
+    with pytest.raises(ValueError):
+        run_parallel({'code': [1, 2, 2], 'Basic Pay': [1, 2, 3]}, workers=1)
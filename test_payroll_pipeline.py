@@ -0,0 +1,161 @@
+"""
+TEST FILE: Streaming Payroll Run (CSV/XLSX)
+============================================
+
+Checks the reader -> chunked gross-up -> writer pipeline in payroll/pipeline.py,
+with the standard six components and with a component definition.
+"""
+
+import sys
+import os
+import csv
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.cache import GrossUpCache
+from payroll.components import load_components
+from payroll.core import calculate_gross_up_salary
+from payroll import pipeline
+from payroll.pipeline import iter_salary_chunks, read_salary_rows, run_payroll_file
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_run_matches_scalar(tmp_path):
+    """Excel-style column names, passthrough Emp_ID, results equal the scalar function"""
+    rows = [
+        ['E001', 45000, 9000, 3000, 1500, 12, 500],
+        ['E002', 55000, 11000, 0, 2000, 12, 0],
+        ['E003', 70000, 14000, 5000, 3000, 15, 1500],
+        ['E004', 12345.67, '', '', '', '', ''],
+        ['E005', 60000, 100, 0, 0, 12.5, 10],
+    ]
+    source = tmp_path / 'salaries.csv'
+    target = tmp_path / 'payroll_output.csv'
+    write_csv(source, ['Emp_ID', 'Basic_Pay', 'HRA', 'Over_Time', 'Other_Allow', 'PF_Percent', 'Other_Deduct'], rows)
+
+    summary = run_payroll_file(str(source), str(target), chunk_size=2, progress=None)
+
+    assert summary['rows'] == 5
+    assert summary['chunks'] == 3
+    assert summary['invalid'] == 0
+    output = read_csv(target)
+    assert [row['Emp_ID'] for row in output] == ['E001', 'E002', 'E003', 'E004', 'E005']
+    for row, out in zip(rows, output):
+        data = {key: value for key, value in zip(
+            ['Basic Pay', 'HRA', 'Over Time', 'Other Allowances', 'PF Percentage', 'Other Deductions'], row[1:])
+            if value != ''}
+        expected = calculate_gross_up_salary(data)
+        assert float(out['Net Salary']) == expected['Net Salary']
+        assert float(out['Gross Salary']) == expected['Gross Salary']
+        assert out['Status'] == 'OK'
+
+
+def test_invalid_and_unparseable_rows_do_not_stop_run(tmp_path, monkeypatch):
+    source = tmp_path / 'salaries.csv'
+    target = tmp_path / 'out.csv'
+    write_csv(source, ['code', 'Basic Pay', 'PF Percentage'], [
+        [1, 50000, 12],
+        [2, 0, 12],
+        [3, 'abc', 12],
+        [4, 40000, 100],
+        [5, 30000, 10],
+        [6, 'nan', 12],
+        [7, 'inf', 12],
+        [8, 30000, '1e400'],
+    ])
+
+    summary = run_payroll_file(str(source), str(target), chunk_size=3, progress=None)
+
+    assert summary['rows'] == 8
+    assert summary['invalid_rows'] == [1, 2, 3, 5, 6, 7]
+    assert [row['Status'] for row in read_csv(target)] == ['OK', 'INVALID', 'PARSE ERROR', 'INVALID', 'OK',
+                                                           'PARSE ERROR', 'PARSE ERROR', 'PARSE ERROR']
+
+    # Only the first MAX_INVALID_ROWS are listed; all of them are counted
+    monkeypatch.setattr(pipeline, 'MAX_INVALID_ROWS', 3)
+    summary = run_payroll_file(str(source), str(target), chunk_size=3, progress=None)
+    assert summary['invalid'] == 6 and summary['invalid_rows'] == [1, 2, 3]
+
+
+def test_reader_is_lazy(tmp_path):
+    """Chunks are produced one at a time without reading the whole file"""
+    source = tmp_path / 'salaries.csv'
+    write_csv(source, ['Basic Pay'], [[1000 + i] for i in range(10)])
+
+    chunks = iter_salary_chunks(read_salary_rows(str(source)), chunk_size=4)
+    first = next(chunks)
+    assert list(first['columns']['Basic Pay']) == [1000.0, 1001.0, 1002.0, 1003.0]
+    assert [len(chunk['passthrough']) for chunk in chunks] == [4, 2]
+
+
+def test_missing_basic_pay_column(tmp_path):
+    source = tmp_path / 'salaries.csv'
+    write_csv(source, ['HRA'], [[1]])
+    with pytest.raises(ValueError):
+        run_payroll_file(str(source), str(tmp_path / 'out.csv'), progress=None)
+
+
+def test_other_components(tmp_path):
+    """A definition's own columns (key, label or emp_salary column) are inputs, not passthrough"""
+    components = load_components()  # payroll/components.json: adds Conveyance (conv) and Medical
+    source = tmp_path / 'salaries.csv'
+    target = tmp_path / 'out.csv'
+    write_csv(source, ['Emp_ID', 'Basic Pay', 'conv', 'Medical'], [['E001', 50000, 1600, 1250]])
+    run_payroll_file(str(source), str(target), progress=None, components=components)
+    out, = read_csv(target)
+    expected = components.calculate({'Basic Pay': 50000, 'Conveyance': 1600, 'Medical': 1250})
+    assert list(out)[:2] == ['Emp_ID', 'Total Inclusions'] and out['Status'] == 'OK'
+    assert float(out['Net Salary']) == expected['Net Salary'] and float(out['Total Inclusions']) == 52850
+
+    with pytest.raises(ValueError, match='standard components'):
+        run_payroll_file(str(source), str(target), progress=None, components=components, cache=GrossUpCache())
+
+
+def test_memory_does_not_grow_with_file_size(tmp_path):
+    """Peak memory for 8x more rows stays close to the 1x run (bounded by chunk_size)"""
+    def peak_for(row_count):
+        source = tmp_path / f'in_{row_count}.csv'
+        write_csv(source, ['code', 'Basic Pay', 'HRA', 'PF Percentage'],
+                  ([i, 30000 + i % 500, 5000, 12] for i in range(row_count)))
+        tracemalloc.start()
+        run_payroll_file(str(source), str(tmp_path / 'out.csv'), chunk_size=1000, progress=None)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    small = peak_for(5000)
+    large = peak_for(40000)
+    assert large < small * 1.5
+
+
+def test_xlsx_round_trip(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['Emp_ID', 'Basic Pay', 'HRA', 'PF Percentage'])
+    sheet.append(['E001', 50000, 10000, 12])
+    sheet.append(['E002', 60000, None, 15])
+    workbook.save(tmp_path / 'in.xlsx')
+
+    summary = run_payroll_file(str(tmp_path / 'in.xlsx'), str(tmp_path / 'out.xlsx'), progress=None)
+
+    assert summary['rows'] == 2
+    out = openpyxl.load_workbook(tmp_path / 'out.xlsx', read_only=True)
+    values = list(out.active.iter_rows(values_only=True))
+    header = list(values[0])
+    assert values[1][header.index('Net Salary')] == calculate_gross_up_salary(
+        {'Basic Pay': 50000, 'HRA': 10000, 'PF Percentage': 12})['Net Salary']
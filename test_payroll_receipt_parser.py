@@ -0,0 +1,91 @@
+"""
+TEST FILE: Receipt Parser and Bulk Importer
+============================================
+
+Checks payroll/receipt_parser.py: legacy and gross-up receipts parse to
+exact paise, the sample Salary_Receipt files import into the typed schema,
+the emp_salary receipt column is read too, and malformed receipts are
+reported without stopping the import.
+"""
+
+import sys
+import os
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS, calculate_gross_up_salary
+from payroll.receipt_parser import GROSS_UP, LEGACY, ReceiptFormatError, import_receipts, parse_receipt
+from payroll.receipts import render_receipt
+from payroll.storage import SalaryStore
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SAMPLES = os.path.join(ROOT, 'Salary_Receipt')
+
+
+def gross_up_text(code=7, basic=50000):
+    result = calculate_gross_up_salary({'Basic Pay': basic, 'HRA': 20000, 'PF Percentage': 12.5})
+    return render_receipt(result, code, 'Mar', '2025', generated_on='31-03-2025')
+
+
+def test_parse_both_layouts():
+    with open(os.path.join(SAMPLES, '1.txt')) as f:
+        legacy = parse_receipt(f.read())
+    assert (legacy.layout, legacy.code, legacy.year, legacy.month) == (LEGACY, 1, 2025, 1)
+    assert (legacy.tdays, legacy.present, legacy.absent) == (31, 28, 3)
+    assert (legacy.conv, legacy.medical, legacy.pf, legacy.gross, legacy.net) == (
+        1000000, 400000, 500000, 10000000, 9132258)
+    assert legacy.generated_on == '2025-03-21'
+
+    receipt = parse_receipt(gross_up_text())
+    assert (receipt.layout, receipt.code, receipt.month, receipt.pf_percent) == (GROSS_UP, 7, 3, 1250)
+    assert (receipt.basic, receipt.hra) == (5000000, 2000000)
+    assert receipt.net == round(calculate_gross_up_salary(
+        {'Basic Pay': 50000, 'HRA': 20000, 'PF Percentage': 12.5})['Net Salary'] * 100)
+
+    with pytest.raises(ReceiptFormatError, match='Net Salary'):
+        parse_receipt(gross_up_text().replace('Net Salary (Take-Home)', 'Take-Home'))
+    with pytest.raises(ReceiptFormatError, match='Rs.----'):
+        parse_receipt(gross_up_text().replace('Rs.5000000.00', 'Rs.----').replace('Rs.50000.00', 'Rs.----'))
+    with pytest.raises(ReceiptFormatError, match='layout'):
+        parse_receipt('hello')
+
+
+def test_import_files_and_column(tmp_path):
+    files = tmp_path / 'receipts'
+    files.mkdir()
+    for name in os.listdir(SAMPLES):
+        (files / name).write_bytes(open(os.path.join(SAMPLES, name), 'rb').read())
+    (files / '11.txt').write_text(gross_up_text(code=999))   # code comes from the file name
+    (files / '12.txt').write_text('not a receipt')
+    (files / '13.txt').write_text(gross_up_text().replace('Mar-2025', 'Month-YYYY'))
+
+    legacy_db = str(tmp_path / 'ems.db')
+    with SalaryStore(legacy_db) as store:
+        record = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+        store.insert_many([dict(record, code=20, month='Apr', year='2025', reciept=gross_up_text(code=20)),
+                           dict(record, code=21, month='Apr', year='2025', reciept='garbled'),
+                           dict(record, code=22, month='Apr', year='2025')])
+
+    target = str(tmp_path / 'typed.db')
+    con = sqlite3.connect(target)
+    import_receipts(target, files=[], progress=None)
+    # An existing row keeps its amounts; receipt values fill only NULLs
+    con.execute('INSERT INTO employee_salary ("code", "year", "month", "name", "net_paise") '
+                'VALUES (1, 2025, 1, \'Asha\', 1)')
+    con.commit()
+
+    summary = import_receipts(target, files=str(files), column_source=legacy_db, workers=2, chunk_size=3,
+                              progress=None)
+    assert (summary['imported'], summary['legacy'], summary['gross_up']) == (12, 10, 2)
+    malformed = sorted(os.path.basename(source) for source, _ in summary['malformed'])
+    assert malformed == ['12.txt', '13.txt', 'emp_salary code=21 Apr-2025']
+
+    assert con.execute('SELECT "name", "net_paise", "tdays" FROM employee_salary WHERE "code"=1').fetchone() == (
+        'Asha', 1, 31)
+    assert con.execute('SELECT COUNT(*) FROM employee_salary').fetchone()[0] == 12
+    assert con.execute('SELECT "pf_basis_points" FROM gross_up_breakdown WHERE "code"=11').fetchone() == (1250,)
+    assert con.execute('SELECT "month" FROM salary_receipt WHERE "code"=20').fetchone() == (4,)
+    con.close()
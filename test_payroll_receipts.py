@@ -0,0 +1,51 @@
+"""
+TEST FILE: Salary Receipt Rendering
+====================================
+
+Checks payroll/receipts.py: the compiled template renders exactly like the
+layout itself, and bulk runs write one receipt per valid employee.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import calculate_gross_up_salary, calculate_gross_up_batch
+from payroll.receipts import GROSS_UP_RECEIPT, ReceiptTemplate, render_receipt, write_receipts
+
+
+def test_compiled_template_matches_layout():
+    result = calculate_gross_up_salary({'Basic Pay': 50000, 'HRA': 10000, 'Over Time': 5000,
+                                        'Other Allowances': 2000, 'PF Percentage': 12, 'Other Deductions': 1000})
+    text = render_receipt(result, 7, 'Jan', '2025', generated_on='21-03-2025')
+
+    expected = GROSS_UP_RECEIPT.format_map(dict(result, code=7, month='Jan', year='2025', generated_on='21-03-2025'))
+    assert text == expected
+    assert 'Net Salary (Take-Home)\t:    Rs.69136.36' in text
+    assert 'PF (12.0%)\t\t:    Rs.6000.00' in text
+
+
+def test_unsupported_placeholder():
+    with pytest.raises(ValueError):
+        ReceiptTemplate('{Net Salary:,.2f}')
+    assert ReceiptTemplate('100% {x}').render({'x': 1}) == '100% 1'
+
+
+def test_write_receipts(tmp_path):
+    rows = [(101, 50000, 12), (102, 0, 12), (103, 65000.5, 15)]
+    result = calculate_gross_up_batch({'Basic Pay': [r[1] for r in rows], 'PF Percentage': [r[2] for r in rows]})
+    codes = [r[0] for r in rows]
+
+    summary = write_receipts(result, codes, str(tmp_path / 'Jan'), 'Jan', '2025',
+                             generated_on='01-02-2025', workers=2, chunk_size=1)
+
+    assert summary['written'] == 2
+    assert summary['skipped'] == 1
+    assert sorted(os.listdir(tmp_path / 'Jan')) == ['101.txt', '103.txt']
+    for code, basic, pf in (rows[0], rows[2]):
+        expected = render_receipt(calculate_gross_up_salary({'Basic Pay': basic, 'PF Percentage': pf}),
+                                  code, 'Jan', '2025', generated_on='01-02-2025')
+        assert (tmp_path / 'Jan' / f'{code}.txt').read_text() == expected
@@ -0,0 +1,61 @@
+"""
+TEST FILE: Slotted Record Types
+================================
+
+Checks SalaryResult and Employee in payroll/core.py: they read like the
+dicts they copy (indexing, get, items, dict(), ** unpacking, == against a
+dict), are read-only, pickle for worker processes and are smaller than the
+dicts. The calculation functions keep returning plain dicts.
+"""
+
+import sys
+import os
+import json
+import pickle
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import (EMP_SALARY_COLUMNS, EMPLOYEE_FIELDS, SALARY_RESULT_KEYS, EmpSalaryRecord, Employee,
+                          SalaryResult, calculate_gross_up_paise, calculate_gross_up_salary, paise_inputs,
+                          paise_result_to_rupees)
+
+
+def test_salary_result_reads_like_a_dict():
+    plain = calculate_gross_up_salary({'Basic Pay': 50000, 'HRA': 10000, 'Over Time': 5000,
+                                       'Other Allowances': 2000, 'PF Percentage': 12})
+    assert type(plain) is dict and json.loads(json.dumps(plain)) == plain
+    exact = calculate_gross_up_paise(paise_inputs(plain))
+    assert type(exact) is dict and type(paise_result_to_rupees(exact)) is dict
+
+    result = SalaryResult.from_mapping(plain)
+    assert not hasattr(result, '__dict__')
+    assert result['Gross Salary'] == result.gross_salary == 67000 / (1 - 12 / 100)
+    assert list(result) == list(result.keys()) == list(SALARY_RESULT_KEYS) and len(result) == 11
+    assert 'Net Salary' in result and 'Bonus' not in result and result.get('Bonus', 0) == 0
+    assert result == plain and plain == result and dict(result) == plain == {**result}
+    assert json.loads(json.dumps(result.to_dict())) == plain
+    assert result.copy() == plain and type(result.copy()) is dict
+    with pytest.raises(KeyError):
+        result['Bonus']
+
+    with pytest.raises(TypeError):
+        result['Net Salary'] = 1.0
+    with pytest.raises(AttributeError):
+        result.net_salary = 1.0
+    assert result.net_salary == plain['Net Salary']
+
+    assert pickle.loads(pickle.dumps(result)) == result
+    assert SalaryResult.from_mapping(exact)['Gross Salary'] == 7613636
+    assert sys.getsizeof(result) < sys.getsizeof(plain) / 3
+
+
+def test_employee_from_record():
+    record = EmpSalaryRecord(*(f'{name}-1' for name in EMP_SALARY_COLUMNS))
+    employee = Employee.from_record(record)
+    assert employee.name == employee['name'] == 'name-1'
+    assert dict(employee) == {name: f'{name}-1' for name in EMPLOYEE_FIELDS}
+    assert dict(Employee()) == dict.fromkeys(EMPLOYEE_FIELDS, '')
+    assert repr(Employee(code=1)).startswith("Employee({'code': 1, 'designation': ''")
+    assert sys.getsizeof(employee) < sys.getsizeof(dict(employee)) / 2
@@ -0,0 +1,108 @@
+"""
+TEST FILE: In-Memory Employee Search Index
+===========================================
+
+Checks payroll/search_index.py: name-prefix and exact-field lookups,
+incremental updates, persistence and lookup speed.
+"""
+
+import sys
+import os
+import time
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.search_index import EmployeeIndex, build_index, index_path, open_index, parse_query
+from payroll.storage import SalaryStore
+
+FIRST_NAMES = ['Ravi', 'Anita', 'Kumaran', 'Priya', 'Suresh', 'Meena', 'Arjun', 'Divya']
+LAST_NAMES = ['Kumar', 'Sharma', 'Iyer', 'Nair', 'Reddy', 'Das']
+
+
+def make_employee(code, **values):
+    record = dict.fromkeys(EMP_SALARY_COLUMNS, '')
+    record.update({
+        'code': code,
+        'name': f'{FIRST_NAMES[code % len(FIRST_NAMES)]} {LAST_NAMES[code % len(LAST_NAMES)]}',
+        'email': f'emp{code}@xyz.com',
+        'designation': ['Clerk', 'Manager', 'Engineer'][code % 3],
+        'hl': ['Chennai', 'Pune'][code % 2],
+        'status': 'Active' if code % 10 else 'Inactive',
+        'month': 'Jan', 'year': '2025',
+    })
+    record.update(values)
+    return record
+
+
+def test_parse_query():
+    assert parse_query('designation:clerk status:Active ra') == {'designation': 'clerk', 'status': 'Active', 'name': 'ra'}
+    assert parse_query('location:Pune') == {'hl': 'Pune'}
+    assert parse_query('Ravi Ku') == {'name': 'Ravi Ku'}
+
+
+def test_lookups_and_incremental_updates():
+    index = EmployeeIndex()
+    for code in range(1, 49):
+        index.add(make_employee(code))
+
+    ravis = index.search(name='rav')
+    assert ravis and all(index.employees[c][0].startswith('Ravi') for c in ravis)
+    assert set(index.search(name='kum')) == {c for c in range(1, 49) if 'Kumar' in index.employees[c][0]}
+    assert index.search(email='EMP7@xyz.com') == [7]
+    assert index.search(designation='manager', hl='pune') == [c for c in range(1, 49) if c % 3 == 1 and c % 2 == 1]
+    assert index.search(name='ravi', status='inactive') == [c for c in ravis if c % 10 == 0]
+
+    index.update(make_employee(7, name='Zara Khan', designation='Director'))
+    assert index.search(name='zar') == [7]
+    assert index.search(email='emp7@xyz.com') == [7]
+    assert 7 not in index.search(designation='Manager', limit=100)
+    assert index.search(designation='director') == [7]
+
+    index.remove(7)
+    assert index.search(name='zara') == []
+    assert index.search(designation='director') == []
+    assert 'director' not in index.exact['designation']
+
+
+def test_persist_and_reopen(tmp_path):
+    with SalaryStore(str(tmp_path / 'ems.db')) as store:
+        store.insert_many(make_employee(code) for code in range(1, 101))
+        index = open_index(store)
+        assert os.path.exists(index_path(store))
+        assert len(index) == 100
+
+        reopened = open_index(store)
+        assert reopened.names == index.names and reopened.stamp == store.stamp()
+
+        # The table changed behind the index's back - rebuilt, not trusted
+        store.insert(make_employee(101, name='New Joiner'))
+        assert open_index(store).search(name='new') == [101]
+
+        # An edit by another program leaves count and last rowid as they were
+        open_index(store)
+        with sqlite3.connect(str(tmp_path / 'ems.db')) as other:
+            other.execute('UPDATE emp_salary SET "name"=? WHERE "code"=?', ('Zara Khan', 5))
+        assert open_index(store).search(name='zara') == [5]
+
+        # An earlier month saved later does not replace the employee's latest one
+        store.insert(make_employee(5, name='Old Name', month='Dec', year='2024'))
+        assert open_index(store).search(name='zara') == [5] and open_index(store).search(name='old') == []
+
+
+def test_lookup_under_a_millisecond(tmp_path):
+    index = EmployeeIndex()
+    index.bulk_load(make_employee(code) for code in range(1, 100001))
+    queries = [{'name': 'div'}, {'name': 'sharma', 'limit': 10}, {'email': 'emp99999@xyz.com'},
+               {'designation': 'engineer', 'hl': 'chennai', 'name': 'ar'}, {'status': 'inactive', 'limit': 20}]
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for query in queries:
+            index.search(**query)
+    average_ms = (time.perf_counter() - start) * 1000 / (100 * len(queries))
+    print(f"\n  average lookup: {average_ms:.3f} ms over 100k employees")
+    assert average_ms < 1.0
@@ -0,0 +1,113 @@
+"""
+TEST FILE: Gross-Up HTTP Service
+=================================
+
+Checks payroll/service.py over a real localhost socket: the single-record
+endpoint matches calculate_gross_up_salary(), bad requests get 4xx JSON
+errors, a batch sent to the worker pool reports its invalid rows without
+failing the others, and the workers calculate the service's components.
+"""
+
+import sys
+import os
+import json
+import asyncio
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.components import load_components
+from payroll.core import calculate_gross_up_salary
+from payroll.service import GrossUpService, calculate_rows
+
+
+async def send(connection, method, path, body=b''):
+    reader, writer = connection
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+                 + body)
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b'\r\n':
+        name, _, value = line.decode().partition(':')
+        headers[name.lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers['content-length'])))
+
+
+def serve(check, **options):
+    async def run():
+        service = GrossUpService(workers=1, **options)
+        host, port = await service.start('127.0.0.1', 0)
+        connection = await asyncio.open_connection(host, port)
+        try:
+            await check(service, connection)
+        finally:
+            connection[1].close()
+            await service.close()
+    asyncio.run(run())
+
+
+def test_single_record_and_errors():
+    async def check(service, connection):
+        assert await send(connection, 'GET', '/health') == (200, {'status': 'ok'})
+        inputs = {'Basic Pay': 50000, 'HRA': '10000', 'Over Time': 5000, 'Other Allowances': 2000}
+        status, result = await send(connection, 'POST', '/gross-up', json.dumps(inputs).encode())
+        assert status == 200 and result == calculate_gross_up_salary(inputs)
+
+        assert await send(connection, 'POST', '/gross-up', b'{"Basic Pay": 0}') == (
+            400, {'error': 'Basic Pay must be greater than 0'})
+        assert (await send(connection, 'POST', '/gross-up', b'{"Basic Pay": "abc"}'))[0] == 400
+        assert (await send(connection, 'POST', '/gross-up', b'{"Basic Pay": NaN}'))[0] == 400
+        assert await send(connection, 'POST', '/gross-up', b'{"Basic Pay": 1e308, "HRA": 1e308}') == (
+            400, {'error': 'Result is not a finite number'})
+        assert (await send(connection, 'POST', '/gross-up', b'not json'))[0] == 400
+        assert (await send(connection, 'GET', '/gross-up'))[0] == 405
+        assert (await send(connection, 'POST', '/gross-up/batch', b'{"row": []}'))[0] == 400
+        status, _ = await send(connection, 'GET', '/payroll')
+        assert status == 404
+        assert service.requests == 10
+
+        # A malformed request is answered, then the connection is closed
+        connection[1].write(b'nonsense\r\n\r\n')
+        assert (await connection[0].readline()).startswith(b'HTTP/1.1 400')
+        await connection[0].read()
+        assert connection[0].at_eof()
+
+    serve(check)
+
+
+def test_batch_in_worker_pool():
+    rows = [{'Basic Pay': 30000 + i, 'PF Percentage': 12} for i in range(500)]
+    rows[3] = {'Basic Pay': 50000, 'PF Percentage': 150}
+    rows[7] = {'Basic Pay': 'abc'}
+    rows[9] = ['not', 'an', 'object']
+    rows[11] = {'Basic Pay': 1e308, 'HRA': 1e308}  # the gross overflows
+
+    async def check(service, connection):
+        status, response = await send(connection, 'POST', '/gross-up/batch', json.dumps({'rows': rows}).encode())
+        assert status == 200 and service.offloaded == 1
+        assert response['rows'] == 500 and response['invalid'] == 4
+        assert response['errors'] == [{'row': 3, 'error': 'PF Percentage must be between 0 and 100'},
+                                      {'row': 7, 'error': 'Basic Pay must be a number'},
+                                      {'row': 9, 'error': 'Expected a JSON object of salary components'},
+                                      {'row': 11, 'error': 'Result is not a finite number'}]
+        assert [i for i, result in enumerate(response['results']) if result is None] == [3, 7, 9, 11]
+        assert response['results'][42] == calculate_gross_up_salary(rows[42])
+        assert response == calculate_rows(rows)
+
+        # the connection stays usable after a batch
+        assert await send(connection, 'GET', '/health') == (200, {'status': 'ok'})
+
+    serve(check, inline_bytes=0)
+
+
+def test_other_components_in_worker_pool():
+    components = load_components()  # payroll/components.json: adds Conveyance and Medical
+    rows = [{'Basic Pay': 30000 + i, 'Conveyance': 1600} for i in range(100)]
+
+    async def check(service, connection):
+        status, response = await send(connection, 'POST', '/gross-up/batch', json.dumps({'rows': rows}).encode())
+        assert status == 200 and service.offloaded == 1 and response['invalid'] == 0
+        assert response['results'][5] == components.calculate(rows[5])
+        status, result = await send(connection, 'POST', '/gross-up', json.dumps(rows[5]).encode())
+        assert status == 200 and result == components.calculate(rows[5])
+
+    serve(check, inline_bytes=0, components=components)
@@ -0,0 +1,95 @@
+"""
+TEST FILE: SQLite Storage for emp_salary
+=========================================
+
+Checks payroll/storage.py: CRUD used by the GUI buttons, bulk inserts of a
+whole payroll month, WAL mode and indexes.
+"""
+
+import sys
+import os
+import time
+import sqlite3
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll.core import EMP_SALARY_COLUMNS
+from payroll.storage import SalaryStore
+
+
+def make_record(code, month='Jan', year='2025', net='70136.36'):
+    record = {name: f'{name}-{code}' for name in EMP_SALARY_COLUMNS}
+    record.update({'code': code, 'month': month, 'year': year, 'net': net})
+    return record
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SalaryStore(str(tmp_path / 'ems.db')) as store:
+        yield store
+
+
+def test_schema_wal_and_indexes(store):
+    assert store.con.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    columns = [row[1] for row in store.con.execute('PRAGMA table_info(emp_salary)')]
+    assert columns == list(EMP_SALARY_COLUMNS)
+    indexes = {row[1] for row in store.con.execute('PRAGMA index_list(emp_salary)')}
+    assert {'idx_emp_salary_code', 'idx_emp_salary_period'} <= indexes
+    plan = store.con.execute('EXPLAIN QUERY PLAN SELECT * FROM emp_salary WHERE "year"=? AND "month"=?', ('2025', 'Jan')).fetchall()
+    assert 'idx_emp_salary_period' in str(plan)
+
+
+def test_save_search_update_delete(store):
+    store.insert(make_record(1))
+    with pytest.raises(sqlite3.IntegrityError):
+        store.insert(make_record(1))
+    store.insert(make_record(1, month='Feb'))
+
+    assert store.get(1).month == 'Feb'  # latest salary month
+    assert store.get(1, 'Jan', '2025').net == '70136.36'
+
+    assert store.update(make_record(1, net='80000.00'))
+    assert store.get(1, 'Jan', '2025').net == '80000.00'
+    assert not store.update(make_record(2))
+
+    assert store.delete(1, 'Jan', '2025') == 1
+    assert store.get(1, 'Jan', '2025') is None
+    assert store.delete(1) == 1
+    assert store.get(1) is None
+
+
+def test_bulk_insert_100k_month(store):
+    """A whole 100k-employee month in one executemany/transaction"""
+    start = time.perf_counter()
+    written = store.insert_many(make_record(code) for code in range(1, 100001))
+    seconds = time.perf_counter() - start
+
+    assert written == 100000
+    assert store.count() == 100000
+    assert len(store.period('Jan', '2025')) == 100000
+    assert seconds < 10
+
+
+def test_bulk_insert_is_atomic(store):
+    store.insert(make_record(5))
+    with pytest.raises(sqlite3.IntegrityError):
+        store.insert_many([make_record(4), make_record(5)])
+    assert store.get(4) is None
+    assert store.insert_many([make_record(4), make_record(5, net='1')], replace=True) == 2
+    assert store.get(5).net == '1'
+
+
+def test_overwrite_keeps_row_and_latest_month(store):
+    store.insert_many([make_record(1, month='Dec', year='2024'), make_record(1, month='Feb'), make_record(1)])
+    rowids = store.con.execute('SELECT rowid FROM emp_salary ORDER BY rowid').fetchall()
+
+    assert store.get(1).month == 'Feb'  # by (year, month), not by the order saved
+    assert store.insert_many([make_record(1, net='1.00'), make_record(1, month='Dec', year='2024', net='2.00')],
+                             replace=True) == 2
+    assert store.con.execute('SELECT rowid FROM emp_salary ORDER BY rowid').fetchall() == rowids
+    assert store.get(1).month == 'Feb'
+    assert [record.net for record in store.history(1)] == ['2.00', '70136.36', '1.00']
+    store.insert(make_record(1, month='12', year='2025'))
+    assert store.get(1).month == '12'
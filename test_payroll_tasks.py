@@ -0,0 +1,98 @@
+"""
+TEST FILE: Background Tasks for the GUI
+========================================
+
+Checks payroll/tasks.py with a fake Tk scheduler: callbacks run on the
+polling thread, busy state and progress are reported, cancel works, and
+one poll never runs callbacks for longer than its frame budget.
+"""
+
+import sys
+import os
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from payroll import tasks
+from payroll.tasks import TaskRunner
+
+
+class FakeRoot:
+    """Stands in for Tk: after() queues callbacks, pump() runs them."""
+
+    def __init__(self):
+        self.pending = []
+        self.poll_seconds = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            callback = self.pending.pop(0)
+            start = time.perf_counter()
+            callback()
+            self.poll_seconds.append(time.perf_counter() - start)
+            time.sleep(0.001)
+
+
+def test_results_delivered_on_polling_thread():
+    root = FakeRoot()
+    busy = []
+    runner = TaskRunner(root, on_busy=busy.append)
+    seen = {}
+
+    runner.submit(lambda task, x: (x * 2, threading.get_ident()),
+                  21, on_done=lambda value: seen.update(value=value, thread=threading.get_ident()))
+    runner.submit(lambda task: 1 / 0, on_error=lambda ex: seen.update(error=ex))
+    assert runner.busy
+    root.pump()
+
+    assert seen['value'][0] == 42 and seen['value'][1] != threading.get_ident()
+    assert seen['thread'] == threading.get_ident()
+    assert isinstance(seen['error'], ZeroDivisionError)
+    assert busy == [True, False] and not runner.busy and root.pending == []
+    runner.shutdown()
+
+
+def test_progress_and_cancel():
+    root = FakeRoot()
+    reports = []
+    runner = TaskRunner(root, on_progress=lambda task, done, total, text: reports.append((done, total)))
+    started = threading.Event()
+    outcome = []
+
+    def bulk(task):
+        for done in range(1, 1000):
+            task.progress(done, 1000)
+            started.set()
+            task.check()
+            time.sleep(0.001)
+        return 'finished'
+
+    task = runner.submit(bulk, bulk=True, on_done=outcome.append, on_cancel=lambda: outcome.append('cancelled'))
+    started.wait(1)
+    root.pump(timeout=0.05)
+    task.cancel()
+    root.pump()
+
+    assert outcome == ['cancelled']
+    assert reports and all(total == 1000 for done, total in reports)
+    assert len(reports) < 1000    # coalesced, not one callback per report
+    runner.shutdown()
+
+
+def test_poll_respects_frame_budget():
+    root = FakeRoot()
+    runner = TaskRunner(root, max_workers=4)
+    delivered = []
+    for i in range(300):
+        runner.submit(lambda task, i: i, i, on_done=lambda value: (delivered.append(value), time.sleep(0.001)))
+    runner.executor.shutdown(wait=True)
+    root.pump()
+
+    assert sorted(delivered) == list(range(300))
+    # Each poll stops after FRAME_BUDGET; one slow callback may run past it
+    assert max(root.poll_seconds) < tasks.FRAME_BUDGET + 0.03
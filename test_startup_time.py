@@ -0,0 +1,60 @@
+"""
+TEST FILE: Import / Startup Cost Regression
+============================================
+
+Batch workers import the calculation from employee.py. These checks run the
+import in a fresh interpreter and make sure it stays headless (no tkinter,
+no Tk root) and cheap.
+
+Budget can be raised on slow machines with PAYROLL_IMPORT_BUDGET_MS.
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Generous wall-clock budget for `import employee` in a new interpreter,
+# excluding interpreter start-up itself
+IMPORT_BUDGET_MS = float(os.environ.get('PAYROLL_IMPORT_BUDGET_MS', 500))
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    'elapsed_ms': elapsed_ms,
+    'tkinter_loaded': any(name == 'tkinter' or name.startswith('tkinter.') for name in sys.modules),
+}}))
+"""
+
+
+def run_import_probe(module):
+    env = dict(os.environ)
+    env.pop('DISPLAY', None)  # behave like a headless server
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_employee_import_is_headless():
+    """import employee must not load tkinter or need a display"""
+    probe = run_import_probe('employee')
+    assert not probe['tkinter_loaded']
+
+
+def test_core_import_is_headless():
+    probe = run_import_probe('payroll.core')
+    assert not probe['tkinter_loaded']
+
+
+def test_employee_import_time_budget():
+    """Best of 3 runs to smooth out a cold disk cache"""
+    best_ms = min(run_import_probe('employee')['elapsed_ms'] for _ in range(3))
+    print(f"\n  import employee: {best_ms:.1f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    assert best_ms < IMPORT_BUDGET_MS